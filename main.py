@@ -11,25 +11,46 @@ Environment Variables:
     PHONE_AGENT_API_KEY: API key for model authentication (default: EMPTY)
     PHONE_AGENT_MAX_STEPS: Maximum steps per task (default: 100)
     PHONE_AGENT_DEVICE_ID: ADB device ID for multi-device setups
+    PHONE_AGENT_TIMING_PROFILE: Timing profile file for learned action delays
 """
 
 import argparse
+import atexit
 import os
 import shutil
 import subprocess
 import sys
+from typing import Callable
 from urllib.parse import urlparse
 
-from openai import OpenAI
-
 from phone_agent import PhoneAgent
 from phone_agent.agent import AgentConfig
 from phone_agent.agent_ios import IOSAgentConfig, IOSPhoneAgent
+from phone_agent.checkpoint import CheckpointStore
 from phone_agent.config.apps import list_supported_apps
 from phone_agent.config.apps_harmonyos import list_supported_apps as list_harmonyos_apps
 from phone_agent.config.apps_ios import list_supported_apps as list_ios_apps
 from phone_agent.device_factory import DeviceType, get_device_factory, set_device_type
-from phone_agent.model import ModelConfig
+from phone_agent.events import EventSink, JsonlSink, NullSink
+from phone_agent.fleet import FleetConfig, FleetRunner, load_tasks
+from phone_agent.model import (
+    BATCH,
+    INTERACTIVE,
+    HedgeConfig,
+    HedgingPolicy,
+    HttpPoolConfig,
+    ModelConfig,
+    ModelRouter,
+    RequestScheduler,
+    RetryConfig,
+    SchedulerConfig,
+    get_openai_client,
+    get_retry_policy,
+    get_scheduler,
+    pool_stats,
+)
+from phone_agent.server import AgentService, ServiceConfig
+from phone_agent.timing_profile import TimingProfileStore
 from phone_agent.xctest import XCTestConnection
 from phone_agent.xctest import list_devices as list_ios_devices
 
@@ -269,7 +290,12 @@ def check_system_requirements(
     return all_passed
 
 
-def check_model_api(base_url: str, model_name: str, api_key: str = "EMPTY") -> bool:
+def check_model_api(
+    base_url: str,
+    model_name: str,
+    api_key: str = "EMPTY",
+    http_pool: HttpPoolConfig | None = None,
+) -> bool:
     """
     Check if the model API is accessible and the specified model exists.
 
@@ -281,6 +307,7 @@ def check_model_api(base_url: str, model_name: str, api_key: str = "EMPTY") -> b
         base_url: The API base URL
         model_name: The model name to check
         api_key: The API key for authentication
+        http_pool: Pool settings of the shared client, if it is created here
 
     Returns:
         True if all checks pass, False otherwise.
@@ -293,8 +320,10 @@ def check_model_api(base_url: str, model_name: str, api_key: str = "EMPTY") -> b
     # Check 1: Network connectivity using chat API
     print(f"1. Checking API connectivity ({base_url})...", end=" ")
     try:
-        # Create OpenAI client
-        client = OpenAI(base_url=base_url, api_key=api_key, timeout=30.0)
+        # Use the shared client, so the agents reuse the checked connection
+        client = get_openai_client(base_url, api_key, http_pool).with_options(
+            timeout=30.0
+        )
 
         # Use chat completion to test connectivity (more universally supported than /models)
         response = client.chat.completions.create(
@@ -383,6 +412,26 @@ Examples:
     # List supported apps
     python main.py --list-apps
 
+    # Learn action delays per device/app, then compare them with the defaults
+    python main.py --timing-profile timing.json "Open Settings"
+    python main.py --timing-profile timing.json --show-timing-profile
+
+    # Checkpoint every step, then resume a run after a crash
+    python main.py --checkpoint-dir checkpoints "Open Settings"
+    python main.py --checkpoint-dir checkpoints --list-checkpoints
+    python main.py --checkpoint-dir checkpoints --resume RUN_ID
+
+    # Run a task file on every connected device, 4 at a time
+    python main.py --devices all --tasks-file tasks.jsonl --concurrency 4
+
+    # Log agent events as JSON lines instead of printing them
+    python main.py --events-jsonl events.jsonl "Open Settings"
+
+    # Serve tasks over HTTP, streaming step events
+    python main.py --serve --port 8080
+    curl -X POST localhost:8080/tasks -d '{"task": "打开设置"}'
+    curl -N localhost:8080/tasks/<id>/events
+
     # iOS specific examples
     # Run with iOS device
     python main.py --device-type ios "Open Safari and search for iPhone tips"
@@ -409,6 +458,14 @@ Examples:
         help="Model API base URL",
     )
 
+    parser.add_argument(
+        "--endpoints",
+        type=str,
+        default=os.getenv("PHONE_AGENT_ENDPOINTS"),
+        help="Comma-separated base URLs of replicas serving the model; each run "
+        "is pinned to one, replacing --base-url",
+    )
+
     parser.add_argument(
         "--model",
         type=str,
@@ -494,10 +551,161 @@ Examples:
         "--quiet", "-q", action="store_true", help="Suppress verbose output"
     )
 
+    parser.add_argument(
+        "--events-jsonl",
+        type=str,
+        metavar="PATH",
+        help="Append agent events to a JSONL file instead of printing them",
+    )
+
     parser.add_argument(
         "--list-apps", action="store_true", help="List supported apps and exit"
     )
 
+    # Service options
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as an HTTP service accepting tasks on the --devices",
+    )
+
+    parser.add_argument(
+        "--host",
+        type=str,
+        default=os.getenv("PHONE_AGENT_HOST", "127.0.0.1"),
+        help="Service: address to listen on (default: 127.0.0.1)",
+    )
+
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=int(os.getenv("PHONE_AGENT_PORT", "8080")),
+        help="Service: port to listen on (default: 8080)",
+    )
+
+    # Fleet options
+    parser.add_argument(
+        "--tasks-file",
+        type=str,
+        help='JSONL file of tasks ({"task": ...} per line) to run across devices',
+    )
+
+    parser.add_argument(
+        "--devices",
+        type=str,
+        default="all",
+        help="Fleet devices: 'all' connected devices or a comma-separated list",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Fleet: maximum devices used at once (default: all)",
+    )
+
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=2,
+        help="Fleet: attempts per task, retrying model errors (default: 2)",
+    )
+
+    parser.add_argument(
+        "--results",
+        type=str,
+        default="fleet_results.jsonl",
+        help="Fleet: JSONL file results are appended to",
+    )
+
+    parser.add_argument(
+        "--timing-profile",
+        type=str,
+        default=os.getenv("PHONE_AGENT_TIMING_PROFILE"),
+        help="Timing profile file: learn per-device/app/action delays and use them",
+    )
+
+    parser.add_argument(
+        "--show-timing-profile",
+        action="store_true",
+        help="Print learned delays from --timing-profile next to the defaults and exit",
+    )
+
+    # Checkpoint options
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=str,
+        default=os.getenv("PHONE_AGENT_CHECKPOINT_DIR"),
+        help="Write a checkpoint of every step to this directory (resumable)",
+    )
+
+    parser.add_argument(
+        "--resume",
+        type=str,
+        metavar="RUN_ID",
+        help="Resume an interrupted run from --checkpoint-dir",
+    )
+
+    parser.add_argument(
+        "--list-checkpoints",
+        action="store_true",
+        help="List unfinished runs in --checkpoint-dir and exit",
+    )
+
+    # Model request scheduling
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=int(os.getenv("PHONE_AGENT_MAX_IN_FLIGHT", "0")) or None,
+        help="Cap concurrent model requests per endpoint, adapting to TTFT "
+        "(default: no cap)",
+    )
+
+    parser.add_argument(
+        "--scheduler-lock-dir",
+        type=str,
+        default=os.getenv("PHONE_AGENT_SCHEDULER_LOCK_DIR"),
+        help="Directory of lock files sharing --max-in-flight between processes",
+    )
+
+    parser.add_argument(
+        "--priority",
+        type=str,
+        choices=["interactive", "batch"],
+        help="Model request priority (default: interactive, batch for fleets)",
+    )
+
+    # Model connection pool
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=int(os.getenv("PHONE_AGENT_MAX_CONNECTIONS", "64")),
+        help="Connections in the pool shared by all agents per model endpoint "
+        "(default: 64)",
+    )
+
+    parser.add_argument(
+        "--no-http2",
+        action="store_true",
+        help="Use HTTP/1.1 only for the model endpoint",
+    )
+
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=int(os.getenv("PHONE_AGENT_MAX_RETRIES", "3")),
+        help="Retries of a model request after a connection error or 5xx, with "
+        "jittered exponential backoff (default: 3)",
+    )
+
+    parser.add_argument(
+        "--hedge-budget",
+        type=float,
+        default=float(os.getenv("PHONE_AGENT_HEDGE_BUDGET", "0")) or None,
+        help="Duplicate model requests slower to first token than the 95th "
+        "percentile, for at most this share of requests, e.g. 0.05 "
+        "(default: off)",
+    )
+
     parser.add_argument(
         "--lang",
         type=str,
@@ -524,6 +732,306 @@ Examples:
     return parser.parse_args()
 
 
+def list_checkpoints(directory: str | None) -> None:
+    """
+    Print the unfinished runs of a checkpoint directory.
+
+    Args:
+        directory: Checkpoint directory.
+    """
+    if not directory or not os.path.isdir(directory):
+        print("No checkpoints found. Record them with --checkpoint-dir DIR.")
+        return
+
+    checkpoints = CheckpointStore(directory).unfinished()
+    if not checkpoints:
+        print(f"No unfinished runs in {directory}")
+        return
+    print(f"{'Run ID':<24} {'Steps':>5} {'Device':<16} Task")
+    print("-" * 78)
+    for checkpoint in checkpoints:
+        device_id = checkpoint.metadata.get("device_id") or "-"
+        print(
+            f"{checkpoint.run_id:<24} {checkpoint.steps:>5} {device_id[:16]:<16} "
+            f"{checkpoint.task[:40]}"
+        )
+    print(f"\nResume with: --checkpoint-dir {directory} --resume RUN_ID")
+
+
+def show_timing_profile(path: str | None) -> None:
+    """
+    Print learned delays next to the defaults from config/timing.py.
+
+    Args:
+        path: Timing profile file.
+    """
+    if not path or not os.path.exists(path):
+        print("No timing profile found. Record one with --timing-profile PATH.")
+        return
+
+    profiles = TimingProfileStore(path).profiles()
+    print(f"Timing profile: {path}\n")
+    print(
+        f"{'Device':<16} {'App':<16} {'Action':<11} {'n':>4} "
+        f"{'p50':>6} {'p90':>6} {'Delay':>6} {'Default':>8}"
+    )
+    print("-" * 78)
+    for profile in profiles:
+        delay = f"{profile.delay:.2f}" if profile.delay is not None else "-"
+        default = f"{profile.default:.2f}" if profile.default is not None else "-"
+        print(
+            f"{profile.device[:16]:<16} {profile.app[:16]:<16} {profile.action:<11} "
+            f"{profile.samples:>4} {profile.p50:>6.2f} {profile.p90:>6.2f} "
+            f"{delay:>6} {default:>8}"
+        )
+
+    learned = [p for p in profiles if p.delay is not None and p.default is not None]
+    if learned:
+        saved = sum(p.default - p.delay for p in learned) / len(learned)
+        print(f"\nAverage saving per action vs default: {saved:.2f}s")
+
+
+def create_http_pool_config(args) -> HttpPoolConfig:
+    """Pool settings of the shared model client from the command line."""
+    return HttpPoolConfig(
+        max_connections=args.max_connections,
+        max_keepalive_connections=args.max_connections,
+        http2=not args.no_http2,
+    )
+
+
+def print_pool_stats() -> None:
+    """Print the connection use of the shared model clients."""
+    for pool in pool_stats():
+        print(
+            f"Model connections: {pool.connections_opened} opened for "
+            f"{pool.requests} requests ({pool.reuse_rate:.0%} reused), peak "
+            f"{pool.peak_in_flight}/{pool.max_connections} in use"
+        )
+
+
+def create_router(args) -> ModelRouter | None:
+    """Build the model router if --endpoints is set."""
+    if not args.endpoints:
+        return None
+    endpoints = [url.strip() for url in args.endpoints.split(",") if url.strip()]
+    return ModelRouter(endpoints) if endpoints else None
+
+
+def print_router_stats(router: ModelRouter | None) -> None:
+    """Print how the runs were spread over the model replicas."""
+    if router is None:
+        return
+    for route in router.stats():
+        ttft = f"{route.ttft_ewma:.3f}s" if route.ttft_ewma is not None else "-"
+        print(
+            f"Model replica {route.endpoint}: {route.requests} requests, "
+            f"TTFT {ttft}, {route.failures} failures"
+        )
+
+
+def create_hedging(args) -> HedgingPolicy | None:
+    """Build the hedging policy of the agents if --hedge-budget is set."""
+    if not args.hedge_budget:
+        return None
+    return HedgingPolicy(HedgeConfig(budget=args.hedge_budget))
+
+
+def print_hedge_stats(hedging: HedgingPolicy | None) -> None:
+    """Print how many model requests were hedged."""
+    if hedging is None:
+        return
+    stats = hedging.stats()
+    print(
+        f"Hedged model requests: {stats.hedged}/{stats.requests} "
+        f"({stats.hedge_rate:.1%}), {stats.hedge_wins} won, delay "
+        f"{stats.delay:.3f}s"
+    )
+
+
+def print_circuit_stats() -> None:
+    """Print the retries and circuit state of each model endpoint that failed."""
+    for circuit in get_retry_policy().stats():
+        if not circuit.failures:
+            continue
+        print(
+            f"Model endpoint {circuit.endpoint}: {circuit.failures} failures, "
+            f"{circuit.retries} retries, {circuit.rejected} rejected while "
+            f"open, circuit {circuit.state}"
+        )
+
+
+def create_scheduler(args) -> RequestScheduler | None:
+    """Build the process-wide request scheduler if --max-in-flight is set."""
+    if not args.max_in_flight:
+        return None
+    return get_scheduler(
+        SchedulerConfig(
+            max_in_flight=args.max_in_flight, lock_dir=args.scheduler_lock_dir
+        )
+    )
+
+
+def create_event_sink(args, console: bool = True) -> EventSink | None:
+    """
+    Build the event sink of the agents from --events-jsonl.
+
+    Args:
+        args: Parsed command line arguments.
+        console: Print events when no file is given. Otherwise they are
+            dropped, as in fleet and service modes.
+
+    Returns:
+        The sink, or None for the agents' default console output.
+    """
+    if args.events_jsonl:
+        sink = JsonlSink(args.events_jsonl)
+        atexit.register(sink.close)
+        return sink
+    return None if console else NullSink()
+
+
+def select_devices(args) -> list[str]:
+    """Device IDs from --devices: every connected device, or the given list."""
+    if args.devices == "all":
+        device_ids = [
+            device.device_id
+            for device in get_device_factory().list_devices()
+            if device.status == "device"
+        ]
+    else:
+        device_ids = [d.strip() for d in args.devices.split(",") if d.strip()]
+    if not device_ids:
+        print("No devices available.")
+        sys.exit(1)
+    return device_ids
+
+
+def create_agent_factory(
+    args,
+    model_config: ModelConfig,
+    priority: int,
+    router: ModelRouter | None = None,
+    hedging: HedgingPolicy | None = None,
+) -> Callable[[str], PhoneAgent]:
+    """
+    Build a factory of quiet per-device agents for fleet and service modes.
+
+    Args:
+        args: Parsed command line arguments.
+        model_config: Model configuration shared by all agents.
+        priority: Scheduler priority unless --priority is given.
+        router: Router shared by all agents, from --endpoints.
+        hedging: Hedging policy shared by all agents, from --hedge-budget.
+
+    Returns:
+        Callable creating the PhoneAgent for a device ID.
+    """
+    timing_profile = (
+        TimingProfileStore(args.timing_profile) if args.timing_profile else None
+    )
+    scheduler = create_scheduler(args)
+    if args.priority is not None:
+        priority = INTERACTIVE if args.priority == "interactive" else BATCH
+    event_sink = create_event_sink(args, console=False)
+
+    def create_agent(device_id: str) -> PhoneAgent:
+        return PhoneAgent(
+            model_config=model_config,
+            agent_config=AgentConfig(
+                max_steps=args.max_steps,
+                device_id=device_id,
+                verbose=False,
+                lang=args.lang,
+                timing_profile=timing_profile,
+                scheduler=scheduler,
+                priority=priority,
+                event_sink=event_sink,
+                router=router,
+                hedging=hedging,
+            ),
+        )
+
+    return create_agent
+
+
+def run_fleet(
+    args,
+    model_config: ModelConfig,
+    router: ModelRouter | None = None,
+    hedging: HedgingPolicy | None = None,
+) -> None:
+    """
+    Run --tasks-file across devices and append results to --results.
+
+    Args:
+        args: Parsed command line arguments.
+        model_config: Model configuration shared by all agents.
+        router: Router shared by all agents, from --endpoints.
+        hedging: Hedging policy shared by all agents, from --hedge-budget.
+    """
+    device_ids = select_devices(args)
+    tasks = load_tasks(args.tasks_file)
+    runner = FleetRunner(
+        create_agent_factory(args, model_config, BATCH, router, hedging),
+        device_ids,
+        FleetConfig(
+            concurrency=args.concurrency,
+            max_attempts=args.max_attempts,
+            results_path=args.results,
+        ),
+    )
+    print(f"Running {len(tasks)} task(s) on {len(runner.device_ids)} device(s)")
+    runner.run(tasks)
+
+    stats = runner.stats
+    print(
+        f"\nCompleted {stats.completed}/{stats.tasks} in {stats.elapsed:.1f}s "
+        f"({stats.throughput:.1f} tasks/min, {stats.retries} retries)"
+    )
+    print(f"Results: {args.results}")
+    print_pool_stats()
+    print_router_stats(router)
+    print_hedge_stats(hedging)
+    print_circuit_stats()
+    if args.max_in_flight:
+        for endpoint in get_scheduler().stats():
+            print(
+                f"Model queue wait: {endpoint.mean_queue_time:.3f}s mean over "
+                f"{endpoint.requests} requests (limit {endpoint.limit:g})"
+            )
+
+
+def run_service(
+    args,
+    model_config: ModelConfig,
+    router: ModelRouter | None = None,
+    hedging: HedgingPolicy | None = None,
+) -> None:
+    """
+    Serve tasks over HTTP on warm per-device agents until interrupted.
+
+    Args:
+        args: Parsed command line arguments.
+        model_config: Model configuration shared by all agents.
+        router: Router shared by all agents, from --endpoints.
+        hedging: Hedging policy shared by all agents, from --hedge-budget.
+    """
+    device_ids = select_devices(args)
+    service = AgentService(
+        create_agent_factory(args, model_config, INTERACTIVE, router, hedging),
+        device_ids,
+        ServiceConfig(host=args.host, port=args.port),
+    )
+    print(f"Serving {len(device_ids)} device(s) on http://{args.host}:{args.port}")
+    print("  POST /tasks, GET /tasks/<id>/events, DELETE /tasks/<id>")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+        service.shutdown()
+
+
 def handle_ios_device_commands(args) -> bool:
     """
     Handle iOS device-related commands.
@@ -697,11 +1205,14 @@ def main():
     if device_type != DeviceType.IOS:
         set_device_type(device_type)
 
-    # Enable HDC verbose mode if using HDC
+    # Enable HDC verbose mode if using HDC, unless output is quiet or shared
+    # by many agents
     if device_type == DeviceType.HDC:
         from phone_agent.hdc import set_hdc_verbose
 
-        set_hdc_verbose(True)
+        set_hdc_verbose(
+            not (args.quiet or args.events_jsonl or args.tasks_file or args.serve)
+        )
 
     # Handle --list-apps (no system check needed)
     if args.list_apps:
@@ -727,6 +1238,18 @@ def main():
             )
         return
 
+    if args.show_timing_profile:
+        show_timing_profile(args.timing_profile)
+        return
+
+    if args.list_checkpoints:
+        list_checkpoints(args.checkpoint_dir)
+        return
+
+    if args.resume and not args.checkpoint_dir:
+        print("--resume needs --checkpoint-dir.")
+        sys.exit(1)
+
     # Handle device commands (these may need partial system checks)
     if handle_device_commands(args):
         return
@@ -741,17 +1264,35 @@ def main():
         sys.exit(1)
 
     # Check model API connectivity and model availability
-    if not check_model_api(args.base_url, args.model, args.apikey):
-        sys.exit(1)
+    http_pool = create_http_pool_config(args)
+    # Model clients share the process-wide policy, so set it up first
+    get_retry_policy(RetryConfig(max_retries=args.max_retries))
+    router = create_router(args)
+    hedging = create_hedging(args)
+    endpoints = router.endpoints if router is not None else [args.base_url]
+    for endpoint in endpoints:
+        if not check_model_api(endpoint, args.model, args.apikey, http_pool):
+            sys.exit(1)
 
     # Create configurations and agent based on device type
     model_config = ModelConfig(
-        base_url=args.base_url,
+        base_url=endpoints[0],
         model_name=args.model,
         api_key=args.apikey,
+        http_pool=http_pool,
         lang=args.lang,
     )
 
+    if args.tasks_file or args.serve:
+        if device_type == DeviceType.IOS:
+            print("Fleet and service modes support adb and hdc devices only.")
+            sys.exit(1)
+        if args.serve:
+            run_service(args, model_config, router, hedging)
+        else:
+            run_fleet(args, model_config, router, hedging)
+        return
+
     if device_type == DeviceType.IOS:
         # Create iOS agent
         agent_config = IOSAgentConfig(
@@ -760,6 +1301,11 @@ def main():
             device_id=args.device_id,
             verbose=not args.quiet,
             lang=args.lang,
+            scheduler=create_scheduler(args),
+            priority=BATCH if args.priority == "batch" else INTERACTIVE,
+            event_sink=create_event_sink(args),
+            router=router,
+            hedging=hedging,
         )
 
         agent = IOSPhoneAgent(
@@ -773,6 +1319,17 @@ def main():
             device_id=args.device_id,
             verbose=not args.quiet,
             lang=args.lang,
+            timing_profile=(
+                TimingProfileStore(args.timing_profile) if args.timing_profile else None
+            ),
+            scheduler=create_scheduler(args),
+            priority=BATCH if args.priority == "batch" else INTERACTIVE,
+            checkpoint_store=(
+                CheckpointStore(args.checkpoint_dir) if args.checkpoint_dir else None
+            ),
+            event_sink=create_event_sink(args),
+            router=router,
+            hedging=hedging,
         )
 
         agent = PhoneAgent(
@@ -788,7 +1345,10 @@ def main():
         print("Phone Agent - AI-powered phone automation")
     print("=" * 50)
     print(f"Model: {model_config.model_name}")
-    print(f"Base URL: {model_config.base_url}")
+    if router is not None:
+        print(f"Endpoints: {', '.join(router.endpoints)}")
+    else:
+        print(f"Base URL: {model_config.base_url}")
     print(f"Max Steps: {agent_config.max_steps}")
     print(f"Language: {agent_config.lang}")
     print(f"Device Type: {args.device_type.upper()}")
@@ -818,7 +1378,14 @@ def main():
     print("=" * 50)
 
     # Run with provided task or enter interactive mode
-    if args.task:
+    if args.resume:
+        if device_type == DeviceType.IOS:
+            print("Resuming runs supports adb and hdc devices only.")
+            sys.exit(1)
+        print(f"\nResuming: {args.resume}\n")
+        result = agent.resume(args.resume)
+        print(f"\nResult: {result}")
+    elif args.task:
         print(f"\nTask: {args.task}\n")
         result = agent.run(args.task)
         print(f"\nResult: {result}")
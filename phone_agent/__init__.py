@@ -6,7 +6,8 @@ using AI models for visual understanding and decision making.
 """
 
 from phone_agent.agent import PhoneAgent
+from phone_agent.agent_async import AsyncPhoneAgent
 from phone_agent.agent_ios import IOSPhoneAgent
 
 __version__ = "0.1.0"
-__all__ = ["PhoneAgent", "IOSPhoneAgent"]
+__all__ = ["PhoneAgent", "IOSPhoneAgent", "AsyncPhoneAgent"]
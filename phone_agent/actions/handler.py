@@ -30,6 +30,8 @@ class ActionHandler:
         confirmation_callback: Optional callback for sensitive action confirmation.
             Should return True to proceed, False to cancel.
         takeover_callback: Optional callback for takeover requests (login, captcha).
+        delay_provider: Optional callback returning the delay to wait after an
+            action, by action name. Returning None keeps the configured default.
     """
 
     def __init__(
@@ -37,10 +39,12 @@ class ActionHandler:
         device_id: str | None = None,
         confirmation_callback: Callable[[str], bool] | None = None,
         takeover_callback: Callable[[str], None] | None = None,
+        delay_provider: Callable[[str], float | None] | None = None,
     ):
         self.device_id = device_id
         self.confirmation_callback = confirmation_callback or self._default_confirmation
         self.takeover_callback = takeover_callback or self._default_takeover
+        self.delay_provider = delay_provider
 
     def execute(
         self, action: dict[str, Any], screen_width: int, screen_height: int
@@ -115,6 +119,12 @@ class ActionHandler:
         y = int(element[1] / 1000 * screen_height)
         return x, y
 
+    def _delay(self, action_name: str) -> float | None:
+        """Delay after an action, or None for the configured default."""
+        if self.delay_provider is None:
+            return None
+        return self.delay_provider(action_name)
+
     def _handle_launch(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle app launch action."""
         app_name = action.get("app")
@@ -122,7 +132,9 @@ class ActionHandler:
             return ActionResult(False, False, "No app name specified")
 
         device_factory = get_device_factory()
-        success = device_factory.launch_app(app_name, self.device_id)
+        success = device_factory.launch_app(
+            app_name, self.device_id, delay=self._delay("Launch")
+        )
         if success:
             return ActionResult(True, False)
         return ActionResult(False, False, f"App not found: {app_name}")
@@ -145,7 +157,7 @@ class ActionHandler:
                 )
 
         device_factory = get_device_factory()
-        device_factory.tap(x, y, self.device_id)
+        device_factory.tap(x, y, self.device_id, delay=self._delay("Tap"))
         return ActionResult(True, False)
 
     def _handle_type(self, action: dict, width: int, height: int) -> ActionResult:
@@ -184,19 +196,26 @@ class ActionHandler:
         end_x, end_y = self._convert_relative_to_absolute(end, width, height)
 
         device_factory = get_device_factory()
-        device_factory.swipe(start_x, start_y, end_x, end_y, device_id=self.device_id)
+        device_factory.swipe(
+            start_x,
+            start_y,
+            end_x,
+            end_y,
+            device_id=self.device_id,
+            delay=self._delay("Swipe"),
+        )
         return ActionResult(True, False)
 
     def _handle_back(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle back button action."""
         device_factory = get_device_factory()
-        device_factory.back(self.device_id)
+        device_factory.back(self.device_id, delay=self._delay("Back"))
         return ActionResult(True, False)
 
     def _handle_home(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle home button action."""
         device_factory = get_device_factory()
-        device_factory.home(self.device_id)
+        device_factory.home(self.device_id, delay=self._delay("Home"))
         return ActionResult(True, False)
 
     def _handle_double_tap(self, action: dict, width: int, height: int) -> ActionResult:
@@ -207,7 +226,9 @@ class ActionHandler:
 
         x, y = self._convert_relative_to_absolute(element, width, height)
         device_factory = get_device_factory()
-        device_factory.double_tap(x, y, self.device_id)
+        device_factory.double_tap(
+            x, y, self.device_id, delay=self._delay("Double Tap")
+        )
         return ActionResult(True, False)
 
     def _handle_long_press(self, action: dict, width: int, height: int) -> ActionResult:
@@ -218,7 +239,9 @@ class ActionHandler:
 
         x, y = self._convert_relative_to_absolute(element, width, height)
         device_factory = get_device_factory()
-        device_factory.long_press(x, y, device_id=self.device_id)
+        device_factory.long_press(
+            x, y, device_id=self.device_id, delay=self._delay("Long Press")
+        )
         return ActionResult(True, False)
 
     def _handle_wait(self, action: dict, width: int, height: int) -> ActionResult:
@@ -342,7 +365,6 @@ def parse_action(response: str) -> dict[str, Any]:
     Raises:
         ValueError: If the response cannot be parsed.
     """
-    print(f"Parsing action: {response}")
     try:
         response = response.strip()
         if response.startswith('do(action="Type"') or response.startswith(
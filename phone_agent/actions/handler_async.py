@@ -0,0 +1,275 @@
+"""Asyncio action handler for the async agent."""
+
+import asyncio
+from types import ModuleType
+from typing import Any, Awaitable, Callable
+
+from phone_agent.actions.handler import ActionHandler, ActionResult
+from phone_agent.config.timing import TIMING_CONFIG
+
+
+class AsyncActionHandler:
+    """
+    Handles execution of actions from AI model output on an async device.
+
+    Mirrors ActionHandler, but every device call and delay is awaited.
+    Callbacks may be plain functions or coroutine functions; plain ones run in
+    a worker thread so a console prompt does not block the event loop.
+
+    Args:
+        device: Async device backend, such as phone_agent.adb.async_device.
+        device_id: Optional device ID for multi-device setups.
+        confirmation_callback: Optional callback for sensitive action confirmation.
+            Should return True to proceed, False to cancel.
+        takeover_callback: Optional callback for takeover requests (login, captcha).
+        delay_provider: Optional callback returning the delay to wait after an
+            action, by action name. Returning None keeps the configured default.
+    """
+
+    def __init__(
+        self,
+        device: ModuleType | Any,
+        device_id: str | None = None,
+        confirmation_callback: Callable[[str], bool | Awaitable[bool]] | None = None,
+        takeover_callback: Callable[[str], None | Awaitable[None]] | None = None,
+        delay_provider: Callable[[str], float | None] | None = None,
+    ):
+        self.device = device
+        self.device_id = device_id
+        self.confirmation_callback = (
+            confirmation_callback or ActionHandler._default_confirmation
+        )
+        self.takeover_callback = takeover_callback or ActionHandler._default_takeover
+        self.delay_provider = delay_provider
+
+    async def execute(
+        self, action: dict[str, Any], screen_width: int, screen_height: int
+    ) -> ActionResult:
+        """
+        Execute an action from the AI model.
+
+        Args:
+            action: The action dictionary from the model.
+            screen_width: Current screen width in pixels.
+            screen_height: Current screen height in pixels.
+
+        Returns:
+            ActionResult indicating success and whether to finish.
+        """
+        action_type = action.get("_metadata")
+
+        if action_type == "finish":
+            return ActionResult(
+                success=True, should_finish=True, message=action.get("message")
+            )
+
+        if action_type != "do":
+            return ActionResult(
+                success=False,
+                should_finish=True,
+                message=f"Unknown action type: {action_type}",
+            )
+
+        action_name = action.get("action")
+        handler_method = self._get_handler(action_name)
+
+        if handler_method is None:
+            return ActionResult(
+                success=False,
+                should_finish=False,
+                message=f"Unknown action: {action_name}",
+            )
+
+        try:
+            return await handler_method(action, screen_width, screen_height)
+        except Exception as e:
+            return ActionResult(
+                success=False, should_finish=False, message=f"Action failed: {e}"
+            )
+
+    def _get_handler(self, action_name: str) -> Callable | None:
+        """Get the handler method for an action."""
+        handlers = {
+            "Launch": self._handle_launch,
+            "Tap": self._handle_tap,
+            "Type": self._handle_type,
+            "Type_Name": self._handle_type,
+            "Swipe": self._handle_swipe,
+            "Back": self._handle_back,
+            "Home": self._handle_home,
+            "Double Tap": self._handle_double_tap,
+            "Long Press": self._handle_long_press,
+            "Wait": self._handle_wait,
+            "Take_over": self._handle_takeover,
+            "Note": self._handle_passthrough,
+            "Call_API": self._handle_passthrough,
+            "Interact": self._handle_interact,
+        }
+        return handlers.get(action_name)
+
+    @staticmethod
+    async def _call(callback: Callable[[str], Any], message: str) -> Any:
+        """Await a callback, running plain functions in a worker thread."""
+        if asyncio.iscoroutinefunction(callback):
+            return await callback(message)
+        return await asyncio.to_thread(callback, message)
+
+    def _delay(self, action_name: str) -> float | None:
+        """Delay after an action, or None for the configured default."""
+        if self.delay_provider is None:
+            return None
+        return self.delay_provider(action_name)
+
+    @staticmethod
+    def _convert_relative_to_absolute(
+        element: list[int], screen_width: int, screen_height: int
+    ) -> tuple[int, int]:
+        """Convert relative coordinates (0-1000) to absolute pixels."""
+        x = int(element[0] / 1000 * screen_width)
+        y = int(element[1] / 1000 * screen_height)
+        return x, y
+
+    async def _handle_launch(
+        self, action: dict, width: int, height: int
+    ) -> ActionResult:
+        """Handle app launch action."""
+        app_name = action.get("app")
+        if not app_name:
+            return ActionResult(False, False, "No app name specified")
+
+        success = await self.device.launch_app(
+            app_name, self.device_id, delay=self._delay("Launch")
+        )
+        if success:
+            return ActionResult(True, False)
+        return ActionResult(False, False, f"App not found: {app_name}")
+
+    async def _handle_tap(self, action: dict, width: int, height: int) -> ActionResult:
+        """Handle tap action."""
+        element = action.get("element")
+        if not element:
+            return ActionResult(False, False, "No element coordinates")
+
+        x, y = self._convert_relative_to_absolute(element, width, height)
+
+        # Check for sensitive operation
+        if "message" in action:
+            if not await self._call(self.confirmation_callback, action["message"]):
+                return ActionResult(
+                    success=False,
+                    should_finish=True,
+                    message="User cancelled sensitive operation",
+                )
+
+        await self.device.tap(x, y, self.device_id, delay=self._delay("Tap"))
+        return ActionResult(True, False)
+
+    async def _handle_type(self, action: dict, width: int, height: int) -> ActionResult:
+        """Handle text input action."""
+        text = action.get("text", "")
+
+        original_ime = await self.device.detect_and_set_adb_keyboard(self.device_id)
+        await asyncio.sleep(TIMING_CONFIG.action.keyboard_switch_delay)
+
+        await self.device.clear_text(self.device_id)
+        await asyncio.sleep(TIMING_CONFIG.action.text_clear_delay)
+
+        await self.device.type_text(text, self.device_id)
+        await asyncio.sleep(TIMING_CONFIG.action.text_input_delay)
+
+        await self.device.restore_keyboard(original_ime, self.device_id)
+        await asyncio.sleep(TIMING_CONFIG.action.keyboard_restore_delay)
+
+        return ActionResult(True, False)
+
+    async def _handle_swipe(
+        self, action: dict, width: int, height: int
+    ) -> ActionResult:
+        """Handle swipe action."""
+        start = action.get("start")
+        end = action.get("end")
+
+        if not start or not end:
+            return ActionResult(False, False, "Missing swipe coordinates")
+
+        start_x, start_y = self._convert_relative_to_absolute(start, width, height)
+        end_x, end_y = self._convert_relative_to_absolute(end, width, height)
+
+        await self.device.swipe(
+            start_x,
+            start_y,
+            end_x,
+            end_y,
+            device_id=self.device_id,
+            delay=self._delay("Swipe"),
+        )
+        return ActionResult(True, False)
+
+    async def _handle_back(self, action: dict, width: int, height: int) -> ActionResult:
+        """Handle back button action."""
+        await self.device.back(self.device_id, delay=self._delay("Back"))
+        return ActionResult(True, False)
+
+    async def _handle_home(self, action: dict, width: int, height: int) -> ActionResult:
+        """Handle home button action."""
+        await self.device.home(self.device_id, delay=self._delay("Home"))
+        return ActionResult(True, False)
+
+    async def _handle_double_tap(
+        self, action: dict, width: int, height: int
+    ) -> ActionResult:
+        """Handle double tap action."""
+        element = action.get("element")
+        if not element:
+            return ActionResult(False, False, "No element coordinates")
+
+        x, y = self._convert_relative_to_absolute(element, width, height)
+        await self.device.double_tap(
+            x, y, self.device_id, delay=self._delay("Double Tap")
+        )
+        return ActionResult(True, False)
+
+    async def _handle_long_press(
+        self, action: dict, width: int, height: int
+    ) -> ActionResult:
+        """Handle long press action."""
+        element = action.get("element")
+        if not element:
+            return ActionResult(False, False, "No element coordinates")
+
+        x, y = self._convert_relative_to_absolute(element, width, height)
+        await self.device.long_press(
+            x, y, device_id=self.device_id, delay=self._delay("Long Press")
+        )
+        return ActionResult(True, False)
+
+    async def _handle_wait(self, action: dict, width: int, height: int) -> ActionResult:
+        """Handle wait action."""
+        duration_str = action.get("duration", "1 seconds")
+        try:
+            duration = float(duration_str.replace("seconds", "").strip())
+        except ValueError:
+            duration = 1.0
+
+        await asyncio.sleep(duration)
+        return ActionResult(True, False)
+
+    async def _handle_takeover(
+        self, action: dict, width: int, height: int
+    ) -> ActionResult:
+        """Handle takeover request (login, captcha, etc.)."""
+        message = action.get("message", "User intervention required")
+        await self._call(self.takeover_callback, message)
+        return ActionResult(True, False)
+
+    async def _handle_passthrough(
+        self, action: dict, width: int, height: int
+    ) -> ActionResult:
+        """Handle Note and Call_API (placeholders, as in ActionHandler)."""
+        return ActionResult(True, False)
+
+    async def _handle_interact(
+        self, action: dict, width: int, height: int
+    ) -> ActionResult:
+        """Handle interaction request (user choice needed)."""
+        return ActionResult(True, False, message="User interaction required")
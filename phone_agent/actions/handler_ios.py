@@ -13,7 +13,14 @@ from phone_agent.xctest import (
     swipe,
     tap,
 )
+from phone_agent.xctest.device import (
+    add_back_gesture,
+    new_gesture_sequence,
+    swipe_duration,
+)
+from phone_agent.xctest.gestures import GestureSequence, perform_gestures
 from phone_agent.xctest.input import clear_text, hide_keyboard, type_text
+from phone_agent.xctest.session import WDAHttpSession, get_wda_http_session
 
 
 @dataclass
@@ -26,6 +33,10 @@ class ActionResult:
     requires_confirmation: bool = False
 
 
+# Pure pointer actions that can be merged into one W3C actions request
+BATCHABLE_ACTIONS = ("Tap", "Double Tap", "Long Press", "Swipe", "Back")
+
+
 class IOSActionHandler:
     """
     Handles execution of actions from AI model output for iOS devices.
@@ -36,6 +47,8 @@ class IOSActionHandler:
         confirmation_callback: Optional callback for sensitive action confirmation.
             Should return True to proceed, False to cancel.
         takeover_callback: Optional callback for takeover requests (login, captcha).
+        http_session: Optional pooled WDA HTTP session. Defaults to the shared
+            session for wda_url.
     """
 
     def __init__(
@@ -44,9 +57,11 @@ class IOSActionHandler:
         session_id: str | None = None,
         confirmation_callback: Callable[[str], bool] | None = None,
         takeover_callback: Callable[[str], None] | None = None,
+        http_session: WDAHttpSession | None = None,
     ):
         self.wda_url = wda_url
         self.session_id = session_id
+        self.http_session = http_session or get_wda_http_session(wda_url)
         self.confirmation_callback = confirmation_callback or self._default_confirmation
         self.takeover_callback = takeover_callback or self._default_takeover
 
@@ -95,6 +110,138 @@ class IOSActionHandler:
                 success=False, should_finish=False, message=f"Action failed: {e}"
             )
 
+    def execute_batch(
+        self,
+        actions: list[dict[str, Any]],
+        screen_width: int,
+        screen_height: int,
+        gesture_pause: float = 1.0,
+        delay: float = 1.0,
+    ) -> list[ActionResult]:
+        """
+        Execute several actions, merging consecutive pointer gestures.
+
+        Runs of Tap, Double Tap, Long Press, Swipe and Back are compiled into a
+        single W3C actions request with explicit pauses between them. Other
+        actions, and taps carrying a sensitive ``message``, run one at a time
+        through execute(). Execution stops at the first finishing action.
+
+        IOSPhoneAgent emits one action per step and calls execute(), so this
+        is for callers that already hold several actions, such as replays.
+
+        Args:
+            actions: Action dictionaries in model output form.
+            screen_width: Current screen width in pixels.
+            screen_height: Current screen height in pixels.
+            gesture_pause: Pause in seconds between merged gestures.
+            delay: Delay in seconds after each merged gesture request.
+
+        Returns:
+            One ActionResult per executed action.
+        """
+        results: list[ActionResult] = []
+        pending: list[dict[str, Any]] = []
+
+        for action in actions:
+            if self._is_batchable(action):
+                pending.append(action)
+                continue
+
+            results.extend(
+                self._flush_gestures(
+                    pending, screen_width, screen_height, gesture_pause, delay
+                )
+            )
+            pending = []
+
+            result = self.execute(action, screen_width, screen_height)
+            results.append(result)
+            if result.should_finish:
+                return results
+
+        results.extend(
+            self._flush_gestures(
+                pending, screen_width, screen_height, gesture_pause, delay
+            )
+        )
+        return results
+
+    @staticmethod
+    def _is_batchable(action: dict[str, Any]) -> bool:
+        """Check whether an action is a plain pointer gesture."""
+        return (
+            action.get("_metadata") == "do"
+            and action.get("action") in BATCHABLE_ACTIONS
+            and "message" not in action
+        )
+
+    def _flush_gestures(
+        self,
+        actions: list[dict[str, Any]],
+        width: int,
+        height: int,
+        gesture_pause: float,
+        delay: float,
+    ) -> list[ActionResult]:
+        """Send pending pointer actions as one gesture sequence."""
+        if len(actions) <= 1:
+            return [self.execute(action, width, height) for action in actions]
+
+        sequence = new_gesture_sequence()
+        for i, action in enumerate(actions):
+            if i > 0:
+                sequence.pause(gesture_pause)
+            error = self._add_gesture(sequence, action, width, height)
+            if error:
+                return [ActionResult(False, False, error) for _ in actions]
+
+        if not perform_gestures(
+            sequence, self.wda_url, self.session_id, self.http_session
+        ):
+            return [ActionResult(False, False, "Gesture batch failed") for _ in actions]
+
+        time.sleep(delay)
+        return [ActionResult(True, False) for _ in actions]
+
+    def _add_gesture(
+        self, sequence: GestureSequence, action: dict, width: int, height: int
+    ) -> str | None:
+        """Append one pointer action to a sequence. Returns an error or None."""
+        action_name = action.get("action")
+
+        if action_name == "Back":
+            add_back_gesture(sequence)
+            return None
+
+        if action_name == "Swipe":
+            start = action.get("start")
+            end = action.get("end")
+            if not start or not end:
+                return "Missing swipe coordinates"
+            start_x, start_y = self._convert_relative_to_absolute(start, width, height)
+            end_x, end_y = self._convert_relative_to_absolute(end, width, height)
+            sequence.swipe(
+                start_x,
+                start_y,
+                end_x,
+                end_y,
+                swipe_duration(start_x, start_y, end_x, end_y),
+            )
+            return None
+
+        element = action.get("element")
+        if not element:
+            return "No element coordinates"
+        x, y = self._convert_relative_to_absolute(element, width, height)
+
+        if action_name == "Tap":
+            sequence.tap(x, y)
+        elif action_name == "Double Tap":
+            sequence.double_tap(x, y)
+        else:  # Long Press
+            sequence.long_press(x, y, 3.0)
+        return None
+
     def _get_handler(self, action_name: str) -> Callable | None:
         """Get the handler method for an action."""
         handlers = {
@@ -130,7 +277,10 @@ class IOSActionHandler:
             return ActionResult(False, False, "No app name specified")
 
         success = launch_app(
-            app_name, wda_url=self.wda_url, session_id=self.session_id
+            app_name,
+            wda_url=self.wda_url,
+            session_id=self.session_id,
+            http_session=self.http_session,
         )
         if success:
             return ActionResult(True, False)
@@ -155,7 +305,13 @@ class IOSActionHandler:
                     message="User cancelled sensitive operation",
                 )
 
-        tap(x, y, wda_url=self.wda_url, session_id=self.session_id)
+        tap(
+            x,
+            y,
+            wda_url=self.wda_url,
+            session_id=self.session_id,
+            http_session=self.http_session,
+        )
         return ActionResult(True, False)
 
     def _handle_type(self, action: dict, width: int, height: int) -> ActionResult:
@@ -163,14 +319,27 @@ class IOSActionHandler:
         text = action.get("text", "")
 
         # Clear existing text and type new text
-        clear_text(wda_url=self.wda_url, session_id=self.session_id)
+        clear_text(
+            wda_url=self.wda_url,
+            session_id=self.session_id,
+            http_session=self.http_session,
+        )
         time.sleep(0.5)
 
-        type_text(text, wda_url=self.wda_url, session_id=self.session_id)
+        type_text(
+            text,
+            wda_url=self.wda_url,
+            session_id=self.session_id,
+            http_session=self.http_session,
+        )
         time.sleep(0.5)
 
         # Hide keyboard after typing
-        hide_keyboard(wda_url=self.wda_url, session_id=self.session_id)
+        hide_keyboard(
+            wda_url=self.wda_url,
+            session_id=self.session_id,
+            http_session=self.http_session,
+        )
         time.sleep(0.5)
 
         return ActionResult(True, False)
@@ -195,17 +364,26 @@ class IOSActionHandler:
             end_y,
             wda_url=self.wda_url,
             session_id=self.session_id,
+            http_session=self.http_session,
         )
         return ActionResult(True, False)
 
     def _handle_back(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle back gesture (swipe from left edge)."""
-        back(wda_url=self.wda_url, session_id=self.session_id)
+        back(
+            wda_url=self.wda_url,
+            session_id=self.session_id,
+            http_session=self.http_session,
+        )
         return ActionResult(True, False)
 
     def _handle_home(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle home button action."""
-        home(wda_url=self.wda_url, session_id=self.session_id)
+        home(
+            wda_url=self.wda_url,
+            session_id=self.session_id,
+            http_session=self.http_session,
+        )
         return ActionResult(True, False)
 
     def _handle_double_tap(self, action: dict, width: int, height: int) -> ActionResult:
@@ -215,7 +393,13 @@ class IOSActionHandler:
             return ActionResult(False, False, "No element coordinates")
 
         x, y = self._convert_relative_to_absolute(element, width, height)
-        double_tap(x, y, wda_url=self.wda_url, session_id=self.session_id)
+        double_tap(
+            x,
+            y,
+            wda_url=self.wda_url,
+            session_id=self.session_id,
+            http_session=self.http_session,
+        )
         return ActionResult(True, False)
 
     def _handle_long_press(self, action: dict, width: int, height: int) -> ActionResult:
@@ -231,6 +415,7 @@ class IOSActionHandler:
             duration=3.0,
             wda_url=self.wda_url,
             session_id=self.session_id,
+            http_session=self.http_session,
         )
         return ActionResult(True, False)
 
@@ -0,0 +1,278 @@
+"""
+Asyncio device control for Android automation.
+
+Async counterparts of the functions in device.py, input.py and screenshot.py.
+Commands run as asyncio subprocesses and delays use asyncio.sleep, so one
+event loop can drive many devices without a thread per device.
+"""
+
+import asyncio
+import base64
+from io import BytesIO
+
+from PIL import Image
+
+from phone_agent.adb.screenshot import Screenshot, _create_fallback_screenshot
+from phone_agent.config.apps import APP_PACKAGES
+from phone_agent.config.timing import TIMING_CONFIG
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+async def _run(
+    device_id: str | None, args: list[str], timeout: float | None = None
+) -> tuple[bytes, bytes]:
+    """
+    Run an adb command and return its (stdout, stderr).
+
+    Raises:
+        asyncio.TimeoutError: If the command does not finish within timeout.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *_get_adb_prefix(device_id),
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        return await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+
+
+async def _shell(device_id: str | None, *args: str) -> str:
+    """Run an adb shell command and return its decoded output."""
+    stdout, stderr = await _run(device_id, ["shell", *args])
+    return (stdout + stderr).decode("utf-8", errors="replace")
+
+
+async def get_screenshot(device_id: str | None = None, timeout: int = 10) -> Screenshot:
+    """
+    Capture a screenshot from the connected Android device.
+
+    The PNG is streamed over ``adb exec-out`` instead of being written to the
+    device and pulled, which saves a round trip and a temporary file.
+
+    Args:
+        device_id: Optional ADB device ID for multi-device setups.
+        timeout: Timeout in seconds for the capture.
+
+    Returns:
+        Screenshot object containing base64 data and dimensions. Falls back to
+        a black image (is_sensitive=True on secure screens) like the sync
+        version.
+    """
+    try:
+        stdout, stderr = await _run(
+            device_id, ["exec-out", "screencap", "-p"], timeout=timeout
+        )
+        if not stdout.startswith(PNG_SIGNATURE):
+            output = (stdout + stderr).decode("utf-8", errors="replace")
+            sensitive = "Status: -1" in output or "Failed" in output
+            return _create_fallback_screenshot(is_sensitive=sensitive)
+
+        width, height = Image.open(BytesIO(stdout)).size
+        return Screenshot(
+            base64_data=base64.b64encode(stdout).decode("utf-8"),
+            width=width,
+            height=height,
+            is_sensitive=False,
+        )
+    except Exception as e:
+        print(f"Screenshot error: {e}")
+        return _create_fallback_screenshot(is_sensitive=False)
+
+
+async def get_current_app(device_id: str | None = None) -> str:
+    """
+    Get the currently focused app name.
+
+    Args:
+        device_id: Optional ADB device ID for multi-device setups.
+
+    Returns:
+        The app name if recognized, otherwise "System Home".
+    """
+    output = await _shell(device_id, "dumpsys", "window")
+    if not output:
+        raise ValueError("No output from dumpsys window")
+
+    for line in output.split("\n"):
+        if "mCurrentFocus" in line or "mFocusedApp" in line:
+            for app_name, package in APP_PACKAGES.items():
+                if package in line:
+                    return app_name
+
+    return "System Home"
+
+
+async def get_device_model(device_id: str | None = None) -> str:
+    """Get the device model name, or "unknown" if unavailable."""
+    stdout, _ = await _run(device_id, ["shell", "getprop", "ro.product.model"])
+    return stdout.decode("utf-8", errors="replace").strip() or "unknown"
+
+
+async def tap(
+    x: int, y: int, device_id: str | None = None, delay: float | None = None
+) -> None:
+    """Tap at the specified coordinates, then wait delay seconds."""
+    if delay is None:
+        delay = TIMING_CONFIG.device.default_tap_delay
+
+    await _shell(device_id, "input", "tap", str(x), str(y))
+    await asyncio.sleep(delay)
+
+
+async def double_tap(
+    x: int, y: int, device_id: str | None = None, delay: float | None = None
+) -> None:
+    """Double tap at the specified coordinates, then wait delay seconds."""
+    if delay is None:
+        delay = TIMING_CONFIG.device.default_double_tap_delay
+
+    await _shell(device_id, "input", "tap", str(x), str(y))
+    await asyncio.sleep(TIMING_CONFIG.device.double_tap_interval)
+    await _shell(device_id, "input", "tap", str(x), str(y))
+    await asyncio.sleep(delay)
+
+
+async def long_press(
+    x: int,
+    y: int,
+    duration_ms: int = 3000,
+    device_id: str | None = None,
+    delay: float | None = None,
+) -> None:
+    """Long press at the specified coordinates, then wait delay seconds."""
+    if delay is None:
+        delay = TIMING_CONFIG.device.default_long_press_delay
+
+    await _shell(
+        device_id, "input", "swipe", str(x), str(y), str(x), str(y), str(duration_ms)
+    )
+    await asyncio.sleep(delay)
+
+
+async def swipe(
+    start_x: int,
+    start_y: int,
+    end_x: int,
+    end_y: int,
+    duration_ms: int | None = None,
+    device_id: str | None = None,
+    delay: float | None = None,
+) -> None:
+    """Swipe from start to end coordinates, then wait delay seconds."""
+    if delay is None:
+        delay = TIMING_CONFIG.device.default_swipe_delay
+
+    if duration_ms is None:
+        # Calculate duration based on distance
+        dist_sq = (start_x - end_x) ** 2 + (start_y - end_y) ** 2
+        duration_ms = int(dist_sq / 1000)
+        duration_ms = max(1000, min(duration_ms, 2000))  # Clamp between 1000-2000ms
+
+    await _shell(
+        device_id,
+        "input",
+        "swipe",
+        str(start_x),
+        str(start_y),
+        str(end_x),
+        str(end_y),
+        str(duration_ms),
+    )
+    await asyncio.sleep(delay)
+
+
+async def back(device_id: str | None = None, delay: float | None = None) -> None:
+    """Press the back button, then wait delay seconds."""
+    if delay is None:
+        delay = TIMING_CONFIG.device.default_back_delay
+
+    await _shell(device_id, "input", "keyevent", "4")
+    await asyncio.sleep(delay)
+
+
+async def home(device_id: str | None = None, delay: float | None = None) -> None:
+    """Press the home button, then wait delay seconds."""
+    if delay is None:
+        delay = TIMING_CONFIG.device.default_home_delay
+
+    await _shell(device_id, "input", "keyevent", "KEYCODE_HOME")
+    await asyncio.sleep(delay)
+
+
+async def launch_app(
+    app_name: str, device_id: str | None = None, delay: float | None = None
+) -> bool:
+    """
+    Launch an app by name, then wait delay seconds.
+
+    Returns:
+        True if app was launched, False if app not found.
+    """
+    if delay is None:
+        delay = TIMING_CONFIG.device.default_launch_delay
+
+    if app_name not in APP_PACKAGES:
+        return False
+
+    await _shell(
+        device_id,
+        "monkey",
+        "-p",
+        APP_PACKAGES[app_name],
+        "-c",
+        "android.intent.category.LAUNCHER",
+        "1",
+    )
+    await asyncio.sleep(delay)
+    return True
+
+
+async def type_text(text: str, device_id: str | None = None) -> None:
+    """Type text into the focused input field using ADB Keyboard."""
+    encoded_text = base64.b64encode(text.encode("utf-8")).decode("utf-8")
+    await _shell(
+        device_id, "am", "broadcast", "-a", "ADB_INPUT_B64", "--es", "msg", encoded_text
+    )
+
+
+async def clear_text(device_id: str | None = None) -> None:
+    """Clear text in the focused input field."""
+    await _shell(device_id, "am", "broadcast", "-a", "ADB_CLEAR_TEXT")
+
+
+async def detect_and_set_adb_keyboard(device_id: str | None = None) -> str:
+    """
+    Switch to ADB Keyboard if needed.
+
+    Returns:
+        The original keyboard IME identifier for later restoration.
+    """
+    current_ime = (
+        await _shell(device_id, "settings", "get", "secure", "default_input_method")
+    ).strip()
+
+    if "com.android.adbkeyboard/.AdbIME" not in current_ime:
+        await _shell(device_id, "ime", "set", "com.android.adbkeyboard/.AdbIME")
+
+    # Warm up the keyboard
+    await type_text("", device_id)
+
+    return current_ime
+
+
+async def restore_keyboard(ime: str, device_id: str | None = None) -> None:
+    """Restore the original keyboard IME."""
+    await _shell(device_id, "ime", "set", ime)
+
+
+def _get_adb_prefix(device_id: str | None) -> list:
+    """Get ADB command prefix with optional device specifier."""
+    if device_id:
+        return ["adb", "-s", device_id]
+    return ["adb"]
@@ -38,6 +38,27 @@ def get_current_app(device_id: str | None = None) -> str:
     return "System Home"
 
 
+def get_device_model(device_id: str | None = None) -> str:
+    """
+    Get the device model name.
+
+    Args:
+        device_id: Optional ADB device ID for multi-device setups.
+
+    Returns:
+        The model name (ro.product.model), or "unknown" if unavailable.
+    """
+    adb_prefix = _get_adb_prefix(device_id)
+
+    result = subprocess.run(
+        adb_prefix + ["shell", "getprop", "ro.product.model"],
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+    )
+    return result.stdout.strip() or "unknown"
+
+
 def tap(
     x: int, y: int, device_id: str | None = None, delay: float | None = None
 ) -> None:
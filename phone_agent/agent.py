@@ -1,16 +1,59 @@
 """Main PhoneAgent class for orchestrating phone automation."""
 
+import contextlib
 import json
+import time
 import traceback
-from dataclasses import dataclass
+from concurrent.futures import Future
+from dataclasses import dataclass, replace
 from typing import Any, Callable
 
-from phone_agent.actions import ActionHandler
+from phone_agent.actions import ActionHandler, ActionResult
 from phone_agent.actions.handler import do, finish, parse_action
-from phone_agent.config import get_messages, get_system_prompt
+from phone_agent.budget import (
+    ACT,
+    BUDGET_STOP_MESSAGES,
+    INFER,
+    OBSERVE,
+    RunBudget,
+    RunResult,
+    StopReason,
+)
+from phone_agent.checkpoint import CheckpointStats, CheckpointStore, CheckpointWriter
+from phone_agent.config import get_date_info, get_messages, get_system_prompt
+from phone_agent.context import ContextConfig, ContextManager, PromptStats
 from phone_agent.device_factory import get_device_factory
+from phone_agent.events import (
+    ACTION,
+    CACHED_RESPONSE,
+    CHECKPOINT,
+    INFERENCE_START,
+    LOOP_DETECTED,
+    REPLAYED_STEP,
+    RUN_STOPPED,
+    STEP_ERROR,
+    TASK_FINISHED,
+    AgentEvent,
+    ConsoleSink,
+    EventSink,
+)
+from phone_agent.loop_detector import (
+    LoopDetector,
+    LoopDetectorConfig,
+    LoopEvent,
+    LoopPolicy,
+)
 from phone_agent.model import ModelClient, ModelConfig
-from phone_agent.model.client import MessageBuilder
+from phone_agent.model.cache import ResponseCache
+from phone_agent.model.client import MessageBuilder, ModelResponse
+from phone_agent.model.hedging import HedgingPolicy
+from phone_agent.model.retry import ModelRequestError, RetryPolicy
+from phone_agent.model.router import ModelRouter
+from phone_agent.model.scheduler import INTERACTIVE, RequestScheduler
+from phone_agent.observation import Observation, ObservationCapturer
+from phone_agent.pipeline import StepPipeline
+from phone_agent.timing_profile import AdaptiveTiming, TimingProfileStore
+from phone_agent.trajectory import TrajectoryRun, TrajectoryStore, screen_fingerprint
 
 
 @dataclass
@@ -21,13 +64,55 @@ class AgentConfig:
     device_id: str | None = None
     lang: str = "cn"
     system_prompt: str | None = None
-    verbose: bool = True
+    verbose: bool = True  # Print every event when event_sink is not set
+    parallel_observation: bool = True  # Capture screenshot and current app concurrently
+    # Turn/token budget for the prompt; by default the full history is sent
+    context: ContextConfig | None = None
+    pipelined: bool = False  # Overlap device, model and bookkeeping stages in run()
+    early_dispatch: bool = False  # Start the action before the model stream closes
+    # Replay recorded trajectories for repeated tasks, recording successful runs
+    trajectory_store: TrajectoryStore | None = None
+    # Reuse model responses for repeated screens (opt-in)
+    response_cache: ResponseCache | None = None
+    # Detect cycles and no-progress streaks and escalate (opt-in)
+    loop_detection: LoopDetectorConfig | None = None
+    # Learn per-device/app/action settle times and use them as delays (opt-in)
+    timing_profile: TimingProfileStore | None = None
+    # Share model endpoint slots with other agents (device_id is the flow)
+    scheduler: RequestScheduler | None = None
+    priority: int = INTERACTIVE  # Scheduler priority class
+    # Append every step to a checkpoint so resume() can continue the run
+    checkpoint_store: CheckpointStore | None = None
+    # Receiver of step and model events; by default they are printed
+    event_sink: EventSink | None = None
+    # Spread runs over model replicas, pinning each run to one (opt-in)
+    router: ModelRouter | None = None
+    # Duplicate model requests slow to start to another replica (opt-in)
+    hedging: HedgingPolicy | None = None
+    # Retries and circuit breakers of model requests; by default process-wide
+    retry_policy: RetryPolicy | None = None
 
     def __post_init__(self):
         if self.system_prompt is None:
             self.system_prompt = get_system_prompt(self.lang)
 
 
+# Actions safe to start while the model stream is still draining. Anything
+# that may need user confirmation or ends the task waits for the full response.
+EARLY_DISPATCH_ACTIONS = (
+    "Launch",
+    "Tap",
+    "Type",
+    "Type_Name",
+    "Swipe",
+    "Back",
+    "Home",
+    "Double Tap",
+    "Long Press",
+    "Wait",
+)
+
+
 @dataclass
 class StepResult:
     """Result of a single agent step."""
@@ -37,6 +122,10 @@ class StepResult:
     action: dict[str, Any] | None
     thinking: str
     message: str | None = None
+    prompt_stats: PromptStats | None = None  # Size of the prompt for this step
+    loop_event: LoopEvent | None = None  # Loop detected at this step, if any
+    stop_reason: StopReason | None = None  # Set when a limit or error ended the run
+    model_retries: int = 0  # Model request attempts sent again at this step
 
 
 class PhoneAgent:
@@ -51,6 +140,8 @@ class PhoneAgent:
         agent_config: Configuration for the agent behavior.
         confirmation_callback: Optional callback for sensitive action confirmation.
         takeover_callback: Optional callback for takeover requests.
+        step_callback: Optional callback invoked with each StepResult. In
+            pipelined mode it runs on a background worker.
 
     Example:
         >>> from phone_agent import PhoneAgent
@@ -67,47 +158,161 @@ class PhoneAgent:
         agent_config: AgentConfig | None = None,
         confirmation_callback: Callable[[str], bool] | None = None,
         takeover_callback: Callable[[str], None] | None = None,
+        step_callback: Callable[[StepResult], None] | None = None,
     ):
         self.model_config = model_config or ModelConfig()
         self.agent_config = agent_config or AgentConfig()
+        self.step_callback = step_callback
+        self.event_sink = self.agent_config.event_sink or ConsoleSink(
+            self.agent_config.lang, verbose=self.agent_config.verbose
+        )
 
-        self.model_client = ModelClient(self.model_config)
+        self.model_client = ModelClient(
+            self.model_config,
+            scheduler=self.agent_config.scheduler,
+            priority=self.agent_config.priority,
+            flow=self.agent_config.device_id or "default",
+            event_sink=self.event_sink,
+            router=self.agent_config.router,
+            hedging=self.agent_config.hedging,
+            retry_policy=self.agent_config.retry_policy,
+        )
+        self.timing: AdaptiveTiming | None = None
+        if self.agent_config.timing_profile is not None:
+            self.timing = AdaptiveTiming(
+                self.agent_config.timing_profile,
+                get_device=self._device_model,
+                get_app=self._action_app,
+                get_fingerprint=self._screen_fingerprint,
+            )
         self.action_handler = ActionHandler(
             device_id=self.agent_config.device_id,
             confirmation_callback=confirmation_callback,
             takeover_callback=takeover_callback,
+            delay_provider=self.timing.delay_for if self.timing else None,
+        )
+
+        self.observer = ObservationCapturer(
+            get_screenshot=self._capture_screenshot,
+            get_current_app=self._capture_current_app,
+            parallel=self.agent_config.parallel_observation,
         )
+        self._last_observation: Observation | None = None
+        self._pipeline = StepPipeline()
 
         self._context: list[dict[str, Any]] = []
+        self.context_manager = ContextManager(self.agent_config.context)
+        self._trajectory: TrajectoryRun | None = None
+        self._task: str | None = None
+        self._actions: list[str] = []  # Action texts of this run, oldest first
+        self.loop_detector: LoopDetector | None = None
+        if self.agent_config.loop_detection is not None:
+            self.loop_detector = LoopDetector(self.agent_config.loop_detection)
+        self._loop_hint: str | None = None
         self._step_count = 0
-
-    def run(self, task: str) -> str:
+        self._budget = RunBudget()
+        self.last_run: RunResult | None = None
+        self.run_id: str | None = None  # Checkpoint ID of the current run
+        self.checkpoint: CheckpointWriter | None = None  # Open during a run
+        self.last_checkpoint_stats: CheckpointStats | None = None  # Of the last run
+        self._checkpointed = 0  # Context messages already in the checkpoint
+
+    def run(
+        self,
+        task: str,
+        deadline: float | None = None,
+        token_budget: int | None = None,
+    ) -> str:
         """
         Run the agent to complete a task.
 
+        The run stops early, with a partial result, once the next stage would
+        not fit in the time left or the next model request would not fit in
+        the token budget. The outcome, including why the run ended and the
+        time spent per stage, is stored in last_run.
+
         Args:
             task: Natural language description of the task.
+            deadline: Optional wall-clock budget for the run, in seconds.
+            token_budget: Optional budget of prompt + completion tokens.
 
         Returns:
             Final message from the agent.
         """
         self._context = []
         self._step_count = 0
+        self._start_task(task)
+        self._budget = RunBudget(deadline=deadline, token_budget=token_budget)
+        self._start_checkpoint(task)
+        return self._run_loop(task, is_first=True)
 
-        # First step with user prompt
-        result = self._execute_step(task, is_first=True)
+    def resume(
+        self,
+        run_id: str,
+        deadline: float | None = None,
+        token_budget: int | None = None,
+    ) -> str:
+        """
+        Continue an interrupted run from its last durable checkpoint.
 
-        if result.finished:
-            return result.message or "Task completed"
+        The context, step count and action log are restored and the run goes
+        on with a fresh screenshot, so steps already taken are not repeated.
+        An action whose step was not checkpointed yet may have been executed;
+        the model sees its effect on the new screenshot.
+
+        Args:
+            run_id: ID of the run, as in run_id or CheckpointStore.unfinished().
+            deadline: Optional wall-clock budget for the rest of the run.
+            token_budget: Optional token budget for the rest of the run.
+
+        Returns:
+            Final message from the agent.
+
+        Raises:
+            ValueError: If checkpointing is off or the run already finished.
+        """
+        store = self.agent_config.checkpoint_store
+        if store is None:
+            raise ValueError("resume() needs AgentConfig.checkpoint_store")
+        checkpoint = store.load(run_id)
+        if checkpoint.finished:
+            raise ValueError(f"Run {run_id} already finished ({checkpoint.reason})")
+
+        self._start_task(checkpoint.task)
+        # A recorded trajectory replays from the first step, not mid-run
+        self._trajectory = None
+        self._context = checkpoint.messages
+        self._step_count = checkpoint.steps
+        self._actions = checkpoint.actions
+        self._budget = RunBudget(deadline=deadline, token_budget=token_budget)
+        self.run_id = run_id
+        self._close_checkpoint()
+        self.checkpoint = store.reopen(run_id)
+        self._checkpointed = len(self._context)
+
+        self._emit(CHECKPOINT, run_id=run_id, resumed=True, steps=checkpoint.steps)
+        return self._run_loop(checkpoint.task, is_first=not self._context)
+
+    def _run_loop(self, task: str, is_first: bool) -> str:
+        """Take steps until the run finishes or a limit is reached."""
+        if self.agent_config.pipelined:
+            return self._run_pipelined(task, is_first)
+
+        if is_first:
+            # First step with user prompt
+            result = self._execute_step(task, is_first=True)
+
+            if result.finished:
+                return self._end_run(result)
 
         # Continue until finished or max steps reached
         while self._step_count < self.agent_config.max_steps:
             result = self._execute_step(is_first=False)
 
             if result.finished:
-                return result.message or "Task completed"
+                return self._end_run(result)
 
-        return "Max steps reached"
+        return self._end_run(message="Max steps reached", reason=StopReason.MAX_STEPS)
 
     def step(self, task: str | None = None) -> StepResult:
         """
@@ -126,23 +331,285 @@ class PhoneAgent:
         if is_first and not task:
             raise ValueError("Task is required for the first step")
 
+        if is_first:
+            self._start_task(task)
+
         return self._execute_step(task, is_first)
 
     def reset(self) -> None:
         """Reset the agent state for a new task."""
         self._context = []
         self._step_count = 0
+        self._trajectory = None
+        self._task = None
+        self._actions = []
+        self._loop_hint = None
+        self._budget = RunBudget()
+        if self.loop_detector is not None:
+            self.loop_detector.reset()
+        self._release_model_pin()
+        # A run interrupted by an exception stays resumable
+        self._close_checkpoint()
+
+    def cancel(self) -> None:
+        """
+        Cancel the current run from another thread.
+
+        The run stops before its next stage (an in-progress model request or
+        action completes first) and last_run.reason is StopReason.CANCELLED.
+        """
+        self._budget.cancel()
+
+    def close(self) -> None:
+        """
+        Stop the observation and pipeline worker threads.
+
+        Call it once the agent is no longer needed; workers are started again
+        if it is used afterwards.
+        """
+        self.observer.close()
+        self._pipeline.close()
+
+    def _release_model_pin(self) -> None:
+        """Let the model client route the next run anew, if it routes at all."""
+        # Swapped-in clients, e.g. fakes in tests, may not implement new_run()
+        new_run = getattr(self.model_client, "new_run", None)
+        if new_run is not None:
+            new_run()
+
+    def _end_run(
+        self,
+        result: StepResult | None = None,
+        message: str | None = None,
+        reason: StopReason = StopReason.FINISHED,
+    ) -> str:
+        """Store the outcome of the run in last_run and return its message."""
+        if result is not None:
+            message = result.message or "Task completed"
+            reason = result.stop_reason or StopReason.FINISHED
+        self.last_run = self._budget.result(message, reason, self._step_count)
+        self._release_model_pin()
+        if self.checkpoint is not None:
+            self.checkpoint.append(
+                {
+                    "type": "end",
+                    "reason": reason.value,
+                    "message": message,
+                    "steps": self._step_count,
+                    "time": time.time(),
+                }
+            )
+            self._close_checkpoint()
+        return message
+
+    def _start_checkpoint(self, task: str) -> None:
+        """Open the checkpoint of a new run, if checkpointing is on."""
+        self._close_checkpoint()
+        store = self.agent_config.checkpoint_store
+        if store is None:
+            self.run_id = None
+            return
+        self.run_id = store.new_run_id()
+        self.checkpoint = store.start(
+            self.run_id,
+            task,
+            {
+                "device_id": self.agent_config.device_id,
+                "device_type": get_device_factory().device_type.value,
+                "model": self.model_config.model_name,
+                "lang": self.agent_config.lang,
+                "max_steps": self.agent_config.max_steps,
+            },
+        )
+        self._checkpointed = 0
+        self._emit(CHECKPOINT, run_id=self.run_id, resumed=False, steps=0)
+
+    def _close_checkpoint(self) -> None:
+        """Close the run's checkpoint, keeping its write stats."""
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+            self.last_checkpoint_stats = self.checkpoint.stats
+            self.checkpoint = None
+
+    def _checkpoint_step(self, observation: Observation) -> None:
+        """Append the context added by the step that just concluded."""
+        if self.checkpoint is None:
+            return
+        self.checkpoint.append(
+            {
+                "type": "step",
+                "step": self._step_count,
+                "messages": self._context[self._checkpointed :],
+                "action": self._actions[-1] if self._actions else None,
+                "current_app": observation.current_app,
+                "time": time.time(),
+            }
+        )
+        self._checkpointed = len(self._context)
+
+    def _budget_stop(self, stage: str) -> StepResult | None:
+        """A final StepResult if the run was cancelled or the stage does not fit."""
+        reason = self._budget.stop_reason(stage)
+        if reason is None:
+            return None
+        return self._stopped(reason)
+
+    def _stopped(self, reason: StopReason) -> StepResult:
+        """Build the final StepResult of a run stopped by a budget."""
+        _, message = BUDGET_STOP_MESSAGES[reason]
+        self._emit(RUN_STOPPED, reason=reason.value, message=message)
+        return StepResult(
+            success=False,
+            finished=True,
+            action=None,
+            thinking="",
+            message=message,
+            prompt_stats=self.context_manager.last_stats,
+            stop_reason=reason,
+        )
 
     def _execute_step(
         self, user_prompt: str | None = None, is_first: bool = False
     ) -> StepResult:
         """Execute a single step of the agent loop."""
+        stopped = self._budget_stop(OBSERVE)
+        if stopped is not None:
+            self._notify(stopped)
+            return stopped
+
         self._step_count += 1
 
-        # Capture current screen state
-        device_factory = get_device_factory()
-        screenshot = device_factory.get_screenshot(self.agent_config.device_id)
-        current_app = device_factory.get_current_app(self.agent_config.device_id)
+        observation = self._observe()
+        self._add_observation(observation, user_prompt, is_first)
+
+        inference = self._infer(observation)
+        if isinstance(inference, StepResult):
+            self._notify(inference)
+            return inference
+        response, action, dispatched = inference
+
+        if dispatched is None and action.get("_metadata") != "finish":
+            stopped = self._budget_stop(ACT)
+            if stopped is not None:
+                self._notify(stopped)
+                return stopped
+
+        self._record_response(response, action)
+        if dispatched is not None:
+            result = dispatched.result()
+        else:
+            result = self._act(action, observation.screenshot)
+
+        step_result = self._conclude_step(response, action, result)
+        self._checkpoint_step(observation)
+        self._notify(step_result)
+        return step_result
+
+    def _run_pipelined(self, task: str, is_first: bool = True) -> str:
+        """
+        Run the agent loop with overlapping stages.
+
+        The action of step N and the observation of step N+1 are queued on the
+        device worker as soon as the action is known, while the calling thread
+        updates the context and logs. Step callbacks run on a background
+        worker and overlap with the next step's inference. Sensitive actions
+        and takeovers run without overlap so their prompts stay readable.
+        """
+        pipeline = self._pipeline
+        try:
+            next_observation = pipeline.device(self._observe)
+
+            while True:
+                self._step_count += 1
+                observation = next_observation.result()
+                self._add_observation(observation, task if is_first else None, is_first)
+                is_first = False
+
+                inference = self._infer(observation)
+                if isinstance(inference, StepResult):
+                    pipeline.background(self._notify, inference)
+                    return self._end_run(inference)
+                response, action, dispatched = inference
+
+                if dispatched is None and action.get("_metadata") != "finish":
+                    stopped = self._budget_stop(ACT)
+                    if stopped is not None:
+                        pipeline.background(self._notify, stopped)
+                        return self._end_run(stopped)
+
+                if dispatched is None and self._is_interactive(action):
+                    self._record_response(response, action)
+                    result = self._act(action, observation.screenshot)
+                    next_observation = None
+                else:
+                    act = dispatched or pipeline.device(
+                        self._act, action, observation.screenshot
+                    )
+                    next_observation = None
+                    if (
+                        action.get("_metadata") != "finish"
+                        and self._step_count < self.agent_config.max_steps
+                        and self._budget.allows(OBSERVE)
+                    ):
+                        next_observation = pipeline.device(self._observe)
+                    self._record_response(response, action)
+                    result = act.result()
+
+                step_result = self._conclude_step(response, action, result)
+                # The next observation may already be in, so pass this step's
+                self._checkpoint_step(observation)
+                pipeline.background(self._notify, step_result)
+
+                if step_result.finished:
+                    if next_observation is not None:
+                        next_observation.cancel()
+                    return self._end_run(step_result)
+
+                if self._step_count >= self.agent_config.max_steps:
+                    return self._end_run(
+                        message="Max steps reached", reason=StopReason.MAX_STEPS
+                    )
+
+                if next_observation is None:
+                    stopped = self._budget_stop(OBSERVE)
+                    if stopped is not None:
+                        pipeline.background(self._notify, stopped)
+                        return self._end_run(stopped)
+                    next_observation = pipeline.device(self._observe)
+        except BaseException:
+            # Errors of background work must not hide the one raised here
+            with contextlib.suppress(Exception):
+                pipeline.close()
+            raise
+        finally:
+            pipeline.close()  # Nothing left to do after the close above
+
+    @staticmethod
+    def _is_interactive(action: dict[str, Any]) -> bool:
+        """Check whether executing an action may prompt the user."""
+        return "message" in action and action.get("_metadata") == "do"
+
+    def _observe(self) -> Observation:
+        """Observe stage: capture the current screen state."""
+        with self._budget.timed(OBSERVE):
+            observation = self.observer.capture()
+        if (
+            self._trajectory is not None
+            or self.agent_config.response_cache is not None
+            or self.loop_detector is not None
+        ):
+            observation.fingerprint = screen_fingerprint(
+                observation.screenshot.base64_data
+            )
+        self._last_observation = observation
+        return observation
+
+    def _add_observation(
+        self, observation: Observation, user_prompt: str | None, is_first: bool
+    ) -> None:
+        """Append the user message for an observation to the context."""
+        screenshot = observation.screenshot
+        current_app = observation.current_app
 
         # Build messages
         if is_first:
@@ -150,8 +617,10 @@ class PhoneAgent:
                 MessageBuilder.create_system_message(self.agent_config.system_prompt)
             )
 
+            # Volatile data goes last so the prompt prefix stays cacheable
+            date_info = get_date_info(self.agent_config.lang)
             screen_info = MessageBuilder.build_screen_info(current_app)
-            text_content = f"{user_prompt}\n\n{screen_info}"
+            text_content = f"{user_prompt}\n\n{date_info}\n\n{screen_info}"
 
             self._context.append(
                 MessageBuilder.create_user_message(
@@ -161,6 +630,9 @@ class PhoneAgent:
         else:
             screen_info = MessageBuilder.build_screen_info(current_app)
             text_content = f"** Screen Info **\n\n{screen_info}"
+            if self._loop_hint is not None:
+                text_content = f"{self._loop_hint}\n\n{text_content}"
+                self._loop_hint = None
 
             self._context.append(
                 MessageBuilder.create_user_message(
@@ -168,53 +640,243 @@ class PhoneAgent:
                 )
             )
 
+    def _infer(
+        self, observation: Observation
+    ) -> tuple[ModelResponse, dict[str, Any], Future | None] | StepResult:
+        """
+        Infer stage: get the next action, or a failed StepResult.
+
+        With early dispatch enabled, a safe action is queued on the device
+        worker as soon as it has streamed in, and its future is returned as
+        the third element. The early action is authoritative for the step.
+        While a recorded trajectory still matches the screen, its action is
+        replayed without asking the model.
+        """
+        replayed = self._replay(observation)
+        if replayed is not None:
+            return replayed
+
+        dispatched: dict[str, Any] = {}
+        on_action = None
+        if self.agent_config.early_dispatch:
+
+            def on_action(action_text: str) -> None:
+                dispatched.update(self._dispatch_early(action_text, observation))
+
+        cache = self.agent_config.response_cache
+        cache_key = None
+        response = None
+        if cache is not None:
+            cache_key = cache.key(
+                observation.fingerprint,
+                observation.current_app,
+                self._task or "",
+                self._actions,
+            )
+            response = cache.get(cache_key)
+            if response is not None:
+                self._emit(CACHED_RESPONSE, action=response.action)
+
         # Get model response
         try:
-            msgs = get_messages(self.agent_config.lang)
-            print("\n" + "=" * 50)
-            print(f"💭 {msgs['thinking']}:")
-            print("-" * 50)
-            response = self.model_client.request(self._context)
+            if response is None:
+                prompt = self.context_manager.build(self._context)
+                prompt_tokens = self.context_manager.last_stats.estimated_tokens
+                max_tokens = self._budget.max_tokens(
+                    prompt_tokens, self.model_config.max_tokens
+                )
+                if max_tokens is None:
+                    return self._stopped(StopReason.TOKEN_BUDGET)
+                stopped = self._budget_stop(INFER)
+                if stopped is not None:
+                    return stopped
+
+                self._emit(INFERENCE_START, max_tokens=max_tokens)
+                with self._budget.timed(INFER):
+                    response = self.model_client.request(
+                        prompt, on_action=on_action, max_tokens=max_tokens
+                    )
+                self._budget.charge(
+                    (response.prompt_tokens or prompt_tokens) + response.usage_tokens
+                )
+                self.context_manager.record_usage(
+                    response.prompt_tokens, response.cached_tokens
+                )
+                if cache is not None:
+                    cache.put(cache_key, response)
         except Exception as e:
-            if self.agent_config.verbose:
-                traceback.print_exc()
+            if "future" in dispatched:
+                # Let an already started action finish before giving up
+                dispatched["future"].result()
+            self._emit_step_error(INFER, e)
             return StepResult(
                 success=False,
                 finished=True,
                 action=None,
                 thinking="",
                 message=f"Model error: {e}",
+                prompt_stats=self.context_manager.last_stats,
+                stop_reason=StopReason.ERROR,
+                model_retries=e.retries if isinstance(e, ModelRequestError) else 0,
             )
 
+        if "future" in dispatched:
+            self._record_trajectory_step(observation, response, replayed=False)
+            # Already running; the detector only keeps its history up to date
+            self._check_loop(observation, dispatched["action"])
+            return response, dispatched["action"], dispatched["future"]
+
         # Parse action from response
         try:
             action = parse_action(response.action)
-        except ValueError:
-            if self.agent_config.verbose:
-                traceback.print_exc()
+        except ValueError as e:
+            self._emit_step_error(INFER, e)
             action = finish(message=response.action)
 
-        if self.agent_config.verbose:
-            # Print thinking process
-            print("-" * 50)
-            print(f"🎯 {msgs['action']}:")
-            print(json.dumps(action, ensure_ascii=False, indent=2))
-            print("=" * 50 + "\n")
+        checked = self._check_loop(observation, action)
+        if checked is not action:
+            # The context, checkpoint and trajectory get the executed action
+            response = replace(response, action=self._action_text(checked))
+        self._record_trajectory_step(observation, response, replayed=False)
+        return response, checked, None
+
+    def _check_loop(
+        self, observation: Observation, action: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Feed the loop detector and apply its policy to the action."""
+        if self.loop_detector is None:
+            return action
+
+        event = self.loop_detector.observe(
+            self._step_count,
+            observation.fingerprint,
+            self._action_key(action),
+            self.agent_config.max_steps - self._step_count,
+        )
+        if event is None:
+            return action
+
+        self._emit(
+            LOOP_DETECTED,
+            kind=event.kind,
+            wasted_steps=event.wasted_steps,
+            policy=event.policy.value,
+        )
 
-        # Remove image from context to save space
-        self._context[-1] = MessageBuilder.remove_images_from_message(self._context[-1])
+        msgs = get_messages(self.agent_config.lang)
+
+        if event.policy is LoopPolicy.BACK:
+            return do(action="Back")
+        if event.policy is LoopPolicy.HOME:
+            return do(action="Home")
+        if event.policy is LoopPolicy.TAKEOVER:
+            return do(action="Take_over", message=msgs["loop_hint"])
+        if event.policy is LoopPolicy.FINISH:
+            return finish(message=msgs["loop_finish"])
+
+        self._loop_hint = msgs["loop_hint"]
+        return action
+
+    @staticmethod
+    def _action_key(action: dict[str, Any]) -> str:
+        """Stable text key of a parsed action."""
+        return json.dumps(action, ensure_ascii=False, sort_keys=True)
+
+    @staticmethod
+    def _action_text(action: dict[str, Any]) -> str:
+        """Action call text of a parsed action, as the model writes it."""
+        args = ", ".join(
+            f"{key}={json.dumps(value, ensure_ascii=False)}"
+            for key, value in action.items()
+            if key != "_metadata"
+        )
+        return f"{action['_metadata']}({args})"
+
+    def _start_task(self, task: str) -> None:
+        """Reset per-run state and look up a recorded trajectory."""
+        self._task = task
+        self._actions = []
+        self._loop_hint = None
+        if self.loop_detector is not None:
+            self.loop_detector.reset()
+        store = self.agent_config.trajectory_store
+        if store is None:
+            self._trajectory = None
+            return
+        self._trajectory = TrajectoryRun(task=task, replay=store.lookup(task))
+
+    def _replay(
+        self, observation: Observation
+    ) -> tuple[ModelResponse, dict[str, Any], None] | None:
+        """Replay the next recorded action if the screen still matches."""
+        run = self._trajectory
+        expected = run.next_replay_step() if run is not None else None
+        if expected is None:
+            return None
+
+        store = self.agent_config.trajectory_store
+        try:
+            if not store.matches(
+                expected, observation.fingerprint, observation.current_app
+            ):
+                raise ValueError("Screen differs from the recorded trajectory")
+            action = parse_action(expected.action)
+        except ValueError:
+            # Diverged: hand this and all later steps back to the model
+            store.count_divergence()
+            run.replay = None
+            return None
+
+        self._emit(REPLAYED_STEP, action=expected.action)
 
-        # Execute action
+        response = ModelResponse(
+            thinking="", action=expected.action, raw_content=expected.action
+        )
+        self._record_trajectory_step(observation, response, replayed=True)
+        return response, action, None
+
+    def _record_trajectory_step(
+        self, observation: Observation, response: ModelResponse, replayed: bool
+    ) -> None:
+        """Add the step to this run's trajectory and count it."""
+        if self._trajectory is None:
+            return
+        self._trajectory.record(
+            observation.fingerprint, observation.current_app, response.action
+        )
+        self.agent_config.trajectory_store.count(replayed)
+
+    def _dispatch_early(
+        self, action_text: str, observation: Observation
+    ) -> dict[str, Any]:
+        """Queue a complete, safe action on the device worker."""
         try:
-            result = self.action_handler.execute(
-                action, screenshot.width, screenshot.height
-            )
-        except Exception as e:
-            if self.agent_config.verbose:
-                traceback.print_exc()
-            result = self.action_handler.execute(
-                finish(message=str(e)), screenshot.width, screenshot.height
-            )
+            action = parse_action(action_text)
+        except ValueError:
+            return {}
+
+        if (
+            action.get("_metadata") != "do"
+            or action.get("action") not in EARLY_DISPATCH_ACTIONS
+            or "message" in action
+        ):
+            return {}
+
+        # Leave actions that close a loop to the loop policy
+        if self.loop_detector is not None and self.loop_detector.check(
+            observation.fingerprint, self._action_key(action)
+        ):
+            return {}
+
+        future = self._pipeline.device(self._act, action, observation.screenshot)
+        return {"action": action, "future": future}
+
+    def _record_response(self, response: ModelResponse, action: dict[str, Any]) -> None:
+        """Emit the action and move the model response into the context."""
+        self._emit(ACTION, action=action, thinking=response.thinking)
+
+        # Remove image from context to save space
+        self._context[-1] = MessageBuilder.remove_images_from_message(self._context[-1])
 
         # Add assistant response to context
         self._context.append(
@@ -222,17 +884,49 @@ class PhoneAgent:
                 f"<think>{response.thinking}</think><answer>{response.action}</answer>"
             )
         )
+        self._actions.append(response.action)
+
+    def _act(self, action: dict[str, Any], screenshot) -> ActionResult:
+        """Act stage: execute the action on the device, including settle delay."""
+        try:
+            with self._budget.timed(ACT):
+                result = self.action_handler.execute(
+                    action, screenshot.width, screenshot.height
+                )
+                if self.timing is not None:
+                    self.timing.settle()
+            return result
+        except Exception as e:
+            self._emit_step_error(ACT, e)
+            return self.action_handler.execute(
+                finish(message=str(e)), screenshot.width, screenshot.height
+            )
 
+    def _conclude_step(
+        self, response: ModelResponse, action: dict[str, Any], result: ActionResult
+    ) -> StepResult:
+        """Build the StepResult once the action has been executed."""
         # Check if finished
         finished = action.get("_metadata") == "finish" or result.should_finish
 
-        if finished and self.agent_config.verbose:
+        loop_event = self._step_loop_event()
+        if (
+            self._trajectory is not None
+            and action.get("_metadata") == "finish"
+            and result.success
+            and loop_event is None
+        ):
+            self.agent_config.trajectory_store.record(
+                self._trajectory.task, self._trajectory.recorded
+            )
+
+        if finished:
             msgs = get_messages(self.agent_config.lang)
-            print("\n" + "🎉 " + "=" * 48)
-            print(
-                f"✅ {msgs['task_completed']}: {result.message or action.get('message', msgs['done'])}"
+            self._emit(
+                TASK_FINISHED,
+                success=result.success,
+                message=result.message or action.get("message", msgs["done"]),
             )
-            print("=" * 50 + "\n")
 
         return StepResult(
             success=result.success,
@@ -240,14 +934,88 @@ class PhoneAgent:
             action=action,
             thinking=response.thinking,
             message=result.message or action.get("message"),
+            prompt_stats=self.context_manager.last_stats,
+            loop_event=loop_event,
+            model_retries=response.retries,
+        )
+
+    def _step_loop_event(self) -> LoopEvent | None:
+        """The loop event raised at the current step, if any."""
+        if self.loop_detector is None or not self.loop_detector.events:
+            return None
+        event = self.loop_detector.events[-1]
+        return event if event.step == self._step_count else None
+
+    def _emit(self, event_type: str, **data: Any) -> None:
+        """Send an event of the current step to the event sink."""
+        if self.event_sink.enabled:
+            self.event_sink.emit(
+                AgentEvent(
+                    event_type,
+                    data,
+                    source=self.agent_config.device_id,
+                    step=self._step_count,
+                )
+            )
+
+    def _emit_step_error(self, stage: str, error: Exception) -> None:
+        """Report the exception being handled, with its traceback."""
+        self._emit(
+            STEP_ERROR,
+            stage=stage,
+            error=str(error),
+            traceback=traceback.format_exc(),
         )
 
+    def _notify(self, step_result: StepResult) -> None:
+        """Hand a finished step to the step callback, if any."""
+        if self.step_callback is not None:
+            self.step_callback(step_result)
+
+    def _capture_screenshot(self):
+        """Take a screenshot of the device."""
+        device_factory = get_device_factory()
+        return device_factory.get_screenshot(self.agent_config.device_id)
+
+    def _capture_current_app(self) -> str:
+        """Look up the foreground app of the device."""
+        device_factory = get_device_factory()
+        return device_factory.get_current_app(self.agent_config.device_id)
+
+    def _device_model(self) -> str:
+        """Device model used to key timing profiles."""
+        try:
+            device_factory = get_device_factory()
+            return device_factory.get_device_model(self.agent_config.device_id)
+        except Exception:
+            return self.agent_config.device_id or "unknown"
+
+    def _action_app(self) -> str:
+        """App the current action is taken in."""
+        if self._last_observation is None:
+            return "unknown"
+        return self._last_observation.current_app
+
+    def _screen_fingerprint(self) -> int:
+        """Fingerprint of a fresh screenshot, for settle measurements."""
+        return screen_fingerprint(self._capture_screenshot().base64_data)
+
     @property
     def context(self) -> list[dict[str, Any]]:
         """Get the current conversation context."""
         return self._context.copy()
 
+    @property
+    def budget(self) -> RunBudget:
+        """Get the budget and per-stage timings of the current run."""
+        return self._budget
+
     @property
     def step_count(self) -> int:
         """Get the current step count."""
         return self._step_count
+
+    @property
+    def last_observation(self) -> Observation | None:
+        """Get the observation captured by the most recent step."""
+        return self._last_observation
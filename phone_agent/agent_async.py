@@ -0,0 +1,415 @@
+"""Asyncio PhoneAgent for driving many devices from one event loop."""
+
+import traceback
+from types import ModuleType
+from typing import Any, Awaitable, Callable
+
+from phone_agent.actions.handler import finish, parse_action
+from phone_agent.actions.handler_async import AsyncActionHandler
+from phone_agent.agent import AgentConfig, StepResult
+from phone_agent.budget import (
+    ACT,
+    BUDGET_STOP_MESSAGES,
+    INFER,
+    OBSERVE,
+    RunBudget,
+    RunResult,
+    StopReason,
+)
+from phone_agent.config import get_date_info, get_messages
+from phone_agent.context import ContextManager
+from phone_agent.events import (
+    ACTION,
+    INFERENCE_START,
+    RUN_STOPPED,
+    STEP_ERROR,
+    TASK_FINISHED,
+    AgentEvent,
+    ConsoleSink,
+)
+from phone_agent.model import ModelConfig
+from phone_agent.model.client import AsyncModelClient, MessageBuilder
+from phone_agent.model.retry import ModelRequestError
+from phone_agent.observation import AsyncObservationCapturer, Observation
+
+# AgentConfig options that only the sync PhoneAgent implements
+UNSUPPORTED_OPTIONS = (
+    "pipelined",
+    "early_dispatch",
+    "trajectory_store",
+    "response_cache",
+    "loop_detection",
+    "timing_profile",
+    "checkpoint_store",
+)
+
+
+class AsyncPhoneAgent:
+    """
+    Asyncio agent for automating Android phone interactions.
+
+    Steps follow PhoneAgent's sequential loop (observe, infer, act) and return
+    the same StepResult, but model streaming, device commands and delays are
+    awaited. One process can run many agents concurrently, e.g. with
+    asyncio.gather, without a thread per device.
+
+    Args:
+        model_config: Configuration for the AI model.
+        agent_config: Configuration for the agent behavior. The pipelining,
+            replay, caching, loop detection, timing profile and checkpoint
+            options are not supported.
+        confirmation_callback: Optional callback for sensitive action
+            confirmation. May be a coroutine function.
+        takeover_callback: Optional callback for takeover requests. May be a
+            coroutine function.
+        step_callback: Optional callback invoked with each StepResult.
+        device: Async device backend. Defaults to phone_agent.adb.async_device.
+
+    Example:
+        >>> agents = [
+        ...     AsyncPhoneAgent(model_config, AgentConfig(device_id=serial))
+        ...     for serial in serials
+        ... ]
+        >>> results = await asyncio.gather(*(a.run(task) for a in agents))
+    """
+
+    def __init__(
+        self,
+        model_config: ModelConfig | None = None,
+        agent_config: AgentConfig | None = None,
+        confirmation_callback: Callable[[str], bool | Awaitable[bool]] | None = None,
+        takeover_callback: Callable[[str], None | Awaitable[None]] | None = None,
+        step_callback: Callable[[StepResult], None] | None = None,
+        device: ModuleType | Any = None,
+    ):
+        self.model_config = model_config or ModelConfig()
+        self.agent_config = agent_config or AgentConfig()
+        self.step_callback = step_callback
+
+        for option in UNSUPPORTED_OPTIONS:
+            if getattr(self.agent_config, option):
+                raise ValueError(f"AsyncPhoneAgent does not support {option}")
+
+        if device is None:
+            from phone_agent.adb import async_device
+
+            device = async_device
+        self.device = device
+        self.event_sink = self.agent_config.event_sink or ConsoleSink(
+            self.agent_config.lang, verbose=self.agent_config.verbose
+        )
+
+        self.model_client = AsyncModelClient(
+            self.model_config,
+            scheduler=self.agent_config.scheduler,
+            priority=self.agent_config.priority,
+            flow=self.agent_config.device_id or "default",
+            event_sink=self.event_sink,
+            router=self.agent_config.router,
+            hedging=self.agent_config.hedging,
+            retry_policy=self.agent_config.retry_policy,
+        )
+        self.action_handler = AsyncActionHandler(
+            device=self.device,
+            device_id=self.agent_config.device_id,
+            confirmation_callback=confirmation_callback,
+            takeover_callback=takeover_callback,
+        )
+
+        self.observer = AsyncObservationCapturer(
+            get_screenshot=self._capture_screenshot,
+            get_current_app=self._capture_current_app,
+        )
+        self._last_observation: Observation | None = None
+
+        self._context: list[dict[str, Any]] = []
+        self.context_manager = ContextManager(self.agent_config.context)
+        self._step_count = 0
+        self._budget = RunBudget()
+        self.last_run: RunResult | None = None
+
+    async def run(
+        self,
+        task: str,
+        deadline: float | None = None,
+        token_budget: int | None = None,
+    ) -> str:
+        """
+        Run the agent to complete a task.
+
+        Args:
+            task: Natural language description of the task.
+            deadline: Optional wall-clock budget for the run, in seconds.
+            token_budget: Optional budget of prompt + completion tokens.
+
+        Returns:
+            Final message from the agent. The outcome is stored in last_run.
+        """
+        self._context = []
+        self._step_count = 0
+        self._budget = RunBudget(deadline=deadline, token_budget=token_budget)
+
+        # First step with user prompt
+        result = await self._execute_step(task, is_first=True)
+
+        if result.finished:
+            return self._end_run(result)
+
+        # Continue until finished or max steps reached
+        while self._step_count < self.agent_config.max_steps:
+            result = await self._execute_step(is_first=False)
+
+            if result.finished:
+                return self._end_run(result)
+
+        return self._end_run(message="Max steps reached", reason=StopReason.MAX_STEPS)
+
+    async def step(self, task: str | None = None) -> StepResult:
+        """
+        Execute a single step of the agent.
+
+        Args:
+            task: Task description (only needed for first step).
+
+        Returns:
+            StepResult with step details.
+        """
+        is_first = len(self._context) == 0
+
+        if is_first and not task:
+            raise ValueError("Task is required for the first step")
+
+        return await self._execute_step(task, is_first)
+
+    def reset(self) -> None:
+        """Reset the agent state for a new task."""
+        self._context = []
+        self._step_count = 0
+        self._budget = RunBudget()
+        self._release_model_pin()
+
+    def cancel(self) -> None:
+        """Cancel the current run before its next stage, from any thread."""
+        self._budget.cancel()
+
+    def _release_model_pin(self) -> None:
+        """Let the model client route the next run anew, if it routes at all."""
+        # Swapped-in clients, e.g. fakes in tests, may not implement new_run()
+        new_run = getattr(self.model_client, "new_run", None)
+        if new_run is not None:
+            new_run()
+
+    def _end_run(
+        self,
+        result: StepResult | None = None,
+        message: str | None = None,
+        reason: StopReason = StopReason.FINISHED,
+    ) -> str:
+        """Store the outcome of the run in last_run and return its message."""
+        if result is not None:
+            message = result.message or "Task completed"
+            reason = result.stop_reason or StopReason.FINISHED
+        self.last_run = self._budget.result(message, reason, self._step_count)
+        self._release_model_pin()
+        return message
+
+    def _stopped(self, reason: StopReason) -> StepResult:
+        """Build the final StepResult of a run stopped by a budget."""
+        _, message = BUDGET_STOP_MESSAGES[reason]
+        self._emit(RUN_STOPPED, reason=reason.value, message=message)
+        return StepResult(
+            success=False,
+            finished=True,
+            action=None,
+            thinking="",
+            message=message,
+            prompt_stats=self.context_manager.last_stats,
+            stop_reason=reason,
+        )
+
+    async def _execute_step(
+        self, user_prompt: str | None = None, is_first: bool = False
+    ) -> StepResult:
+        """Execute a single step of the agent loop."""
+        step_result = await self._run_step(user_prompt, is_first)
+        if self.step_callback is not None:
+            self.step_callback(step_result)
+        return step_result
+
+    async def _run_step(self, user_prompt: str | None, is_first: bool) -> StepResult:
+        """Observe, infer and act once."""
+        reason = self._budget.stop_reason(OBSERVE)
+        if reason is not None:
+            return self._stopped(reason)
+
+        self._step_count += 1
+
+        # Capture current screen state
+        with self._budget.timed(OBSERVE):
+            observation = await self.observer.capture()
+        self._last_observation = observation
+        screenshot = observation.screenshot
+        current_app = observation.current_app
+
+        # Build messages
+        if is_first:
+            self._context.append(
+                MessageBuilder.create_system_message(self.agent_config.system_prompt)
+            )
+
+            # Volatile data goes last so the prompt prefix stays cacheable
+            date_info = get_date_info(self.agent_config.lang)
+            screen_info = MessageBuilder.build_screen_info(current_app)
+            text_content = f"{user_prompt}\n\n{date_info}\n\n{screen_info}"
+        else:
+            screen_info = MessageBuilder.build_screen_info(current_app)
+            text_content = f"** Screen Info **\n\n{screen_info}"
+
+        self._context.append(
+            MessageBuilder.create_user_message(
+                text=text_content, image_base64=screenshot.base64_data
+            )
+        )
+
+        prompt = self.context_manager.build(self._context)
+        prompt_tokens = self.context_manager.last_stats.estimated_tokens
+        max_tokens = self._budget.max_tokens(
+            prompt_tokens, self.model_config.max_tokens
+        )
+        if max_tokens is None:
+            return self._stopped(StopReason.TOKEN_BUDGET)
+        reason = self._budget.stop_reason(INFER)
+        if reason is not None:
+            return self._stopped(reason)
+
+        # Get model response
+        try:
+            self._emit(INFERENCE_START, max_tokens=max_tokens)
+            with self._budget.timed(INFER):
+                response = await self.model_client.request(
+                    prompt, max_tokens=max_tokens
+                )
+            self._budget.charge(
+                (response.prompt_tokens or prompt_tokens) + response.usage_tokens
+            )
+            self.context_manager.record_usage(
+                response.prompt_tokens, response.cached_tokens
+            )
+        except Exception as e:
+            self._emit_step_error(INFER, e)
+            return StepResult(
+                success=False,
+                finished=True,
+                action=None,
+                thinking="",
+                message=f"Model error: {e}",
+                prompt_stats=self.context_manager.last_stats,
+                stop_reason=StopReason.ERROR,
+                model_retries=e.retries if isinstance(e, ModelRequestError) else 0,
+            )
+
+        # Parse action from response
+        try:
+            action = parse_action(response.action)
+        except ValueError as e:
+            self._emit_step_error(INFER, e)
+            action = finish(message=response.action)
+
+        if action.get("_metadata") != "finish":
+            reason = self._budget.stop_reason(ACT)
+            if reason is not None:
+                return self._stopped(reason)
+
+        self._emit(ACTION, action=action, thinking=response.thinking)
+
+        # Remove image from context to save space
+        self._context[-1] = MessageBuilder.remove_images_from_message(self._context[-1])
+
+        # Add assistant response to context
+        self._context.append(
+            MessageBuilder.create_assistant_message(
+                f"<think>{response.thinking}</think><answer>{response.action}</answer>"
+            )
+        )
+
+        # Execute action
+        try:
+            with self._budget.timed(ACT):
+                result = await self.action_handler.execute(
+                    action, screenshot.width, screenshot.height
+                )
+        except Exception as e:
+            self._emit_step_error(ACT, e)
+            result = await self.action_handler.execute(
+                finish(message=str(e)), screenshot.width, screenshot.height
+            )
+
+        # Check if finished
+        finished = action.get("_metadata") == "finish" or result.should_finish
+
+        if finished:
+            msgs = get_messages(self.agent_config.lang)
+            self._emit(
+                TASK_FINISHED,
+                success=result.success,
+                message=result.message or action.get("message", msgs["done"]),
+            )
+
+        return StepResult(
+            success=result.success,
+            finished=finished,
+            action=action,
+            thinking=response.thinking,
+            message=result.message or action.get("message"),
+            prompt_stats=self.context_manager.last_stats,
+            model_retries=response.retries,
+        )
+
+    def _emit(self, event_type: str, **data: Any) -> None:
+        """Send an event of the current step to the event sink."""
+        if self.event_sink.enabled:
+            self.event_sink.emit(
+                AgentEvent(
+                    event_type,
+                    data,
+                    source=self.agent_config.device_id,
+                    step=self._step_count,
+                )
+            )
+
+    async def _capture_screenshot(self):
+        """Take a screenshot of the device."""
+        return await self.device.get_screenshot(self.agent_config.device_id)
+
+    async def _capture_current_app(self) -> str:
+        """Look up the foreground app of the device."""
+        return await self.device.get_current_app(self.agent_config.device_id)
+
+    @property
+    def _emit_step_error(self, stage: str, error: Exception) -> None:
+        """Report the exception being handled, with its traceback."""
+        self._emit(
+            STEP_ERROR,
+            stage=stage,
+            error=str(error),
+            traceback=traceback.format_exc(),
+        )
+
+    def context(self) -> list[dict[str, Any]]:
+        """Get the current conversation context."""
+        return self._context.copy()
+
+    @property
+    def budget(self) -> RunBudget:
+        """Get the budget and per-stage timings of the current run."""
+        return self._budget
+
+    @property
+    def step_count(self) -> int:
+        """Get the current step count."""
+        return self._step_count
+
+    @property
+    def last_observation(self) -> Observation | None:
+        """Get the observation captured by the most recent step."""
+        return self._last_observation
@@ -1,16 +1,41 @@
 """iOS PhoneAgent class for orchestrating iOS phone automation."""
 
-import json
 import traceback
 from dataclasses import dataclass
 from typing import Any, Callable
 
 from phone_agent.actions.handler import do, finish, parse_action
 from phone_agent.actions.handler_ios import IOSActionHandler
-from phone_agent.config import get_messages, get_system_prompt
+from phone_agent.budget import (
+    ACT,
+    BUDGET_STOP_MESSAGES,
+    INFER,
+    OBSERVE,
+    RunBudget,
+    RunResult,
+    StopReason,
+)
+from phone_agent.config import get_date_info, get_messages, get_system_prompt
+from phone_agent.context import ContextConfig, ContextManager, PromptStats
+from phone_agent.events import (
+    ACTION,
+    INFERENCE_START,
+    RUN_STOPPED,
+    STEP_ERROR,
+    TASK_FINISHED,
+    AgentEvent,
+    ConsoleSink,
+    EventSink,
+)
 from phone_agent.model import ModelClient, ModelConfig
 from phone_agent.model.client import MessageBuilder
+from phone_agent.model.hedging import HedgingPolicy
+from phone_agent.model.retry import ModelRequestError, RetryPolicy
+from phone_agent.model.router import ModelRouter
+from phone_agent.model.scheduler import INTERACTIVE, RequestScheduler
+from phone_agent.observation import Observation, ObservationCapturer
 from phone_agent.xctest import XCTestConnection, get_current_app, get_screenshot
+from phone_agent.xctest.session import WDASessionConfig, get_wda_http_session
 
 
 @dataclass
@@ -23,7 +48,23 @@ class IOSAgentConfig:
     device_id: str | None = None  # iOS device UDID
     lang: str = "cn"
     system_prompt: str | None = None
-    verbose: bool = True
+    verbose: bool = True  # Print every event when event_sink is not set
+    parallel_observation: bool = True  # Capture screenshot and current app concurrently
+    # Turn/token budget for the prompt; by default the full history is sent
+    context: ContextConfig | None = None
+    # Pool, retry and TLS settings for the shared WDA HTTP session
+    wda_http_config: WDASessionConfig | None = None
+    # Share model endpoint slots with other agents (device_id is the flow)
+    scheduler: RequestScheduler | None = None
+    priority: int = INTERACTIVE  # Scheduler priority class
+    # Receiver of step and model events; by default they are printed
+    event_sink: EventSink | None = None
+    # Spread runs over model replicas, pinning each run to one (opt-in)
+    router: ModelRouter | None = None
+    # Duplicate model requests slow to start to another replica (opt-in)
+    hedging: HedgingPolicy | None = None
+    # Retries and circuit breakers of model requests; by default process-wide
+    retry_policy: RetryPolicy | None = None
 
     def __post_init__(self):
         if self.system_prompt is None:
@@ -39,6 +80,8 @@ class StepResult:
     action: dict[str, Any] | None
     thinking: str
     message: str | None = None
+    prompt_stats: PromptStats | None = None  # Size of the prompt for this step
+    stop_reason: StopReason | None = None  # Set when a limit or error ended the run
 
 
 class IOSPhoneAgent:
@@ -73,11 +116,30 @@ class IOSPhoneAgent:
     ):
         self.model_config = model_config or ModelConfig()
         self.agent_config = agent_config or IOSAgentConfig()
+        self.event_sink = self.agent_config.event_sink or ConsoleSink(
+            self.agent_config.lang, verbose=self.agent_config.verbose
+        )
+
+        self.model_client = ModelClient(
+            self.model_config,
+            scheduler=self.agent_config.scheduler,
+            priority=self.agent_config.priority,
+            flow=self.agent_config.device_id or "default",
+            event_sink=self.event_sink,
+            router=self.agent_config.router,
+            hedging=self.agent_config.hedging,
+            retry_policy=self.agent_config.retry_policy,
+        )
 
-        self.model_client = ModelClient(self.model_config)
+        # Share one keep-alive HTTP session for every WDA call of this agent
+        self.http_session = get_wda_http_session(
+            self.agent_config.wda_url, self.agent_config.wda_http_config
+        )
 
         # Initialize WDA connection and create session if needed
-        self.wda_connection = XCTestConnection(wda_url=self.agent_config.wda_url)
+        self.wda_connection = XCTestConnection(
+            wda_url=self.agent_config.wda_url, http_session=self.http_session
+        )
 
         # Auto-create session if not provided
         if self.agent_config.session_id is None:
@@ -94,38 +156,61 @@ class IOSPhoneAgent:
             session_id=self.agent_config.session_id,
             confirmation_callback=confirmation_callback,
             takeover_callback=takeover_callback,
+            http_session=self.http_session,
+        )
+
+        self.observer = ObservationCapturer(
+            get_screenshot=self._capture_screenshot,
+            get_current_app=self._capture_current_app,
+            parallel=self.agent_config.parallel_observation,
         )
+        self._last_observation: Observation | None = None
 
         self._context: list[dict[str, Any]] = []
+        self.context_manager = ContextManager(self.agent_config.context)
         self._step_count = 0
+        self._budget = RunBudget()
+        self.last_run: RunResult | None = None
 
-    def run(self, task: str) -> str:
+    def run(
+        self,
+        task: str,
+        deadline: float | None = None,
+        token_budget: int | None = None,
+    ) -> str:
         """
         Run the agent to complete a task.
 
+        The run stops early, with a partial result, once the next stage would
+        not fit in the time left or the next model request would not fit in
+        the token budget. The outcome is stored in last_run.
+
         Args:
             task: Natural language description of the task.
+            deadline: Optional wall-clock budget for the run, in seconds.
+            token_budget: Optional budget of prompt + completion tokens.
 
         Returns:
             Final message from the agent.
         """
         self._context = []
         self._step_count = 0
+        self._budget = RunBudget(deadline=deadline, token_budget=token_budget)
 
         # First step with user prompt
         result = self._execute_step(task, is_first=True)
 
         if result.finished:
-            return result.message or "Task completed"
+            return self._end_run(result)
 
         # Continue until finished or max steps reached
         while self._step_count < self.agent_config.max_steps:
             result = self._execute_step(is_first=False)
 
             if result.finished:
-                return result.message or "Task completed"
+                return self._end_run(result)
 
-        return "Max steps reached"
+        return self._end_run(message="Max steps reached", reason=StopReason.MAX_STEPS)
 
     def step(self, task: str | None = None) -> StepResult:
         """
@@ -150,22 +235,73 @@ class IOSPhoneAgent:
         """Reset the agent state for a new task."""
         self._context = []
         self._step_count = 0
+        self._budget = RunBudget()
+        self._release_model_pin()
+
+    def cancel(self) -> None:
+        """Cancel the current run before its next stage, from any thread."""
+        self._budget.cancel()
+
+    def close(self) -> None:
+        """
+        Stop the observation worker thread.
+
+        Call it once the agent is no longer needed; the worker is started
+        again if it is used afterwards.
+        """
+        self.observer.close()
+
+    def _release_model_pin(self) -> None:
+        """Let the model client route the next run anew, if it routes at all."""
+        # Swapped-in clients, e.g. fakes in tests, may not implement new_run()
+        new_run = getattr(self.model_client, "new_run", None)
+        if new_run is not None:
+            new_run()
+
+    def _end_run(
+        self,
+        result: StepResult | None = None,
+        message: str | None = None,
+        reason: StopReason = StopReason.FINISHED,
+    ) -> str:
+        """Store the outcome of the run in last_run and return its message."""
+        if result is not None:
+            message = result.message or "Task completed"
+            reason = result.stop_reason or StopReason.FINISHED
+        self.last_run = self._budget.result(message, reason, self._step_count)
+        self._release_model_pin()
+        return message
+
+    def _stopped(self, reason: StopReason) -> StepResult:
+        """Build the final StepResult of a run stopped by a budget."""
+        _, message = BUDGET_STOP_MESSAGES[reason]
+        self._emit(RUN_STOPPED, reason=reason.value, message=message)
+        return StepResult(
+            success=False,
+            finished=True,
+            action=None,
+            thinking="",
+            message=message,
+            prompt_stats=self.context_manager.last_stats,
+            stop_reason=reason,
+        )
 
     def _execute_step(
         self, user_prompt: str | None = None, is_first: bool = False
     ) -> StepResult:
         """Execute a single step of the agent loop."""
+        reason = self._budget.stop_reason(OBSERVE)
+        if reason is not None:
+            return self._stopped(reason)
+
         self._step_count += 1
 
         # Capture current screen state
-        screenshot = get_screenshot(
-            wda_url=self.agent_config.wda_url,
-            session_id=self.agent_config.session_id,
-            device_id=self.agent_config.device_id,
-        )
-        current_app = get_current_app(
-            wda_url=self.agent_config.wda_url, session_id=self.agent_config.session_id
-        )
+        with self._budget.timed(OBSERVE):
+            observation = self.observer.capture()
+        self._last_observation = observation
+        screenshot = observation.screenshot
+        current_app = observation.current_app
 
         # Build messages
         if is_first:
@@ -173,8 +309,10 @@ class IOSPhoneAgent:
                 MessageBuilder.create_system_message(self.agent_config.system_prompt)
             )
 
+            # Volatile data goes last so the prompt prefix stays cacheable
+            date_info = get_date_info(self.agent_config.lang)
             screen_info = MessageBuilder.build_screen_info(current_app)
-            text_content = f"{user_prompt}\n\n{screen_info}"
+            text_content = f"{user_prompt}\n\n{date_info}\n\n{screen_info}"
 
             self._context.append(
                 MessageBuilder.create_user_message(
@@ -192,50 +330,65 @@ class IOSPhoneAgent:
             )
 
         # Get model response
+        prompt = self.context_manager.build(self._context)
+        prompt_tokens = self.context_manager.last_stats.estimated_tokens
+        max_tokens = self._budget.max_tokens(
+            prompt_tokens, self.model_config.max_tokens
+        )
+        if max_tokens is None:
+            return self._stopped(StopReason.TOKEN_BUDGET)
+        reason = self._budget.stop_reason(INFER)
+        if reason is not None:
+            return self._stopped(reason)
+
         try:
-            response = self.model_client.request(self._context)
+            self._emit(INFERENCE_START, max_tokens=max_tokens)
+            with self._budget.timed(INFER):
+                response = self.model_client.request(prompt, max_tokens=max_tokens)
+            self._budget.charge(
+                (response.prompt_tokens or prompt_tokens) + response.usage_tokens
+            )
+            self.context_manager.record_usage(
+                response.prompt_tokens, response.cached_tokens
+            )
         except Exception as e:
-            if self.agent_config.verbose:
-                traceback.print_exc()
+            self._emit_step_error(INFER, e)
             return StepResult(
                 success=False,
                 finished=True,
                 action=None,
                 thinking="",
                 message=f"Model error: {e}",
+                prompt_stats=self.context_manager.last_stats,
+                stop_reason=StopReason.ERROR,
+                model_retries=e.retries if isinstance(e, ModelRequestError) else 0,
             )
 
         # Parse action from response
         try:
             action = parse_action(response.action)
-        except ValueError:
-            if self.agent_config.verbose:
-                traceback.print_exc()
+        except ValueError as e:
+            self._emit_step_error(INFER, e)
             action = finish(message=response.action)
 
-        if self.agent_config.verbose:
-            # Print thinking process
-            msgs = get_messages(self.agent_config.lang)
-            print("\n" + "=" * 50)
-            print(f"💭 {msgs['thinking']}:")
-            print("-" * 50)
-            print(response.thinking)
-            print("-" * 50)
-            print(f"🎯 {msgs['action']}:")
-            print(json.dumps(action, ensure_ascii=False, indent=2))
-            print("=" * 50 + "\n")
+        self._emit(ACTION, action=action, thinking=response.thinking)
+
+        if action.get("_metadata") != "finish":
+            reason = self._budget.stop_reason(ACT)
+            if reason is not None:
+                return self._stopped(reason)
 
         # Remove image from context to save space
         self._context[-1] = MessageBuilder.remove_images_from_message(self._context[-1])
 
         # Execute action
         try:
-            result = self.action_handler.execute(
-                action, screenshot.width, screenshot.height
-            )
+            with self._budget.timed(ACT):
+                result = self.action_handler.execute(
+                    action, screenshot.width, screenshot.height
+                )
         except Exception as e:
-            if self.agent_config.verbose:
-                traceback.print_exc()
+            self._emit_step_error(ACT, e)
             result = self.action_handler.execute(
                 finish(message=str(e)), screenshot.width, screenshot.height
             )
@@ -250,13 +403,13 @@ class IOSPhoneAgent:
         # Check if finished
         finished = action.get("_metadata") == "finish" or result.should_finish
 
-        if finished and self.agent_config.verbose:
+        if finished:
             msgs = get_messages(self.agent_config.lang)
-            print("\n" + "🎉 " + "=" * 48)
-            print(
-                f"✅ {msgs['task_completed']}: {result.message or action.get('message', msgs['done'])}"
+            self._emit(
+                TASK_FINISHED,
+                success=result.success,
+                message=result.message or action.get("message", msgs["done"]),
             )
-            print("=" * 50 + "\n")
 
         return StepResult(
             success=result.success,
@@ -264,6 +417,46 @@ class IOSPhoneAgent:
             action=action,
             thinking=response.thinking,
             message=result.message or action.get("message"),
+            prompt_stats=self.context_manager.last_stats,
+            model_retries=response.retries,
+        )
+
+    def _emit(self, event_type: str, **data: Any) -> None:
+        """Send an event of the current step to the event sink."""
+        if self.event_sink.enabled:
+            self.event_sink.emit(
+                AgentEvent(
+                    event_type,
+                    data,
+                    source=self.agent_config.device_id,
+                    step=self._step_count,
+                )
+            )
+
+    def _emit_step_error(self, stage: str, error: Exception) -> None:
+        """Report the exception being handled, with its traceback."""
+        self._emit(
+            STEP_ERROR,
+            stage=stage,
+            error=str(error),
+            traceback=traceback.format_exc(),
+        )
+
+    def _capture_screenshot(self):
+        """Take a screenshot via WDA (falls back to idevicescreenshot)."""
+        return get_screenshot(
+            wda_url=self.agent_config.wda_url,
+            session_id=self.agent_config.session_id,
+            device_id=self.agent_config.device_id,
+            http_session=self.http_session,
+        )
+
+    def _capture_current_app(self) -> str:
+        """Look up the foreground app via WDA."""
+        return get_current_app(
+            wda_url=self.agent_config.wda_url,
+            session_id=self.agent_config.session_id,
+            http_session=self.http_session,
         )
 
     @property
@@ -271,7 +464,17 @@ class IOSPhoneAgent:
         """Get the current conversation context."""
         return self._context.copy()
 
+    @property
+    def budget(self) -> RunBudget:
+        """Get the budget and per-stage timings of the current run."""
+        return self._budget
+
     @property
     def step_count(self) -> int:
         """Get the current step count."""
         return self._step_count
+
+    @property
+    def last_observation(self) -> Observation | None:
+        """Get the observation captured by the most recent step."""
+        return self._last_observation
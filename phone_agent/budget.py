@@ -0,0 +1,204 @@
+"""Wall-clock and token budgets for agent runs, with per-stage timing."""
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Iterator
+
+# Stages of an agent step, in order
+OBSERVE = "observe"
+INFER = "infer"
+ACT = "act"
+STAGES = (OBSERVE, INFER, ACT)
+
+
+class StopReason(Enum):
+    """Why a run ended."""
+
+    FINISHED = "finished"  # The model finished the task, or an action ended it
+    MAX_STEPS = "max_steps"
+    DEADLINE = "deadline"  # The next stage would not fit in the time left
+    TOKEN_BUDGET = "token_budget"  # The next request would not fit the budget
+    ERROR = "error"  # The model request failed
+    CANCELLED = "cancelled"  # cancel() was called on the budget
+
+
+# i18n key and final message of runs stopped by a budget
+BUDGET_STOP_MESSAGES = {
+    StopReason.DEADLINE: ("deadline_reached", "Deadline reached"),
+    StopReason.TOKEN_BUDGET: ("token_budget_exhausted", "Token budget exhausted"),
+    StopReason.CANCELLED: ("run_cancelled", "Task cancelled"),
+}
+
+
+@dataclass
+class StageTiming:
+    """Accumulated wall time of one stage."""
+
+    count: int = 0
+    total: float = 0.0
+    last: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass
+class RunResult:
+    """Outcome of a run, including partial runs stopped by a budget."""
+
+    message: str
+    reason: StopReason
+    steps: int
+    elapsed: float  # Seconds since the run started
+    tokens_used: int  # Prompt + completion tokens of model requests
+    stage_timings: dict[str, StageTiming] = field(default_factory=dict)
+
+    @property
+    def completed(self) -> bool:
+        """Whether the model finished the task rather than a limit stopping it."""
+        return self.reason is StopReason.FINISHED
+
+
+class RunBudget:
+    """
+    Tracks elapsed time, spent tokens and per-stage timings of a run.
+
+    A stage is allowed to start only if the time left covers its mean duration
+    so far, so a run stops before an inference it cannot finish rather than
+    overrunning its deadline. Model requests get max_tokens lowered to what
+    is left of the token budget after the prompt.
+
+    Args:
+        deadline: Seconds the run may take. None for no time limit.
+        token_budget: Prompt + completion tokens the run may spend. None for
+            no token limit.
+        min_completion_tokens: Smallest completion worth requesting; with less
+            budget left the run stops instead.
+
+    Example:
+        >>> budget = RunBudget(deadline=60, token_budget=50000)
+        >>> max_tokens = budget.max_tokens(prompt_tokens, config.max_tokens)
+        >>> if max_tokens is not None and budget.allows(INFER):
+        ...     with budget.timed(INFER):
+        ...         response = client.request(prompt, max_tokens=max_tokens)
+        ...     budget.charge(prompt_tokens + response.usage_tokens)
+    """
+
+    def __init__(
+        self,
+        deadline: float | None = None,
+        token_budget: int | None = None,
+        min_completion_tokens: int = 256,
+    ):
+        self.deadline = deadline
+        self.token_budget = token_budget
+        self.min_completion_tokens = min_completion_tokens
+        self.started_at = time.perf_counter()
+        self.tokens_used = 0
+        self.timings: dict[str, StageTiming] = {
+            stage: StageTiming() for stage in STAGES
+        }
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def remaining_time(self) -> float | None:
+        if self.deadline is None:
+            return None
+        return self.deadline - self.elapsed
+
+    @property
+    def remaining_tokens(self) -> int | None:
+        if self.token_budget is None:
+            return None
+        return self.token_budget - self.tokens_used
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Stop the run before its next stage. Safe to call from any thread."""
+        self._cancelled.set()
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        """Record the wall time of a stage. Safe to use from worker threads."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                timing = self.timings.setdefault(stage, StageTiming())
+                timing.count += 1
+                timing.total += seconds
+                timing.last = seconds
+
+    def allows(self, stage: str) -> bool:
+        """Whether the time left covers the stage's mean duration so far."""
+        if self.cancelled:
+            return False
+        remaining = self.remaining_time
+        if remaining is None:
+            return True
+        with self._lock:
+            expected = self.timings.get(stage, StageTiming()).mean
+        return remaining > expected
+
+    def stop_reason(self, stage: str) -> StopReason | None:
+        """Why the stage may not start (cancelled or deadline), or None."""
+        if self.cancelled:
+            return StopReason.CANCELLED
+        if not self.allows(stage):
+            return StopReason.DEADLINE
+        return None
+
+    def charge(self, tokens: int) -> None:
+        """Add tokens spent by a model request."""
+        with self._lock:
+            self.tokens_used += tokens
+
+    def max_tokens(self, prompt_tokens: int, configured: int) -> int | None:
+        """
+        Completion limit for the next request.
+
+        Args:
+            prompt_tokens: (Estimated) prompt size of the request.
+            configured: max_tokens from the model config.
+
+        Returns:
+            The configured limit, lowered to fit the token budget, or None if
+            not even min_completion_tokens fit.
+        """
+        remaining = self.remaining_tokens
+        if remaining is None:
+            return configured
+        available = remaining - prompt_tokens
+        if available < self.min_completion_tokens:
+            return None
+        return min(configured, available)
+
+    def result(self, message: str, reason: StopReason, steps: int) -> RunResult:
+        """Snapshot the budget into a RunResult."""
+        with self._lock:
+            timings = {
+                stage: StageTiming(timing.count, timing.total, timing.last)
+                for stage, timing in self.timings.items()
+            }
+        return RunResult(
+            message=message,
+            reason=reason,
+            steps=steps,
+            elapsed=self.elapsed,
+            tokens_used=self.tokens_used,
+            stage_timings=timings,
+        )
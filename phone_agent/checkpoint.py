@@ -0,0 +1,225 @@
+"""Append-only run checkpoints for resuming agent runs after a crash."""
+
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class CheckpointStats:
+    """Write overhead of a run's checkpoint."""
+
+    records: int = 0
+    bytes: int = 0
+    fsyncs: int = 0
+    seconds: float = 0.0  # Time spent serializing, writing and syncing
+
+    @property
+    def mean_ms(self) -> float:
+        """Mean overhead per record, in milliseconds."""
+        return self.seconds / self.records * 1000 if self.records else 0.0
+
+
+@dataclass
+class Checkpoint:
+    """State of a run rebuilt from its last durable records."""
+
+    run_id: str
+    task: str
+    steps: int = 0
+    # Context with screenshots removed, as sent to the model
+    messages: list[dict[str, Any]] = field(default_factory=list)
+    actions: list[str] = field(default_factory=list)  # Action texts, oldest first
+    current_app: str | None = None  # Foreground app at the last step
+    metadata: dict[str, Any] = field(default_factory=dict)  # Device session info
+    started_at: float = 0.0
+    updated_at: float = 0.0
+    finished: bool = False
+    reason: str | None = None  # StopReason value of a finished run
+    message: str | None = None
+
+
+class CheckpointWriter:
+    """
+    Appends the records of one run to its checkpoint file.
+
+    Every record is flushed to the OS, so it survives the process dying. The
+    file is fsynced at most once per fsync_interval seconds, and when the
+    writer is closed, so the cost of durability against power loss is shared
+    by all records written in between.
+
+    Args:
+        path: Checkpoint file, opened for appending.
+        fsync_interval: Seconds between fsyncs. 0 syncs every record.
+    """
+
+    def __init__(self, path: str, fsync_interval: float = 1.0):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.stats = CheckpointStats()
+        self._file = open(path, "a", encoding="utf-8")
+        self._last_sync = time.perf_counter()
+        self._dirty = False
+
+    def append(self, record: dict[str, Any]) -> None:
+        """Write one record as a JSON line."""
+        start = time.perf_counter()
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        self._file.write(line)
+        self._file.flush()
+        self._dirty = True
+        if start - self._last_sync >= self.fsync_interval:
+            self._sync()
+        self.stats.records += 1
+        self.stats.bytes += len(line.encode("utf-8"))
+        self.stats.seconds += time.perf_counter() - start
+
+    def close(self) -> None:
+        """Sync outstanding records and close the file."""
+        if self._file.closed:
+            return
+        start = time.perf_counter()
+        if self._dirty:
+            self._sync()
+        self._file.close()
+        self.stats.seconds += time.perf_counter() - start
+
+    def _sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._last_sync = time.perf_counter()
+        self._dirty = False
+        self.stats.fsyncs += 1
+
+
+class CheckpointStore:
+    """
+    Directory of run checkpoints, one JSONL file per run.
+
+    A run's file starts with a "start" record (task and device session
+    metadata), gets a "step" record after each step (the context messages
+    added by the step, its action and the foreground app) and ends with an
+    "end" record once the run is over. A record cut short by a crash is
+    ignored when loading.
+
+    Args:
+        directory: Directory holding the checkpoint files.
+        fsync_interval: Seconds between fsyncs of a run's file.
+
+    Example:
+        >>> store = CheckpointStore("checkpoints")
+        >>> agent = PhoneAgent(agent_config=AgentConfig(checkpoint_store=store))
+        >>> agent.run("Open Settings")  # Killed half-way
+        >>> for checkpoint in store.unfinished():
+        ...     agent.resume(checkpoint.run_id)
+    """
+
+    def __init__(self, directory: str, fsync_interval: float = 1.0):
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def new_run_id() -> str:
+        return time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+
+    def path(self, run_id: str) -> str:
+        return os.path.join(self.directory, f"{run_id}.jsonl")
+
+    def start(
+        self, run_id: str, task: str, metadata: dict[str, Any]
+    ) -> CheckpointWriter:
+        """Create the checkpoint of a new run and write its start record."""
+        writer = CheckpointWriter(self.path(run_id), self.fsync_interval)
+        writer.append(
+            {
+                "type": "start",
+                "run_id": run_id,
+                "task": task,
+                "metadata": metadata,
+                "time": time.time(),
+            }
+        )
+        return writer
+
+    def reopen(self, run_id: str) -> CheckpointWriter:
+        """Open an existing checkpoint for appending, dropping a torn record."""
+        path = self.path(run_id)
+        _, valid_size = _read_records(path)
+        if valid_size < os.path.getsize(path):
+            with open(path, "r+b") as f:
+                f.truncate(valid_size)
+        return CheckpointWriter(path, self.fsync_interval)
+
+    def load(self, run_id: str) -> Checkpoint:
+        """
+        Rebuild a run's state from its checkpoint.
+
+        Raises:
+            FileNotFoundError: If the run has no checkpoint.
+            ValueError: If the checkpoint has no start record.
+        """
+        records, _ = _read_records(self.path(run_id))
+        if not records or records[0].get("type") != "start":
+            raise ValueError(f"Checkpoint of run {run_id} has no start record")
+
+        start = records[0]
+        checkpoint = Checkpoint(
+            run_id=run_id,
+            task=start["task"],
+            metadata=start.get("metadata", {}),
+            started_at=start["time"],
+            updated_at=start["time"],
+        )
+        for record in records[1:]:
+            checkpoint.updated_at = record.get("time", checkpoint.updated_at)
+            if record["type"] == "step":
+                checkpoint.steps = record["step"]
+                checkpoint.messages.extend(record["messages"])
+                if record.get("action") is not None:
+                    checkpoint.actions.append(record["action"])
+                checkpoint.current_app = record.get("current_app")
+            elif record["type"] == "end":
+                checkpoint.finished = True
+                checkpoint.reason = record.get("reason")
+                checkpoint.message = record.get("message")
+        return checkpoint
+
+    def runs(self) -> list[Checkpoint]:
+        """All loadable checkpoints, most recently updated first."""
+        checkpoints = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".jsonl"):
+                continue
+            try:
+                checkpoints.append(self.load(name[: -len(".jsonl")]))
+            except (OSError, ValueError, KeyError):
+                continue
+        return sorted(checkpoints, key=lambda c: c.updated_at, reverse=True)
+
+    def unfinished(self) -> list[Checkpoint]:
+        """Checkpoints of runs that never wrote an end record."""
+        return [checkpoint for checkpoint in self.runs() if not checkpoint.finished]
+
+
+def _read_records(path: str) -> tuple[list[dict[str, Any]], int]:
+    """
+    Read the complete records of a checkpoint file.
+
+    Returns:
+        Tuple of (records, size in bytes of the valid prefix of the file).
+    """
+    records = []
+    valid_size = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+            valid_size += len(line)
+    return records, valid_size
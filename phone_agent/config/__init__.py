@@ -4,7 +4,9 @@ from phone_agent.config.apps import APP_PACKAGES
 from phone_agent.config.apps_ios import APP_PACKAGES_IOS
 from phone_agent.config.i18n import get_message, get_messages
 from phone_agent.config.prompts_en import SYSTEM_PROMPT as SYSTEM_PROMPT_EN
+from phone_agent.config.prompts_en import get_date_info as get_date_info_en
 from phone_agent.config.prompts_zh import SYSTEM_PROMPT as SYSTEM_PROMPT_ZH
+from phone_agent.config.prompts_zh import get_date_info as get_date_info_zh
 from phone_agent.config.timing import (
     TIMING_CONFIG,
     ActionTimingConfig,
@@ -31,6 +33,24 @@ def get_system_prompt(lang: str = "cn") -> str:
     return SYSTEM_PROMPT_ZH
 
 
+def get_date_info(lang: str = "cn") -> str:
+    """
+    Get today's date line by language.
+
+    The date is sent with the task rather than in the system prompt, so the
+    system prompt stays byte-stable and can be served from the prefix cache.
+
+    Args:
+        lang: Language code, 'cn' for Chinese, 'en' for English.
+
+    Returns:
+        Date line string.
+    """
+    if lang == "en":
+        return get_date_info_en()
+    return get_date_info_zh()
+
+
 # Default to Chinese for backward compatibility
 SYSTEM_PROMPT = SYSTEM_PROMPT_ZH
 
@@ -41,6 +61,7 @@ __all__ = [
     "SYSTEM_PROMPT_ZH",
     "SYSTEM_PROMPT_EN",
     "get_system_prompt",
+    "get_date_info",
     "get_messages",
     "get_message",
     "TIMING_CONFIG",
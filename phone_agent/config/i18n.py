@@ -23,6 +23,23 @@ MESSAGES_ZH = {
     "time_to_first_token": "首 Token 延迟 (TTFT)",
     "time_to_thinking_end": "思考完成延迟",
     "total_inference_time": "总推理时间",
+    "stopped_early": "动作完成后已关闭流",
+    "tokens_saved": "预计节省 Token",
+    "trailing_tokens": "动作后多余 Token",
+    "prompt_cache": "前缀缓存命中 Token",
+    "usage_not_reported": "未上报（流已提前关闭）",
+    "queue_time": "排队等待时间",
+    "replayed_step": "复用已记录的操作",
+    "cached_response": "命中响应缓存",
+    "loop_detected": "检测到循环",
+    "loop_hint": "注意：最近几步在重复操作且页面没有变化，请换一种方法。",
+    "loop_finish": "多次重复操作后页面仍无变化，任务已停止",
+    "deadline_reached": "剩余时间不足以完成下一阶段，任务已停止",
+    "token_budget_exhausted": "Token 预算不足以发起下一次请求，任务已停止",
+    "run_cancelled": "任务已取消",
+    "checkpoint_run": "检查点运行 ID",
+    "resuming_run": "从检查点继续运行",
+    "model_retry": "模型请求失败，重试",
 }
 
 # English messages
@@ -48,6 +65,24 @@ MESSAGES_EN = {
     "time_to_first_token": "Time to First Token (TTFT)",
     "time_to_thinking_end": "Time to Thinking End",
     "total_inference_time": "Total Inference Time",
+    "stopped_early": "Stream Closed After Action",
+    "tokens_saved": "Projected Tokens Saved",
+    "trailing_tokens": "Tokens After Action",
+    "prompt_cache": "Prompt Tokens Cached",
+    "usage_not_reported": "not reported (stream closed early)",
+    "queue_time": "Queue Wait Time",
+    "replayed_step": "Replayed Recorded Action",
+    "cached_response": "Cached Response",
+    "loop_detected": "Loop Detected",
+    "loop_hint": "Note: the last steps repeated without changing the screen. "
+    "Try a different approach.",
+    "loop_finish": "Stopped after repeated actions made no progress",
+    "deadline_reached": "Stopped: the next stage would overrun the deadline",
+    "token_budget_exhausted": "Stopped: too few tokens left for another request",
+    "run_cancelled": "Stopped: the task was cancelled",
+    "checkpoint_run": "Checkpoint run ID",
+    "resuming_run": "Resuming run from checkpoint",
+    "model_retry": "Model request failed, retry",
 }
 
 
@@ -2,14 +2,14 @@
 
 from datetime import datetime
 
-today = datetime.today()
-formatted_date = today.strftime("%Y-%m-%d, %A")
 
-SYSTEM_PROMPT = (
-    "The current date: "
-    + formatted_date
-    + """
-# Setup
+def get_date_info(today: datetime | None = None) -> str:
+    """Date line sent with the task, kept out of the cacheable system prompt."""
+    today = today or datetime.today()
+    return "The current date: " + today.strftime("%Y-%m-%d, %A")
+
+
+SYSTEM_PROMPT = """# Setup
 You are a professional Android operation agent assistant that can fulfill the user's high-level instructions. Given a screenshot of the Android interface at each step, you first analyze the situation, then plan the best course of action using Python-style pseudo-code.
 
 # More details about the code
@@ -76,4 +76,3 @@ REMEMBER:
 - Only ONE LINE of action in <answer> part per response: Each step must contain exactly one line of executable code.
 - Generate execution code strictly according to format requirements.
 """
-)
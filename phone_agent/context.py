@@ -0,0 +1,225 @@
+"""Sliding-window management of the conversation sent to the model."""
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any
+
+_ANSWER_RE = re.compile(r"<answer>(.*?)</answer>", re.DOTALL)
+
+
+@dataclass
+class ContextConfig:
+    """
+    Budget for the prompt sent on each step.
+
+    The system prompt and the task message are always kept, as is the current
+    observation and the response before it. Older turns beyond the budget are
+    compacted into a short action log appended to the task message.
+
+    Turns are compacted compact_chunk at a time. The task message, and with it
+    everything after the system prompt, then only changes once per chunk, so
+    the server's prefix cache covers the whole prompt on the other steps.
+    """
+
+    max_turns: int | None = None  # Completed turns kept verbatim (None: all)
+    max_tokens: int | None = None  # Estimated prompt token budget (None: none)
+    image_tokens: int = 1000  # Estimated tokens per screenshot
+    compact_chunk: int = 5  # Turns compacted at a time
+
+
+@dataclass
+class PromptStats:
+    """Size of the prompt built for a single step."""
+
+    messages: int
+    estimated_tokens: int
+    verbatim_turns: int
+    compacted_turns: int
+    # Server-reported usage, filled in once the response arrives; None when
+    # the stream was closed early, before the usage chunk
+    prompt_tokens: int | None = None
+    cached_tokens: int | None = None
+
+    @property
+    def cache_hit_rate(self) -> float | None:
+        """Share of prompt tokens served from the server's prefix cache."""
+        if not self.prompt_tokens or self.cached_tokens is None:
+            return None
+        return self.cached_tokens / self.prompt_tokens
+
+
+def estimate_tokens(message: dict[str, Any], image_tokens: int = 1000) -> int:
+    """
+    Roughly estimate the prompt tokens of a message.
+
+    ASCII text counts as four characters per token and other characters
+    (e.g. Chinese) as one token each. Images count as image_tokens.
+
+    Args:
+        message: Message dictionary in OpenAI format.
+        image_tokens: Estimated tokens per image.
+
+    Returns:
+        Estimated token count.
+    """
+    content = message.get("content")
+    if isinstance(content, str):
+        parts = [content]
+        images = 0
+    else:
+        parts = [item.get("text", "") for item in content if item.get("type") == "text"]
+        images = sum(1 for item in content if item.get("type") == "image_url")
+
+    tokens = images * image_tokens
+    for text in parts:
+        ascii_chars = len(text.encode("ascii", "ignore"))
+        tokens += ascii_chars // 4 + (len(text) - ascii_chars)
+    return tokens + 4  # Role and message framing
+
+
+class ContextManager:
+    """
+    Builds the prompt for each step from the full conversation history.
+
+    The history is [system, task, assistant, observation, assistant, ...,
+    observation]. A completed turn is an assistant response together with the
+    observation that followed it. At most the newest max_turns turns are
+    kept verbatim; if the estimate still exceeds max_tokens, more turns are
+    compacted until it fits or only the newest turn is left. The number of
+    compacted turns is rounded up to a multiple of compact_chunk. Each
+    compacted turn becomes one line of the action log.
+
+    Args:
+        config: Budget configuration. With the defaults the full history is
+            sent unchanged, but prompt sizes are still reported.
+    """
+
+    def __init__(self, config: ContextConfig | None = None):
+        self.config = config or ContextConfig()
+        self.last_stats: PromptStats | None = None
+
+    def build(self, history: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Build the prompt for the next request.
+
+        Args:
+            history: Full conversation history. It is not modified.
+
+        Returns:
+            Messages to send to the model.
+        """
+        head, body = history[:2], history[2:]
+        # body alternates assistant, observation; pair them up
+        turns = [body[i : i + 2] for i in range(0, len(body), 2)]
+
+        # The newest turn holds the current observation and is always kept
+        keep = len(turns)
+        if self.config.max_turns is not None:
+            keep = min(keep, max(self.config.max_turns, 1))
+
+        while True:
+            keep = self._align(len(turns), keep)
+            prompt = self._assemble(head, turns, len(turns) - keep)
+            tokens = sum(
+                estimate_tokens(message, self.config.image_tokens) for message in prompt
+            )
+            over_budget = (
+                self.config.max_tokens is not None and tokens > self.config.max_tokens
+            )
+            if not over_budget or keep <= min(len(turns), 1):
+                break
+            keep -= 1
+
+        self.last_stats = PromptStats(
+            messages=len(prompt),
+            estimated_tokens=tokens,
+            verbatim_turns=keep,
+            compacted_turns=len(turns) - keep,
+        )
+        return prompt
+
+    def record_usage(
+        self, prompt_tokens: int | None, cached_tokens: int | None
+    ) -> None:
+        """Attach server-reported usage to the stats of the last prompt."""
+        if self.last_stats is not None:
+            self.last_stats.prompt_tokens = prompt_tokens
+            self.last_stats.cached_tokens = cached_tokens
+
+    def _align(self, turns: int, keep: int) -> int:
+        """Lower keep so the compacted turns fill whole chunks."""
+        compacted = turns - keep
+        if compacted <= 0:
+            return keep
+        chunk = max(self.config.compact_chunk, 1)
+        compacted = -(-compacted // chunk) * chunk  # Round up
+        return max(turns - compacted, min(turns, 1))
+
+    def _assemble(
+        self, head: list[dict[str, Any]], turns: list[list[dict]], compacted: int
+    ) -> list[dict[str, Any]]:
+        """Join the head, the action log and the verbatim turns."""
+        if compacted <= 0:
+            return head + [message for turn in turns for message in turn]
+
+        task_message = dict(head[1])
+        log = self._action_log(head[1], turns[:compacted])
+        task_message["content"] = self._append_text(task_message["content"], log)
+
+        prompt = [head[0], task_message]
+        for turn in turns[compacted:]:
+            prompt.extend(turn)
+        return prompt
+
+    @staticmethod
+    def _action_log(
+        task_message: dict[str, Any], turns: list[list[dict[str, Any]]]
+    ) -> str:
+        """Summarise compacted turns as one line per step."""
+        lines = ["** Earlier Steps **"]
+        observation = task_message
+        for index, turn in enumerate(turns, start=1):
+            app = _current_app(observation)
+            action = _answer(turn[0])
+            lines.append(f"{index}. [{app}] {action}" if app else f"{index}. {action}")
+            if len(turn) > 1:
+                observation = turn[1]
+        return "\n".join(lines)
+
+    @staticmethod
+    def _append_text(content: Any, text: str) -> Any:
+        """Append text to string or multi-part message content."""
+        if isinstance(content, str):
+            return f"{content}\n\n{text}"
+        content = [dict(item) for item in content]
+        for item in content:
+            if item.get("type") == "text":
+                item["text"] = f"{item['text']}\n\n{text}"
+                return content
+        return content + [{"type": "text", "text": text}]
+
+
+def _message_text(message: dict[str, Any]) -> str:
+    content = message.get("content")
+    if isinstance(content, str):
+        return content
+    return "\n".join(
+        item.get("text", "") for item in content if item.get("type") == "text"
+    )
+
+
+def _answer(message: dict[str, Any]) -> str:
+    """Action part of an assistant message."""
+    text = _message_text(message)
+    match = _ANSWER_RE.search(text)
+    return (match.group(1) if match else text).strip()
+
+
+def _current_app(message: dict[str, Any]) -> str | None:
+    """current_app from the screen info JSON at the end of an observation."""
+    text = _message_text(message)
+    try:
+        return json.loads(text.rsplit("\n\n", 1)[-1]).get("current_app")
+    except (ValueError, AttributeError):
+        return None
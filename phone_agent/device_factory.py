@@ -53,6 +53,10 @@ class DeviceFactory:
         """Get current app name."""
         return self.module.get_current_app(device_id)
 
+    def get_device_model(self, device_id: str | None = None) -> str:
+        """Get device model name."""
+        return self.module.get_device_model(device_id)
+
     def tap(
         self, x: int, y: int, device_id: str | None = None, delay: float | None = None
     ):
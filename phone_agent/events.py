@@ -0,0 +1,265 @@
+"""Typed agent events and the sinks that receive them."""
+
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import IO, Any
+
+from phone_agent.budget import BUDGET_STOP_MESSAGES, StopReason
+from phone_agent.config.i18n import get_messages
+
+# Event types. Stream events are emitted per streamed chunk by the model
+# client; the others at most a few times per step.
+INFERENCE_START = "inference_start"  # A model request is about to be sent
+THINKING = "thinking"  # Streamed thinking text (stream event)
+ACTION_START = "action_start"  # The action part has begun (stream event)
+MODEL_METRICS = "model_metrics"  # Timing and token metrics of a response
+MODEL_RETRY = "model_retry"  # A model request failed and is sent again
+CACHED_RESPONSE = "cached_response"  # The response cache answered the step
+REPLAYED_STEP = "replayed_step"  # A recorded trajectory step was replayed
+LOOP_DETECTED = "loop_detected"
+ACTION = "action"  # The parsed action of the step, with its thinking
+TASK_FINISHED = "task_finished"
+RUN_STOPPED = "run_stopped"  # A budget or cancellation ended the run
+CHECKPOINT = "checkpoint"  # A run checkpoint was started or reopened
+STEP_ERROR = "step_error"  # A stage of the step raised; the step recovers
+
+STREAM_EVENTS = (THINKING, ACTION_START)
+# Events the console shows even when the agent is not verbose
+CONSOLE_ALWAYS = (INFERENCE_START, THINKING, ACTION_START, MODEL_METRICS, MODEL_RETRY)
+
+
+@dataclass
+class AgentEvent:
+    """A structured event emitted by an agent or its model client."""
+
+    type: str
+    data: dict[str, Any] = field(default_factory=dict)
+    source: str | None = None  # Device ID or scheduler flow of the emitter
+    step: int | None = None  # Agent step the event belongs to, if known
+    time: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "type": self.type,
+            "time": self.time,
+            "source": self.source,
+            "step": self.step,
+            "data": self.data,
+        }
+
+
+class EventSink:
+    """
+    Receiver of agent events.
+
+    Emitters skip building events entirely for a sink whose enabled flag is
+    False, so a disabled sink costs one attribute check per emit site.
+    """
+
+    enabled = True
+
+    def emit(self, event: AgentEvent) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release resources held by the sink."""
+
+
+class NullSink(EventSink):
+    """Discards all events; the silent high-throughput mode."""
+
+    enabled = False
+
+    def emit(self, event: AgentEvent) -> None:
+        pass
+
+
+class MemorySink(EventSink):
+    """
+    Keeps events in a list, e.g. for inspection after a run.
+
+    Args:
+        include_stream: Also keep per-chunk THINKING and ACTION_START events.
+    """
+
+    def __init__(self, include_stream: bool = False):
+        self.include_stream = include_stream
+        self.events: list[AgentEvent] = []
+
+    def emit(self, event: AgentEvent) -> None:
+        if self.include_stream or event.type not in STREAM_EVENTS:
+            self.events.append(event)
+
+    def of_type(self, event_type: str) -> list[AgentEvent]:
+        """Events of one type, oldest first."""
+        return [event for event in self.events if event.type == event_type]
+
+    def clear(self) -> None:
+        self.events = []
+
+
+class JsonlSink(EventSink):
+    """
+    Appends events to a file as JSON lines.
+
+    Writes are buffered and may be shared by several agents; the file is
+    flushed when the sink is closed or flush() is called. The ACTION event
+    carries the full thinking text, so per-chunk stream events are skipped
+    unless include_stream is set.
+
+    Args:
+        path: File to append to, or an open text file.
+        include_stream: Also write per-chunk THINKING and ACTION_START events.
+    """
+
+    def __init__(self, path: str | IO[str], include_stream: bool = False):
+        self.include_stream = include_stream
+        if isinstance(path, str):
+            self._file = open(path, "a", encoding="utf-8")
+            self._owns_file = True
+        else:
+            self._file = path
+            self._owns_file = False
+        self._lock = threading.Lock()
+
+    def emit(self, event: AgentEvent) -> None:
+        if not self.include_stream and event.type in STREAM_EVENTS:
+            return
+        line = json.dumps(
+            event.to_dict(), ensure_ascii=False, separators=(",", ":"), default=str
+        )
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def flush(self) -> None:
+        with self._lock:
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._owns_file:
+                self._file.close()
+            else:
+                self._file.flush()
+
+
+class ConsoleSink(EventSink):
+    """
+    Prints events to stdout in the agent's classic console format.
+
+    Args:
+        lang: Language for UI messages: 'cn' or 'en'.
+        verbose: Print every event. Otherwise only the streamed thinking and
+            the model metrics are printed.
+    """
+
+    def __init__(self, lang: str = "cn", verbose: bool = True):
+        self.lang = lang
+        self.verbose = verbose
+        self.msgs = get_messages(lang)
+
+    def emit(self, event: AgentEvent) -> None:
+        if not self.verbose and event.type not in CONSOLE_ALWAYS:
+            return
+        render = getattr(self, f"_print_{event.type}", None)
+        if render is not None:
+            render(event.data)
+
+    def _print_inference_start(self, data: dict[str, Any]) -> None:
+        print("\n" + "=" * 50)
+        print(f"💭 {self.msgs['thinking']}:")
+        print("-" * 50)
+
+    def _print_thinking(self, data: dict[str, Any]) -> None:
+        print(data["text"], end="", flush=True)
+
+    def _print_action_start(self, data: dict[str, Any]) -> None:
+        print()  # Newline after the streamed thinking
+
+    def _print_model_metrics(self, data: dict[str, Any]) -> None:
+        msgs = self.msgs
+        print()
+        print("=" * 50)
+        print(f"⏱️  {msgs['performance_metrics']}:")
+        print("-" * 50)
+        if data.get("queue_time") is not None:
+            print(f"{msgs['queue_time']}: {data['queue_time']:.3f}s")
+        if data.get("time_to_first_token") is not None:
+            print(f"{msgs['time_to_first_token']}: {data['time_to_first_token']:.3f}s")
+        if data.get("time_to_thinking_end") is not None:
+            print(
+                f"{msgs['time_to_thinking_end']}:        "
+                f"{data['time_to_thinking_end']:.3f}s"
+            )
+        print(f"{msgs['total_inference_time']}:          {data['total_time']:.3f}s")
+        if data.get("stopped_early"):
+            print(f"{msgs['stopped_early']}: {data['time_to_action']:.3f}s")
+            if data.get("tokens_saved") is not None:
+                print(
+                    f"{msgs['tokens_saved']}: ~{data['tokens_saved']:.0f} "
+                    f"(~{data['server_time_freed']:.3f}s)"
+                )
+        elif data.get("trailing_tokens"):
+            print(
+                f"{msgs['trailing_tokens']}: {data['trailing_tokens']} "
+                f"({data['trailing_time']:.3f}s)"
+            )
+        prompt_tokens = data.get("prompt_tokens")
+        if prompt_tokens is None and data.get("stopped_early"):
+            # The stream was closed before the usage chunk
+            print(f"{msgs['prompt_cache']}: {msgs['usage_not_reported']}")
+        elif prompt_tokens:
+            cached = data.get("cached_tokens") or 0
+            print(
+                f"{msgs['prompt_cache']}: {cached}/{prompt_tokens} "
+                f"({cached / prompt_tokens:.0%})"
+            )
+        print("=" * 50)
+
+    def _print_model_retry(self, data: dict[str, Any]) -> None:
+        print(
+            f"\n⚠️  {self.msgs['model_retry']} #{data['attempt']} "
+            f"({data['endpoint']}, {data['delay']:.1f}s): {data['error']}"
+        )
+
+    def _print_cached_response(self, data: dict[str, Any]) -> None:
+        print("\n" + "=" * 50)
+        print(f"🗃️  {self.msgs['cached_response']}: {data['action']}")
+
+    def _print_replayed_step(self, data: dict[str, Any]) -> None:
+        print("\n" + "=" * 50)
+        print(f"♻️  {self.msgs['replayed_step']}: {data['action']}")
+
+    def _print_loop_detected(self, data: dict[str, Any]) -> None:
+        print(
+            f"🔁 {self.msgs['loop_detected']}: {data['kind']}, "
+            f"{data['wasted_steps']} steps -> {data['policy']}"
+        )
+
+    def _print_action(self, data: dict[str, Any]) -> None:
+        print("-" * 50)
+        print(f"🎯 {self.msgs['action']}:")
+        print(json.dumps(data["action"], ensure_ascii=False, indent=2))
+        print("=" * 50 + "\n")
+
+    def _print_task_finished(self, data: dict[str, Any]) -> None:
+        print("\n" + "🎉 " + "=" * 48)
+        print(f"✅ {self.msgs['task_completed']}: {data['message']}")
+        print("=" * 50 + "\n")
+
+    def _print_run_stopped(self, data: dict[str, Any]) -> None:
+        message_key, _ = BUDGET_STOP_MESSAGES[StopReason(data["reason"])]
+        print(f"\n⏱️  {self.msgs[message_key]}")
+
+    def _print_checkpoint(self, data: dict[str, Any]) -> None:
+        if data.get("resumed"):
+            run_id, steps = data["run_id"], data["steps"]
+            print(f"💾 {self.msgs['resuming_run']}: {run_id} ({steps})")
+        else:
+            print(f"💾 {self.msgs['checkpoint_run']}: {data['run_id']}")
+
+    def _print_step_error(self, data: dict[str, Any]) -> None:
+        print(data["traceback"], end="", file=sys.stderr)
@@ -0,0 +1,333 @@
+"""Run a queue of tasks across many devices, one agent per device."""
+
+import json
+import queue
+import threading
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Iterable
+
+from phone_agent.agent import PhoneAgent
+from phone_agent.budget import StopReason
+
+
+@dataclass
+class FleetTask:
+    """A task in the fleet queue."""
+
+    task_id: str
+    task: str
+    deadline: float | None = None  # Per-run wall-clock budget (seconds)
+    token_budget: int | None = None
+
+
+@dataclass
+class FleetConfig:
+    """
+    Configuration for a fleet run.
+
+    Retried tasks go back to the shared queue, so another device may pick
+    them up.
+    """
+
+    concurrency: int | None = None  # Devices used at once; None uses all
+    max_attempts: int = 2  # Attempts per task, including the first
+    # Run outcomes that are retried; exceptions from run() always are
+    retry_on: tuple[StopReason, ...] = (StopReason.ERROR,)
+    results_path: str | None = None  # JSONL file, one line per task
+
+
+@dataclass
+class TaskResult:
+    """Outcome of a task, written as one JSONL line."""
+
+    task_id: str
+    task: str
+    device_id: str
+    status: str  # "completed", "failed" or "error"
+    message: str
+    reason: str  # StopReason value, or "exception"
+    attempts: int
+    steps: int = 0
+    queue_time: float = 0.0  # Seconds from fleet start to the last attempt
+    run_time: float = 0.0  # Seconds spent in the last attempt
+    tokens_used: int = 0
+    stage_times: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class FleetStats:
+    """Throughput summary of a fleet run."""
+
+    devices: int
+    tasks: int
+    completed: int
+    retries: int
+    elapsed: float
+
+    @property
+    def throughput(self) -> float:
+        """Finished tasks per minute."""
+        return self.tasks / self.elapsed * 60 if self.elapsed else 0.0
+
+
+def load_tasks(path: str) -> list[FleetTask]:
+    """
+    Load tasks from a JSONL file.
+
+    Each line is an object with a "task" field and optional "id", "deadline"
+    and "token_budget" fields. Blank lines are skipped; ids default to the
+    line number.
+
+    Args:
+        path: Path to the tasks file.
+
+    Returns:
+        Tasks in file order.
+    """
+    tasks = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            tasks.append(
+                FleetTask(
+                    task_id=str(entry.get("id", line_number)),
+                    task=entry["task"],
+                    deadline=entry.get("deadline"),
+                    token_budget=entry.get("token_budget"),
+                )
+            )
+    return tasks
+
+
+class FleetRunner:
+    """
+    Pulls tasks from a shared queue onto per-device workers.
+
+    Every device gets its own worker thread and its own agent, built once by
+    agent_factory and reused for each task that device runs. Tasks are taken
+    from the queue as devices become free, so faster devices run more tasks.
+    If no device gets an agent, the tasks are recorded as errors.
+
+    Args:
+        agent_factory: Callable building the agent for a device ID. Tests and
+            benchmarks can return agents wired to simulated devices.
+        device_ids: Devices to run on.
+        config: Fleet configuration.
+
+    Example:
+        >>> runner = FleetRunner(
+        ...     lambda device_id: PhoneAgent(agent_config=AgentConfig(
+        ...         device_id=device_id, verbose=False)),
+        ...     ["emulator-5554", "emulator-5556"],
+        ...     FleetConfig(results_path="results.jsonl"),
+        ... )
+        >>> results = runner.run(load_tasks("tasks.jsonl"))
+    """
+
+    def __init__(
+        self,
+        agent_factory: Callable[[str], PhoneAgent],
+        device_ids: list[str],
+        config: FleetConfig | None = None,
+    ):
+        if not device_ids:
+            raise ValueError("No devices to run on")
+        self.agent_factory = agent_factory
+        self.config = config or FleetConfig()
+        concurrency = self.config.concurrency or len(device_ids)
+        self.device_ids = device_ids[:concurrency]
+        self.results: list[TaskResult] = []
+        self.stats: FleetStats | None = None
+        self._queue: queue.Queue[tuple[FleetTask, int] | None] = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._retries = 0
+        self._workers_alive = 0  # Workers whose agent is built or being built
+        self._started_at = 0.0
+        self._results_file = None
+
+    def run(self, tasks: Iterable[FleetTask]) -> list[TaskResult]:
+        """
+        Run all tasks and wait for them to finish.
+
+        Args:
+            tasks: Tasks to run.
+
+        Returns:
+            One TaskResult per task, in completion order.
+        """
+        self.results = []
+        self._retries = 0
+        self._pending = 0
+        self._workers_alive = len(self.device_ids)
+        self._queue = queue.Queue()
+        self._started_at = time.perf_counter()
+        for task in tasks:
+            self._pending += 1
+            self._queue.put((task, 1))
+        if self._pending == 0:
+            self._queue.put(None)
+
+        if self.config.results_path:
+            self._results_file = open(self.config.results_path, "a", encoding="utf-8")
+        workers = [
+            threading.Thread(
+                target=self._worker, args=(device_id,), name=f"fleet-{device_id}"
+            )
+            for device_id in self.device_ids
+        ]
+        try:
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        finally:
+            if self._results_file is not None:
+                self._results_file.close()
+                self._results_file = None
+
+        self.stats = FleetStats(
+            devices=len(self.device_ids),
+            tasks=len(self.results),
+            completed=sum(r.status == "completed" for r in self.results),
+            retries=self._retries,
+            elapsed=time.perf_counter() - self._started_at,
+        )
+        return self.results
+
+    def _worker(self, device_id: str) -> None:
+        """Run tasks on one device until the queue is drained."""
+        try:
+            agent = self.agent_factory(device_id)
+        except Exception as e:
+            # Leave the tasks to the other devices, if any is left
+            traceback.print_exc()
+            with self._lock:
+                self._workers_alive -= 1
+                last = self._workers_alive == 0
+            if last:
+                self._fail_queued(device_id, f"No agent could be built: {e}")
+            return
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    # Pass the stop signal on to the next worker
+                    self._queue.put(None)
+                    return
+                task, attempt = item
+                requeued = False
+                try:
+                    result = self._run_task(agent, device_id, task, attempt)
+                    requeued = result is None
+                    if not requeued:
+                        self._record(result)
+                except Exception:
+                    # E.g. the results file could not be written
+                    traceback.print_exc()
+                finally:
+                    if not requeued:
+                        self._task_done()
+        finally:
+            agent.close()
+
+    def _fail_queued(self, device_id: str, message: str) -> None:
+        """Record every queued task as an error once no worker is left."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is None:
+                self._queue.put(None)
+                return
+            task, attempt = item
+            try:
+                self._record(
+                    TaskResult(
+                        task_id=task.task_id,
+                        task=task.task,
+                        device_id=device_id,
+                        status="error",
+                        message=message,
+                        reason="exception",
+                        attempts=attempt - 1,
+                    )
+                )
+            except Exception:
+                traceback.print_exc()
+            finally:
+                self._task_done()
+
+    def _run_task(
+        self, agent: PhoneAgent, device_id: str, task: FleetTask, attempt: int
+    ) -> TaskResult | None:
+        """Run one attempt; return its result, or None if it was requeued."""
+        queue_time = time.perf_counter() - self._started_at
+        start = time.perf_counter()
+        try:
+            message = agent.run(
+                task.task, deadline=task.deadline, token_budget=task.token_budget
+            )
+            run = agent.last_run
+            reason = run.reason
+            retry = reason in self.config.retry_on
+        except Exception as e:
+            traceback.print_exc()
+            message, run, reason, retry = str(e), None, None, True
+
+        if retry and attempt < self.config.max_attempts:
+            with self._lock:
+                self._retries += 1
+            self._queue.put((task, attempt + 1))
+            return None
+
+        if reason is StopReason.FINISHED:
+            status = "completed"
+        elif reason is None or reason is StopReason.ERROR:
+            status = "error"
+        else:
+            status = "failed"
+
+        return TaskResult(
+            task_id=task.task_id,
+            task=task.task,
+            device_id=device_id,
+            status=status,
+            message=message,
+            reason=reason.value if reason is not None else "exception",
+            attempts=attempt,
+            steps=run.steps if run is not None else 0,
+            queue_time=round(queue_time, 3),
+            run_time=round(time.perf_counter() - start, 3),
+            tokens_used=run.tokens_used if run is not None else 0,
+            stage_times=(
+                {
+                    stage: round(timing.total, 3)
+                    for stage, timing in run.stage_timings.items()
+                }
+                if run is not None
+                else {}
+            ),
+        )
+
+    def _record(self, result: TaskResult) -> None:
+        """Keep a final result and append it to the results file."""
+        with self._lock:
+            self.results.append(result)
+            if self._results_file is not None:
+                line = json.dumps(asdict(result), ensure_ascii=False)
+                self._results_file.write(line + "\n")
+                self._results_file.flush()
+
+    def _task_done(self) -> None:
+        """Count a task as settled and stop the workers after the last one."""
+        with self._lock:
+            self._pending -= 1
+            done = self._pending == 0
+        if done:
+            self._queue.put(None)
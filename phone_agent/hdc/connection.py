@@ -44,6 +44,11 @@ def set_hdc_verbose(verbose: bool):
     _HDC_VERBOSE = verbose
 
 
+def is_hdc_verbose() -> bool:
+    """Whether HDC commands and lookups are logged."""
+    return _HDC_VERBOSE
+
+
 class ConnectionType(Enum):
     """Type of HDC connection."""
 
@@ -7,7 +7,7 @@ from typing import List, Optional, Tuple
 
 from phone_agent.config.apps_harmonyos import APP_ABILITIES, APP_PACKAGES
 from phone_agent.config.timing import TIMING_CONFIG
-from phone_agent.hdc.connection import _run_hdc_command
+from phone_agent.hdc.connection import _run_hdc_command, is_hdc_verbose
 import re
 
 def get_current_app(device_id: str | None = None) -> str:
@@ -71,12 +71,35 @@ def get_current_app(device_id: str | None = None) -> str:
             if package == foreground_bundle:
                 return app_name
         # If bundle is found but not in our known apps, return the bundle name
-        print(f'Bundle is found but not in our known apps: {foreground_bundle}')
+        if is_hdc_verbose():
+            print(f'Bundle is found but not in our known apps: {foreground_bundle}')
         return foreground_bundle
-    print(f'No bundle is found')
+    if is_hdc_verbose():
+        print(f'No bundle is found')
     return "System Home"
 
 
+def get_device_model(device_id: str | None = None) -> str:
+    """
+    Get the device model name.
+
+    Args:
+        device_id: Optional HDC device ID for multi-device setups.
+
+    Returns:
+        The model name (const.product.model), or "unknown" if unavailable.
+    """
+    hdc_prefix = _get_hdc_prefix(device_id)
+
+    result = _run_hdc_command(
+        hdc_prefix + ["shell", "param", "get", "const.product.model"],
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+    )
+    return result.stdout.strip() or "unknown"
+
+
 def tap(
     x: int, y: int, device_id: str | None = None, delay: float | None = None
 ) -> None:
@@ -0,0 +1,162 @@
+"""Detection of agent loops and no-progress streaks."""
+
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+
+from phone_agent.trajectory import fingerprint_distance
+
+
+class LoopPolicy(Enum):
+    """What the agent does when a loop is detected."""
+
+    HINT = "hint"  # Tell the model on the next step that it is looping
+    BACK = "back"  # Replace the action with Back
+    HOME = "home"  # Replace the action with Home
+    TAKEOVER = "takeover"  # Hand over to a human
+    FINISH = "finish"  # Stop the task
+
+
+@dataclass
+class LoopDetectorConfig:
+    """
+    Thresholds and policies for loop detection.
+
+    A cycle is the same action on the same screen max_repeats times within the
+    last window steps (this includes A->B->A->B oscillation). A stall is
+    max_stall consecutive steps on an unchanged screen, whatever the actions.
+    Policies escalate: the first trigger in a run uses policies[0], the
+    second policies[1], and so on, staying on the last one.
+    """
+
+    window: int = 8
+    max_repeats: int = 3
+    max_stall: int = 5
+    max_distance: int = 4  # Fingerprint bits two "same" screens may differ by
+    policies: tuple[LoopPolicy, ...] = (
+        LoopPolicy.HINT,
+        LoopPolicy.BACK,
+        LoopPolicy.FINISH,
+    )
+
+
+@dataclass
+class LoopEvent:
+    """A detected loop and the policy applied to it."""
+
+    step: int
+    kind: str  # "cycle" or "stall"
+    policy: LoopPolicy
+    action: str  # Key of the action the model wanted to take
+    wasted_steps: int  # Steps spent in the loop before it was caught
+    remaining_steps: int  # Step budget left when the policy was applied
+
+
+@dataclass
+class _Entry:
+    fingerprint: int
+    action: str
+
+
+class LoopDetector:
+    """
+    Watches (screen fingerprint, action) pairs for cycles and stalls.
+
+    Args:
+        config: Thresholds and escalation policies.
+
+    Example:
+        >>> detector = LoopDetector(LoopDetectorConfig())
+        >>> event = detector.observe(step, fingerprint, action_key, remaining)
+        >>> if event is not None and event.policy is LoopPolicy.FINISH:
+        ...     stop()
+    """
+
+    def __init__(self, config: LoopDetectorConfig | None = None):
+        self.config = config or LoopDetectorConfig()
+        self.events: list[LoopEvent] = []
+        self._history: deque[_Entry] = deque(maxlen=self.config.window)
+        self._triggers = 0
+
+    def reset(self) -> None:
+        """Forget the history for a new run. Past events are kept."""
+        self._history.clear()
+        self._triggers = 0
+
+    def check(self, fingerprint: int, action: str) -> tuple[str, int] | None:
+        """
+        Check whether taking an action on a screen would close a loop.
+
+        Args:
+            fingerprint: Fingerprint of the current screen.
+            action: Key identifying the action the model returned.
+
+        Returns:
+            (kind, wasted steps) if a loop is detected, otherwise None.
+        """
+        same_screen = [
+            fingerprint_distance(entry.fingerprint, fingerprint)
+            <= self.config.max_distance
+            for entry in self._history
+        ]
+
+        repeats = 1 + sum(
+            1
+            for entry, same in zip(self._history, same_screen)
+            if same and entry.action == action
+        )
+        if repeats >= self.config.max_repeats:
+            return "cycle", repeats - 1
+
+        stall = 1
+        for same in reversed(same_screen):
+            if not same:
+                break
+            stall += 1
+        if stall >= self.config.max_stall:
+            return "stall", stall - 1
+
+        return None
+
+    def observe(
+        self, step: int, fingerprint: int, action: str, remaining_steps: int
+    ) -> LoopEvent | None:
+        """
+        Record a step and return the policy to apply if it closes a loop.
+
+        Args:
+            step: Current step number.
+            fingerprint: Fingerprint of the current screen.
+            action: Key identifying the action the model returned.
+            remaining_steps: Step budget left after this step.
+
+        Returns:
+            The LoopEvent to act on, or None.
+        """
+        detected = self.check(fingerprint, action)
+        if detected is None:
+            self._history.append(_Entry(fingerprint, action))
+            return None
+
+        kind, wasted = detected
+        policies = self.config.policies
+        policy = policies[min(self._triggers, len(policies) - 1)]
+        self._triggers += 1
+        # Start afresh so the same loop is not reported again right away
+        self._history.clear()
+
+        event = LoopEvent(
+            step=step,
+            kind=kind,
+            policy=policy,
+            action=action,
+            wasted_steps=wasted,
+            remaining_steps=remaining_steps,
+        )
+        self.events.append(event)
+        return event
+
+    @property
+    def wasted_steps(self) -> int:
+        """Total steps spent in detected loops."""
+        return sum(event.wasted_steps for event in self.events)
@@ -1,5 +1,80 @@
 """Model client module for AI inference."""
 
-from phone_agent.model.client import ModelClient, ModelConfig
+from phone_agent.model.cache import (
+    MemoryCacheBackend,
+    ResponseCache,
+    SqliteCacheBackend,
+)
+from phone_agent.model.client import AsyncModelClient, ModelClient, ModelConfig
+from phone_agent.model.fake_server import (
+    FakeModelServer,
+    FakeServerConfig,
+    FakeServerStats,
+    RuleResponder,
+    ScriptedResponder,
+)
+from phone_agent.model.hedging import HedgeConfig, HedgeStats, HedgingPolicy
+from phone_agent.model.http_pool import (
+    HttpPoolConfig,
+    PoolStats,
+    close_openai_clients,
+    get_async_openai_client,
+    get_openai_client,
+    pool_stats,
+)
+from phone_agent.model.retry import (
+    CircuitOpenError,
+    CircuitStats,
+    ModelRequestError,
+    RetryConfig,
+    RetryPolicy,
+    get_retry_policy,
+)
+from phone_agent.model.router import ModelRouter, RouterConfig, RouteStats
+from phone_agent.model.scheduler import (
+    BATCH,
+    INTERACTIVE,
+    RequestScheduler,
+    SchedulerConfig,
+    get_scheduler,
+)
+from phone_agent.model.stream_parser import StreamEvent, StreamParser
 
-__all__ = ["ModelClient", "ModelConfig"]
+__all__ = [
+    "ModelClient",
+    "AsyncModelClient",
+    "ModelConfig",
+    "StreamEvent",
+    "StreamParser",
+    "ResponseCache",
+    "MemoryCacheBackend",
+    "SqliteCacheBackend",
+    "RequestScheduler",
+    "SchedulerConfig",
+    "get_scheduler",
+    "INTERACTIVE",
+    "BATCH",
+    "HttpPoolConfig",
+    "PoolStats",
+    "get_openai_client",
+    "get_async_openai_client",
+    "pool_stats",
+    "close_openai_clients",
+    "ModelRouter",
+    "RouterConfig",
+    "RouteStats",
+    "HedgingPolicy",
+    "HedgeConfig",
+    "HedgeStats",
+    "RetryPolicy",
+    "RetryConfig",
+    "CircuitStats",
+    "ModelRequestError",
+    "CircuitOpenError",
+    "get_retry_policy",
+    "FakeModelServer",
+    "FakeServerConfig",
+    "FakeServerStats",
+    "ScriptedResponder",
+    "RuleResponder",
+]
@@ -0,0 +1,236 @@
+"""Memoization of model responses for repeated screens."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from phone_agent.model.client import ModelResponse
+
+
+class CacheBackend(Protocol):
+    """Storage for cached responses. Implementations bound their own size."""
+
+    def get(self, key: str) -> tuple[dict[str, Any], float] | None:
+        """Return (value, stored_at) and mark the entry as recently used."""
+
+    def set(self, key: str, value: dict[str, Any], stored_at: float) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+
+    def __len__(self) -> int:
+        """Number of stored entries."""
+
+
+class MemoryCacheBackend:
+    """
+    In-process LRU backend.
+
+    Args:
+        max_entries: Maximum number of entries kept.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[dict[str, Any], float] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: dict[str, Any], stored_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteCacheBackend:
+    """
+    Persistent LRU backend in a local sqlite file.
+
+    Entries survive restarts and can be shared by processes on one host.
+
+    Args:
+        path: Database file path.
+        max_entries: Maximum number of entries kept.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT, stored_at REAL, used_at REAL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> tuple[dict[str, Any], float] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET used_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: dict[str, Any], stored_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), stored_at, time.time()),
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                "ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters of a ResponseCache."""
+
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0  # Misses caused by an entry older than the TTL
+    stores: int = 0
+    size: int = 0  # Entries in the backend at the last lookup or store
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResponseCache:
+    """
+    Bounded LRU/TTL cache of model responses.
+
+    A response is reused when the agent is on the same screen (perceptual
+    fingerprint and current app), for the same task, right after the same
+    recent actions. This catches retry loops that would otherwise pay for the
+    same inference again.
+
+    Args:
+        backend: Storage backend. Defaults to an in-memory LRU.
+        ttl: Seconds an entry stays valid. None keeps entries until evicted.
+        recent_actions: Number of most recent actions included in the key.
+
+    Example:
+        >>> cache = ResponseCache(SqliteCacheBackend("responses.db"), ttl=3600)
+        >>> agent = PhoneAgent(agent_config=AgentConfig(response_cache=cache))
+        >>> cache.stats.hit_rate
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        ttl: float | None = 3600,
+        recent_actions: int = 3,
+    ):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl = ttl
+        self.recent_actions = recent_actions
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def key(
+        self, fingerprint: int, current_app: str, task: str, actions: list[str]
+    ) -> str:
+        """
+        Build the cache key for a step.
+
+        Args:
+            fingerprint: Screen fingerprint of the current frame.
+            current_app: Current app name.
+            task: Task being performed.
+            actions: Actions taken so far in the run, oldest first.
+
+        Returns:
+            Hex digest identifying the step.
+        """
+        recent = actions[-self.recent_actions :] if self.recent_actions else []
+        payload = json.dumps(
+            [fingerprint, current_app, task, recent], ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> ModelResponse | None:
+        """Return the cached response for a key, or None on a miss."""
+        entry = self.backend.get(key)
+        expired = (
+            entry is not None
+            and self.ttl is not None
+            and time.time() - entry[1] > self.ttl
+        )
+        if expired:
+            self.backend.delete(key)
+
+        with self._lock:
+            self.stats.size = len(self.backend)
+            if entry is None or expired:
+                self.stats.misses += 1
+                self.stats.expired += int(expired)
+                return None
+            self.stats.hits += 1
+
+        value = entry[0]
+        return ModelResponse(
+            thinking=value["thinking"],
+            action=value["action"],
+            raw_content=value["raw_content"],
+        )
+
+    def put(self, key: str, response: ModelResponse) -> None:
+        """Store a model response under a key."""
+        value = {
+            "thinking": response.thinking,
+            "action": response.action,
+            "raw_content": response.raw_content,
+        }
+        self.backend.set(key, value, time.time())
+        with self._lock:
+            self.stats.stores += 1
+            self.stats.size = len(self.backend)
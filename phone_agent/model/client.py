@@ -1,13 +1,38 @@
 """Model client for AI inference using OpenAI-compatible API."""
 
+import asyncio
 import json
 import time
-from dataclasses import dataclass, field
-from typing import Any
-
-from openai import OpenAI
-
-from phone_agent.config.i18n import get_message
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable
+
+from openai import NOT_GIVEN
+
+from phone_agent.events import (
+    ACTION_START,
+    MODEL_METRICS,
+    MODEL_RETRY,
+    THINKING,
+    AgentEvent,
+    ConsoleSink,
+    EventSink,
+)
+from phone_agent.model import stream_parser
+from phone_agent.model.hedging import AsyncHedgedStream, HedgedStream, HedgingPolicy
+from phone_agent.model.http_pool import (
+    HttpPoolConfig,
+    get_async_openai_client,
+    get_openai_client,
+)
+from phone_agent.model.retry import (
+    CircuitOpenError,
+    ModelRequestError,
+    RetryPolicy,
+    get_retry_policy,
+)
+from phone_agent.model.router import ModelRouter
+from phone_agent.model.scheduler import INTERACTIVE, RequestScheduler, Slot
+from phone_agent.model.stream_parser import StreamParser
 
 
 @dataclass
@@ -23,6 +48,19 @@ class ModelConfig:
     frequency_penalty: float = 0.2
     extra_body: dict[str, Any] = field(default_factory=dict)
     lang: str = "cn"  # Language for UI messages: 'cn' or 'en'
+    # Close the stream (and cancel server-side generation) once the action
+    # call is complete instead of draining trailing tokens. The usage chunk
+    # comes last, so prompt and cached tokens are then not reported and
+    # budgets fall back to the estimated prompt size.
+    stop_on_action_complete: bool = False
+    # With stop_on_action_complete, drain one stream in this many (and the
+    # first) to measure the trailing tokens that an early stop saves; 0 never
+    early_stop_sample_every: int = 20
+    # Ask for a final usage chunk (prompt, cached and completion tokens)
+    include_usage: bool = True
+    # Pool limits and timeouts of the client shared by every ModelClient of
+    # the endpoint; only the first client of an endpoint applies them
+    http_pool: HttpPoolConfig | None = None
 
 
 @dataclass
@@ -35,7 +73,34 @@ class ModelResponse:
     # Performance metrics
     time_to_first_token: float | None = None  # Time to first token (seconds)
     time_to_thinking_end: float | None = None  # Time to thinking end (seconds)
+    time_to_action: float | None = None  # Time until the action call was complete
     total_time: float | None = None  # Total inference time (seconds)
+    # Stream metrics (token counts are streamed content chunks)
+    completion_tokens: int = 0  # Tokens received
+    trailing_tokens: int = 0  # Tokens received after the action was complete
+    trailing_time: float | None = None  # Time spent receiving them (seconds)
+    stopped_early: bool = False  # Stream closed once the action was complete
+    # Projected saving of an early stop: moving average of the trailing
+    # tokens and time of sampled drained streams; None before any sample
+    tokens_saved: float | None = None
+    server_time_freed: float | None = None  # Seconds
+    # Server-reported usage, if the server sent it; None after an early stop
+    prompt_tokens: int | None = None
+    cached_tokens: int | None = None  # Prompt tokens served from the prefix cache
+    reported_completion_tokens: int | None = None
+    # Seconds spent waiting for a scheduler slot; not part of the times above
+    queue_time: float | None = None
+    endpoint: str | None = None  # Base URL that served the response
+    failovers: int = 0  # Endpoints that failed to connect before it
+    hedged: bool = False  # A duplicate request was sent after a slow start
+    retries: int = 0  # Attempts sent again after a retryable failure
+
+    @property
+    def usage_tokens(self) -> int:
+        """Completion tokens to charge: reported usage, else streamed chunks."""
+        if self.reported_completion_tokens is not None:
+            return self.reported_completion_tokens
+        return self.completion_tokens
 
 
 class ModelClient:
@@ -44,176 +109,737 @@ class ModelClient:
 
     Args:
         config: Model configuration.
+        scheduler: Optional RequestScheduler shared with other clients; each
+            request waits for a slot of the endpoint first.
+        priority: Scheduler priority class of this client's requests.
+        flow: Scheduler fairness key, e.g. the device ID.
+        event_sink: Receiver of streamed thinking and metrics events; by
+            default they are printed to the console.
+        router: Optional ModelRouter shared with other clients. Requests then
+            go to the endpoint pinned for the current run instead of
+            config.base_url; call new_run() when a run starts.
+        hedging: Optional HedgingPolicy shared with other clients. A request
+            without a first chunk after the policy's delay is then duplicated
+            to another endpoint (the same one without a router), and the
+            slower copy is cancelled.
+        retry_policy: RetryPolicy for retryable failures and circuit
+            breaking; by default the process-wide one.
     """
 
-    def __init__(self, config: ModelConfig | None = None):
+    def __init__(
+        self,
+        config: ModelConfig | None = None,
+        scheduler: RequestScheduler | None = None,
+        priority: int = INTERACTIVE,
+        flow: str = "default",
+        event_sink: EventSink | None = None,
+        router: ModelRouter | None = None,
+        hedging: HedgingPolicy | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ):
         self.config = config or ModelConfig()
-        self.client = OpenAI(base_url=self.config.base_url, api_key=self.config.api_key)
-
-    def request(self, messages: list[dict[str, Any]]) -> ModelResponse:
+        self.client = get_openai_client(
+            self.config.base_url, self.config.api_key, self.config.http_pool
+        )
+        self.scheduler = scheduler
+        self.priority = priority
+        self.flow = flow
+        self.event_sink = event_sink or ConsoleSink(self.config.lang)
+        self.router = router
+        self.hedging = hedging
+        self.retry_policy = retry_policy or get_retry_policy()
+        self._pin = _EndpointPin(self.config.base_url, router)
+        self._trailing = _TrailingEstimate(self.config.early_stop_sample_every)
+
+    def new_run(self) -> None:
+        """Release the endpoint of the previous run; the next request routes."""
+        self._pin.release()
+
+    def request(
+        self,
+        messages: list[dict[str, Any]],
+        on_action: Callable[[str], None] | None = None,
+        max_tokens: int | None = None,
+    ) -> ModelResponse:
         """
         Send a request to the model.
 
         Args:
             messages: List of message dictionaries in OpenAI format.
+            on_action: Optional callback invoked with the action text as soon
+                as a complete ``do(...)``/``finish(...)`` call has streamed in,
+                before the stream is drained. Called at most once.
+            max_tokens: Optional completion limit for this request, overriding
+                the configured max_tokens.
 
         Returns:
             ModelResponse containing thinking and action.
 
+        Failed attempts are retried as the retry policy allows, as long as
+        the action has not streamed in completely. A stream that breaks after
+        it has keeps the response read so far. With a router, a run moves to
+        another endpoint instead of waiting for a failing one.
+
         Raises:
-            ValueError: If the response cannot be parsed.
+            ModelRequestError: If retryable failures outlasted the retries.
+            openai.APIStatusError: If the endpoint rejected the request (4xx).
         """
-        # Start timing
-        start_time = time.time()
-        time_to_first_token = None
-        time_to_thinking_end = None
-
-        stream = self.client.chat.completions.create(
-            messages=messages,
-            model=self.config.model_name,
-            max_tokens=self.config.max_tokens,
-            temperature=self.config.temperature,
-            top_p=self.config.top_p,
-            frequency_penalty=self.config.frequency_penalty,
-            extra_body=self.config.extra_body,
-            stream=True,
+        if max_tokens is None:
+            max_tokens = self.config.max_tokens
+
+        retries = failovers = 0
+        stop_early = self.config.stop_on_action_complete and not self._trailing.sample()
+        while True:
+            endpoint = self._pin.current()
+            reader = _StreamReader(
+                self.config,
+                on_action,
+                self.event_sink,
+                self.flow,
+                stop_early,
+                self._trailing,
+            )
+            try:
+                self.retry_policy.admit(endpoint)
+                self._stream(endpoint, reader, messages, max_tokens)
+            except Exception as e:
+                outcome, delay = _after_failure(
+                    self._pin,
+                    self.retry_policy,
+                    endpoint,
+                    reader,
+                    e,
+                    retries,
+                    failovers,
+                )
+                if outcome == _KEEP:
+                    return reader.finish(failovers, retries)
+                if outcome == _FAILOVER:
+                    failovers += 1
+                else:
+                    retries += 1
+                    time.sleep(delay)
+                continue
+            self.retry_policy.record_success(reader.endpoint)
+            return reader.finish(failovers, retries)
+
+    def _stream(
+        self,
+        endpoint: str,
+        reader: "_StreamReader",
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+    ) -> None:
+        """Stream one completion from an endpoint into the reader."""
+        slot = None
+        if self.scheduler is not None:
+            slot = self.scheduler.acquire(endpoint, self.priority, self.flow)
+
+        reader.start(endpoint, slot)
+        self._pin.begin(endpoint)
+        stream = None
+        hedge = _HedgeAccount(self._pin, self.scheduler)
+        try:
+            args = _completion_args(self.config, messages, max_tokens)
+            if self.hedging is None:
+                stream = self._openai_client(endpoint).chat.completions.create(**args)
+            else:
+
+                def open_hedge() -> Any:
+                    # Runs on the duplicate's own thread
+                    hedge_endpoint = self._pin.alternative(endpoint)
+                    self.retry_policy.admit(hedge_endpoint)
+                    hedge_slot = None
+                    if self.scheduler is not None:
+                        hedge_slot = self.scheduler.acquire(
+                            hedge_endpoint, self.priority, self.flow
+                        )
+                    hedge.begin(hedge_endpoint, hedge_slot)
+                    client = self._openai_client(hedge_endpoint)
+                    return client.chat.completions.create(**args)
+
+                stream = HedgedStream(
+                    self.hedging,
+                    lambda: self._openai_client(endpoint).chat.completions.create(
+                        **args
+                    ),
+                    open_hedge,
+                    hedge.end,
+                )
+
+            for chunk in stream:
+                if reader.feed(chunk):
+                    break
+            reader.hedged = getattr(stream, "hedged", False)
+            reader.drained = not reader.stopped_early
+        finally:
+            if stream is not None:
+                # After an early stop or an error, dropping the connection
+                # aborts the request, and any hedged copy, on the server
+                stream.close()
+            ttft = reader.time_to_first_token
+            if getattr(stream, "hedge_won", False):
+                # The response came from the duplicate's endpoint
+                reader.endpoint = hedge.endpoint
+                ttft = None
+            self._pin.end(endpoint, ttft)
+            if slot is not None:
+                self.scheduler.release(slot, ttft)
+
+    def _openai_client(self, endpoint: str) -> Any:
+        """The OpenAI client of an endpoint."""
+        if self.router is None:
+            return self.client
+        return get_openai_client(endpoint, self.config.api_key, self.config.http_pool)
+
+
+class AsyncModelClient:
+    """
+    Asyncio client for OpenAI-compatible vision-language models.
+
+    Same request semantics, metrics and ModelResponse as ModelClient, on
+    openai.AsyncOpenAI so many agents can share one event loop.
+
+    Args:
+        config: Model configuration.
+        scheduler: Optional RequestScheduler shared with other clients.
+        priority: Scheduler priority class of this client's requests.
+        flow: Scheduler fairness key, e.g. the device ID.
+        event_sink: Receiver of streamed thinking and metrics events; by
+            default they are printed to the console.
+        router: Optional ModelRouter pinning each run to an endpoint.
+        hedging: Optional HedgingPolicy duplicating requests slow to start.
+        retry_policy: RetryPolicy; by default the process-wide one.
+    """
+
+    def __init__(
+        self,
+        config: ModelConfig | None = None,
+        scheduler: RequestScheduler | None = None,
+        priority: int = INTERACTIVE,
+        flow: str = "default",
+        event_sink: EventSink | None = None,
+        router: ModelRouter | None = None,
+        hedging: HedgingPolicy | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ):
+        self.config = config or ModelConfig()
+        self.client = get_async_openai_client(
+            self.config.base_url, self.config.api_key, self.config.http_pool
         )
+        self.scheduler = scheduler
+        self.priority = priority
+        self.flow = flow
+        self.event_sink = event_sink or ConsoleSink(self.config.lang)
+        self.router = router
+        self.hedging = hedging
+        self.retry_policy = retry_policy or get_retry_policy()
+        self._pin = _EndpointPin(self.config.base_url, router)
+        self._trailing = _TrailingEstimate(self.config.early_stop_sample_every)
+
+    def new_run(self) -> None:
+        """Release the endpoint of the previous run; the next request routes."""
+        self._pin.release()
+
+    async def request(
+        self,
+        messages: list[dict[str, Any]],
+        on_action: Callable[[str], None] | None = None,
+        max_tokens: int | None = None,
+    ) -> ModelResponse:
+        """
+        Send a request to the model.
 
-        raw_content = ""
-        buffer = ""  # Buffer to hold content that might be part of a marker
-        action_markers = ["finish(message=", "do(action="]
-        in_action_phase = False  # Track if we've entered the action phase
-        first_token_received = False
+        Args:
+            messages: List of message dictionaries in OpenAI format.
+            on_action: Optional callback invoked with the action text as soon
+                as a complete action call has streamed in. Called at most once.
+            max_tokens: Optional completion limit for this request, overriding
+                the configured max_tokens.
 
-        for chunk in stream:
-            if len(chunk.choices) == 0:
+        Returns:
+            ModelResponse containing thinking and action.
+        """
+        if max_tokens is None:
+            max_tokens = self.config.max_tokens
+
+        retries = failovers = 0
+        stop_early = self.config.stop_on_action_complete and not self._trailing.sample()
+        while True:
+            endpoint = self._pin.current()
+            reader = _StreamReader(
+                self.config,
+                on_action,
+                self.event_sink,
+                self.flow,
+                stop_early,
+                self._trailing,
+            )
+            try:
+                self.retry_policy.admit(endpoint)
+                await self._stream(endpoint, reader, messages, max_tokens)
+            except Exception as e:
+                outcome, delay = _after_failure(
+                    self._pin,
+                    self.retry_policy,
+                    endpoint,
+                    reader,
+                    e,
+                    retries,
+                    failovers,
+                )
+                if outcome == _KEEP:
+                    return reader.finish(failovers, retries)
+                if outcome == _FAILOVER:
+                    failovers += 1
+                else:
+                    retries += 1
+                    await asyncio.sleep(delay)
                 continue
-            if chunk.choices[0].delta.content is not None:
-                content = chunk.choices[0].delta.content
-                raw_content += content
-
-                # Record time to first token
-                if not first_token_received:
-                    time_to_first_token = time.time() - start_time
-                    first_token_received = True
-
-                if in_action_phase:
-                    # Already in action phase, just accumulate content without printing
-                    continue
-
-                buffer += content
-
-                # Check if any marker is fully present in buffer
-                marker_found = False
-                for marker in action_markers:
-                    if marker in buffer:
-                        # Marker found, print everything before it
-                        thinking_part = buffer.split(marker, 1)[0]
-                        print(thinking_part, end="", flush=True)
-                        print()  # Print newline after thinking is complete
-                        in_action_phase = True
-                        marker_found = True
-
-                        # Record time to thinking end
-                        if time_to_thinking_end is None:
-                            time_to_thinking_end = time.time() - start_time
-
-                        break
-
-                if marker_found:
-                    continue  # Continue to collect remaining content
-
-                # Check if buffer ends with a prefix of any marker
-                # If so, don't print yet (wait for more content)
-                is_potential_marker = False
-                for marker in action_markers:
-                    for i in range(1, len(marker)):
-                        if buffer.endswith(marker[:i]):
-                            is_potential_marker = True
-                            break
-                    if is_potential_marker:
-                        break
-
-                if not is_potential_marker:
-                    # Safe to print the buffer
-                    print(buffer, end="", flush=True)
-                    buffer = ""
-
-        # Calculate total time
-        total_time = time.time() - start_time
-
-        # Parse thinking and action from response
-        thinking, action = self._parse_response(raw_content)
-
-        # Print performance metrics
-        lang = self.config.lang
-        print()
-        print("=" * 50)
-        print(f"⏱️  {get_message('performance_metrics', lang)}:")
-        print("-" * 50)
-        if time_to_first_token is not None:
-            print(
-                f"{get_message('time_to_first_token', lang)}: {time_to_first_token:.3f}s"
+            self.retry_policy.record_success(reader.endpoint)
+            return reader.finish(failovers, retries)
+
+    async def _stream(
+        self,
+        endpoint: str,
+        reader: "_StreamReader",
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+    ) -> None:
+        """Stream one completion from an endpoint into the reader."""
+        slot = None
+        if self.scheduler is not None:
+            slot = await self.scheduler.acquire_async(
+                endpoint, self.priority, self.flow
             )
-        if time_to_thinking_end is not None:
-            print(
-                f"{get_message('time_to_thinking_end', lang)}:        {time_to_thinking_end:.3f}s"
+
+        reader.start(endpoint, slot)
+        self._pin.begin(endpoint)
+        stream = None
+        hedge = _HedgeAccount(self._pin, self.scheduler)
+        try:
+            args = _completion_args(self.config, messages, max_tokens)
+            if self.hedging is None:
+                client = self._openai_client(endpoint)
+                stream = await client.chat.completions.create(**args)
+            else:
+
+                async def open_hedge() -> Any:
+                    hedge_endpoint = self._pin.alternative(endpoint)
+                    self.retry_policy.admit(hedge_endpoint)
+                    hedge_slot = None
+                    if self.scheduler is not None:
+                        hedge_slot = await self.scheduler.acquire_async(
+                            hedge_endpoint, self.priority, self.flow
+                        )
+                    hedge.begin(hedge_endpoint, hedge_slot)
+                    client = self._openai_client(hedge_endpoint)
+                    return await client.chat.completions.create(**args)
+
+                stream = AsyncHedgedStream(
+                    self.hedging,
+                    lambda: self._openai_client(endpoint).chat.completions.create(
+                        **args
+                    ),
+                    open_hedge,
+                    hedge.end,
+                )
+
+            async for chunk in stream:
+                if reader.feed(chunk):
+                    break
+            reader.hedged = getattr(stream, "hedged", False)
+            reader.drained = not reader.stopped_early
+        finally:
+            if stream is not None:
+                await stream.close()
+            ttft = reader.time_to_first_token
+            if getattr(stream, "hedge_won", False):
+                # The response came from the duplicate's endpoint
+                reader.endpoint = hedge.endpoint
+                ttft = None
+            self._pin.end(endpoint, ttft)
+            if slot is not None:
+                self.scheduler.release(slot, ttft)
+
+    def _openai_client(self, endpoint: str) -> Any:
+        """The AsyncOpenAI client of an endpoint."""
+        if self.router is None:
+            return self.client
+        return get_async_openai_client(
+            endpoint, self.config.api_key, self.config.http_pool
+        )
+
+
+class _EndpointPin:
+    """
+    Endpoint of a client's current run.
+
+    Without a router it is always the configured base URL. With one, the run
+    is pinned on its first request and moved when its endpoint fails.
+    """
+
+    def __init__(self, base_url: str, router: ModelRouter | None):
+        self.base_url = base_url
+        self.router = router
+        self.endpoint: str | None = None
+
+    def current(self) -> str:
+        if self.router is None:
+            return self.base_url
+        if self.endpoint is None:
+            self.endpoint = self.router.pin()
+        return self.endpoint
+
+    def release(self) -> None:
+        if self.endpoint is not None:
+            self.router.unpin(self.endpoint)
+            self.endpoint = None
+
+    def alternative(self, endpoint: str) -> str:
+        if self.router is None:
+            return endpoint
+        return self.router.alternative(endpoint)
+
+    def begin(self, endpoint: str) -> None:
+        if self.router is not None:
+            self.router.begin(endpoint)
+
+    def end(self, endpoint: str, ttft: float | None) -> None:
+        if self.router is not None:
+            self.router.end(endpoint, ttft)
+
+    def fail_over(self, endpoint: str, failovers: int) -> bool:
+        """
+        Move the run off an endpoint that failed.
+
+        Args:
+            endpoint: The endpoint that failed.
+            failovers: Failovers of the request so far.
+
+        Returns:
+            True if the run moved to another endpoint.
+        """
+        router = self.router
+        if router is None or failovers >= router.config.max_failovers:
+            return False
+        router.fail(endpoint)
+        self.endpoint = router.pin(previous=endpoint, exclude=(endpoint,))
+        return self.endpoint != endpoint  # Unless every other one is down
+
+
+class _TrailingEstimate:
+    """
+    Moving average of the tokens and time a stream runs on after its action.
+
+    An early-stopped stream never shows what the server would still have
+    generated, so the saving is projected from drained streams: all of them
+    without early stop, and one in sample_every with it.
+    """
+
+    ALPHA = 0.3  # Weight of the newest sample
+
+    def __init__(self, sample_every: int):
+        self.sample_every = sample_every
+        self.requests = 0
+        self.tokens: float | None = None
+        self.time: float | None = None
+
+    def sample(self) -> bool:
+        """Whether the next early-stop request should drain its stream."""
+        self.requests += 1
+        if self.sample_every <= 0:
+            return False
+        return self.tokens is None or self.requests % self.sample_every == 0
+
+    def update(self, tokens: int, seconds: float) -> None:
+        """Add the trailing tokens and time of a drained stream."""
+        if self.tokens is None:
+            self.tokens, self.time = float(tokens), seconds
+            return
+        self.tokens = self.ALPHA * tokens + (1 - self.ALPHA) * self.tokens
+        self.time = self.ALPHA * seconds + (1 - self.ALPHA) * self.time
+
+
+class _HedgeAccount:
+    """
+    Router and scheduler accounting of the duplicate of a hedged request.
+
+    The duplicate counts as in flight on the endpoint it went to, holds a
+    scheduler slot there, and is credited with its own time to first token.
+    """
+
+    def __init__(self, pin: _EndpointPin, scheduler: RequestScheduler | None):
+        self.pin = pin
+        self.scheduler = scheduler
+        self.endpoint: str | None = None
+        self.slot: Slot | None = None
+
+    def begin(self, endpoint: str, slot: Slot | None) -> None:
+        """Count the duplicate as in flight once it is about to be sent."""
+        self.endpoint = endpoint
+        self.slot = slot
+        self.pin.begin(endpoint)
+
+    def end(self, ttft: float | None) -> None:
+        """Count the duplicate as done, won or lost."""
+        if self.endpoint is None:
+            return  # Never sent
+        self.pin.end(self.endpoint, ttft)
+        if self.slot is not None:
+            self.scheduler.release(self.slot, ttft)
+
+
+# How a request goes on after a failed attempt
+_KEEP = "keep"  # Return the response read so far
+_FAILOVER = "failover"  # Send it again at once, to the run's new endpoint
+_RETRY = "retry"  # Send it again after a backoff
+
+
+def _after_failure(
+    pin: _EndpointPin,
+    policy: RetryPolicy,
+    endpoint: str,
+    reader: "_StreamReader",
+    error: Exception,
+    retries: int,
+    failovers: int,
+) -> tuple[str, float]:
+    """
+    Decide how a request goes on after a failed attempt.
+
+    Returns:
+        The outcome and the backoff in seconds before a retry.
+
+    Raises:
+        The error itself if it is fatal, or ModelRequestError once the
+        retries are used up.
+    """
+    if not policy.record_error(endpoint, error):
+        raise error
+    if reader.time_to_action is not None:
+        # Only the tail after the action is lost; sending the request again
+        # could also dispatch the action twice
+        return _KEEP, 0.0
+    if pin.fail_over(endpoint, failovers):
+        reader.retrying(error, endpoint, pin.current(), failovers + 1, 0.0)
+        return _FAILOVER, 0.0
+    if retries >= policy.config.max_retries or isinstance(error, CircuitOpenError):
+        # An open circuit fails fast: it stays open longer than a backoff
+        raise ModelRequestError(endpoint, retries, str(error)) from error
+    delay = policy.backoff(endpoint, retries + 1)
+    reader.retrying(error, endpoint, endpoint, retries + 1, delay)
+    return _RETRY, delay
+
+
+def _completion_args(
+    config: ModelConfig, messages: list[dict[str, Any]], max_tokens: int
+) -> dict[str, Any]:
+    """Arguments of a streamed chat completion request."""
+    stream_options = NOT_GIVEN
+    if config.include_usage:
+        stream_options = {"include_usage": True}
+
+    return {
+        "messages": messages,
+        "model": config.model_name,
+        "max_tokens": max_tokens,
+        "temperature": config.temperature,
+        "top_p": config.top_p,
+        "frequency_penalty": config.frequency_penalty,
+        "extra_body": config.extra_body,
+        "stream": True,
+        "stream_options": stream_options,
+    }
+
+
+class _StreamReader:
+    """
+    Consumes streamed completion chunks and builds the ModelResponse.
+
+    Shared by the sync and async clients, which only differ in how they
+    iterate and close the stream.
+    """
+
+    def __init__(
+        self,
+        config: ModelConfig,
+        on_action: Callable[[str], None] | None,
+        event_sink: EventSink | None = None,
+        source: str | None = None,
+        stop_early: bool = False,
+        trailing: _TrailingEstimate | None = None,
+    ):
+        self.config = config
+        self.stop_early = stop_early
+        self.trailing = trailing
+        self.event_sink = event_sink
+        self.source = source
+        # Stream events are only built for a sink that wants them
+        self.emit_events = event_sink is not None and event_sink.enabled
+        self.on_action = on_action
+        self.endpoint: str | None = None
+        self.queue_time: float | None = None
+        self.hedged = False
+        self.parser = StreamParser()
+        self.start_time = time.time()
+        self.time_to_first_token: float | None = None
+        self.time_to_thinking_end: float | None = None
+        self.time_to_action: float | None = None
+        self.completion_tokens = 0
+        self.trailing_tokens = 0
+        self.stopped_early = False
+        self.drained = False  # Read to its end without an error
+        self.usage = None
+
+    def start(self, endpoint: str, slot: Slot | None = None) -> None:
+        """Start the clock once the request is about to be sent."""
+        self.endpoint = endpoint
+        self.queue_time = slot.queue_time if slot is not None else None
+        self.start_time = time.time()
+
+    def feed(self, chunk: Any) -> bool:
+        """
+        Process one chunk.
+
+        Returns:
+            True if the caller should stop reading and close the stream.
+        """
+        if getattr(chunk, "usage", None) is not None:
+            self.usage = chunk.usage
+        if len(chunk.choices) == 0:
+            return False
+        content = chunk.choices[0].delta.content
+        if content is None:
+            return False
+
+        self.completion_tokens += 1
+
+        # Record time to first token
+        if self.time_to_first_token is None:
+            self.time_to_first_token = time.time() - self.start_time
+
+        if self.time_to_action is not None:
+            self.trailing_tokens += 1
+
+        for event in self.parser.feed(content):
+            if event.type == stream_parser.THINKING:
+                if self.emit_events:
+                    self._emit(THINKING, {"text": event.text})
+            elif event.type == stream_parser.ACTION_START:
+                if self.emit_events:
+                    self._emit(ACTION_START, {})
+                self.time_to_thinking_end = time.time() - self.start_time
+            elif event.type == stream_parser.ACTION_COMPLETE:
+                self.time_to_action = time.time() - self.start_time
+                if self.on_action is not None:
+                    self.on_action(event.text)
+
+        if self.time_to_action is not None and self.stop_early:
+            self.stopped_early = True
+            return True
+        return False
+
+    def retrying(
+        self,
+        error: Exception,
+        failed_endpoint: str,
+        endpoint: str,
+        attempt: int,
+        delay: float,
+    ) -> None:
+        """Emit a MODEL_RETRY event for a failed attempt."""
+        if self.emit_events:
+            self._emit(
+                MODEL_RETRY,
+                {
+                    "error": str(error),
+                    "failed_endpoint": failed_endpoint,
+                    "endpoint": endpoint,
+                    "attempt": attempt,
+                    "delay": delay,
+                },
             )
-        print(
-            f"{get_message('total_inference_time', lang)}:          {total_time:.3f}s"
+
+    def finish(self, failovers: int = 0, retries: int = 0) -> ModelResponse:
+        """Flush the parser, emit performance metrics and build the response."""
+        for event in self.parser.close():
+            if self.emit_events:
+                self._emit(THINKING, {"text": event.text})
+
+        # Calculate total time
+        total_time = time.time() - self.start_time
+        time_to_first_token = self.time_to_first_token
+        time_to_thinking_end = self.time_to_thinking_end
+        completion_tokens = self.completion_tokens
+        trailing_tokens = self.trailing_tokens
+        stopped_early = self.stopped_early
+
+        trailing_time = None
+        tokens_saved = None
+        server_time_freed = None
+        trailing = self.trailing
+        if not stopped_early and self.time_to_action is not None:
+            trailing_time = total_time - self.time_to_action
+            if trailing is not None and self.drained:
+                # Only a stream read to its end shows the whole tail
+                trailing.update(trailing_tokens, trailing_time)
+        elif stopped_early and trailing is not None:
+            tokens_saved, server_time_freed = trailing.tokens, trailing.time
+
+        thinking, action = self.parser.result()
+        prompt_tokens, cached_tokens, reported_completion_tokens = _read_usage(
+            self.usage
         )
-        print("=" * 50)
 
-        return ModelResponse(
+        response = ModelResponse(
             thinking=thinking,
             action=action,
-            raw_content=raw_content,
+            raw_content=self.parser.raw,
             time_to_first_token=time_to_first_token,
             time_to_thinking_end=time_to_thinking_end,
+            time_to_action=self.time_to_action,
             total_time=total_time,
+            completion_tokens=completion_tokens,
+            trailing_tokens=trailing_tokens,
+            trailing_time=trailing_time,
+            stopped_early=stopped_early,
+            tokens_saved=tokens_saved,
+            server_time_freed=server_time_freed,
+            prompt_tokens=prompt_tokens,
+            cached_tokens=cached_tokens,
+            reported_completion_tokens=reported_completion_tokens,
+            queue_time=self.queue_time,
+            endpoint=self.endpoint,
+            failovers=failovers,
+            hedged=self.hedged,
+            retries=retries,
         )
+        if self.emit_events:
+            metrics = asdict(response)
+            for text_field in ("thinking", "action", "raw_content"):
+                del metrics[text_field]
+            self._emit(MODEL_METRICS, metrics)
+        return response
 
-    def _parse_response(self, content: str) -> tuple[str, str]:
-        """
-        Parse the model response into thinking and action parts.
+    def _emit(self, event_type: str, data: dict[str, Any]) -> None:
+        self.event_sink.emit(AgentEvent(event_type, data, source=self.source))
 
-        Parsing rules:
-        1. If content contains 'finish(message=', everything before is thinking,
-           everything from 'finish(message=' onwards is action.
-        2. If rule 1 doesn't apply but content contains 'do(action=',
-           everything before is thinking, everything from 'do(action=' onwards is action.
-        3. Fallback: If content contains '<answer>', use legacy parsing with XML tags.
-        4. Otherwise, return empty thinking and full content as action.
 
-        Args:
-            content: Raw response content.
+def _read_usage(usage: Any) -> tuple[int | None, int | None, int | None]:
+    """
+    Extract prompt, cached prompt and completion tokens from a usage object.
 
-        Returns:
-            Tuple of (thinking, action).
-        """
-        # Rule 1: Check for finish(message=
-        if "finish(message=" in content:
-            parts = content.split("finish(message=", 1)
-            thinking = parts[0].strip()
-            action = "finish(message=" + parts[1]
-            return thinking, action
-
-        # Rule 2: Check for do(action=
-        if "do(action=" in content:
-            parts = content.split("do(action=", 1)
-            thinking = parts[0].strip()
-            action = "do(action=" + parts[1]
-            return thinking, action
-
-        # Rule 3: Fallback to legacy XML tag parsing
-        if "<answer>" in content:
-            parts = content.split("<answer>", 1)
-            thinking = parts[0].replace("<think>", "").replace("</think>", "").strip()
-            action = parts[1].replace("</answer>", "").strip()
-            return thinking, action
-
-        # Rule 4: No markers found, return content as action
-        return "", content
+    Returns:
+        Tuple of (prompt_tokens, cached_tokens, completion_tokens); None where
+        not reported.
+    """
+    if usage is None:
+        return None, None, None
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    return usage.prompt_tokens, cached_tokens, completion_tokens
 
 
 class MessageBuilder:
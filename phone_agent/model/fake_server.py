@@ -0,0 +1,536 @@
+"""Synthetic OpenAI-compatible model server for offline load and latency tests."""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+DEFAULT_THINKING = "The screen shows what I need, so I continue with the task."
+IMAGE_TOKENS = 1000  # Prompt tokens counted per image
+
+# Token-sized pieces of a response: words with their trailing space, and
+# punctuation on its own so actions stream in several chunks
+_TOKEN = re.compile(r"\w+\s*|[^\w\s]+\s*|\s+")
+
+
+@dataclass
+class FakeServerConfig:
+    """
+    Configuration for FakeModelServer.
+
+    The time to first token of a request is log-normal around ttft, except
+    for a tail_share of requests that stall for a time drawn uniformly from
+    tail_ttft. Prefill time grows with the prompt, and tokens then stream at
+    tokens_per_second. Every draw comes from a generator seeded by seed and
+    the request body, so a run replays the same latencies whatever the
+    interleaving of concurrent requests.
+    """
+
+    host: str = "127.0.0.1"
+    port: int = 8000  # 0 picks a free port
+    model: str = "autoglm-phone-9b"
+    seed: int = 0
+    ttft: float = 0.3  # Median time to first token (seconds)
+    ttft_sigma: float = 0.25  # Spread of the log-normal TTFT; 0 is constant
+    tail_share: float = 0.01  # Share of requests with a stalled first token
+    tail_ttft: tuple[float, float] = (1.0, 3.0)  # Range of stalled TTFTs
+    prefill_per_token: float = 0.0  # Extra seconds of TTFT per prompt token
+    tokens_per_second: float = 50.0  # Decode rate; 0 streams at once
+    max_concurrency: int = 0  # Requests served at once; 0 is unlimited
+    thinking: str = DEFAULT_THINKING  # Text streamed before every action
+
+
+@dataclass
+class FakeServerStats:
+    """Counters of a FakeModelServer."""
+
+    requests: int  # Chat completion requests received
+    completed: int  # Responses sent in full
+    cancelled: int  # Streams the client closed early
+    completion_tokens: int  # Tokens sent, including those of cancelled streams
+    in_flight: int
+    peak_in_flight: int
+
+
+class ScriptedResponder:
+    """
+    Answers step n of a run with the n-th action of a script.
+
+    The step is the number of assistant messages in the request. Once the
+    script runs out its last action is repeated.
+
+    Args:
+        actions: Actions in the do(...)/finish(...) grammar.
+
+    Example:
+        >>> ScriptedResponder([
+        ...     'do(action="Launch", app="Settings")',
+        ...     'finish(message="Done")',
+        ... ])
+    """
+
+    def __init__(self, actions: list[str]):
+        if not actions:
+            raise ValueError("No actions to script")
+        self.actions = actions
+
+    def __call__(self, messages: list[dict[str, Any]]) -> str:
+        step = sum(message.get("role") == "assistant" for message in messages)
+        return self.actions[min(step, len(self.actions) - 1)]
+
+
+class RuleResponder:
+    """
+    Answers with the action of the first rule matching the latest user text.
+
+    That text holds the task on the first step and the screen info, such as
+    the current app, on every step.
+
+    Args:
+        rules: (regular expression, action) pairs, tried in order.
+        default: Action when no rule matches.
+        max_steps: Step from which the run is finished whatever the rules.
+
+    Example:
+        >>> RuleResponder(
+        ...     [(r'"current_app": "Settings"', 'finish(message="Opened")')],
+        ...     default='do(action="Launch", app="Settings")',
+        ... )
+    """
+
+    def __init__(
+        self,
+        rules: list[tuple[str, str]],
+        default: str = 'do(action="Back")',
+        max_steps: int | None = None,
+    ):
+        self.rules = [(re.compile(pattern), action) for pattern, action in rules]
+        self.default = default
+        self.max_steps = max_steps
+
+    def __call__(self, messages: list[dict[str, Any]]) -> str:
+        step = sum(message.get("role") == "assistant" for message in messages)
+        if self.max_steps is not None and step + 1 >= self.max_steps:
+            return 'finish(message="Step limit reached")'
+        text = next(
+            (_text_of(m) for m in reversed(messages) if m.get("role") == "user"),
+            "",
+        )
+        for pattern, action in self.rules:
+            if pattern.search(text):
+                return action
+        return self.default
+
+
+def tap_then_finish(steps: int = 5) -> ScriptedResponder:
+    """Responder tapping the screen center, finishing on the given step."""
+    tap = 'do(action="Tap", element=[500, 500])'
+    return ScriptedResponder([tap] * (steps - 1) + ['finish(message="Done")'])
+
+
+class FakeModelServer:
+    """
+    Streams scripted agent responses with realistic, reproducible latencies.
+
+    Serves streaming and non-streaming /v1/chat/completions and /v1/models
+    on CPU, so ModelClient, PhoneAgent and fleet runs can be load tested
+    without a GPU model server. Responses are the config's thinking followed
+    by the responder's action; max_tokens truncates them and usage is sent
+    when the stream options ask for it. With max_concurrency set, requests
+    beyond it wait for a slot, as on a saturated server.
+
+    Args:
+        config: Latency and serving configuration.
+        responder: Callable returning the action for a request's messages;
+            tap_then_finish() by default.
+
+    Example:
+        >>> server = FakeModelServer(FakeServerConfig(port=0, ttft=0.2))
+        >>> server.start()
+        >>> agent = PhoneAgent(ModelConfig(base_url=server.base_url))
+        >>> server.shutdown()
+    """
+
+    def __init__(
+        self,
+        config: FakeServerConfig | None = None,
+        responder: Callable[[list[dict[str, Any]]], str] | None = None,
+    ):
+        self.config = config or FakeServerConfig()
+        self.responder = responder or tap_then_finish()
+        self._slots = (
+            threading.Semaphore(self.config.max_concurrency)
+            if self.config.max_concurrency
+            else None
+        )
+        self._seen: dict[str, int] = {}  # Times each request body was received
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._completed = 0
+        self._cancelled = 0
+        self._completion_tokens = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._httpd: ThreadingHTTPServer | None = None
+
+    def start(self) -> None:
+        """Bind and serve on a background thread."""
+        self._bind()
+        threading.Thread(
+            target=self._httpd.serve_forever, name="fake-model-server", daemon=True
+        ).start()
+
+    def serve_forever(self) -> None:
+        """Bind and serve until shutdown()."""
+        self._bind()
+        self._httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+    @property
+    def server_address(self) -> tuple[str, int] | None:
+        """Bound (host, port), e.g. when serving on port 0."""
+        return self._httpd.server_address if self._httpd is not None else None
+
+    @property
+    def base_url(self) -> str:
+        """OpenAI base URL of the server, for ModelConfig.base_url."""
+        host, port = self.server_address or (self.config.host, self.config.port)
+        return f"http://{host}:{port}/v1"
+
+    def stats(self) -> FakeServerStats:
+        with self._lock:
+            return FakeServerStats(
+                requests=self._requests,
+                completed=self._completed,
+                cancelled=self._cancelled,
+                completion_tokens=self._completion_tokens,
+                in_flight=self._in_flight,
+                peak_in_flight=self._peak_in_flight,
+            )
+
+    def _bind(self) -> None:
+        self._httpd = ThreadingHTTPServer(
+            (self.config.host, self.config.port), _make_handler(self)
+        )
+        self._httpd.daemon_threads = True
+
+    def _rng(self, raw_body: bytes) -> random.Random:
+        """Generator of a request, seeded by the body and its repeat count."""
+        digest = hashlib.sha256(raw_body).hexdigest()
+        with self._lock:
+            self._requests += 1
+            repeat = self._seen.get(digest, 0)
+            self._seen[digest] = repeat + 1
+        # A retried or hedged copy of a request draws new latencies
+        return random.Random(f"{self.config.seed}:{digest}:{repeat}")
+
+    def _ttft(self, rng: random.Random, prompt_tokens: int) -> float:
+        config = self.config
+        if rng.random() < config.tail_share:
+            ttft = rng.uniform(*config.tail_ttft)
+        elif config.ttft_sigma > 0:
+            ttft = rng.lognormvariate(math.log(config.ttft), config.ttft_sigma)
+        else:
+            ttft = config.ttft
+        return ttft + prompt_tokens * config.prefill_per_token
+
+    def _acquire(self) -> None:
+        if self._slots is not None:
+            self._slots.acquire()
+        with self._lock:
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+    def _release(self, tokens: int, cancelled: bool) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completion_tokens += tokens
+            if cancelled:
+                self._cancelled += 1
+            else:
+                self._completed += 1
+        if self._slots is not None:
+            self._slots.release()
+
+
+def _text_of(message: dict[str, Any]) -> str:
+    """Text parts of a message, whose content may be a string or a list."""
+    content = message.get("content") or ""
+    if isinstance(content, str):
+        return content
+    return "\n".join(
+        part.get("text", "") for part in content if part.get("type") == "text"
+    )
+
+
+def _prompt_tokens(messages: list[dict[str, Any]]) -> int:
+    """Rough prompt size: four characters per token plus a fixed cost per image."""
+    tokens = 0
+    for message in messages:
+        tokens += len(_text_of(message)) // 4
+        content = message.get("content")
+        if isinstance(content, list):
+            images = sum(part.get("type") == "image_url" for part in content)
+            tokens += images * IMAGE_TOKENS
+    return tokens
+
+
+def _make_handler(server: FakeModelServer) -> type[BaseHTTPRequestHandler]:
+    """Build the request handler class bound to a fake server."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0].rstrip("/") != "/v1/models":
+                return self._json(404, {"error": {"message": "Not found"}})
+            model = {
+                "id": server.config.model,
+                "object": "model",
+                "created": 0,
+                "owned_by": "phone-agent",
+            }
+            self._json(200, {"object": "list", "data": [model]})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw_body = self.rfile.read(length)
+            if self.path.split("?")[0].rstrip("/") != "/v1/chat/completions":
+                return self._json(404, {"error": {"message": "Not found"}})
+            try:
+                body = json.loads(raw_body)
+                messages = body["messages"]
+            except (ValueError, KeyError, TypeError):
+                return self._json(400, {"error": {"message": "Invalid request"}})
+
+            rng = server._rng(raw_body)
+            prompt_tokens = _prompt_tokens(messages)
+            action = server.responder(messages)
+            thinking = server.config.thinking
+            content = f"{thinking}\n{action}" if thinking else action
+            tokens = _TOKEN.findall(content)
+            finish_reason = "stop"
+            max_tokens = body.get("max_tokens") or body.get("max_completion_tokens")
+            if max_tokens is not None and len(tokens) > max_tokens:
+                tokens = tokens[:max_tokens]
+                finish_reason = "length"
+            usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(tokens),
+                "total_tokens": prompt_tokens + len(tokens),
+            }
+
+            server._acquire()
+            self.sent = 0
+            cancelled = False
+            try:
+                time.sleep(server._ttft(rng, prompt_tokens))
+                if body.get("stream"):
+                    include_usage = (body.get("stream_options") or {}).get(
+                        "include_usage", False
+                    )
+                    self._stream(tokens, finish_reason, usage, include_usage)
+                else:
+                    rate = server.config.tokens_per_second
+                    if rate > 0:
+                        time.sleep(len(tokens) / rate)
+                    self.sent = len(tokens)
+                    self._json(
+                        200,
+                        {
+                            **self._envelope("chat.completion"),
+                            "choices": [
+                                {
+                                    "index": 0,
+                                    "message": {
+                                        "role": "assistant",
+                                        "content": "".join(tokens),
+                                    },
+                                    "finish_reason": finish_reason,
+                                }
+                            ],
+                            "usage": usage,
+                        },
+                    )
+            except (BrokenPipeError, ConnectionResetError):
+                cancelled = True
+                self.close_connection = True
+            finally:
+                server._release(self.sent, cancelled)
+
+        def _stream(
+            self,
+            tokens: list[str],
+            finish_reason: str,
+            usage: dict[str, int],
+            include_usage: bool,
+        ) -> None:
+            """Send the response as SSE chunks, counting the tokens sent."""
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            envelope = self._envelope("chat.completion.chunk")
+            rate = server.config.tokens_per_second
+            start = time.monotonic()
+            for index, token in enumerate(tokens):
+                if rate > 0:
+                    # Pace against the start so sleep overshoot does not add up
+                    time.sleep(max(start + index / rate - time.monotonic(), 0.0))
+                delta = {"content": token}
+                if index == 0:
+                    delta["role"] = "assistant"
+                self._event(
+                    {
+                        **envelope,
+                        "choices": [
+                            {"index": 0, "delta": delta, "finish_reason": None}
+                        ],
+                    }
+                )
+                self.sent += 1
+            self._event(
+                {
+                    **envelope,
+                    "choices": [
+                        {"index": 0, "delta": {}, "finish_reason": finish_reason}
+                    ],
+                }
+            )
+            if include_usage:
+                self._event({**envelope, "choices": [], "usage": usage})
+            self._chunk(b"data: [DONE]\n\n", last=True)
+
+        def _envelope(self, kind: str) -> dict[str, Any]:
+            return {
+                "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                "object": kind,
+                "created": int(time.time()),
+                "model": server.config.model,
+            }
+
+        def _event(self, data: dict[str, Any]) -> None:
+            self._chunk(f"data: {json.dumps(data)}\n\n".encode())
+
+        def _chunk(self, data: bytes, last: bool = False) -> None:
+            frame = f"{len(data):x}\r\n".encode() + data + b"\r\n"
+            self.wfile.write(frame + (b"0\r\n\r\n" if last else b""))
+            self.wfile.flush()
+
+        def _json(self, status: int, data: Any) -> None:
+            payload = json.dumps(data).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+def main() -> None:
+    """Serve a fake model from the command line."""
+    defaults = FakeServerConfig()
+    parser = argparse.ArgumentParser(
+        description="Synthetic OpenAI-compatible model server for offline tests",
+        epilog=(
+            "Example: phone-agent-fake-model --port 8000 "
+            "--ttft 0.3 --tokens-per-second 40 --steps 5"
+        ),
+    )
+    parser.add_argument("--host", default=defaults.host)
+    parser.add_argument("--port", type=int, default=defaults.port)
+    parser.add_argument("--model", default=defaults.model)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--ttft", type=float, default=defaults.ttft, help="Median TTFT (seconds)"
+    )
+    parser.add_argument("--ttft-sigma", type=float, default=defaults.ttft_sigma)
+    parser.add_argument(
+        "--tail-share",
+        type=float,
+        default=defaults.tail_share,
+        help="Share of requests with a stalled first token",
+    )
+    parser.add_argument(
+        "--tail-ttft",
+        type=float,
+        nargs=2,
+        metavar=("MIN", "MAX"),
+        default=defaults.tail_ttft,
+        help="Range of stalled TTFTs (seconds)",
+    )
+    parser.add_argument(
+        "--prefill-per-token", type=float, default=defaults.prefill_per_token
+    )
+    parser.add_argument(
+        "--tokens-per-second", type=float, default=defaults.tokens_per_second
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=defaults.max_concurrency,
+        help="Requests served at once (0 is unlimited)",
+    )
+    parser.add_argument(
+        "--steps",
+        type=int,
+        default=5,
+        help="Tap until this step, then finish (ignored with --script)",
+    )
+    parser.add_argument(
+        "--script",
+        help="File with one action per line, answered in order for each run",
+    )
+    args = parser.parse_args()
+
+    responder = tap_then_finish(args.steps)
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            responder = ScriptedResponder([line.strip() for line in f if line.strip()])
+
+    server = FakeModelServer(
+        FakeServerConfig(
+            host=args.host,
+            port=args.port,
+            model=args.model,
+            seed=args.seed,
+            ttft=args.ttft,
+            ttft_sigma=args.ttft_sigma,
+            tail_share=args.tail_share,
+            tail_ttft=tuple(args.tail_ttft),
+            prefill_per_token=args.prefill_per_token,
+            tokens_per_second=args.tokens_per_second,
+            max_concurrency=args.max_concurrency,
+        ),
+        responder,
+    )
+    print(f"Fake model server on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
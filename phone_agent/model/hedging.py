@@ -0,0 +1,378 @@
+"""Hedged model requests, cutting the tail of time to first token."""
+
+import asyncio
+import queue
+import socket
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator
+
+
+@dataclass
+class HedgeConfig:
+    """
+    Configuration for HedgingPolicy.
+
+    A request is hedged once it has waited longer than the given percentile
+    of recent times to first chunk. Hedges spend a token bucket that fills by
+    budget per request, so at most that share of requests is sent twice.
+    """
+
+    percentile: float = 95.0  # Hedge requests slower than this percentile
+    budget: float = 0.05  # Max share of requests that may be hedged
+    burst: float = 5.0  # Hedges that may be sent back to back
+    min_samples: int = 20  # Samples needed before the percentile is used
+    initial_delay: float = 2.0  # Hedge delay until then (seconds)
+    min_delay: float = 0.05  # Lower bound of the hedge delay (seconds)
+    window: int = 500  # Recent samples the percentile is taken over
+
+
+@dataclass
+class HedgeStats:
+    """Snapshot of the hedging of all clients sharing a policy."""
+
+    requests: int  # Requests sent through the policy
+    hedged: int  # Requests that got a duplicate
+    hedge_wins: int  # Of which the duplicate streamed first
+    delay: float  # Current hedge delay (seconds)
+
+    @property
+    def hedge_rate(self) -> float:
+        return self.hedged / self.requests if self.requests else 0.0
+
+
+class HedgingPolicy:
+    """
+    Decides when to hedge model requests, shared by many model clients.
+
+    Thread-safe. The delay follows the first-chunk times of the responses
+    that won; a duplicate cancelled before its first chunk adds no sample.
+
+    Args:
+        config: Hedging configuration.
+
+    Example:
+        >>> hedging = HedgingPolicy(HedgeConfig(percentile=95, budget=0.05))
+        >>> agent = PhoneAgent(model_config, AgentConfig(hedging=hedging))
+    """
+
+    def __init__(self, config: HedgeConfig | None = None):
+        self.config = config or HedgeConfig()
+        self._samples: deque[float] = deque(maxlen=self.config.window)
+        self._tokens = self.config.burst
+        self._requests = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def start(self) -> float:
+        """Count a request and return how long it may wait before hedging."""
+        with self._lock:
+            self._requests += 1
+            self._tokens = min(self._tokens + self.config.budget, self.config.burst)
+            return self._delay()
+
+    def try_hedge(self) -> bool:
+        """Spend budget on a duplicate; False when the budget is used up."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self._hedged += 1
+            return True
+
+    def record(self, first_chunk_time: float, hedge_won: bool = False) -> None:
+        """Record the first-chunk time of the attempt that won."""
+        with self._lock:
+            self._samples.append(first_chunk_time)
+            if hedge_won:
+                self._hedge_wins += 1
+
+    def stats(self) -> HedgeStats:
+        with self._lock:
+            return HedgeStats(
+                requests=self._requests,
+                hedged=self._hedged,
+                hedge_wins=self._hedge_wins,
+                delay=self._delay(),
+            )
+
+    def _delay(self) -> float:
+        """Hedge delay from recent samples. Holds the lock."""
+        config = self.config
+        if len(self._samples) < config.min_samples:
+            return config.initial_delay
+        samples = sorted(self._samples)
+        index = min(int(len(samples) * config.percentile / 100), len(samples) - 1)
+        return max(samples[index], config.min_delay)
+
+
+_END = object()  # Marks the end of an attempt's stream
+
+
+class _Attempt:
+    """One copy of a hedged request, streamed on its own thread."""
+
+    def __init__(
+        self,
+        index: int,
+        open_stream: Callable[[], Any],
+        events: "queue.Queue[tuple[_Attempt, Any]]",
+        on_end: Callable[[float | None], None] | None = None,
+    ):
+        self.index = index
+        self.start_time = time.time()
+        self.first_chunk_time: float | None = None
+        self.stream = None
+        self.cancelled = False
+        self.finished = False  # The stream was read to its end
+        self._open_stream = open_stream
+        self._events = events
+        self._on_end = on_end
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self) -> None:
+        try:
+            self.stream = self._open_stream()
+            if self.cancelled:
+                self.stream.close()
+                return
+            for chunk in self.stream:
+                if self.first_chunk_time is None:
+                    self.first_chunk_time = time.time() - self.start_time
+                self._events.put((self, chunk))
+                if self.cancelled:
+                    return
+            self.finished = True
+            self._events.put((self, _END))
+        except Exception as e:
+            if not self.cancelled:
+                self._events.put((self, e))
+        finally:
+            if self._on_end is not None:
+                self._on_end(self.first_chunk_time)
+
+    def cancel(self) -> None:
+        """Close the stream; one still waiting for headers closes on arrival."""
+        self.cancelled = True
+        if self.finished:
+            return  # Its connection may already serve another request
+        if self.stream is not None:
+            try:
+                _abort(self.stream)
+                self.stream.close()
+            except Exception:
+                pass
+
+
+def _abort(stream: Any) -> None:
+    """
+    Shut down the connection of a sync stream read on another thread.
+
+    Closing the response does not wake a read blocked on the socket, so the
+    server would keep working on the copy until its next chunk. HTTP/2
+    connections are shared by other streams and are left open.
+    """
+    response = getattr(stream, "response", None)
+    if response is None or response.http_version != "HTTP/1.1":
+        return
+    network_stream = response.extensions.get("network_stream")
+    sock = network_stream.get_extra_info("socket") if network_stream else None
+    if sock is not None:
+        sock.shutdown(socket.SHUT_RDWR)
+
+
+class HedgedStream:
+    """
+    Chunks of whichever copy of a request streams first.
+
+    The request is sent at once. If no chunk has arrived after the policy's
+    delay and the budget allows, a duplicate is sent through open_hedge. The
+    first copy to deliver a chunk wins and the other one is closed, which
+    aborts it on the server. Errors of a copy are only raised if the other
+    copy fails too.
+
+    Args:
+        policy: Shared hedging policy.
+        open_stream: Sends the request and returns its chunk stream.
+        open_hedge: Sends the duplicate, e.g. to another endpoint.
+        hedge_done: Called once the duplicate is done, won or lost, with its
+            own time to first chunk (None if it got none).
+    """
+
+    def __init__(
+        self,
+        policy: HedgingPolicy,
+        open_stream: Callable[[], Any],
+        open_hedge: Callable[[], Any],
+        hedge_done: Callable[[float | None], None] | None = None,
+    ):
+        self.policy = policy
+        self._open_hedge = open_hedge
+        self._hedge_done = hedge_done
+        self._events: queue.Queue[tuple[_Attempt, Any]] = queue.Queue()
+        self._delay: float | None = policy.start()
+        self._attempts = [_Attempt(0, open_stream, self._events)]
+        self.hedged = False  # Whether a duplicate was sent
+        self.winner: _Attempt | None = None
+
+    def __iter__(self) -> Iterator[Any]:
+        failed = 0
+        while True:
+            try:
+                attempt, item = self._events.get(timeout=self._delay)
+            except queue.Empty:
+                self._hedge()
+                continue
+
+            if self.winner is None:
+                if item is _END or isinstance(item, BaseException):
+                    failed += 1
+                    if failed < len(self._attempts):
+                        continue  # The other copy may still answer
+                    self._delay = None  # Too late to hedge
+                else:
+                    self._win(attempt)
+            elif attempt is not self.winner:
+                continue
+
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    @property
+    def hedge_won(self) -> bool:
+        """Whether the duplicate streamed first."""
+        return self.winner is not None and self.winner.index > 0
+
+    def close(self) -> None:
+        for attempt in self._attempts:
+            attempt.cancel()
+
+    def _hedge(self) -> None:
+        self._delay = None
+        if self.policy.try_hedge():
+            self.hedged = True
+            self._attempts.append(
+                _Attempt(1, self._open_hedge, self._events, self._hedge_done)
+            )
+
+    def _win(self, attempt: _Attempt) -> None:
+        self._delay = None
+        self.winner = attempt
+        self.policy.record(time.time() - attempt.start_time, attempt.index > 0)
+        for other in self._attempts:
+            if other is not attempt:
+                other.cancel()
+
+
+class AsyncHedgedStream:
+    """
+    Async HedgedStream; the copies are tasks, so a loser is cancelled at once.
+
+    Args:
+        policy: Shared hedging policy.
+        open_stream: Coroutine function sending the request.
+        open_hedge: Coroutine function sending the duplicate.
+        hedge_done: Called once the duplicate is done, as in HedgedStream.
+    """
+
+    def __init__(
+        self,
+        policy: HedgingPolicy,
+        open_stream: Callable[[], Awaitable[Any]],
+        open_hedge: Callable[[], Awaitable[Any]],
+        hedge_done: Callable[[float | None], None] | None = None,
+    ):
+        self.policy = policy
+        self._open_stream = open_stream
+        self._open_hedge = open_hedge
+        self._hedge_done = hedge_done
+        self._events: asyncio.Queue[tuple[int, Any]] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self._streams: dict[int, Any] = {}
+        self._start_times: list[float] = []
+        self.hedged = False  # Whether a duplicate was sent
+        self.winner: int | None = None
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        delay: float | None = self.policy.start()
+        self._launch(self._open_stream)
+        failed = 0
+        try:
+            while True:
+                try:
+                    index, item = await asyncio.wait_for(self._events.get(), delay)
+                except asyncio.TimeoutError:
+                    delay = None
+                    if self.policy.try_hedge():
+                        self.hedged = True
+                        self._launch(self._open_hedge)
+                    continue
+
+                if self.winner is None:
+                    if item is _END or isinstance(item, BaseException):
+                        failed += 1
+                        if failed < len(self._tasks):
+                            continue
+                    else:
+                        self._win(index)
+                    delay = None
+                elif index != self.winner:
+                    continue
+
+                if item is _END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            await self.close()
+
+    @property
+    def hedge_won(self) -> bool:
+        """Whether the duplicate streamed first."""
+        return self.winner is not None and self.winner > 0
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for stream in self._streams.values():
+            try:
+                await stream.close()
+            except Exception:
+                pass
+
+    def _launch(self, open_stream: Callable[[], Awaitable[Any]]) -> None:
+        index = len(self._tasks)
+        self._start_times.append(time.time())
+        self._tasks.append(asyncio.create_task(self._run(index, open_stream)))
+
+    async def _run(self, index: int, open_stream: Callable[[], Awaitable[Any]]):
+        first_chunk_time = None
+        try:
+            stream = await open_stream()
+            self._streams[index] = stream
+            async for chunk in stream:
+                if first_chunk_time is None:
+                    first_chunk_time = time.time() - self._start_times[index]
+                await self._events.put((index, chunk))
+            await self._events.put((index, _END))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._events.put((index, e))
+        finally:
+            if index > 0 and self._hedge_done is not None:
+                self._hedge_done(first_chunk_time)
+
+    def _win(self, index: int) -> None:
+        self.winner = index
+        self.policy.record(time.time() - self._start_times[index], index > 0)
+        for other, task in enumerate(self._tasks):
+            if other != index:
+                task.cancel()
@@ -0,0 +1,283 @@
+"""Process-wide pooled OpenAI clients, shared by every model client."""
+
+import contextlib
+import importlib
+import threading
+from dataclasses import dataclass, replace
+
+from openai import (
+    DEFAULT_CONNECTION_LIMITS,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+    OpenAI,
+    Timeout,
+)
+
+# httpx Limits class of the SDK, so pools are built with the httpx it uses
+Limits = type(DEFAULT_CONNECTION_LIMITS)
+SyncByteStream = importlib.import_module(Limits.__module__.split(".")[0]).SyncByteStream
+
+# End of an OpenAI event stream; events start on a new line
+_SSE_DONE = b"\ndata: [DONE]"
+
+
+@dataclass
+class HttpPoolConfig:
+    """Connection pool and timeout settings of a shared model endpoint client."""
+
+    max_connections: int = 64  # Concurrent connections to the endpoint
+    max_keepalive_connections: int = 32  # Idle connections kept open
+    keepalive_expiry: float = 60.0  # Seconds an idle connection is kept
+    # Negotiated via ALPN on https endpoints only, and only with the h2
+    # package (pip install phone-agent[http2]); plain-http endpoints such as
+    # a local vLLM server, and pools without h2, use HTTP/1.1
+    http2: bool = True
+    connect_timeout: float = 10.0
+    read_timeout: float = 120.0  # Max gap between streamed chunks
+    write_timeout: float = 30.0
+    pool_timeout: float = 30.0  # Max wait for a free connection
+    # SDK retries of failed requests; model clients retry through RetryPolicy
+    max_retries: int = 0
+
+
+@dataclass
+class PoolStats:
+    """Connection use of one shared client since it was created."""
+
+    base_url: str
+    max_connections: int
+    http2: bool  # Whether HTTP/2 is enabled for the pool
+    requests: int = 0  # Requests sent on a pooled connection
+    http2_requests: int = 0  # Of which over HTTP/2
+    connections_opened: int = 0  # New TCP connections
+    tls_handshakes: int = 0
+    in_flight: int = 0  # Requests currently holding a connection
+    peak_in_flight: int = 0
+
+    @property
+    def reuse_rate(self) -> float:
+        """Share of requests sent on an already open connection."""
+        if not self.requests:
+            return 0.0
+        return max(1.0 - self.connections_opened / self.requests, 0.0)
+
+    @property
+    def utilization(self) -> float:
+        """Peak share of max_connections in use."""
+        return self.peak_in_flight / self.max_connections
+
+
+class _PoolTracer:
+    """
+    Counts pool events through the httpcore trace extension.
+
+    A request holds its connection from sending its headers until the
+    response is closed, which for a stream is when the stream is closed.
+    """
+
+    def __init__(self, stats: PoolStats):
+        self.stats = stats
+        self._lock = threading.Lock()
+
+    def __call__(self, name: str, info: dict) -> None:
+        stats = self.stats
+        with self._lock:
+            if name == "connection.connect_tcp.complete":
+                stats.connections_opened += 1
+            elif name == "connection.start_tls.complete":
+                stats.tls_handshakes += 1
+            elif name.endswith(".send_request_headers.started"):
+                stats.requests += 1
+                if name.startswith("http2."):
+                    stats.http2_requests += 1
+                stats.in_flight += 1
+                stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+            elif name.endswith(".response_closed.complete") or name.endswith(
+                ".response_closed.failed"
+            ):
+                stats.in_flight = max(stats.in_flight - 1, 0)
+
+    async def trace_async(self, name: str, info: dict) -> None:
+        self(name, info)
+
+    def on_request(self, request) -> None:
+        request.extensions["trace"] = self
+
+    async def on_request_async(self, request) -> None:
+        request.extensions["trace"] = self.trace_async
+
+
+class _DrainOnClose(SyncByteStream):
+    """
+    Sync HTTP/1.1 response body that is read to its end before it closes.
+
+    The sync openai Stream closes the response as soon as it reads [DONE],
+    before the end of the chunked body, so httpcore drops the connection
+    instead of returning it to the pool. Once [DONE] has passed, only the
+    end of the message is left, so it is read first. A response closed
+    before [DONE], e.g. after an early stop, closes at once, which aborts
+    the request on the server.
+    """
+
+    def __init__(self, stream: SyncByteStream):
+        self._stream = stream
+        self._tail = b""
+        self._done = False
+
+    def __iter__(self):
+        for chunk in self._stream:
+            if not self._done:
+                self._done = _SSE_DONE in self._tail + chunk
+                self._tail = chunk[-len(_SSE_DONE) :]
+            yield chunk
+
+    def close(self) -> None:
+        if self._done:
+            with contextlib.suppress(Exception):
+                for _ in self._stream:
+                    pass
+        self._stream.close()
+
+
+def _drain_on_close(response) -> None:
+    """Response hook of the sync pools."""
+    if response.http_version == "HTTP/1.1":
+        response.stream = _DrainOnClose(response.stream)
+
+
+@dataclass
+class _Pool:
+    client: OpenAI | AsyncOpenAI
+    stats: PoolStats
+
+
+# Process-wide clients, keyed by (base_url, api_key, is_async)
+_pools: dict[tuple[str, str, bool], _Pool] = {}
+_pools_lock = threading.Lock()
+
+
+def _http_client_args(config: HttpPoolConfig) -> dict:
+    return {
+        "limits": Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        "timeout": Timeout(
+            connect=config.connect_timeout,
+            read=config.read_timeout,
+            write=config.write_timeout,
+            pool=config.pool_timeout,
+        ),
+    }
+
+
+def _get_pool(
+    base_url: str, api_key: str, config: HttpPoolConfig | None, is_async: bool
+) -> _Pool:
+    key = (base_url.rstrip("/"), api_key, is_async)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is not None:
+            return pool
+
+        config = config or HttpPoolConfig()
+        stats = PoolStats(
+            base_url=key[0], max_connections=config.max_connections, http2=False
+        )
+        tracer = _PoolTracer(stats)
+        args = _http_client_args(config)
+        if is_async:
+            args["event_hooks"] = {"request": [tracer.on_request_async]}
+            http_client_class, client_class = DefaultAsyncHttpxClient, AsyncOpenAI
+        else:
+            args["event_hooks"] = {
+                "request": [tracer.on_request],
+                "response": [_drain_on_close],
+            }
+            http_client_class, client_class = DefaultHttpxClient, OpenAI
+
+        http_client = None
+        if config.http2:
+            try:
+                http_client = http_client_class(http2=True, **args)
+                stats.http2 = True
+            except ImportError:
+                pass  # h2 is not installed
+        if http_client is None:
+            http_client = http_client_class(**args)
+
+        client = client_class(
+            base_url=base_url,
+            api_key=api_key,
+            max_retries=config.max_retries,
+            http_client=http_client,
+        )
+        pool = _Pool(client, stats)
+        _pools[key] = pool
+        return pool
+
+
+def get_openai_client(
+    base_url: str, api_key: str = "EMPTY", config: HttpPoolConfig | None = None
+) -> OpenAI:
+    """
+    Get the shared OpenAI client for an endpoint, creating it if needed.
+
+    Every ModelClient, API check and deployment check for the same
+    (base_url, api_key) shares one keep-alive connection pool, so a fleet
+    pays one TCP and TLS handshake per pooled connection instead of one per
+    client. The client is thread-safe.
+
+    Args:
+        base_url: Model API base URL.
+        api_key: API key for the endpoint.
+        config: Pool configuration used only when the client is first created.
+
+    Returns:
+        The shared OpenAI client. Use client.with_options() for per-call
+        settings; the copy keeps the shared pool.
+
+    Example:
+        >>> client = get_openai_client("http://localhost:8000/v1")
+        >>> client.with_options(timeout=10.0).models.list()
+    """
+    return _get_pool(base_url, api_key, config, is_async=False).client
+
+
+def get_async_openai_client(
+    base_url: str, api_key: str = "EMPTY", config: HttpPoolConfig | None = None
+) -> AsyncOpenAI:
+    """
+    Get the shared AsyncOpenAI client for an endpoint, creating it if needed.
+
+    Async connections belong to the event loop that opened them, so the
+    shared async clients are meant for a process running one event loop.
+
+    Args:
+        base_url: Model API base URL.
+        api_key: API key for the endpoint.
+        config: Pool configuration used only when the client is first created.
+
+    Returns:
+        The shared AsyncOpenAI client.
+    """
+    return _get_pool(base_url, api_key, config, is_async=True).client
+
+
+def pool_stats() -> list[PoolStats]:
+    """Snapshots of the connection use of every shared client."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [replace(pool.stats) for pool in pools]
+
+
+def close_openai_clients() -> None:
+    """Forget all shared clients, closing the pools of the sync ones."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        if isinstance(pool.client, OpenAI):
+            pool.client.close()
@@ -0,0 +1,255 @@
+"""Retries with backoff and per-endpoint circuit breaking for model requests."""
+
+import importlib
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+from openai import DEFAULT_CONNECTION_LIMITS, APIConnectionError, APIStatusError
+
+# httpx TransportError class of the SDK, which may ship its own httpx build
+TransportError = importlib.import_module(
+    type(DEFAULT_CONNECTION_LIMITS).__module__.split(".")[0]
+).TransportError
+
+# Status codes worth another attempt besides 5xx
+RETRYABLE_STATUS = (408, 409, 429)
+
+# Circuit states
+CLOSED = "closed"  # Requests flow
+OPEN = "open"  # Requests fail fast until the reset timeout
+HALF_OPEN = "half_open"  # One probe request decides between the two
+
+
+@dataclass
+class RetryConfig:
+    """
+    Configuration for RetryPolicy.
+
+    Failed attempts wait a random time between zero and
+    min(backoff_max, backoff_base * 2 ** (retry - 1)) before the next one.
+    After breaker_failures consecutive failures, an endpoint's circuit opens
+    and requests to it fail fast for breaker_reset seconds.
+    """
+
+    max_retries: int = 3  # Attempts after the first
+    backoff_base: float = 0.5  # Seconds
+    backoff_max: float = 8.0  # Seconds
+    breaker_failures: int = 5  # Consecutive failures that open a circuit; 0 never
+    breaker_reset: float = 30.0  # Seconds an open circuit rejects requests
+
+
+@dataclass
+class CircuitStats:
+    """Snapshot of the circuit of an endpoint."""
+
+    endpoint: str
+    state: str  # CLOSED, OPEN or HALF_OPEN
+    consecutive_failures: int
+    failures: int  # Retryable failures
+    retries: int  # Attempts sent again after a failure
+    rejected: int  # Requests failed fast while the circuit was open
+
+
+class ModelRequestError(Exception):
+    """
+    A model request still failed with a retryable error after all retries.
+
+    The last error is the __cause__.
+    """
+
+    def __init__(self, endpoint: str, retries: int, message: str):
+        super().__init__(f"{message} (endpoint {endpoint}, {retries} retries)")
+        self.endpoint = endpoint
+        self.retries = retries
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to an endpoint with an open circuit."""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit open for {endpoint}, retry in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether another attempt may succeed.
+
+    Connection errors, including streams that broke midway and timeouts,
+    5xx responses, 408, 409 and 429 are retryable. Streams that break midway
+    raise httpx transport errors rather than APIConnectionError, so those
+    count as connection errors too, also when they are the __cause__ or
+    __context__ of the error raised. Other 4xx responses mean the request
+    itself is wrong and are fatal.
+    """
+    if isinstance(error, APIStatusError):
+        status = error.status_code
+        return status >= 500 or status in RETRYABLE_STATUS
+    connection_errors = (APIConnectionError, TransportError, CircuitOpenError)
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, connection_errors):
+            return True
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class _Circuit:
+    """Breaker state and counters of one endpoint."""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.state = CLOSED
+        self.open_until = 0.0
+        self.consecutive_failures = 0
+        self.failures = 0
+        self.retries = 0
+        self.rejected = 0
+
+
+class RetryPolicy:
+    """
+    Retry schedule and circuit breakers shared by many model clients.
+
+    Thread-safe. Each endpoint has a circuit. It opens after a run of
+    consecutive retryable failures and rejects requests for the reset
+    timeout. Then a single probe request is let through: success closes the
+    circuit, failure opens it again. Any answer from the endpoint, including
+    a fatal 4xx, counts as success.
+
+    Args:
+        config: Retry configuration.
+
+    Example:
+        >>> policy = RetryPolicy(RetryConfig(max_retries=5))
+        >>> agent = PhoneAgent(model_config, AgentConfig(retry_policy=policy))
+    """
+
+    def __init__(self, config: RetryConfig | None = None):
+        self.config = config or RetryConfig()
+        self._circuits: dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def admit(self, endpoint: str) -> None:
+        """
+        Check that a request may be sent to an endpoint.
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open, or half open
+                with its probe request in flight.
+        """
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.state == CLOSED:
+                return
+            now = time.monotonic()
+            if now >= circuit.open_until:
+                # This request is the probe; another one is let through only
+                # if it has not reported back after another reset timeout
+                circuit.state = HALF_OPEN
+                circuit.open_until = now + self.config.breaker_reset
+                return
+            circuit.rejected += 1
+            raise CircuitOpenError(endpoint, max(circuit.open_until - now, 0.0))
+
+    def record_error(self, endpoint: str, error: BaseException) -> bool:
+        """
+        Record a failed attempt.
+
+        Returns:
+            Whether the error is retryable. A fatal error still shows that
+            the endpoint answered, and counts as success for its circuit.
+        """
+        if isinstance(error, CircuitOpenError):
+            return True  # Nothing was sent
+        if not is_retryable(error):
+            if isinstance(error, APIStatusError):
+                self.record_success(endpoint)
+            return False
+        self.record_failure(endpoint)
+        return True
+
+    def record_success(self, endpoint: str) -> None:
+        """Record an answer from the endpoint, closing its circuit."""
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit.state = CLOSED
+            circuit.consecutive_failures = 0
+
+    def record_failure(self, endpoint: str) -> None:
+        """Record a retryable failure, opening the circuit if needed."""
+        config = self.config
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit.failures += 1
+            circuit.consecutive_failures += 1
+            if circuit.state == HALF_OPEN or (
+                config.breaker_failures
+                and circuit.consecutive_failures >= config.breaker_failures
+            ):
+                circuit.state = OPEN
+                circuit.open_until = time.monotonic() + config.breaker_reset
+
+    def backoff(self, endpoint: str, retry: int) -> float:
+        """
+        Count a retry and return the seconds to wait before it.
+
+        Args:
+            endpoint: Endpoint the retry goes to.
+            retry: 1 for the first retry of a request, 2 for the second...
+        """
+        with self._lock:
+            self._circuit(endpoint).retries += 1
+        config = self.config
+        cap = min(config.backoff_max, config.backoff_base * 2 ** (retry - 1))
+        return random.uniform(0, cap)
+
+    def stats(self) -> list[CircuitStats]:
+        """Snapshot of every endpoint's circuit."""
+        with self._lock:
+            return [
+                CircuitStats(
+                    endpoint=circuit.endpoint,
+                    state=circuit.state,
+                    consecutive_failures=circuit.consecutive_failures,
+                    failures=circuit.failures,
+                    retries=circuit.retries,
+                    rejected=circuit.rejected,
+                )
+                for circuit in self._circuits.values()
+            ]
+
+    def _circuit(self, endpoint: str) -> _Circuit:
+        """Circuit of an endpoint, created on first use. Holds the lock."""
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            circuit = self._circuits[endpoint] = _Circuit(endpoint)
+        return circuit
+
+
+# Process-wide policy used by model clients without their own
+_retry_policy: RetryPolicy | None = None
+_retry_policy_lock = threading.Lock()
+
+
+def get_retry_policy(config: RetryConfig | None = None) -> RetryPolicy:
+    """
+    Get the process-wide retry policy, creating it on first use.
+
+    Sharing it means every client in the process sees the same circuits.
+
+    Args:
+        config: Configuration used only when the policy is first created.
+
+    Returns:
+        The shared RetryPolicy.
+    """
+    global _retry_policy
+    with _retry_policy_lock:
+        if _retry_policy is None:
+            _retry_policy = RetryPolicy(config)
+        return _retry_policy
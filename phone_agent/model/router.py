@@ -0,0 +1,194 @@
+"""Routing of agent runs across replicas of the same model."""
+
+import threading
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class RouterConfig:
+    """Configuration for ModelRouter."""
+
+    ewma_alpha: float = 0.3  # Weight of the newest TTFT in the moving average
+    cooldown: float = 30.0  # Seconds a failed endpoint gets no new runs
+    max_failovers: int = 2  # Endpoints tried after the first for one request
+
+
+@dataclass
+class RouteStats:
+    """Snapshot of the routing state of an endpoint."""
+
+    endpoint: str
+    healthy: bool  # Not cooling down after a connection failure
+    runs: int  # Runs currently pinned to the endpoint
+    in_flight: int  # Requests of this process being served
+    requests: int  # Requests completed
+    failures: int  # Connection failures, each moving a run away
+    ttft_ewma: float | None  # Moving average time to first token (seconds)
+
+
+class _Route:
+    """Live load and latency of one endpoint."""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.runs = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.ttft_ewma: float | None = None
+        self.down_until = 0.0
+
+    def score(self, fallback_ttft: float) -> float:
+        """Expected wait of a new request: TTFT times the queue it joins."""
+        ttft = self.ttft_ewma if self.ttft_ewma is not None else fallback_ttft
+        return ttft * (self.in_flight + 1)
+
+
+class ModelRouter:
+    """
+    Routes agent runs across replicas serving the same model.
+
+    Each run is pinned to one endpoint for all its requests, so the prompt
+    prefix it grows step by step stays in that replica's prefix (KV) cache.
+    A new run goes to the healthy endpoint with the lowest expected wait: its
+    TTFT moving average times its in-flight requests plus one. Endpoints
+    without a TTFT yet are scored with the best known one, so they get
+    traffic. When a request cannot connect, the endpoint cools down and the
+    run moves to the next best endpoint, losing only its cached prefix.
+
+    A router is thread-safe and meant to be shared by all model clients of a
+    process.
+
+    Args:
+        endpoints: Base URLs of the replicas.
+        config: Router configuration.
+
+    Example:
+        >>> router = ModelRouter(["http://gpu-1:8000/v1", "http://gpu-2:8000/v1"])
+        >>> agent = PhoneAgent(model_config, AgentConfig(router=router))
+    """
+
+    def __init__(self, endpoints: list[str], config: RouterConfig | None = None):
+        if not endpoints:
+            raise ValueError("ModelRouter needs at least one endpoint")
+        self.config = config or RouterConfig()
+        self._routes = {
+            endpoint: _Route(endpoint)
+            for endpoint in dict.fromkeys(url.rstrip("/") for url in endpoints)
+        }
+        self._lock = threading.Lock()
+
+    @property
+    def endpoints(self) -> list[str]:
+        return list(self._routes)
+
+    def pin(self, previous: str | None = None, exclude: tuple[str, ...] = ()) -> str:
+        """
+        Choose the endpoint of a run.
+
+        Args:
+            previous: Endpoint the run was pinned to before, if any; it is
+                unpinned.
+            exclude: Endpoints not to choose unless no other is left.
+
+        Returns:
+            The endpoint's base URL.
+        """
+        with self._lock:
+            if previous is not None and previous in self._routes:
+                self._routes[previous].runs -= 1
+            route = self._best(exclude)
+            route.runs += 1
+            return route.endpoint
+
+    def alternative(self, endpoint: str) -> str:
+        """
+        Best endpoint other than the given one, without pinning a run.
+
+        Used for a duplicate of a slow request. With a single endpoint this
+        is the endpoint itself.
+        """
+        with self._lock:
+            if len(self._routes) == 1:
+                return endpoint
+            return self._best((endpoint,)).endpoint
+
+    def unpin(self, endpoint: str) -> None:
+        """Release the pin of a run that ended."""
+        with self._lock:
+            self._routes[endpoint].runs -= 1
+
+    def begin(self, endpoint: str) -> None:
+        """Count a request as in flight on its endpoint."""
+        with self._lock:
+            self._routes[endpoint].in_flight += 1
+
+    def end(self, endpoint: str, ttft: float | None = None) -> None:
+        """
+        Count a request as done.
+
+        Args:
+            endpoint: Endpoint that served the request.
+            ttft: Time to first token, if the request got one.
+        """
+        with self._lock:
+            route = self._routes[endpoint]
+            route.in_flight -= 1
+            if ttft is None:
+                return
+            route.requests += 1
+            if route.ttft_ewma is None:
+                route.ttft_ewma = ttft
+            else:
+                alpha = self.config.ewma_alpha
+                route.ttft_ewma = alpha * ttft + (1 - alpha) * route.ttft_ewma
+
+    def fail(self, endpoint: str) -> None:
+        """Record a connection failure and cool the endpoint down."""
+        with self._lock:
+            route = self._routes[endpoint]
+            route.failures += 1
+            route.down_until = time.monotonic() + self.config.cooldown
+
+    def stats(self) -> list[RouteStats]:
+        """Snapshot of every endpoint, in configured order."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                RouteStats(
+                    endpoint=route.endpoint,
+                    healthy=route.down_until <= now,
+                    runs=route.runs,
+                    in_flight=route.in_flight,
+                    requests=route.requests,
+                    failures=route.failures,
+                    ttft_ewma=route.ttft_ewma,
+                )
+                for route in self._routes.values()
+            ]
+
+    def _best(self, exclude: tuple[str, ...]) -> _Route:
+        """Lowest expected wait among healthy endpoints. Holds the lock."""
+        now = time.monotonic()
+        routes = list(self._routes.values())
+        candidates = [
+            route
+            for route in routes
+            if route.down_until <= now and route.endpoint not in exclude
+        ]
+        if not candidates:
+            # Everything is down or excluded: try the one that failed longest ago
+            candidates = [
+                min(
+                    (route for route in routes if route.endpoint not in exclude),
+                    key=lambda route: route.down_until,
+                    default=min(routes, key=lambda route: route.down_until),
+                )
+            ]
+        known = [route.ttft_ewma for route in routes if route.ttft_ewma is not None]
+        fallback = min(known) if known else 0.0
+        return min(
+            candidates,
+            key=lambda route: (route.score(fallback), route.in_flight, route.runs),
+        )
@@ -0,0 +1,392 @@
+"""Admission control for model requests shared by many agents."""
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+
+# Priority classes; lower values are served first
+INTERACTIVE = 0
+BATCH = 1
+
+
+@dataclass
+class SchedulerConfig:
+    """
+    Configuration for RequestScheduler.
+
+    The in-flight limit of each endpoint starts at max_in_flight. With
+    adaptive set, it shrinks multiplicatively when time to first token rises
+    above the target and grows back additively while TTFT stays under it.
+    Without a target_ttft, the target is ttft_tolerance times the best TTFT
+    seen recently.
+    """
+
+    max_in_flight: int = 8  # Upper bound of concurrent requests per endpoint
+    min_in_flight: int = 1
+    adaptive: bool = True  # Adapt the limit to observed TTFT
+    target_ttft: float | None = None  # Seconds; None derives it from the best TTFT
+    ttft_tolerance: float = 2.0
+    backoff: float = 0.75  # Limit multiplier when TTFT is over the target
+    # Directory of slot lock files that cap max_in_flight across processes
+    # (POSIX only); None limits this process only
+    lock_dir: str | None = None
+
+
+@dataclass
+class Slot:
+    """Permission to send one request; release it once the response is done."""
+
+    endpoint: str
+    priority: int
+    flow: str
+    queue_time: float = 0.0  # Seconds spent waiting for the slot
+    _file_slot: "_FileSlot | None" = None
+
+
+@dataclass
+class EndpointStats:
+    """Snapshot of the scheduling state of an endpoint."""
+
+    endpoint: str
+    limit: float  # Current in-flight limit
+    in_flight: int
+    waiting: int
+    requests: int  # Slots granted so far
+    mean_queue_time: float
+    mean_ttft: float | None
+
+
+class _Waiter:
+    """A queued acquire, woken by a thread event or an asyncio future."""
+
+    def __init__(self, priority: int, flow: str, future=None, loop=None):
+        self.priority = priority
+        self.flow = flow
+        self.granted = False
+        self._event = threading.Event() if future is None else None
+        self._future = future
+        self._loop = loop
+
+    def grant(self) -> None:
+        self.granted = True
+        if self._future is None:
+            self._event.set()
+        else:
+            self._loop.call_soon_threadsafe(_resolve, self._future)
+
+    def wait(self, timeout: float | None) -> bool:
+        return self._event.wait(timeout)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class _Endpoint:
+    """Per-endpoint limit, wait queues and statistics."""
+
+    def __init__(self, config: SchedulerConfig):
+        self.limit = float(config.max_in_flight)
+        self.in_flight = 0
+        # priority -> flow -> waiters; flows are served round-robin
+        self.queues: dict[int, OrderedDict[str, deque[_Waiter]]] = {}
+        self.waiting = 0
+        self.best_ttft: float | None = None
+        self.last_backoff = 0.0
+        self.requests = 0
+        self.queue_time_total = 0.0
+        self.ttft_total = 0.0
+        self.ttft_count = 0
+
+    def enqueue(self, waiter: _Waiter) -> None:
+        flows = self.queues.setdefault(waiter.priority, OrderedDict())
+        flows.setdefault(waiter.flow, deque()).append(waiter)
+        self.waiting += 1
+
+    def remove(self, waiter: _Waiter) -> None:
+        flows = self.queues.get(waiter.priority, {})
+        waiters = flows.get(waiter.flow)
+        if waiters and waiter in waiters:
+            waiters.remove(waiter)
+            self.waiting -= 1
+            if not waiters:
+                del flows[waiter.flow]
+
+    def next_waiter(self) -> _Waiter | None:
+        """Pop the next waiter: best priority, then the next flow in turn."""
+        for priority in sorted(self.queues):
+            flows = self.queues[priority]
+            if not flows:
+                continue
+            flow, waiters = next(iter(flows.items()))
+            waiter = waiters.popleft()
+            # Move the flow to the back so other flows go first
+            del flows[flow]
+            if waiters:
+                flows[flow] = waiters
+            self.waiting -= 1
+            return waiter
+        return None
+
+
+class RequestScheduler:
+    """
+    Caps concurrent model requests per endpoint with priorities and fairness.
+
+    Requests beyond the in-flight limit of an endpoint wait. Freed slots go
+    to the best priority class with waiters and, within a class, round-robin
+    across flows (e.g. one flow per device or task), so one busy device
+    cannot starve the others. The limit adapts to the TTFT reported on
+    release, backing off before the server starts thrashing.
+
+    A scheduler is thread-safe and can serve sync and asyncio clients at the
+    same time. get_scheduler() returns a process-wide instance.
+
+    Args:
+        config: Scheduler configuration.
+
+    Example:
+        >>> scheduler = RequestScheduler(SchedulerConfig(max_in_flight=4))
+        >>> client = ModelClient(config, scheduler=scheduler, flow="emulator-5554")
+    """
+
+    def __init__(self, config: SchedulerConfig | None = None):
+        self.config = config or SchedulerConfig()
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, _Endpoint] = {}
+
+    def acquire(
+        self,
+        endpoint: str,
+        priority: int = INTERACTIVE,
+        flow: str = "default",
+        timeout: float | None = None,
+    ) -> Slot:
+        """
+        Wait for a request slot.
+
+        Args:
+            endpoint: Endpoint the request goes to, e.g. the base URL.
+            priority: Priority class; INTERACTIVE requests go before BATCH.
+            flow: Fairness key, such as a device or task ID.
+            timeout: Optional maximum wait in seconds.
+
+        Returns:
+            The granted Slot; pass it to release() when the request is done.
+
+        Raises:
+            TimeoutError: If no slot was granted within timeout.
+        """
+        start = time.perf_counter()
+        waiter = _Waiter(priority, flow)
+        self._enqueue(endpoint, waiter)
+        if not waiter.wait(timeout):
+            self._cancel(endpoint, waiter)
+            if not waiter.granted:
+                raise TimeoutError(f"No model request slot for {endpoint}")
+        slot = Slot(endpoint, priority, flow)
+        if self.config.lock_dir:
+            try:
+                slot._file_slot = _FileSlot.acquire(
+                    self.config.lock_dir, endpoint, self.config.max_in_flight
+                )
+            except BaseException:
+                self.release(slot)
+                raise
+        slot.queue_time = time.perf_counter() - start
+        self._record_wait(endpoint, slot.queue_time)
+        return slot
+
+    async def acquire_async(
+        self, endpoint: str, priority: int = INTERACTIVE, flow: str = "default"
+    ) -> Slot:
+        """
+        Wait for a request slot without blocking the event loop.
+
+        Same arguments as acquire(); cancelling the wait leaves the queue.
+        """
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(priority, flow, loop.create_future(), loop)
+        self._enqueue(endpoint, waiter)
+        try:
+            await waiter._future
+        except asyncio.CancelledError:
+            self._cancel(endpoint, waiter)
+            raise
+        slot = Slot(endpoint, priority, flow)
+        if self.config.lock_dir:
+            try:
+                slot._file_slot = await asyncio.to_thread(
+                    _FileSlot.acquire,
+                    self.config.lock_dir,
+                    endpoint,
+                    self.config.max_in_flight,
+                )
+            except BaseException:
+                self.release(slot)
+                raise
+        slot.queue_time = time.perf_counter() - start
+        self._record_wait(endpoint, slot.queue_time)
+        return slot
+
+    def release(self, slot: Slot, ttft: float | None = None) -> None:
+        """
+        Return a slot and hand it to the next waiter.
+
+        Args:
+            slot: Slot from acquire().
+            ttft: Time to first token of the request, if one arrived. Drives
+                the adaptive limit.
+        """
+        if slot._file_slot is not None:
+            slot._file_slot.release()
+            slot._file_slot = None
+        with self._lock:
+            state = self._endpoints[slot.endpoint]
+            state.in_flight -= 1
+            if ttft is not None:
+                state.ttft_total += ttft
+                state.ttft_count += 1
+                if self.config.adaptive:
+                    self._adapt(state, ttft)
+            self._dispatch(state)
+
+    def stats(self) -> list[EndpointStats]:
+        """Get a snapshot of every endpoint seen so far."""
+        with self._lock:
+            return [
+                EndpointStats(
+                    endpoint=endpoint,
+                    limit=round(state.limit, 2),
+                    in_flight=state.in_flight,
+                    waiting=state.waiting,
+                    requests=state.requests,
+                    mean_queue_time=(
+                        state.queue_time_total / state.requests
+                        if state.requests
+                        else 0.0
+                    ),
+                    mean_ttft=(
+                        state.ttft_total / state.ttft_count
+                        if state.ttft_count
+                        else None
+                    ),
+                )
+                for endpoint, state in self._endpoints.items()
+            ]
+
+    def _enqueue(self, endpoint: str, waiter: _Waiter) -> None:
+        with self._lock:
+            state = self._endpoints.get(endpoint)
+            if state is None:
+                state = self._endpoints[endpoint] = _Endpoint(self.config)
+            state.enqueue(waiter)
+            self._dispatch(state)
+
+    def _cancel(self, endpoint: str, waiter: _Waiter) -> None:
+        """Drop a waiter that gave up; free its slot if it was just granted."""
+        with self._lock:
+            state = self._endpoints[endpoint]
+            if not waiter.granted:
+                state.remove(waiter)
+                return
+        if waiter._future is not None:
+            # Granted but the task was cancelled before it could use the slot
+            self.release(Slot(endpoint, waiter.priority, waiter.flow))
+
+    def _record_wait(self, endpoint: str, queue_time: float) -> None:
+        with self._lock:
+            state = self._endpoints[endpoint]
+            state.requests += 1
+            state.queue_time_total += queue_time
+
+    def _dispatch(self, state: _Endpoint) -> None:
+        """Grant slots while the endpoint is under its limit. Holds the lock."""
+        limit = max(int(state.limit), self.config.min_in_flight)
+        while state.in_flight < limit:
+            waiter = state.next_waiter()
+            if waiter is None:
+                return
+            state.in_flight += 1
+            waiter.grant()
+
+    def _adapt(self, state: _Endpoint, ttft: float) -> None:
+        """Additive increase, multiplicative decrease on TTFT. Holds the lock."""
+        config = self.config
+        # The baseline drifts up slowly so one lucky response cannot pin it
+        if state.best_ttft is None:
+            state.best_ttft = ttft
+        else:
+            state.best_ttft = min(ttft, state.best_ttft * 1.001)
+        target = config.target_ttft or state.best_ttft * config.ttft_tolerance
+
+        if ttft > target:
+            # Back off at most once per TTFT interval: requests granted before
+            # the last backoff still report the old congestion
+            now = time.perf_counter()
+            if now - state.last_backoff >= ttft:
+                state.limit = max(state.limit * config.backoff, config.min_in_flight)
+                state.last_backoff = now
+        else:
+            state.limit = min(state.limit + 1 / state.limit, config.max_in_flight)
+
+
+class _FileSlot:
+    """One of max_in_flight lock files shared by every process on the host."""
+
+    def __init__(self, file):
+        self._file = file
+
+    @classmethod
+    def acquire(cls, lock_dir: str, endpoint: str, count: int) -> "_FileSlot":
+        try:
+            import fcntl
+        except ImportError:
+            raise RuntimeError(
+                "Cross-process scheduling (lock_dir) needs POSIX file locks"
+            ) from None
+
+        os.makedirs(lock_dir, exist_ok=True)
+        key = hashlib.sha1(endpoint.encode()).hexdigest()[:12]
+        paths = [os.path.join(lock_dir, f"{key}-{i}.lock") for i in range(count)]
+        while True:
+            for path in paths:
+                file = open(path, "a+")
+                try:
+                    fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    file.close()
+                    continue
+                return cls(file)
+            time.sleep(0.01)
+
+    def release(self) -> None:
+        # Closing the file drops the lock
+        self._file.close()
+
+
+_scheduler: RequestScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler(config: SchedulerConfig | None = None) -> RequestScheduler:
+    """
+    Get the process-wide scheduler, creating it on first use.
+
+    Args:
+        config: Configuration used if the scheduler does not exist yet.
+
+    Returns:
+        The shared RequestScheduler.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler(config)
+        return _scheduler
@@ -0,0 +1,248 @@
+"""Incremental parser for streamed model responses."""
+
+import ast
+from dataclasses import dataclass
+
+# Event types emitted by StreamParser.feed()
+THINKING = "thinking"  # Thinking text that is safe to display
+ACTION_START = "action_start"  # The action part has begun
+ACTION_COMPLETE = "action_complete"  # The action call is complete
+
+# Markers that start the action part, in order of precedence
+CALL_MARKERS = ("finish(message=", "do(action=")
+ANSWER_OPEN = "<answer>"
+ANSWER_CLOSE = "</answer>"
+THINK_TAGS = ("<think>", "</think>")
+
+# Every proper prefix of a marker or tag. A thinking suffix matching one of
+# these is held back until the next delta decides what it is.
+_HOLDBACK = {
+    token[:i]
+    for token in (*CALL_MARKERS, ANSWER_OPEN, *THINK_TAGS)
+    for i in range(1, len(token))
+}
+_MAX_HOLDBACK = max(len(prefix) for prefix in _HOLDBACK)
+
+
+@dataclass
+class StreamEvent:
+    """A structured event produced while parsing a response stream."""
+
+    type: str
+    text: str = ""
+
+
+class StreamParser:
+    """
+    Incremental think/answer/action parser for streamed responses.
+
+    Consumes content deltas in O(delta): marker search only looks at the new
+    delta plus a short held-back tail, and the action call is tracked with a
+    running parenthesis/quote scanner, so it is only parsed when it balances.
+
+    Both response formats are accepted: thinking followed directly by a
+    ``do(...)``/``finish(...)`` call, and ``<think>...</think>`` followed by
+    ``<answer>...</answer>``. ``<think>`` tags are dropped from thinking text.
+
+    Example:
+        >>> parser = StreamParser()
+        >>> for delta in deltas:
+        ...     for event in parser.feed(delta):
+        ...         if event.type == THINKING:
+        ...             print(event.text, end="")
+        >>> parser.close()
+        >>> thinking, action = parser.result()
+    """
+
+    def __init__(self):
+        self._raw: list[str] = []
+        self._thinking: list[str] = []
+        self._action: list[str] = []
+        self._pending = ""  # Held-back thinking tail
+        self._marker: str | None = None  # Marker that started the action
+        self._answer_tail = ""  # Tail used to spot </answer> across deltas
+        # Call scanner state
+        self._depth = 0
+        self._quote: str | None = None
+        self._escaped = False
+        self._scanned = 0  # Action characters scanned so far
+        self._call_done = False  # Scanner reached its first balanced close
+        self.complete_action: str | None = None
+
+    @property
+    def in_action(self) -> bool:
+        """Whether the action part has started."""
+        return self._marker is not None
+
+    @property
+    def raw(self) -> str:
+        """All content consumed so far."""
+        return "".join(self._raw)
+
+    def feed(self, delta: str) -> list[StreamEvent]:
+        """
+        Consume a content delta.
+
+        Args:
+            delta: New content from the stream.
+
+        Returns:
+            Events produced by this delta, in order.
+        """
+        self._raw.append(delta)
+        if self._marker is None:
+            return self._feed_thinking(delta)
+        return self._feed_action(delta)
+
+    def close(self) -> list[StreamEvent]:
+        """
+        Flush held-back thinking text at the end of the stream.
+
+        Returns:
+            A final THINKING event, if any text was held back.
+        """
+        if self._marker is not None or not self._pending:
+            return []
+        text, self._pending = self._pending, ""
+        self._thinking.append(text)
+        return [StreamEvent(THINKING, text)]
+
+    def result(self) -> tuple[str, str]:
+        """
+        Return the (thinking, action) split of the whole response.
+
+        Without any marker, the whole response is returned as the action.
+        """
+        if self._marker is None:
+            return "", self.raw
+        thinking = "".join(self._thinking).strip()
+        action = "".join(self._action)
+        if self._marker == ANSWER_OPEN:
+            return thinking, action.replace(ANSWER_CLOSE, "").strip()
+        return thinking, self._marker + action
+
+    def _feed_thinking(self, delta: str) -> list[StreamEvent]:
+        text = self._pending + delta
+        self._pending = ""
+
+        # Earliest action marker wins
+        start, marker = -1, None
+        for candidate in (*CALL_MARKERS, ANSWER_OPEN):
+            index = text.find(candidate)
+            if index != -1 and (start == -1 or index < start):
+                start, marker = index, candidate
+
+        if marker is None:
+            text = self._strip_think_tags(text)
+            for size in range(min(len(text), _MAX_HOLDBACK), 0, -1):
+                if text[-size:] in _HOLDBACK:
+                    text, self._pending = text[:-size], text[-size:]
+                    break
+            if not text:
+                return []
+            self._thinking.append(text)
+            return [StreamEvent(THINKING, text)]
+
+        events = []
+        thinking = self._strip_think_tags(text[:start])
+        if thinking:
+            self._thinking.append(thinking)
+            events.append(StreamEvent(THINKING, thinking))
+        self._marker = marker
+        events.append(StreamEvent(ACTION_START, marker))
+
+        if marker != ANSWER_OPEN:
+            # The call scanner needs to see the marker's opening parenthesis
+            self._scan(marker)
+        events.extend(self._feed_action(text[start + len(marker) :]))
+        return events
+
+    def _feed_action(self, delta: str) -> list[StreamEvent]:
+        if not delta:
+            return []
+        self._action.append(delta)
+        if self.complete_action is not None:
+            return []
+
+        if not self._call_done:
+            self._scan(delta)
+        if self.complete_action is None and self._marker == ANSWER_OPEN:
+            self._check_answer_close(delta)
+
+        if self.complete_action is None:
+            return []
+        return [StreamEvent(ACTION_COMPLETE, self.complete_action)]
+
+    def _scan(self, text: str) -> None:
+        """Advance the parenthesis/quote scanner over new action text."""
+        for i, char in enumerate(text):
+            if self._quote:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == self._quote:
+                    self._quote = None
+            elif char in ("'", '"'):
+                self._quote = char
+            elif char == "(":
+                self._depth += 1
+            elif char == ")":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._call_done = True
+                    end = self._scanned + i + 1
+                    self.complete_action = _parse_call(self._call_text()[:end])
+                    return
+        self._scanned += len(text)
+
+    def _call_text(self) -> str:
+        """Action text as seen by the scanner (including a call marker)."""
+        action = "".join(self._action)
+        if self._marker == ANSWER_OPEN:
+            return action
+        return self._marker + action
+
+    def _check_answer_close(self, delta: str) -> None:
+        """Complete a non-call answer when </answer> arrives."""
+        window = self._answer_tail + delta
+        self._answer_tail = window[-(len(ANSWER_CLOSE) - 1) :]
+        if ANSWER_CLOSE not in window:
+            return
+        answer = "".join(self._action).split(ANSWER_CLOSE, 1)[0].strip()
+        self.complete_action = answer or None
+
+    @staticmethod
+    def _strip_think_tags(text: str) -> str:
+        for tag in THINK_TAGS:
+            text = text.replace(tag, "")
+        return text
+
+
+def _parse_call(text: str) -> str | None:
+    """Return text (without leading whitespace) if it is a call expression."""
+    text = text.lstrip()
+    escaped = text.replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t")
+    try:
+        tree = ast.parse(escaped, mode="eval")
+    except SyntaxError:
+        return None
+    return text if isinstance(tree.body, ast.Call) else None
+
+
+def extract_complete_action(text: str) -> str | None:
+    """
+    Return the leading ``do(...)``/``finish(...)`` call once it is complete.
+
+    The call is complete when its parentheses balance outside string
+    literals and it parses as a Python call expression.
+
+    Args:
+        text: Response content starting at the action marker.
+
+    Returns:
+        The complete call expression, or None if more content is needed.
+    """
+    parser = StreamParser()
+    parser.feed(text)
+    return parser.complete_action
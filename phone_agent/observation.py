@@ -0,0 +1,184 @@
+"""Parallel capture of the screen state observed at the start of each step."""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+
+@dataclass
+class Observation:
+    """Screen state captured for a single agent step."""
+
+    screenshot: Any
+    current_app: str
+    # Per-part timings (seconds)
+    screenshot_time: float = 0.0
+    current_app_time: float = 0.0
+    total_time: float = 0.0
+    # Errors from parts that failed over, keyed by part name
+    errors: dict[str, str] = field(default_factory=dict)
+    # Screen fingerprint, computed when a trajectory store is in use
+    fingerprint: int | None = None
+
+
+class ObservationCapturer:
+    """
+    Captures the screenshot and the current app concurrently.
+
+    Both lookups are independent device round trips, so the current app is
+    resolved on a small per-agent worker thread while the screenshot is taken
+    on the calling thread. If the current-app lookup fails, the last known app
+    (or "System Home") is used and the error is recorded on the Observation.
+    Screenshot errors are raised once the other part has completed.
+
+    Args:
+        get_screenshot: Callable returning a Screenshot.
+        get_current_app: Callable returning the current app name.
+        parallel: Run both parts concurrently. If False, run them in order.
+    """
+
+    def __init__(
+        self,
+        get_screenshot: Callable[[], Any],
+        get_current_app: Callable[[], str],
+        parallel: bool = True,
+    ):
+        self.get_screenshot = get_screenshot
+        self.get_current_app = get_current_app
+        self.parallel = parallel
+        self._last_app = "System Home"
+        self._executor: ThreadPoolExecutor | None = None
+
+    def capture(self) -> Observation:
+        """
+        Capture the current screen state.
+
+        Returns:
+            Observation with the screenshot, current app and timings.
+        """
+        start = time.perf_counter()
+
+        if self.parallel:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="observe"
+                )
+            app_future = self._executor.submit(self._timed, self.get_current_app)
+            screenshot, screenshot_time, screenshot_error = self._timed(
+                self.get_screenshot
+            )
+            current_app, current_app_time, app_error = app_future.result()
+        else:
+            screenshot, screenshot_time, screenshot_error = self._timed(
+                self.get_screenshot
+            )
+            current_app, current_app_time, app_error = self._timed(self.get_current_app)
+
+        if screenshot_error is not None:
+            raise screenshot_error
+
+        errors = {}
+        if app_error is not None:
+            errors["current_app"] = str(app_error)
+            current_app = self._last_app
+        else:
+            self._last_app = current_app
+
+        return Observation(
+            screenshot=screenshot,
+            current_app=current_app,
+            screenshot_time=screenshot_time,
+            current_app_time=current_app_time,
+            total_time=time.perf_counter() - start,
+            errors=errors,
+        )
+
+    def close(self) -> None:
+        """Shut down the worker thread."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    @staticmethod
+    def _timed(fn: Callable[[], Any]) -> tuple[Any, float, Exception | None]:
+        """Run fn and return (result, elapsed seconds, error)."""
+        start = time.perf_counter()
+        try:
+            result, error = fn(), None
+        except Exception as e:
+            result, error = None, e
+        return result, time.perf_counter() - start, error
+
+
+class AsyncObservationCapturer:
+    """
+    Asyncio counterpart of ObservationCapturer.
+
+    Both parts are awaited concurrently on the event loop, with the same
+    fallback to the last known app when the current-app lookup fails.
+
+    Args:
+        get_screenshot: Coroutine function returning a Screenshot.
+        get_current_app: Coroutine function returning the current app name.
+    """
+
+    def __init__(
+        self,
+        get_screenshot: Callable[[], Awaitable[Any]],
+        get_current_app: Callable[[], Awaitable[str]],
+    ):
+        self.get_screenshot = get_screenshot
+        self.get_current_app = get_current_app
+        self._last_app = "System Home"
+
+    async def capture(self) -> Observation:
+        """
+        Capture the current screen state.
+
+        Returns:
+            Observation with the screenshot, current app and timings.
+        """
+        start = time.perf_counter()
+        (
+            (screenshot, screenshot_time, screenshot_error),
+            (
+                current_app,
+                current_app_time,
+                app_error,
+            ),
+        ) = await asyncio.gather(
+            self._timed(self.get_screenshot), self._timed(self.get_current_app)
+        )
+
+        if screenshot_error is not None:
+            raise screenshot_error
+
+        errors = {}
+        if app_error is not None:
+            errors["current_app"] = str(app_error)
+            current_app = self._last_app
+        else:
+            self._last_app = current_app
+
+        return Observation(
+            screenshot=screenshot,
+            current_app=current_app,
+            screenshot_time=screenshot_time,
+            current_app_time=current_app_time,
+            total_time=time.perf_counter() - start,
+            errors=errors,
+        )
+
+    @staticmethod
+    async def _timed(
+        fn: Callable[[], Awaitable[Any]],
+    ) -> tuple[Any, float, Exception | None]:
+        """Await fn and return (result, elapsed seconds, error)."""
+        start = time.perf_counter()
+        try:
+            result, error = await fn(), None
+        except Exception as e:
+            result, error = None, e
+        return result, time.perf_counter() - start, error
@@ -0,0 +1,61 @@
+"""Stage workers for the pipelined agent loop."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class StepPipeline:
+    """
+    Worker threads that let agent step stages overlap.
+
+    Device stages (observe, act, settle) run in order on a single device
+    worker, so the device never sees two commands at once. Background stages
+    (logging, step callbacks, persistence) run on a separate worker and never
+    block the device or the model. Inference stays on the calling thread.
+
+    Example:
+        >>> pipeline = StepPipeline()
+        >>> act = pipeline.device(handler.execute, action, width, height)
+        >>> next_observation = pipeline.device(observer.capture)
+        >>> pipeline.background(save_step, step_result)
+    """
+
+    def __init__(self):
+        self._device: ThreadPoolExecutor | None = None
+        self._background: ThreadPoolExecutor | None = None
+        self._pending: list[Future] = []
+
+    def device(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Queue a device stage. Device stages run strictly in order."""
+        if self._device is None:
+            self._device = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="pipeline-device"
+            )
+        return self._device.submit(fn, *args, **kwargs)
+
+    def background(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Queue a background stage that nothing waits on until drain()."""
+        if self._background is None:
+            self._background = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="pipeline-background"
+            )
+        future = self._background.submit(fn, *args, **kwargs)
+        self._pending.append(future)
+        return future
+
+    def drain(self) -> None:
+        """Wait for all queued background stages and re-raise their errors."""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self) -> None:
+        """Drain background work and stop the workers."""
+        try:
+            self.drain()
+        finally:
+            for executor in (self._device, self._background):
+                if executor is not None:
+                    executor.shutdown(wait=True)
+            self._device = None
+            self._background = None
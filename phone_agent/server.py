@@ -0,0 +1,506 @@
+"""Long-running HTTP service that runs tasks on warm, per-device agents."""
+
+import json
+import queue
+import re
+import threading
+import time
+import traceback
+import uuid
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+from phone_agent.agent import PhoneAgent, StepResult
+from phone_agent.budget import StopReason
+from phone_agent.model.http_pool import pool_stats
+from phone_agent.model.retry import get_retry_policy
+
+# Task states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+@dataclass
+class ServiceConfig:
+    """Configuration for AgentService."""
+
+    host: str = "127.0.0.1"
+    port: int = 8080
+    max_history: int = 1000  # Finished tasks kept for status queries
+    heartbeat: float = 15.0  # Seconds between SSE keep-alive comments
+
+
+class ServiceTask:
+    """A submitted task, its state and its event log."""
+
+    def __init__(
+        self,
+        task: str,
+        device_id: str | None,
+        deadline: float | None = None,
+        token_budget: int | None = None,
+    ):
+        self.task_id = uuid.uuid4().hex[:12]
+        self.task = task
+        self.device_id = device_id
+        self.deadline = deadline
+        self.token_budget = token_budget
+        self.status = QUEUED
+        self.message: str | None = None
+        self.reason: str | None = None
+        self.created_at = time.time()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.events: list[dict[str, Any]] = []
+        self.agent: PhoneAgent | None = None  # Set while running
+        self.cancel_requested = False
+        self._condition = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (COMPLETED, FAILED, CANCELLED)
+
+    def emit(self, event: str, data: dict[str, Any]) -> None:
+        """Append an event and wake up the streams following the task."""
+        with self._condition:
+            self.events.append({"id": len(self.events), "event": event, "data": data})
+            self._condition.notify_all()
+
+    @property
+    def ended(self) -> bool:
+        """Whether the final end event has been emitted."""
+        return bool(self.events) and self.events[-1]["event"] == "end"
+
+    def events_after(self, index: int, timeout: float) -> list[dict[str, Any]]:
+        """
+        Events from index on, waiting up to timeout for new ones.
+
+        Once the task has ended, a client past the end gets the end event
+        again, so it can close instead of waiting for events that never come.
+        """
+        with self._condition:
+            if index >= len(self.events) and not self.ended:
+                self._condition.wait(timeout)
+            if index >= len(self.events) and self.ended:
+                return self.events[-1:]
+            return self.events[index:]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.task_id,
+            "task": self.task,
+            "device_id": self.device_id,
+            "status": self.status,
+            "message": self.message,
+            "reason": self.reason,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class AgentService:
+    """
+    Runs submitted tasks on one long-lived agent per device.
+
+    Agents, and with them model HTTP connections and device sessions, are
+    built once per device and reused, so a task only pays for its own steps.
+    Each device runs one task at a time from its own queue; tasks without a
+    device go to the least loaded one.
+
+    Args:
+        agent_factory: Callable building the agent for a device ID.
+        device_ids: Devices to serve.
+        config: Service configuration.
+
+    Example:
+        >>> service = AgentService(create_agent, ["emulator-5554"])
+        >>> service.serve_forever()
+        # POST /tasks {"task": "..."}, then GET /tasks/<id>/events
+    """
+
+    def __init__(
+        self,
+        agent_factory: Callable[[str], PhoneAgent],
+        device_ids: list[str],
+        config: ServiceConfig | None = None,
+    ):
+        if not device_ids:
+            raise ValueError("No devices to serve")
+        self.agent_factory = agent_factory
+        self.device_ids = device_ids
+        self.config = config or ServiceConfig()
+        self._queues = {device_id: queue.Queue() for device_id in device_ids}
+        self._busy: dict[str, ServiceTask | None] = dict.fromkeys(device_ids)
+        self._errors: dict[str, str] = {}
+        self._tasks: dict[str, ServiceTask] = {}
+        self._lock = threading.Lock()
+        self._workers: list[threading.Thread] = []
+        self._httpd: ThreadingHTTPServer | None = None
+
+    def start(self) -> None:
+        """Start one worker thread per device."""
+        for device_id in self.device_ids:
+            worker = threading.Thread(
+                target=self._worker,
+                args=(device_id,),
+                name=f"service-{device_id}",
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def serve_forever(self) -> None:
+        """Start the workers and serve HTTP until shutdown()."""
+        self.start()
+        self._httpd = ThreadingHTTPServer(
+            (self.config.host, self.config.port), _make_handler(self)
+        )
+        self._httpd.daemon_threads = True
+        self._httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serving HTTP, cancel running tasks and stop the workers."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+        with self._lock:
+            running = [task for task in self._busy.values() if task is not None]
+        for task in running:
+            self.cancel(task.task_id)
+        for device_queue in self._queues.values():
+            device_queue.put(None)  # Workers exit after their current task
+
+    @property
+    def server_address(self) -> tuple[str, int] | None:
+        """Bound (host, port), e.g. when serving on port 0."""
+        return self._httpd.server_address if self._httpd is not None else None
+
+    def submit(
+        self,
+        task: str,
+        device_id: str | None = None,
+        deadline: float | None = None,
+        token_budget: int | None = None,
+    ) -> ServiceTask:
+        """
+        Queue a task.
+
+        Args:
+            task: Natural language description of the task.
+            device_id: Device to run on; None picks the least loaded device.
+            deadline: Optional wall-clock budget of the run, in seconds.
+            token_budget: Optional token budget of the run.
+
+        Returns:
+            The queued ServiceTask.
+
+        Raises:
+            ValueError: If the device is not served.
+        """
+        if device_id is not None and device_id not in self._queues:
+            raise ValueError(f"Unknown device: {device_id}")
+        with self._lock:
+            if device_id is None:
+                # Skip devices whose agent could not be built, if possible
+                candidates = [
+                    d for d in self.device_ids if d not in self._errors
+                ] or self.device_ids
+                device_id = min(candidates, key=self._load)
+            service_task = ServiceTask(task, device_id, deadline, token_budget)
+            self._tasks[service_task.task_id] = service_task
+            self._prune()
+        service_task.emit("status", {"status": QUEUED, "device_id": device_id})
+        self._queues[device_id].put(service_task)
+        return service_task
+
+    def get(self, task_id: str) -> ServiceTask | None:
+        with self._lock:
+            return self._tasks.get(task_id)
+
+    def tasks(self) -> list[ServiceTask]:
+        with self._lock:
+            return list(self._tasks.values())
+
+    def cancel(self, task_id: str) -> ServiceTask | None:
+        """
+        Cancel a queued or running task.
+
+        Queued tasks are dropped; running ones stop before their next stage.
+
+        Returns:
+            The task, or None if it does not exist.
+        """
+        with self._lock:
+            service_task = self._tasks.get(task_id)
+            if service_task is None or service_task.done:
+                return service_task
+            if service_task.status == QUEUED:
+                self._finish(service_task, CANCELLED, "Task cancelled", "cancelled")
+                return service_task
+            service_task.cancel_requested = True
+            agent = service_task.agent
+        if agent is not None:
+            agent.cancel()
+        return service_task
+
+    def health(self) -> dict[str, Any]:
+        """Device, task and model connection overview."""
+        with self._lock:
+            devices = [
+                {
+                    "device_id": device_id,
+                    "running": (
+                        self._busy[device_id].task_id
+                        if self._busy[device_id] is not None
+                        else None
+                    ),
+                    "queued": self._queues[device_id].qsize(),
+                    "error": self._errors.get(device_id),
+                }
+                for device_id in self.device_ids
+            ]
+            statuses: dict[str, int] = {}
+            for service_task in self._tasks.values():
+                status = service_task.status
+                statuses[status] = statuses.get(status, 0) + 1
+        pools = [
+            {
+                "base_url": pool.base_url,
+                "requests": pool.requests,
+                "connections_opened": pool.connections_opened,
+                "in_flight": pool.in_flight,
+                "peak_in_flight": pool.peak_in_flight,
+                "max_connections": pool.max_connections,
+                "http2": pool.http2,
+            }
+            for pool in pool_stats()
+        ]
+        circuits = [asdict(circuit) for circuit in get_retry_policy().stats()]
+        return {
+            "devices": devices,
+            "tasks": statuses,
+            "model_pools": pools,
+            "model_circuits": circuits,
+        }
+
+    def _load(self, device_id: str) -> int:
+        """Queued plus running tasks of a device. Holds the lock."""
+        busy = self._busy[device_id] is not None
+        return self._queues[device_id].qsize() + busy
+
+    def _prune(self) -> None:
+        """Forget the oldest finished tasks beyond max_history. Holds the lock."""
+        finished = [t for t in self._tasks.values() if t.done]
+        excess = len(finished) - self.config.max_history
+        for service_task in finished[: max(excess, 0)]:
+            del self._tasks[service_task.task_id]
+
+    def _finish(
+        self, service_task: ServiceTask, status: str, message: str, reason: str
+    ) -> None:
+        service_task.status = status
+        service_task.message = message
+        service_task.reason = reason
+        service_task.finished_at = time.time()
+        service_task.emit("end", service_task.to_dict())
+
+    def _worker(self, device_id: str) -> None:
+        """Run the device's tasks on its agent, one at a time."""
+        try:
+            agent = self.agent_factory(device_id)
+        except Exception as e:
+            traceback.print_exc()
+            with self._lock:
+                self._errors[device_id] = str(e)
+            agent = None
+
+        try:
+            while True:
+                service_task = self._queues[device_id].get()
+                if service_task is None:
+                    return  # Shut down
+                with self._lock:
+                    if service_task.done:
+                        continue  # Cancelled while queued
+                    if agent is None:
+                        self._finish(
+                            service_task, FAILED, self._errors[device_id], "exception"
+                        )
+                        continue
+                    service_task.status = RUNNING
+                    service_task.started_at = time.time()
+                    service_task.agent = agent
+                    self._busy[device_id] = service_task
+                service_task.emit("status", {"status": RUNNING, "device_id": device_id})
+                self._run(agent, service_task)
+        finally:
+            if agent is not None:
+                agent.close()
+
+    def _run(self, agent: PhoneAgent, service_task: ServiceTask) -> None:
+        agent.reset()
+        agent.step_callback = lambda result: self._on_step(agent, service_task, result)
+        try:
+            message = agent.run(
+                service_task.task,
+                deadline=service_task.deadline,
+                token_budget=service_task.token_budget,
+            )
+            run = agent.last_run
+            status = {
+                StopReason.FINISHED: COMPLETED,
+                StopReason.CANCELLED: CANCELLED,
+            }.get(run.reason, FAILED)
+            reason = run.reason.value
+        except Exception as e:
+            traceback.print_exc()
+            message, status, reason = str(e), FAILED, "exception"
+        finally:
+            agent.step_callback = None
+
+        with self._lock:
+            service_task.agent = None
+            self._busy[service_task.device_id] = None
+            self._finish(service_task, status, message, reason)
+
+    @staticmethod
+    def _on_step(
+        agent: PhoneAgent, service_task: ServiceTask, result: StepResult
+    ) -> None:
+        """Publish a finished step as an event."""
+        if service_task.cancel_requested:
+            # The run's budget may have been created after cancel() was called
+            agent.cancel()
+        budget = agent.budget
+        service_task.emit(
+            "step",
+            {
+                "step": agent.step_count,
+                "thinking": result.thinking,
+                "action": result.action,
+                "message": result.message,
+                "success": result.success,
+                "finished": result.finished,
+                "timings": {
+                    stage: round(timing.last, 3)
+                    for stage, timing in budget.timings.items()
+                },
+                "elapsed": round(budget.elapsed, 3),
+                "tokens_used": budget.tokens_used,
+            },
+        )
+
+
+_TASK_PATH = re.compile(r"^/tasks/([0-9a-f]+)(/events|/cancel)?$")
+
+
+def _make_handler(service: AgentService) -> type[BaseHTTPRequestHandler]:
+    """Build the request handler class bound to a service."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path == "/health":
+                return self._json(200, service.health())
+            if path == "/tasks":
+                return self._json(200, [t.to_dict() for t in service.tasks()])
+            match = _TASK_PATH.match(path)
+            if match is None or match.group(2) == "/cancel":
+                return self._json(404, {"error": "Not found"})
+            service_task = service.get(match.group(1))
+            if service_task is None:
+                return self._json(404, {"error": "Unknown task"})
+            if match.group(2) == "/events":
+                return self._stream(service_task)
+            return self._json(200, service_task.to_dict())
+
+        def do_POST(self):
+            path = self.path.split("?")[0]
+            match = _TASK_PATH.match(path)
+            if match is not None and match.group(2) == "/cancel":
+                return self._cancel(match.group(1))
+            if path != "/tasks":
+                return self._json(404, {"error": "Not found"})
+
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                service_task = service.submit(
+                    body["task"],
+                    device_id=body.get("device_id"),
+                    deadline=body.get("deadline"),
+                    token_budget=body.get("token_budget"),
+                )
+            except (ValueError, KeyError, TypeError) as e:
+                return self._json(400, {"error": f"Bad request: {e}"})
+            self._json(202, service_task.to_dict())
+
+        def do_DELETE(self):
+            match = _TASK_PATH.match(self.path.split("?")[0])
+            if match is None or match.group(2) is not None:
+                return self._json(404, {"error": "Not found"})
+            self._cancel(match.group(1))
+
+        def _cancel(self, task_id: str):
+            service_task = service.cancel(task_id)
+            if service_task is None:
+                return self._json(404, {"error": "Unknown task"})
+            self._json(200, service_task.to_dict())
+
+        def _json(self, status: int, payload: Any):
+            body = json.dumps(payload, ensure_ascii=False).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream(self, service_task: ServiceTask):
+            """Stream the task's events as SSE until it ends."""
+            # Resume after the last event a reconnecting client saw
+            index = 0
+            last_event_id = self.headers.get("Last-Event-ID")
+            if last_event_id is not None:
+                try:
+                    index = int(last_event_id) + 1
+                except ValueError:
+                    index = -1
+                if index < 0:
+                    return self._json(400, {"error": "Invalid Last-Event-ID"})
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+
+            try:
+                while True:
+                    events = service_task.events_after(index, service.config.heartbeat)
+                    if not events:
+                        self.wfile.write(b": keep-alive\n\n")
+                    for event in events:
+                        data = json.dumps(event["data"], ensure_ascii=False)
+                        self.wfile.write(
+                            f"id: {event['id']}\nevent: {event['event']}\n"
+                            f"data: {data}\n\n".encode()
+                        )
+                        index = event["id"] + 1
+                    self.wfile.flush()
+                    if events and events[-1]["event"] == "end":
+                        return
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return Handler
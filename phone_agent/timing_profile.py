@@ -0,0 +1,266 @@
+"""Adaptive post-action delays learned from measured settle times."""
+
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from phone_agent.config.timing import TIMING_CONFIG
+from phone_agent.trajectory import fingerprint_distance
+
+# Actions with a post-action delay, and the DeviceTimingConfig field it replaces
+ACTION_DELAY_FIELDS = {
+    "Tap": "default_tap_delay",
+    "Double Tap": "default_double_tap_delay",
+    "Long Press": "default_long_press_delay",
+    "Swipe": "default_swipe_delay",
+    "Back": "default_back_delay",
+    "Home": "default_home_delay",
+    "Launch": "default_launch_delay",
+}
+
+
+def default_delay(action: str) -> float | None:
+    """The configured global delay for an action, if it has one."""
+    field_name = ACTION_DELAY_FIELDS.get(action)
+    if field_name is None:
+        return None
+    return getattr(TIMING_CONFIG.device, field_name)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of a non-empty list (q in [0, 1])."""
+    ordered = sorted(values)
+    rank = max(math.ceil(q * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def measure_settle(
+    get_fingerprint: Callable[[], int],
+    timeout: float = 3.0,
+    interval: float = 0.05,
+    stable_frames: int = 2,
+    max_distance: int = 2,
+) -> float:
+    """
+    Measure how long the screen takes to stop changing.
+
+    Polls screen fingerprints until stable_frames consecutive frames match,
+    and returns the time at which the first of them was captured. Resolution
+    is bounded by how fast screenshots can be taken.
+
+    Args:
+        get_fingerprint: Callable returning the current screen fingerprint.
+        timeout: Give up and return the elapsed time after this many seconds.
+        interval: Pause between polls.
+        stable_frames: Matching frames required to call the screen stable.
+        max_distance: Fingerprint bits two matching frames may differ by.
+
+    Returns:
+        Settle time in seconds since the call.
+    """
+    start = time.perf_counter()
+    previous = get_fingerprint()
+    changed_at = 0.0
+    stable = 1
+    while True:
+        elapsed = time.perf_counter() - start
+        if stable >= stable_frames or elapsed >= timeout:
+            return changed_at if stable >= stable_frames else elapsed
+        time.sleep(interval)
+        captured_at = time.perf_counter() - start
+        current = get_fingerprint()
+        if fingerprint_distance(previous, current) <= max_distance:
+            stable += 1
+        else:
+            changed_at = captured_at
+            stable = 1
+        previous = current
+
+
+@dataclass
+class TimingProfile:
+    """Learned settle time statistics for one (device, app, action)."""
+
+    device: str
+    app: str
+    action: str
+    samples: int
+    p50: float
+    p90: float
+    delay: float | None  # Delay in use, or None while still learning
+    default: float | None  # Global delay from config/timing.py
+
+
+class TimingProfileStore:
+    """
+    Settle time samples per (device model, app, action), with learned delays.
+
+    Until an entry has min_samples samples, it has no learned delay and the
+    caller should measure. After that the delay is the chosen percentile of
+    the recent samples plus margin, clamped to [min_delay, max_delay].
+
+    A learned entry is never sampled again: AdaptiveTiming only measures
+    entries that are still learning. If an app's timing changes, e.g. after
+    an update, its delay does not follow; delete the entry or the file to
+    learn it anew.
+
+    Args:
+        path: Optional JSON file to persist samples to.
+        quantile: Percentile of the settle times to cover (0.9 = p90).
+        margin: Seconds added on top of the percentile.
+        min_samples: Samples needed before a learned delay is used.
+        max_samples: Most recent samples kept per entry.
+        min_delay: Lower bound for learned delays.
+        max_delay: Upper bound for learned delays.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        quantile: float = 0.9,
+        margin: float = 0.1,
+        min_samples: int = 5,
+        max_samples: int = 50,
+        min_delay: float = 0.05,
+        max_delay: float = 5.0,
+    ):
+        self.path = path
+        self.quantile = quantile
+        self.margin = margin
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._samples: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._samples = json.load(f)
+
+    @staticmethod
+    def _key(device: str, app: str, action: str) -> str:
+        return f"{device}|{app}|{action}"
+
+    def record(self, device: str, app: str, action: str, seconds: float) -> None:
+        """Add a measured settle time and persist the store."""
+        with self._lock:
+            samples = self._samples.setdefault(self._key(device, app, action), [])
+            samples.append(round(seconds, 3))
+            del samples[: -self.max_samples]
+            if self.path:
+                self._save()
+
+    def delay_for(self, device: str, app: str, action: str) -> float | None:
+        """Learned delay for an entry, or None if it needs more samples."""
+        with self._lock:
+            samples = self._samples.get(self._key(device, app, action), [])
+            if len(samples) < self.min_samples:
+                return None
+            delay = percentile(samples, self.quantile) + self.margin
+        return min(max(delay, self.min_delay), self.max_delay)
+
+    def profiles(self) -> list[TimingProfile]:
+        """All entries with their statistics, sorted by key."""
+        with self._lock:
+            items = sorted(self._samples.items())
+        profiles = []
+        for key, samples in items:
+            device, app, action = key.split("|", 2)
+            profiles.append(
+                TimingProfile(
+                    device=device,
+                    app=app,
+                    action=action,
+                    samples=len(samples),
+                    p50=percentile(samples, 0.5),
+                    p90=percentile(samples, 0.9),
+                    delay=self.delay_for(device, app, action),
+                    default=default_delay(action),
+                )
+            )
+        return profiles
+
+    def _save(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._samples, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+class AdaptiveTiming:
+    """
+    Chooses post-action delays for an ActionHandler and learns new ones.
+
+    delay_for() is the handler's delay provider. Entries with a learned delay
+    use it. Entries still learning get no fixed delay; instead settle(),
+    called right after the action, polls the screen until it is stable and
+    records how long that took.
+
+    Args:
+        store: Profile store to read from and record into.
+        get_device: Callable returning the device model.
+        get_app: Callable returning the app the action was taken in.
+        get_fingerprint: Callable returning the current screen fingerprint.
+        settle_timeout: Longest time to poll while learning.
+    """
+
+    def __init__(
+        self,
+        store: TimingProfileStore,
+        get_device: Callable[[], str],
+        get_app: Callable[[], str],
+        get_fingerprint: Callable[[], int],
+        settle_timeout: float = 3.0,
+    ):
+        self.store = store
+        self.get_device = get_device
+        self.get_app = get_app
+        self.get_fingerprint = get_fingerprint
+        self.settle_timeout = settle_timeout
+        self._device: str | None = None
+        self._learning: tuple[str, str] | None = None  # (app, action)
+
+    @property
+    def device(self) -> str:
+        """Device model, looked up once."""
+        if self._device is None:
+            self._device = self.get_device()
+        return self._device
+
+    def delay_for(self, action: str) -> float | None:
+        """
+        Delay to apply after an action.
+
+        Returns:
+            The learned delay, 0 while learning (settle() does the waiting),
+            or None to keep the configured default.
+        """
+        self._learning = None
+        if action not in ACTION_DELAY_FIELDS:
+            return None
+        app = self.get_app()
+        delay = self.store.delay_for(self.device, app, action)
+        if delay is not None:
+            return delay
+        self._learning = (app, action)
+        return 0.0
+
+    def settle(self) -> float | None:
+        """
+        Wait for the screen to settle after a learning action and record it.
+
+        Returns:
+            The measured settle time, or None if nothing was being learned.
+        """
+        if self._learning is None:
+            return None
+        app, action = self._learning
+        self._learning = None
+        seconds = measure_settle(self.get_fingerprint, timeout=self.settle_timeout)
+        self.store.record(self.device, app, action, seconds)
+        return seconds
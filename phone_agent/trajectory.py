@@ -0,0 +1,196 @@
+"""Recording and replay of known-good action sequences for repeated tasks."""
+
+import base64
+import json
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass, field
+from io import BytesIO
+from typing import Callable
+
+from PIL import Image
+
+
+def screen_fingerprint(base64_data: str) -> int:
+    """
+    Compute a 64-bit difference hash (dHash) of a screenshot.
+
+    The image is shrunk to 9x8 grayscale pixels and each bit records whether a
+    pixel is brighter than its right neighbour. Small rendering differences
+    (clock, battery, animations) change only a few bits.
+
+    Args:
+        base64_data: Base64-encoded screenshot.
+
+    Returns:
+        Fingerprint as an integer.
+    """
+    image = Image.open(BytesIO(base64.b64decode(base64_data)))
+    small = image.resize((9, 8), Image.Resampling.BILINEAR).convert("L")
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def fingerprint_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+def normalize_task(task: str) -> str:
+    """Default task template: case- and whitespace-insensitive task text."""
+    return re.sub(r"\s+", " ", task.strip()).lower()
+
+
+@dataclass
+class TrajectoryStep:
+    """One recorded step: the screen it was taken on and the model's action."""
+
+    fingerprint: int
+    current_app: str
+    action: str  # Action text as returned by the model
+
+
+@dataclass
+class TrajectoryStats:
+    """Replay metrics, accumulated over all runs using a store."""
+
+    runs: int = 0  # Runs that looked up a trajectory
+    trajectory_hits: int = 0  # Runs with a recorded trajectory for the task
+    replayed_steps: int = 0  # Steps replayed instead of asking the model
+    model_steps: int = 0  # Steps that went to the model
+    divergences: int = 0  # Replays abandoned because the screen differed
+    recorded: int = 0  # Successful runs recorded
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of runs that found a trajectory to replay."""
+        return self.trajectory_hits / self.runs if self.runs else 0.0
+
+    @property
+    def model_calls_saved(self) -> int:
+        """Model requests avoided by replaying."""
+        return self.replayed_steps
+
+
+class TrajectoryStore:
+    """
+    Store of successful runs, keyed by task template.
+
+    Trajectories are kept in memory and, if a path is given, in a JSON file
+    that is loaded on creation and rewritten atomically on each record.
+
+    Args:
+        path: Optional JSON file to persist trajectories to.
+        key_fn: Maps a task to its template key. Defaults to normalize_task.
+        max_distance: Maximum fingerprint distance (bits) for a screen to
+            count as the recorded one.
+
+    Example:
+        >>> store = TrajectoryStore("trajectories.json")
+        >>> agent = PhoneAgent(agent_config=AgentConfig(trajectory_store=store))
+        >>> agent.run("Open Settings")  # Recorded
+        >>> agent.run("open settings")  # Replayed without model calls
+        >>> store.stats.model_calls_saved
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        key_fn: Callable[[str], str] = normalize_task,
+        max_distance: int = 6,
+    ):
+        self.path = path
+        self.key_fn = key_fn
+        self.max_distance = max_distance
+        self.stats = TrajectoryStats()
+        self._trajectories: dict[str, list[TrajectoryStep]] = {}
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            self._load()
+
+    def lookup(self, task: str) -> list[TrajectoryStep] | None:
+        """Return the recorded trajectory for a task, if any."""
+        with self._lock:
+            steps = self._trajectories.get(self.key_fn(task))
+            self.stats.runs += 1
+            if steps:
+                self.stats.trajectory_hits += 1
+            return list(steps) if steps else None
+
+    def record(self, task: str, steps: list[TrajectoryStep]) -> None:
+        """Store the steps of a successful run, replacing any previous one."""
+        if not steps:
+            return
+        with self._lock:
+            self._trajectories[self.key_fn(task)] = list(steps)
+            self.stats.recorded += 1
+            if self.path:
+                self._save()
+
+    def matches(self, step: TrajectoryStep, fingerprint: int, current_app: str) -> bool:
+        """Check whether the current screen is the one a step was recorded on."""
+        return (
+            step.current_app == current_app
+            and fingerprint_distance(step.fingerprint, fingerprint) <= self.max_distance
+        )
+
+    def count(self, replayed: bool) -> None:
+        """Count a step as replayed or sent to the model."""
+        with self._lock:
+            if replayed:
+                self.stats.replayed_steps += 1
+            else:
+                self.stats.model_steps += 1
+
+    def count_divergence(self) -> None:
+        """Count a replay abandoned on a screen mismatch."""
+        with self._lock:
+            self.stats.divergences += 1
+
+    def __len__(self) -> int:
+        return len(self._trajectories)
+
+    def _load(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        self._trajectories = {
+            key: [TrajectoryStep(**step) for step in steps]
+            for key, steps in data.items()
+        }
+
+    def _save(self) -> None:
+        data = {
+            key: [asdict(step) for step in steps]
+            for key, steps in self._trajectories.items()
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class TrajectoryRun:
+    """Replay and recording state of a single agent run."""
+
+    task: str
+    replay: list[TrajectoryStep] | None = None
+    recorded: list[TrajectoryStep] = field(default_factory=list)
+
+    def next_replay_step(self) -> TrajectoryStep | None:
+        """The recorded step expected next, while replay is still on track."""
+        if self.replay is None or len(self.recorded) >= len(self.replay):
+            return None
+        return self.replay[len(self.recorded)]
+
+    def record(self, fingerprint: int, current_app: str, action: str) -> None:
+        """Append the step just taken to the run's own trajectory."""
+        self.recorded.append(TrajectoryStep(fingerprint, current_app, action))
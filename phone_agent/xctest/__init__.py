@@ -17,11 +17,18 @@ from phone_agent.xctest.device import (
     swipe,
     tap,
 )
+from phone_agent.xctest.gestures import GestureSequence, perform_gestures
 from phone_agent.xctest.input import (
     clear_text,
     type_text,
 )
 from phone_agent.xctest.screenshot import get_screenshot
+from phone_agent.xctest.session import (
+    WDAHttpSession,
+    WDASessionConfig,
+    close_wda_http_sessions,
+    get_wda_http_session,
+)
 
 __all__ = [
     # Screenshot
@@ -44,4 +51,12 @@ __all__ = [
     "ConnectionType",
     "quick_connect",
     "list_devices",
+    # Batched gestures
+    "GestureSequence",
+    "perform_gestures",
+    # HTTP session pooling
+    "WDAHttpSession",
+    "WDASessionConfig",
+    "get_wda_http_session",
+    "close_wda_http_sessions",
 ]
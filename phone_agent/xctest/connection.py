@@ -5,6 +5,8 @@ import time
 from dataclasses import dataclass
 from enum import Enum
 
+from phone_agent.xctest.session import WDAHttpSession, get_wda_http_session
+
 
 class ConnectionType(Enum):
     """Type of iOS connection."""
@@ -44,15 +46,22 @@ class XCTestConnection:
         >>> is_ready = conn.is_wda_ready()
     """
 
-    def __init__(self, wda_url: str = "http://localhost:8100"):
+    def __init__(
+        self,
+        wda_url: str = "http://localhost:8100",
+        http_session: WDAHttpSession | None = None,
+    ):
         """
         Initialize iOS connection manager.
 
         Args:
             wda_url: WebDriverAgent URL (default: http://localhost:8100).
                      For network devices, use http://<device-ip>:8100
+            http_session: Optional pooled WDA HTTP session. Defaults to the
+                     shared session for wda_url.
         """
         self.wda_url = wda_url.rstrip("/")
+        self.http_session = http_session
 
     def list_devices(self) -> list[DeviceInfo]:
         """
@@ -204,11 +213,9 @@ class XCTestConnection:
             True if WDA is ready, False otherwise.
         """
         try:
-            import requests
+            http = self.http_session or get_wda_http_session(self.wda_url)
 
-            response = requests.get(
-                f"{self.wda_url}/status", timeout=timeout, verify=False
-            )
+            response = http.get(f"{self.wda_url}/status", timeout=timeout)
             return response.status_code == 200
         except ImportError:
             print(
@@ -226,13 +233,12 @@ class XCTestConnection:
             Tuple of (success, session_id or error_message).
         """
         try:
-            import requests
+            http = self.http_session or get_wda_http_session(self.wda_url)
 
-            response = requests.post(
+            response = http.post(
                 f"{self.wda_url}/session",
                 json={"capabilities": {}},
                 timeout=30,
-                verify=False,
             )
 
             if response.status_code in (200, 201):
@@ -260,9 +266,9 @@ class XCTestConnection:
             Status dictionary or None if not available.
         """
         try:
-            import requests
+            http = self.http_session or get_wda_http_session(self.wda_url)
 
-            response = requests.get(f"{self.wda_url}/status", timeout=5, verify=False)
+            response = http.get(f"{self.wda_url}/status", timeout=5)
 
             if response.status_code == 200:
                 return response.json()
@@ -5,6 +5,8 @@ import time
 from typing import Optional
 
 from phone_agent.config.apps_ios import APP_PACKAGES_IOS as APP_PACKAGES
+from phone_agent.xctest.gestures import GestureSequence, perform_gestures
+from phone_agent.xctest.session import WDAHttpSession, get_wda_http_session
 
 SCALE_FACTOR = 3 # 3 for most modern iPhone 
 
@@ -29,7 +31,9 @@ def _get_wda_session_url(wda_url: str, session_id: str | None, endpoint: str) ->
 
 
 def get_current_app(
-    wda_url: str = "http://localhost:8100", session_id: str | None = None
+    wda_url: str = "http://localhost:8100",
+    session_id: str | None = None,
+    http_session: WDAHttpSession | None = None,
 ) -> str:
     """
     Get the currently active app bundle ID and name.
@@ -37,17 +41,16 @@ def get_current_app(
     Args:
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
+        http_session: Optional pooled WDA HTTP session.
 
     Returns:
         The app name if recognized, otherwise "System Home".
     """
     try:
-        import requests
+        http = http_session or get_wda_http_session(wda_url)
 
         # Get active app info from WDA using activeAppInfo endpoint
-        response = requests.get(
-            f"{wda_url.rstrip('/')}/wda/activeAppInfo", timeout=5, verify=False
-        )
+        response = http.get(f"{wda_url.rstrip('/')}/wda/activeAppInfo", timeout=5)
 
         if response.status_code == 200:
             data = response.json()
@@ -72,12 +75,25 @@ def get_current_app(
     return "System Home"
 
 
+def new_gesture_sequence() -> GestureSequence:
+    """Create an empty gesture sequence in this device's pixel coordinates."""
+    return GestureSequence(scale=SCALE_FACTOR)
+
+
+def add_back_gesture(sequence: GestureSequence) -> GestureSequence:
+    """Append the left-edge swipe used to navigate back."""
+    return sequence.swipe(
+        0, 640 * SCALE_FACTOR, 400 * SCALE_FACTOR, 640 * SCALE_FACTOR, 0.3
+    )
+
+
 def tap(
     x: int,
     y: int,
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
     delay: float = 1.0,
+    http_session: WDAHttpSession | None = None,
 ) -> None:
     """
     Tap at the specified coordinates using WebDriver W3C Actions API.
@@ -88,37 +104,11 @@ def tap(
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
         delay: Delay in seconds after tap.
+        http_session: Optional pooled WDA HTTP session.
     """
-    try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "actions")
-
-        # W3C WebDriver Actions API for tap/click
-        actions = {
-            "actions": [
-                {
-                    "type": "pointer",
-                    "id": "finger1",
-                    "parameters": {"pointerType": "touch"},
-                    "actions": [
-                        {"type": "pointerMove", "duration": 0, "x": x / SCALE_FACTOR, "y": y / SCALE_FACTOR},
-                        {"type": "pointerDown", "button": 0},
-                        {"type": "pause", "duration": 0.1},
-                        {"type": "pointerUp", "button": 0},
-                    ],
-                }
-            ]
-        }
-
-        requests.post(url, json=actions, timeout=15, verify=False)
-
-        time.sleep(delay)
-
-    except ImportError:
-        print("Error: requests library required. Install: pip install requests")
-    except Exception as e:
-        print(f"Error tapping: {e}")
+    sequence = new_gesture_sequence().tap(x, y)
+    perform_gestures(sequence, wda_url, session_id, http_session)
+    time.sleep(delay)
 
 
 def double_tap(
@@ -127,6 +117,7 @@ def double_tap(
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
     delay: float = 1.0,
+    http_session: WDAHttpSession | None = None,
 ) -> None:
     """
     Double tap at the specified coordinates using WebDriver W3C Actions API.
@@ -137,41 +128,11 @@ def double_tap(
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
         delay: Delay in seconds after double tap.
+        http_session: Optional pooled WDA HTTP session.
     """
-    try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "actions")
-
-        # W3C WebDriver Actions API for double tap
-        actions = {
-            "actions": [
-                {
-                    "type": "pointer",
-                    "id": "finger1",
-                    "parameters": {"pointerType": "touch"},
-                    "actions": [
-                        {"type": "pointerMove", "duration": 0, "x": x / SCALE_FACTOR, "y": y / SCALE_FACTOR},
-                        {"type": "pointerDown", "button": 0},
-                        {"type": "pause", "duration": 100},
-                        {"type": "pointerUp", "button": 0},
-                        {"type": "pause", "duration": 100},
-                        {"type": "pointerDown", "button": 0},
-                        {"type": "pause", "duration": 100},
-                        {"type": "pointerUp", "button": 0},
-                    ],
-                }
-            ]
-        }
-
-        requests.post(url, json=actions, timeout=10, verify=False)
-
-        time.sleep(delay)
-
-    except ImportError:
-        print("Error: requests library required. Install: pip install requests")
-    except Exception as e:
-        print(f"Error double tapping: {e}")
+    sequence = new_gesture_sequence().double_tap(x, y)
+    perform_gestures(sequence, wda_url, session_id, http_session)
+    time.sleep(delay)
 
 
 def long_press(
@@ -181,6 +142,7 @@ def long_press(
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
     delay: float = 1.0,
+    http_session: WDAHttpSession | None = None,
 ) -> None:
     """
     Long press at the specified coordinates using WebDriver W3C Actions API.
@@ -192,40 +154,18 @@ def long_press(
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
         delay: Delay in seconds after long press.
+        http_session: Optional pooled WDA HTTP session.
     """
-    try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "actions")
-
-        # W3C WebDriver Actions API for long press
-        # Convert duration to milliseconds
-        duration_ms = int(duration * 1000)
-
-        actions = {
-            "actions": [
-                {
-                    "type": "pointer",
-                    "id": "finger1",
-                    "parameters": {"pointerType": "touch"},
-                    "actions": [
-                        {"type": "pointerMove", "duration": 0, "x": x / SCALE_FACTOR, "y": y / SCALE_FACTOR},
-                        {"type": "pointerDown", "button": 0},
-                        {"type": "pause", "duration": duration_ms},
-                        {"type": "pointerUp", "button": 0},
-                    ],
-                }
-            ]
-        }
-
-        requests.post(url, json=actions, timeout=int(duration + 10), verify=False)
+    sequence = new_gesture_sequence().long_press(x, y, duration)
+    perform_gestures(sequence, wda_url, session_id, http_session)
+    time.sleep(delay)
 
-        time.sleep(delay)
 
-    except ImportError:
-        print("Error: requests library required. Install: pip install requests")
-    except Exception as e:
-        print(f"Error long pressing: {e}")
+def swipe_duration(start_x: int, start_y: int, end_x: int, end_y: int) -> float:
+    """Calculate a natural swipe duration in seconds based on distance."""
+    dist_sq = (start_x - end_x) ** 2 + (start_y - end_y) ** 2
+    duration = dist_sq / 1000000  # Convert to seconds
+    return max(0.3, min(duration, 2.0))  # Clamp between 0.3-2 seconds
 
 
 def swipe(
@@ -237,9 +177,10 @@ def swipe(
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
     delay: float = 1.0,
+    http_session: WDAHttpSession | None = None,
 ) -> None:
     """
-    Swipe from start to end coordinates using WDA dragfromtoforduration endpoint.
+    Swipe from start to end coordinates as a W3C drag.
 
     Args:
         start_x: Starting X coordinate.
@@ -250,41 +191,21 @@ def swipe(
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
         delay: Delay in seconds after swipe.
+        http_session: Optional pooled WDA HTTP session.
     """
-    try:
-        import requests
-
-        if duration is None:
-            # Calculate duration based on distance
-            dist_sq = (start_x - end_x) ** 2 + (start_y - end_y) ** 2
-            duration = dist_sq / 1000000  # Convert to seconds
-            duration = max(0.3, min(duration, 2.0))  # Clamp between 0.3-2 seconds
-
-        url = _get_wda_session_url(wda_url, session_id, "wda/dragfromtoforduration")
-
-        # WDA dragfromtoforduration API payload
-        payload = {
-            "fromX": start_x / SCALE_FACTOR,
-            "fromY": start_y / SCALE_FACTOR,
-            "toX": end_x / SCALE_FACTOR,
-            "toY": end_y / SCALE_FACTOR,
-            "duration": duration,
-        }
-
-        requests.post(url, json=payload, timeout=int(duration + 10), verify=False)
+    if duration is None:
+        duration = swipe_duration(start_x, start_y, end_x, end_y)
 
-        time.sleep(delay)
-
-    except ImportError:
-        print("Error: requests library required. Install: pip install requests")
-    except Exception as e:
-        print(f"Error swiping: {e}")
+    sequence = new_gesture_sequence().swipe(start_x, start_y, end_x, end_y, duration)
+    perform_gestures(sequence, wda_url, session_id, http_session)
+    time.sleep(delay)
 
 
 def back(
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
     delay: float = 1.0,
+    http_session: WDAHttpSession | None = None,
 ) -> None:
     """
     Navigate back (swipe from left edge).
@@ -293,39 +214,22 @@ def back(
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
         delay: Delay in seconds after navigation.
+        http_session: Optional pooled WDA HTTP session.
 
     Note:
         iOS doesn't have a universal back button. This simulates a back gesture
         by swiping from the left edge of the screen.
     """
-    try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "wda/dragfromtoforduration")
-
-        # Swipe from left edge to simulate back gesture
-        payload = {
-            "fromX": 0,
-            "fromY": 640,
-            "toX": 400,
-            "toY": 640,
-            "duration": 0.3,
-        }
-
-        requests.post(url, json=payload, timeout=10, verify=False)
-
-        time.sleep(delay)
-
-    except ImportError:
-        print("Error: requests library required. Install: pip install requests")
-    except Exception as e:
-        print(f"Error performing back gesture: {e}")
+    sequence = add_back_gesture(new_gesture_sequence())
+    perform_gestures(sequence, wda_url, session_id, http_session)
+    time.sleep(delay)
 
 
 def home(
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
     delay: float = 1.0,
+    http_session: WDAHttpSession | None = None,
 ) -> None:
     """
     Press the home button.
@@ -334,13 +238,14 @@ def home(
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
         delay: Delay in seconds after pressing home.
+        http_session: Optional pooled WDA HTTP session.
     """
     try:
-        import requests
+        http = http_session or get_wda_http_session(wda_url)
 
         url = f"{wda_url.rstrip('/')}/wda/homescreen"
 
-        requests.post(url, timeout=10, verify=False)
+        http.post(url, timeout=10)
 
         time.sleep(delay)
 
@@ -355,6 +260,7 @@ def launch_app(
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
     delay: float = 1.0,
+    http_session: WDAHttpSession | None = None,
 ) -> bool:
     """
     Launch an app by name.
@@ -364,6 +270,7 @@ def launch_app(
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
         delay: Delay in seconds after launching.
+        http_session: Optional pooled WDA HTTP session.
 
     Returns:
         True if app was launched, False if app not found.
@@ -372,14 +279,12 @@ def launch_app(
         return False
 
     try:
-        import requests
+        http = http_session or get_wda_http_session(wda_url)
 
         bundle_id = APP_PACKAGES[app_name]
         url = _get_wda_session_url(wda_url, session_id, "wda/apps/launch")
 
-        response = requests.post(
-            url, json={"bundleId": bundle_id}, timeout=10, verify=False
-        )
+        response = http.post(url, json={"bundleId": bundle_id}, timeout=10)
 
         time.sleep(delay)
         return response.status_code in (200, 201)
@@ -393,7 +298,9 @@ def launch_app(
 
 
 def get_screen_size(
-    wda_url: str = "http://localhost:8100", session_id: str | None = None
+    wda_url: str = "http://localhost:8100",
+    session_id: str | None = None,
+    http_session: WDAHttpSession | None = None,
 ) -> tuple[int, int]:
     """
     Get the screen dimensions.
@@ -401,16 +308,17 @@ def get_screen_size(
     Args:
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
+        http_session: Optional pooled WDA HTTP session.
 
     Returns:
         Tuple of (width, height). Returns (375, 812) as default if unable to fetch.
     """
     try:
-        import requests
+        http = http_session or get_wda_http_session(wda_url)
 
         url = _get_wda_session_url(wda_url, session_id, "window/size")
 
-        response = requests.get(url, timeout=5, verify=False)
+        response = http.get(url, timeout=5)
 
         if response.status_code == 200:
             data = response.json()
@@ -433,6 +341,7 @@ def press_button(
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
     delay: float = 1.0,
+    http_session: WDAHttpSession | None = None,
 ) -> None:
     """
     Press a physical button.
@@ -442,13 +351,14 @@ def press_button(
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
         delay: Delay in seconds after pressing.
+        http_session: Optional pooled WDA HTTP session.
     """
     try:
-        import requests
+        http = http_session or get_wda_http_session(wda_url)
 
         url = f"{wda_url.rstrip('/')}/wda/pressButton"
 
-        requests.post(url, json={"name": button_name}, timeout=10, verify=False)
+        http.post(url, json={"name": button_name}, timeout=10)
 
         time.sleep(delay)
 
@@ -0,0 +1,174 @@
+"""Compile iOS pointer gestures into batched W3C action sequences."""
+
+from dataclasses import dataclass, field
+
+from phone_agent.xctest.session import WDAHttpSession, get_wda_http_session
+
+
+@dataclass
+class PointerOp:
+    """A single pointer gesture in device pixel coordinates."""
+
+    kind: str  # "press", "drag" or "pause"
+    x: float = 0.0
+    y: float = 0.0
+    end_x: float = 0.0
+    end_y: float = 0.0
+    duration: float = 0.0  # Press hold time, drag time or pause length (seconds)
+
+
+@dataclass
+class GestureSequence:
+    """
+    Builder that merges consecutive pointer operations into one W3C request.
+
+    Coordinates are device pixels and are divided by ``scale`` to get WDA
+    points when the sequence is compiled. Each ``pause()`` becomes an explicit
+    pause on the same pointer, so a double tap, or a back gesture followed by
+    a tap, costs one round trip to WDA instead of one per operation.
+
+    Example:
+        >>> seq = GestureSequence(scale=3)
+        >>> seq.tap(100, 200).pause(0.1).tap(100, 200)
+        >>> payload = seq.compile()
+    """
+
+    ops: list[PointerOp] = field(default_factory=list)
+    scale: float = 1.0  # Device pixels per WDA point
+    tap_hold: float = 0.1  # How long a tap keeps the finger down (seconds)
+
+    def tap(self, x: float, y: float) -> "GestureSequence":
+        """Append a tap."""
+        self.ops.append(PointerOp("press", x, y, duration=self.tap_hold))
+        return self
+
+    def double_tap(
+        self, x: float, y: float, interval: float = 0.1
+    ) -> "GestureSequence":
+        """Append two taps separated by interval seconds."""
+        return self.tap(x, y).pause(interval).tap(x, y)
+
+    def long_press(self, x: float, y: float, duration: float) -> "GestureSequence":
+        """Append a long press held for duration seconds."""
+        self.ops.append(PointerOp("press", x, y, duration=duration))
+        return self
+
+    def swipe(
+        self,
+        start_x: float,
+        start_y: float,
+        end_x: float,
+        end_y: float,
+        duration: float,
+    ) -> "GestureSequence":
+        """Append a drag from start to end over duration seconds."""
+        self.ops.append(PointerOp("drag", start_x, start_y, end_x, end_y, duration))
+        return self
+
+    def pause(self, duration: float) -> "GestureSequence":
+        """Append an explicit pause between gestures."""
+        if duration > 0:
+            self.ops.append(PointerOp("pause", duration=duration))
+        return self
+
+    def extend(self, other: "GestureSequence") -> "GestureSequence":
+        """Append all operations of another sequence."""
+        self.ops.extend(other.ops)
+        return self
+
+    @property
+    def total_duration(self) -> float:
+        """Time in seconds the sequence takes to play back on the device."""
+        return sum(op.duration for op in self.ops)
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def compile(self) -> dict:
+        """
+        Compile the sequence into a W3C WebDriver actions payload.
+
+        Returns:
+            Payload for the WDA ``/actions`` endpoint.
+        """
+        actions: list[dict] = []
+        for op in self.ops:
+            ms = int(op.duration * 1000)
+            x, y = op.x / self.scale, op.y / self.scale
+            end_x, end_y = op.end_x / self.scale, op.end_y / self.scale
+            if op.kind == "pause":
+                actions.append({"type": "pause", "duration": ms})
+            elif op.kind == "press":
+                actions.extend(
+                    [
+                        {"type": "pointerMove", "duration": 0, "x": x, "y": y},
+                        {"type": "pointerDown", "button": 0},
+                        {"type": "pause", "duration": ms},
+                        {"type": "pointerUp", "button": 0},
+                    ]
+                )
+            elif op.kind == "drag":
+                actions.extend(
+                    [
+                        {"type": "pointerMove", "duration": 0, "x": x, "y": y},
+                        {"type": "pointerDown", "button": 0},
+                        {
+                            "type": "pointerMove",
+                            "duration": ms,
+                            "x": end_x,
+                            "y": end_y,
+                        },
+                        {"type": "pointerUp", "button": 0},
+                    ]
+                )
+            else:
+                raise ValueError(f"Unknown pointer operation: {op.kind}")
+
+        return {
+            "actions": [
+                {
+                    "type": "pointer",
+                    "id": "finger1",
+                    "parameters": {"pointerType": "touch"},
+                    "actions": actions,
+                }
+            ]
+        }
+
+
+def perform_gestures(
+    sequence: GestureSequence,
+    wda_url: str = "http://localhost:8100",
+    session_id: str | None = None,
+    http_session: WDAHttpSession | None = None,
+) -> bool:
+    """
+    Send a gesture sequence to WDA as a single W3C actions request.
+
+    Args:
+        sequence: The gestures to perform.
+        wda_url: WebDriverAgent URL.
+        session_id: Optional WDA session ID.
+        http_session: Optional pooled WDA HTTP session.
+
+    Returns:
+        True if WDA accepted the request, False otherwise.
+    """
+    if not sequence.ops:
+        return True
+
+    try:
+        http = http_session or get_wda_http_session(wda_url)
+        url = http.url("actions", session_id)
+
+        response = http.post(
+            url, json=sequence.compile(), timeout=int(sequence.total_duration + 15)
+        )
+        return response.status_code in (200, 201)
+
+    except ImportError:
+        print("Error: requests library required. Install: pip install requests")
+    except Exception as e:
+        print(f"Error performing gestures: {e}")
+
+    return False
@@ -2,6 +2,8 @@
 
 import time
 
+from phone_agent.xctest.session import WDAHttpSession, get_wda_http_session
+
 
 def _get_wda_session_url(wda_url: str, session_id: str | None, endpoint: str) -> str:
     """
@@ -28,6 +30,7 @@ def type_text(
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
     frequency: int = 60,
+    http_session: WDAHttpSession | None = None,
 ) -> None:
     """
     Type text into the currently focused input field.
@@ -37,19 +40,20 @@ def type_text(
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
         frequency: Typing frequency (keys per minute). Default is 60.
+        http_session: Optional pooled WDA HTTP session.
 
     Note:
         The input field must be focused before calling this function.
         Use tap() to focus on the input field first.
     """
     try:
-        import requests
+        http = http_session or get_wda_http_session(wda_url)
 
         url = _get_wda_session_url(wda_url, session_id, "wda/keys")
 
         # Send text to WDA
-        response = requests.post(
-            url, json={"value": list(text), "frequency": frequency}, timeout=30, verify=False
+        response = http.post(
+            url, json={"value": list(text), "frequency": frequency}, timeout=30
         )
 
         if response.status_code not in (200, 201):
@@ -64,6 +68,7 @@ def type_text(
 def clear_text(
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
+    http_session: WDAHttpSession | None = None,
 ) -> None:
     """
     Clear text in the currently focused input field.
@@ -71,18 +76,19 @@ def clear_text(
     Args:
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
+        http_session: Optional pooled WDA HTTP session.
 
     Note:
         This sends a clear command to the active element.
         The input field must be focused before calling this function.
     """
     try:
-        import requests
+        http = http_session or get_wda_http_session(wda_url)
 
         # First, try to get the active element
         url = _get_wda_session_url(wda_url, session_id, "element/active")
 
-        response = requests.get(url, timeout=10, verify=False)
+        response = http.get(url, timeout=10)
 
         if response.status_code == 200:
             data = response.json()
@@ -91,11 +97,11 @@ def clear_text(
             if element_id:
                 # Clear the element
                 clear_url = _get_wda_session_url(wda_url, session_id, f"element/{element_id}/clear")
-                requests.post(clear_url, timeout=10, verify=False)
+                http.post(clear_url, timeout=10)
                 return
 
         # Fallback: send backspace commands
-        _clear_with_backspace(wda_url, session_id)
+        _clear_with_backspace(wda_url, session_id, http_session=http)
 
     except ImportError:
         print("Error: requests library required. Install: pip install requests")
@@ -107,6 +113,7 @@ def _clear_with_backspace(
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
     max_backspaces: int = 100,
+    http_session: WDAHttpSession | None = None,
 ) -> None:
     """
     Clear text by sending backspace keys.
@@ -115,19 +122,19 @@ def _clear_with_backspace(
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
         max_backspaces: Maximum number of backspaces to send.
+        http_session: Optional pooled WDA HTTP session.
     """
     try:
-        import requests
+        http = http_session or get_wda_http_session(wda_url)
 
         url = _get_wda_session_url(wda_url, session_id, "wda/keys")
 
         # Send backspace character multiple times
         backspace_char = "\u0008"  # Backspace Unicode character
-        requests.post(
+        http.post(
             url,
             json={"value": [backspace_char] * max_backspaces},
             timeout=10,
-            verify=False,
         )
 
     except Exception as e:
@@ -138,6 +145,7 @@ def send_keys(
     keys: list[str],
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
+    http_session: WDAHttpSession | None = None,
 ) -> None:
     """
     Send a sequence of keys.
@@ -146,17 +154,18 @@ def send_keys(
         keys: List of keys to send.
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
+        http_session: Optional pooled WDA HTTP session.
 
     Example:
         >>> send_keys(["H", "e", "l", "l", "o"])
         >>> send_keys(["\n"])  # Send enter key
     """
     try:
-        import requests
+        http = http_session or get_wda_http_session(wda_url)
 
         url = _get_wda_session_url(wda_url, session_id, "wda/keys")
 
-        requests.post(url, json={"value": keys}, timeout=10, verify=False)
+        http.post(url, json={"value": keys}, timeout=10)
 
     except ImportError:
         print("Error: requests library required. Install: pip install requests")
@@ -168,6 +177,7 @@ def press_enter(
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
     delay: float = 0.5,
+    http_session: WDAHttpSession | None = None,
 ) -> None:
     """
     Press the Enter/Return key.
@@ -176,14 +186,16 @@ def press_enter(
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
         delay: Delay in seconds after pressing enter.
+        http_session: Optional pooled WDA HTTP session.
     """
-    send_keys(["\n"], wda_url, session_id)
+    send_keys(["\n"], wda_url, session_id, http_session=http_session)
     time.sleep(delay)
 
 
 def hide_keyboard(
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
+    http_session: WDAHttpSession | None = None,
 ) -> None:
     """
     Hide the on-screen keyboard.
@@ -191,13 +203,14 @@ def hide_keyboard(
     Args:
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
+        http_session: Optional pooled WDA HTTP session.
     """
     try:
-        import requests
+        http = http_session or get_wda_http_session(wda_url)
 
         url = f"{wda_url.rstrip('/')}/wda/keyboard/dismiss"
 
-        requests.post(url, timeout=10, verify=False)
+        http.post(url, timeout=10)
 
     except ImportError:
         print("Error: requests library required. Install: pip install requests")
@@ -208,6 +221,7 @@ def hide_keyboard(
 def is_keyboard_shown(
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
+    http_session: WDAHttpSession | None = None,
 ) -> bool:
     """
     Check if the on-screen keyboard is currently shown.
@@ -215,16 +229,17 @@ def is_keyboard_shown(
     Args:
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
+        http_session: Optional pooled WDA HTTP session.
 
     Returns:
         True if keyboard is shown, False otherwise.
     """
     try:
-        import requests
+        http = http_session or get_wda_http_session(wda_url)
 
         url = _get_wda_session_url(wda_url, session_id, "wda/keyboard/shown")
 
-        response = requests.get(url, timeout=5, verify=False)
+        response = http.get(url, timeout=5)
 
         if response.status_code == 200:
             data = response.json()
@@ -241,6 +256,7 @@ def is_keyboard_shown(
 def set_pasteboard(
     text: str,
     wda_url: str = "http://localhost:8100",
+    http_session: WDAHttpSession | None = None,
 ) -> None:
     """
     Set the device pasteboard (clipboard) content.
@@ -248,19 +264,18 @@ def set_pasteboard(
     Args:
         text: Text to set in pasteboard.
         wda_url: WebDriverAgent URL.
+        http_session: Optional pooled WDA HTTP session.
 
     Note:
         This can be useful for inputting large amounts of text.
         After setting pasteboard, you can simulate paste gesture.
     """
     try:
-        import requests
+        http = http_session or get_wda_http_session(wda_url)
 
         url = f"{wda_url.rstrip('/')}/wda/setPasteboard"
 
-        requests.post(
-            url, json={"content": text, "contentType": "plaintext"}, timeout=10, verify=False
-        )
+        http.post(url, json={"content": text, "contentType": "plaintext"}, timeout=10)
 
     except ImportError:
         print("Error: requests library required. Install: pip install requests")
@@ -270,22 +285,24 @@ def set_pasteboard(
 
 def get_pasteboard(
     wda_url: str = "http://localhost:8100",
+    http_session: WDAHttpSession | None = None,
 ) -> str | None:
     """
     Get the device pasteboard (clipboard) content.
 
     Args:
         wda_url: WebDriverAgent URL.
+        http_session: Optional pooled WDA HTTP session.
 
     Returns:
         Pasteboard content or None if failed.
     """
     try:
-        import requests
+        http = http_session or get_wda_http_session(wda_url)
 
         url = f"{wda_url.rstrip('/')}/wda/getPasteboard"
 
-        response = requests.post(url, timeout=10, verify=False)
+        response = http.post(url, timeout=10)
 
         if response.status_code == 200:
             data = response.json()
@@ -10,6 +10,8 @@ from io import BytesIO
 
 from PIL import Image
 
+from phone_agent.xctest.session import WDAHttpSession, get_wda_http_session
+
 
 @dataclass
 class Screenshot:
@@ -26,6 +28,7 @@ def get_screenshot(
     session_id: str | None = None,
     device_id: str | None = None,
     timeout: int = 10,
+    http_session: WDAHttpSession | None = None,
 ) -> Screenshot:
     """
     Capture a screenshot from the connected iOS device.
@@ -35,6 +38,7 @@ def get_screenshot(
         session_id: Optional WDA session ID.
         device_id: Optional device UDID (for idevicescreenshot fallback).
         timeout: Timeout in seconds for screenshot operations.
+        http_session: Optional pooled WDA HTTP session.
 
     Returns:
         Screenshot object containing base64 data and dimensions.
@@ -44,7 +48,7 @@ def get_screenshot(
         If both fail, returns a black fallback image.
     """
     # Try WebDriverAgent first (preferred method)
-    screenshot = _get_screenshot_wda(wda_url, session_id, timeout)
+    screenshot = _get_screenshot_wda(wda_url, session_id, timeout, http_session)
     if screenshot:
         return screenshot
 
@@ -58,7 +62,10 @@ def get_screenshot(
 
 
 def _get_screenshot_wda(
-    wda_url: str, session_id: str | None, timeout: int
+    wda_url: str,
+    session_id: str | None,
+    timeout: int,
+    http_session: WDAHttpSession | None = None,
 ) -> Screenshot | None:
     """
     Capture screenshot using WebDriverAgent.
@@ -67,16 +74,17 @@ def _get_screenshot_wda(
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
         timeout: Timeout in seconds.
+        http_session: Optional pooled WDA HTTP session.
 
     Returns:
         Screenshot object or None if failed.
     """
     try:
-        import requests
+        http = http_session or get_wda_http_session(wda_url)
 
         url = f"{wda_url.rstrip('/')}/screenshot"
 
-        response = requests.get(url, timeout=timeout, verify=False)
+        response = http.get(url, timeout=timeout)
 
         if response.status_code == 200:
             data = response.json()
@@ -210,6 +218,7 @@ def get_screenshot_png(
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
     device_id: str | None = None,
+    http_session: WDAHttpSession | None = None,
 ) -> bytes | None:
     """
     Get screenshot as PNG bytes.
@@ -218,11 +227,12 @@ def get_screenshot_png(
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
         device_id: Optional device UDID.
+        http_session: Optional pooled WDA HTTP session.
 
     Returns:
         PNG bytes or None if failed.
     """
-    screenshot = get_screenshot(wda_url, session_id, device_id)
+    screenshot = get_screenshot(wda_url, session_id, device_id, http_session=http_session)
 
     try:
         return base64.b64decode(screenshot.base64_data)
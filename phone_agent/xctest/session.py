@@ -0,0 +1,139 @@
+"""Pooled keep-alive HTTP sessions for WebDriverAgent calls."""
+
+import threading
+from dataclasses import dataclass
+
+
+@dataclass
+class WDASessionConfig:
+    """Configuration for a pooled WDA HTTP session."""
+
+    pool_connections: int = 2  # Number of connection pools to cache
+    pool_maxsize: int = 4  # Max keep-alive connections per pool
+    max_retries: int = 2  # Retries for connection errors (not for read errors)
+    backoff_factor: float = 0.05  # Backoff between retries in seconds
+    verify: bool = False  # TLS verification (WDA usually runs over plain HTTP)
+
+
+class WDAHttpSession:
+    """
+    Keep-alive HTTP session bound to a single WebDriverAgent URL.
+
+    Every tap, swipe and screenshot reuses the same pooled TCP connection
+    instead of opening a fresh one (often through iproxy) per request.
+
+    Args:
+        wda_url: WebDriverAgent URL.
+        config: Pool and retry configuration.
+
+    Example:
+        >>> http = WDAHttpSession("http://localhost:8100")
+        >>> http.get(http.url("status"), timeout=2).status_code
+        200
+    """
+
+    def __init__(self, wda_url: str, config: WDASessionConfig | None = None):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.wda_url = wda_url.rstrip("/")
+        self.config = config or WDASessionConfig()
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+        # Only retry failures that happen before the request reaches WDA.
+        # Gestures are not idempotent, so read and other errors, which may
+        # come after WDA got the request, must not be replayed.
+        retry = Retry(
+            total=self.config.max_retries,
+            connect=self.config.max_retries,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=self.config.backoff_factor,
+            allowed_methods=None,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            max_retries=retry,
+        )
+
+        self._session = requests.Session()
+        self._session.verify = self.config.verify
+        self._session.headers.update({"Connection": "keep-alive"})
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def url(self, endpoint: str, session_id: str | None = None) -> str:
+        """
+        Build a full URL for a WDA endpoint.
+
+        Args:
+            endpoint: The endpoint path.
+            session_id: Optional WDA session ID.
+
+        Returns:
+            Full URL for the endpoint.
+        """
+        endpoint = endpoint.lstrip("/")
+        if session_id:
+            return f"{self.wda_url}/session/{session_id}/{endpoint}"
+        return f"{self.wda_url}/{endpoint}"
+
+    def get(self, url: str, **kwargs):
+        """Send a GET request over the pooled connection."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        """Send a POST request over the pooled connection."""
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs):
+        """Send a request over the pooled connection."""
+        with self._lock:
+            self.request_count += 1
+        return self._session.request(method, url, **kwargs)
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._session.close()
+
+
+# Process-wide sessions, one per WDA URL
+_sessions: dict[str, WDAHttpSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_wda_http_session(
+    wda_url: str = "http://localhost:8100", config: WDASessionConfig | None = None
+) -> WDAHttpSession:
+    """
+    Get the shared pooled session for a WDA URL, creating it if needed.
+
+    Args:
+        wda_url: WebDriverAgent URL.
+        config: Configuration used only when the session is first created.
+
+    Returns:
+        The WDAHttpSession for this URL.
+
+    Raises:
+        ImportError: If the requests library is not installed.
+    """
+    key = wda_url.rstrip("/")
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = WDAHttpSession(key, config)
+            _sessions[key] = session
+        return session
+
+
+def close_wda_http_sessions() -> None:
+    """Close and forget all shared WDA sessions."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,152 @@
+"""
+Threads and wall time to drive many devices: threaded PhoneAgent vs asyncio.
+
+Every device is fake, with the latencies of benchmark_pipeline.py, and the
+model is a fake with a fixed latency. The sync agents each run on their own
+thread (plus an observation worker); the async agents all share one event
+loop.
+
+Usage:
+    python scripts/benchmark_async_agent.py --devices 50 --steps 3
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from benchmark_pipeline import (
+    ACTION_LATENCY,
+    CURRENT_APP_LATENCY,
+    MODEL_LATENCY,
+    SCREENSHOT_LATENCY,
+    SETTLE_DELAY,
+    make_fake_device,
+    make_screenshot,
+)
+
+from phone_agent import AsyncPhoneAgent, PhoneAgent, device_factory
+from phone_agent.agent import AgentConfig
+from phone_agent.device_factory import DeviceFactory, DeviceType
+from phone_agent.model.client import ModelResponse
+
+ACTION = 'do(action="Tap", element=[500, 500])'
+
+
+class FakeModelClient:
+    def request(self, messages, on_action=None, max_tokens=None):
+        time.sleep(MODEL_LATENCY)
+        return ModelResponse(thinking="", action=ACTION, raw_content=ACTION)
+
+    def new_run(self):
+        pass
+
+
+class AsyncFakeModelClient:
+    async def request(self, messages, on_action=None, max_tokens=None):
+        await asyncio.sleep(MODEL_LATENCY)
+        return ModelResponse(thinking="", action=ACTION, raw_content=ACTION)
+
+    def new_run(self):
+        pass
+
+
+def make_async_fake_device():
+    screenshot = make_screenshot()
+
+    async def get_screenshot(device_id=None, timeout=10):
+        await asyncio.sleep(SCREENSHOT_LATENCY)
+        return screenshot
+
+    async def get_current_app(device_id=None):
+        await asyncio.sleep(CURRENT_APP_LATENCY)
+        return "Settings"
+
+    async def tap(x, y, device_id=None, delay=None):
+        await asyncio.sleep(ACTION_LATENCY + SETTLE_DELAY)
+
+    return SimpleNamespace(
+        get_screenshot=get_screenshot, get_current_app=get_current_app, tap=tap
+    )
+
+
+class PeakThreads:
+    """Samples threading.active_count() in the background."""
+
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(0.05):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_threads(devices: int, steps: int) -> tuple[float, int]:
+    factory = DeviceFactory(DeviceType.ADB)
+    factory._module = make_fake_device()
+    device_factory._device_factory = factory
+
+    agents = []
+    for index in range(devices):
+        agent = PhoneAgent(
+            agent_config=AgentConfig(
+                max_steps=steps, device_id=f"emulator-{index}", verbose=False
+            )
+        )
+        agent.model_client = FakeModelClient()
+        agents.append(agent)
+
+    start = time.perf_counter()
+    with PeakThreads() as threads, ThreadPoolExecutor(max_workers=devices) as pool:
+        list(pool.map(lambda agent: agent.run("benchmark"), agents))
+    return time.perf_counter() - start, threads.peak
+
+
+async def run_async(devices: int, steps: int) -> tuple[float, int]:
+    device = make_async_fake_device()
+    agents = []
+    for index in range(devices):
+        agent = AsyncPhoneAgent(
+            agent_config=AgentConfig(
+                max_steps=steps, device_id=f"emulator-{index}", verbose=False
+            ),
+            device=device,
+        )
+        agent.model_client = AsyncFakeModelClient()
+        agents.append(agent)
+
+    start = time.perf_counter()
+    with PeakThreads() as threads:
+        await asyncio.gather(*(agent.run("benchmark") for agent in agents))
+    return time.perf_counter() - start, threads.peak
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=3)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Async first: the sync agents leave their observation workers behind
+        asynchronous = asyncio.run(run_async(args.devices, args.steps))
+        threaded = run_threads(args.devices, args.steps)
+
+    print(f"{args.devices} devices x {args.steps} steps")
+    print(f"{'mode':<10} {'seconds':>8} {'peak threads':>13}")
+    for mode, (seconds, peak) in (("threads", threaded), ("asyncio", asynchronous)):
+        print(f"{mode:<10} {seconds:>8.2f} {peak:>13}")
@@ -0,0 +1,85 @@
+"""
+How closely runs keep to a wall-clock deadline and a token budget.
+
+Reuses the fake device of benchmark_pipeline.py with a fake model that never
+finishes the task, so every run ends on a limit. For each deadline the run
+should stop before overrunning it; for the token budget, the completion limit
+of each request should shrink as the budget runs out.
+
+Usage:
+    python scripts/benchmark_budget.py --deadlines 5 10 --token-budget 20000
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from benchmark_pipeline import MODEL_LATENCY, make_fake_device
+
+from phone_agent import PhoneAgent, device_factory
+from phone_agent.agent import AgentConfig
+from phone_agent.device_factory import DeviceFactory, DeviceType
+from phone_agent.model.client import ModelResponse
+
+COMPLETION_TOKENS = 300
+
+
+class EndlessModelClient:
+    def __init__(self):
+        self.max_tokens: list[int | None] = []
+
+    def request(self, messages, on_action=None, max_tokens=None):
+        self.max_tokens.append(max_tokens)
+        time.sleep(MODEL_LATENCY)
+        action = 'do(action="Tap", element=[500, 500])'
+        return ModelResponse(
+            thinking="",
+            action=action,
+            raw_content=action,
+            completion_tokens=COMPLETION_TOKENS,
+        )
+
+    def new_run(self):
+        pass
+
+
+def run(pipelined: bool, deadline=None, token_budget=None) -> PhoneAgent:
+    factory = DeviceFactory(DeviceType.ADB)
+    factory._module = make_fake_device()
+    device_factory._device_factory = factory
+
+    agent = PhoneAgent(agent_config=AgentConfig(verbose=False, pipelined=pipelined))
+    agent.model_client = EndlessModelClient()
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent.run("benchmark", deadline=deadline, token_budget=token_budget)
+    return agent
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--deadlines", type=float, nargs="+", default=[5.0, 10.0])
+    parser.add_argument("--token-budget", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'mode':<11} {'deadline':>8} {'elapsed':>8} {'steps':>5}  reason")
+    for pipelined in (False, True):
+        mode = "pipelined" if pipelined else "sequential"
+        for deadline in args.deadlines:
+            result = run(pipelined, deadline=deadline).last_run
+            print(
+                f"{mode:<11} {deadline:>8.1f} {result.elapsed:>8.2f} "
+                f"{result.steps:>5}  {result.reason.value}"
+            )
+
+    print("\nStage means (sequential, last deadline):")
+    for stage, timing in result.stage_timings.items():
+        print(f"  {stage:<8} {timing.mean:.2f}s x {timing.count}")
+
+    agent = run(False, token_budget=args.token_budget)
+    result = agent.last_run
+    print(
+        f"\nToken budget {args.token_budget}: {result.tokens_used} used in "
+        f"{result.steps} steps, {result.reason.value}"
+    )
+    print(f"max_tokens per request: {agent.model_client.max_tokens}")
@@ -0,0 +1,136 @@
+"""
+Checkpoint write overhead per step, and model calls saved by resuming.
+
+The device is fake and instant and the model is a fake that thinks for a
+paragraph per step, so the checkpoint cost is not hidden behind I/O waits.
+A run is then killed at --crash-at and either restarted from step 1 or
+resumed from its checkpoint by a fresh agent.
+
+Usage:
+    python scripts/benchmark_checkpoint.py --steps 50 --crash-at 40
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from types import SimpleNamespace
+
+from benchmark_pipeline import make_screenshot
+
+from phone_agent import PhoneAgent, device_factory
+from phone_agent.agent import AgentConfig
+from phone_agent.checkpoint import CheckpointStore
+from phone_agent.device_factory import DeviceFactory, DeviceType
+from phone_agent.model.client import ModelResponse
+
+THINKING = "The settings list is visible, so I scroll to the next entry. " * 8
+
+
+class Crash(BaseException):
+    """Stands in for the process being killed."""
+
+
+class FakeModelClient:
+    def __init__(self, steps: int, crash_at: int | None = None):
+        self.steps = steps
+        self.crash_at = crash_at
+        self.calls = 0
+
+    def request(self, messages, on_action=None, max_tokens=None):
+        self.calls += 1
+        step = sum(message["role"] == "assistant" for message in messages) + 1
+        if step == self.crash_at:
+            raise Crash()
+        if step >= self.steps:
+            action = 'finish(message="done")'
+        else:
+            action = 'do(action="Tap", element=[500, 500])'
+        return ModelResponse(thinking=THINKING, action=action, raw_content=action)
+
+    def new_run(self):
+        pass
+
+
+def make_agent(store: CheckpointStore | None, model: FakeModelClient) -> PhoneAgent:
+    agent = PhoneAgent(
+        agent_config=AgentConfig(max_steps=1000, verbose=False, checkpoint_store=store)
+    )
+    agent.model_client = model
+    return agent
+
+
+def overhead(steps: int, fsync_interval: float) -> tuple[float, float, int, int]:
+    """Return (run seconds, checkpoint ms per step, bytes per step, fsyncs)."""
+    with tempfile.TemporaryDirectory() as directory:
+        store = CheckpointStore(directory, fsync_interval=fsync_interval)
+        agent = make_agent(store, FakeModelClient(steps))
+        start = time.perf_counter()
+        agent.run("benchmark")
+        elapsed = time.perf_counter() - start
+        stats = agent.last_checkpoint_stats
+        return (
+            elapsed,
+            stats.seconds / steps * 1000,
+            stats.bytes // steps,
+            stats.fsyncs,
+        )
+
+
+def crash_recovery(steps: int, crash_at: int) -> tuple[int, int]:
+    """Return model calls after the crash for (restart, resume)."""
+    with tempfile.TemporaryDirectory() as directory:
+        store = CheckpointStore(directory)
+        crashing = make_agent(store, FakeModelClient(steps, crash_at))
+        try:
+            crashing.run("benchmark")
+        except Crash:
+            pass
+
+        restart = FakeModelClient(steps)
+        make_agent(None, restart).run("benchmark")
+
+        resume = FakeModelClient(steps)
+        run_id = store.unfinished()[0].run_id
+        make_agent(store, resume).resume(run_id)
+        return restart.calls, resume.calls
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--crash-at", type=int, default=40)
+    args = parser.parse_args()
+
+    factory = DeviceFactory(DeviceType.ADB)
+    screenshot = make_screenshot()
+    factory._module = SimpleNamespace(
+        get_screenshot=lambda device_id=None, timeout=10: screenshot,
+        get_current_app=lambda device_id=None: "Settings",
+        tap=lambda x, y, device_id=None, delay=None: None,
+    )
+    device_factory._device_factory = factory
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        baseline = make_agent(None, FakeModelClient(args.steps))
+        start = time.perf_counter()
+        baseline.run("benchmark")
+        baseline_time = time.perf_counter() - start
+        results = {
+            "fsync 1s": overhead(args.steps, 1.0),
+            "fsync each": overhead(args.steps, 0.0),
+        }
+        restart_calls, resume_calls = crash_recovery(args.steps, args.crash_at)
+
+    print(f"{args.steps} steps, no checkpoint: {baseline_time * 1000:.0f}ms")
+    print(f"{'mode':<11} {'run':>8} {'per step':>9} {'bytes':>7} {'fsyncs':>7}")
+    for mode, (elapsed, per_step, size, fsyncs) in results.items():
+        print(
+            f"{mode:<11} {elapsed * 1000:>6.0f}ms {per_step:>7.3f}ms "
+            f"{size:>7} {fsyncs:>7}"
+        )
+    print(
+        f"\nKilled at step {args.crash_at}: restart makes {restart_calls} model "
+        f"calls, resume makes {resume_calls}"
+    )
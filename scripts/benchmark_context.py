@@ -0,0 +1,92 @@
+"""
+Prompt size per step with and without a context budget.
+
+Builds a synthetic long-task history (thinking-heavy assistant turns, screen
+info observations, one screenshot on the current observation) and prints the
+estimated prompt tokens sent at a few step counts for each budget. "prefix"
+is the mean share of each step's prompt that repeats the previous step's
+prompt exactly, i.e. what a server prefix cache can serve; compacting one
+turn at a time (chunk=1) changes the task message on every step.
+
+Usage:
+    python scripts/benchmark_context.py --steps 60
+"""
+
+import argparse
+
+from phone_agent.context import ContextConfig, ContextManager, estimate_tokens
+from phone_agent.model.client import MessageBuilder
+
+THINKING = "当前在设置页面，需要找到蓝牙选项并点击进入，然后检查开关状态。" * 4
+BUDGETS = {
+    "unbounded": ContextConfig(),
+    "max_turns=8": ContextConfig(max_turns=8),
+    "max_turns=8 chunk=1": ContextConfig(max_turns=8, compact_chunk=1),
+    "max_tokens=4000": ContextConfig(max_tokens=4000),
+}
+
+
+def observation(app: str, first: bool = False) -> dict:
+    screen_info = MessageBuilder.build_screen_info(app)
+    header = "打开设置并开启蓝牙" if first else "** Screen Info **"
+    text = f"{header}\n\n{screen_info}"
+    return MessageBuilder.create_user_message(text=text, image_base64="AAAA")
+
+
+def history_at(step: int) -> list[dict]:
+    """History as sent on the given (1-based) step."""
+    messages = [
+        MessageBuilder.create_system_message("system prompt " * 300),
+        MessageBuilder.remove_images_from_message(observation("Settings", True)),
+    ]
+    for i in range(1, step):
+        messages.append(
+            MessageBuilder.create_assistant_message(
+                f"<think>{THINKING}</think>"
+                f'<answer>do(action="Tap", element=[500, {i * 10}])</answer>'
+            )
+        )
+        messages.append(observation("Settings"))
+        if i < step - 1:
+            MessageBuilder.remove_images_from_message(messages[-1])
+    return messages
+
+
+def prefix_share(manager: ContextManager, steps: int) -> float:
+    """Mean share of estimated prompt tokens shared with the previous prompt."""
+    previous: list[dict] = []
+    shares = []
+    for step in range(1, steps + 1):
+        prompt = manager.build(history_at(step))
+        shared = 0
+        for old, new in zip(previous, prompt):
+            if old != new:
+                break
+            shared += estimate_tokens(new)
+        if previous:
+            shares.append(shared / manager.last_stats.estimated_tokens)
+        previous = prompt
+    return sum(shares) / len(shares)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--steps", type=int, default=60)
+    args = parser.parse_args()
+
+    checkpoints = [s for s in (1, 5, 10, 20, 40, 60, 100) if s <= args.steps]
+    print(
+        f"{'budget':<20}"
+        + "".join(f"{f'step {s}':>10}" for s in checkpoints)
+        + f"{'prefix':>8}"
+    )
+    for name, config in BUDGETS.items():
+        manager = ContextManager(config)
+        sizes = []
+        for step in checkpoints:
+            manager.build(history_at(step))
+            sizes.append(manager.last_stats.estimated_tokens)
+        share = prefix_share(manager, args.steps)
+        print(
+            f"{name:<20}" + "".join(f"{size:>10}" for size in sizes) + f"{share:>8.0%}"
+        )
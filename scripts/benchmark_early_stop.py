@@ -0,0 +1,135 @@
+"""
+Server slot time with and without early stream termination.
+
+Runs a local fake OpenAI-compatible endpoint that streams a short thinking
+part, the action call, then trailing tokens, and records how long each
+generation held the server and how many tokens it produced before the client
+went away. The saving each early-stopped response projects from its sampled
+drained streams is compared with the measured one.
+
+Usage:
+    python scripts/benchmark_early_stop.py --trailing 200
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from phone_agent.model import ModelConfig
+from phone_agent.model.client import ModelClient
+
+TOKEN_INTERVAL = 0.005  # decode time per token
+THINKING = ["I ", "need ", "to ", "open ", "Settings", ". "]
+ACTION = ['do(action="', "Launch", '", ', 'app="', "Settings", '")']
+
+
+class FakeModelHandler(BaseHTTPRequestHandler):
+    """Streams chat completion chunks and records per-request server stats."""
+
+    trailing = 200
+    generations: list[dict] = []
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+
+        tokens = THINKING + ACTION + ["</answer>"] * self.trailing
+        start = time.perf_counter()
+        sent = 0
+        try:
+            for token in tokens:
+                time.sleep(TOKEN_INTERVAL)
+                chunk = {"choices": [{"index": 0, "delta": {"content": token}}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+                sent += 1
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        self.generations.append(
+            {"tokens": sent, "seconds": time.perf_counter() - start}
+        )
+
+
+def run(url: str, stop_early: bool, requests: int) -> tuple:
+    """
+    Return (client seconds, server seconds, server tokens) per request, the
+    projected and the measured tokens saved per early-stopped response.
+    """
+    FakeModelHandler.generations.clear()
+    client = ModelClient(
+        ModelConfig(
+            base_url=url, stop_on_action_complete=stop_early, early_stop_sample_every=5
+        )
+    )
+    messages = [{"role": "user", "content": "open settings"}]
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        responses = [client.request(messages) for _ in range(requests)]
+    client_time = (time.perf_counter() - start) / requests
+    projected = [r.tokens_saved for r in responses if r.tokens_saved is not None]
+
+    # Let the server notice the closed connections
+    time.sleep(0.2)
+    generations = FakeModelHandler.generations
+    server_time = sum(g["seconds"] for g in generations) / len(generations)
+    server_tokens = sum(g["tokens"] for g in generations) / len(generations)
+    if not projected:
+        return client_time, server_time, server_tokens, None, None
+    full = max(g["tokens"] for g in generations)
+    cut = [full - g["tokens"] for g in generations if g["tokens"] < full]
+    return (
+        client_time,
+        server_time,
+        server_tokens,
+        sum(projected) / len(projected),
+        sum(cut) / len(cut),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--trailing", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=10)
+    args = parser.parse_args()
+
+    FakeModelHandler.trailing = args.trailing
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeModelHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    try:
+        results = {
+            "drain": run(url, False, args.requests),
+            "early stop": run(url, True, args.requests),
+        }
+    finally:
+        server.shutdown()
+
+    print(f"{'mode':<12} {'client':>10} {'server':>10} {'tokens':>8}")
+    for mode, (client_time, server_time, tokens, *_) in results.items():
+        print(
+            f"{mode:<12} {client_time * 1000:>8.0f}ms "
+            f"{server_time * 1000:>8.0f}ms {tokens:>8.0f}"
+        )
+    # Early stop drains one stream in 5 to keep its projection calibrated
+    projected, measured = results["early stop"][3:]
+    print(
+        f"\ntokens saved per early-stopped stream: projected {projected:.0f}, "
+        f"measured {measured:.0f}"
+    )
@@ -0,0 +1,117 @@
+"""
+Throughput of many agents in one process with each event sink.
+
+Every agent runs on its own thread against a fake device and a fake
+streaming OpenAI client, so the time left is the agent loop, the stream
+parser and the event sink. The console sink prints to /dev/null, which keeps
+the per-chunk write and flush but not a terminal's rendering cost.
+
+Usage:
+    python scripts/benchmark_events.py --agents 16 --steps 10
+"""
+
+import argparse
+import contextlib
+import os
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from benchmark_pipeline import make_screenshot
+
+from phone_agent import PhoneAgent, device_factory
+from phone_agent.agent import AgentConfig
+from phone_agent.device_factory import DeviceFactory, DeviceType
+from phone_agent.events import ConsoleSink, EventSink, JsonlSink, MemorySink, NullSink
+
+THINKING = "The settings list is visible, so I scroll to the next entry. " * 8
+
+
+def make_chunks(finish: bool) -> list[SimpleNamespace]:
+    """Streamed chunks of one response, one word per chunk."""
+    if finish:
+        action = 'finish(message="done")'
+    else:
+        action = 'do(action="Tap", element=[500, 500])'
+    tokens = [word + " " for word in THINKING.split()] + [action]
+    return [
+        SimpleNamespace(
+            usage=None,
+            choices=[SimpleNamespace(delta=SimpleNamespace(content=token))],
+        )
+        for token in tokens
+    ]
+
+
+class FakeOpenAI:
+    """Stands in for openai.OpenAI, streaming canned chunks."""
+
+    def __init__(self, steps: int):
+        self.steps = steps
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, messages, **kwargs):
+        step = sum(message["role"] == "assistant" for message in messages) + 1
+        return iter(make_chunks(finish=step >= self.steps))
+
+
+def run(agents: int, steps: int, sink: EventSink) -> float:
+    """Run every agent once and return the wall time in seconds."""
+    fleet = []
+    for index in range(agents):
+        agent = PhoneAgent(
+            agent_config=AgentConfig(
+                max_steps=steps,
+                device_id=f"device-{index}",
+                event_sink=sink,
+            )
+        )
+        agent.model_client.client = FakeOpenAI(steps)
+        fleet.append(agent)
+
+    threads = [
+        threading.Thread(target=agent.run, args=("benchmark",)) for agent in fleet
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--agents", type=int, default=16)
+    parser.add_argument("--steps", type=int, default=10)
+    args = parser.parse_args()
+
+    factory = DeviceFactory(DeviceType.ADB)
+    screenshot = make_screenshot()
+    factory._module = SimpleNamespace(
+        get_screenshot=lambda device_id=None, timeout=10: screenshot,
+        get_current_app=lambda device_id=None: "Settings",
+        tap=lambda x, y, device_id=None, delay=None: None,
+    )
+    device_factory._device_factory = factory
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            run(args.agents, 2, NullSink())  # Warm-up
+            results["console"] = run(args.agents, args.steps, ConsoleSink("en"))
+            jsonl = JsonlSink(os.path.join(directory, "events.jsonl"))
+            results["jsonl"] = run(args.agents, args.steps, jsonl)
+            jsonl.close()
+            memory = MemorySink()
+            results["memory"] = run(args.agents, args.steps, memory)
+            results["null"] = run(args.agents, args.steps, NullSink())
+
+    total = args.agents * args.steps
+    chunks = len(make_chunks(finish=False))
+    print(f"{args.agents} agents x {args.steps} steps, {chunks} chunks per step")
+    print(f"{'sink':<8} {'wall':>8} {'steps/s':>8}")
+    for name, elapsed in results.items():
+        print(f"{name:<8} {elapsed * 1000:>6.0f}ms {total / elapsed:>8.0f}")
+    print(f"memory sink kept {len(memory.events)} events")
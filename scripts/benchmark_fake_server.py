@@ -0,0 +1,156 @@
+"""
+Latency fidelity and fleet throughput against the synthetic model server.
+
+FakeModelServer is configured with a TTFT distribution, a tail and a decode
+rate. ModelClient requests check that the measured TTFT and token rate
+follow the configuration. A fleet of PhoneAgent runs on fake devices, with
+rule-based responses, is then run with more and more devices: throughput
+flattens at the server's max_concurrency, and every task should end the
+same way in every run.
+
+Usage:
+    python scripts/benchmark_fake_server.py --clients 16 --requests 25
+"""
+
+import argparse
+import threading
+from types import SimpleNamespace
+
+from benchmark_pipeline import make_screenshot
+
+from phone_agent import PhoneAgent, device_factory
+from phone_agent.agent import AgentConfig
+from phone_agent.device_factory import DeviceFactory, DeviceType
+from phone_agent.events import NullSink
+from phone_agent.fleet import FleetConfig, FleetRunner, FleetTask
+from phone_agent.model import (
+    FakeModelServer,
+    FakeServerConfig,
+    ModelConfig,
+    RuleResponder,
+    close_openai_clients,
+)
+from phone_agent.model.client import ModelClient
+
+
+def percentile(values: list[float], share: float) -> float:
+    return values[min(int(len(values) * share), len(values) - 1)]
+
+
+def measure_client(config: FakeServerConfig, clients: int, requests: int) -> dict:
+    """TTFT and decode rate seen by ModelClient under concurrent load."""
+    close_openai_clients()
+    server = FakeModelServer(config)
+    server.start()
+    ttfts = []
+    rates = []
+    lock = threading.Lock()
+
+    def client_loop(index: int):
+        client = ModelClient(
+            ModelConfig(base_url=server.base_url),
+            flow=f"device-{index}",
+            event_sink=NullSink(),
+        )
+        for request in range(requests):
+            # Distinct requests, as every step of every run is
+            messages = [{"role": "user", "content": f"device {index} step {request}"}]
+            response = client.request(messages)
+            decode = response.total_time - response.time_to_first_token
+            with lock:
+                ttfts.append(response.time_to_first_token)
+                rates.append((response.completion_tokens - 1) / decode)
+
+    threads = [threading.Thread(target=client_loop, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.shutdown()
+    ttfts.sort()
+    rates.sort()
+    return {
+        "p50": percentile(ttfts, 0.5),
+        "p99": percentile(ttfts, 0.99),
+        "tail": sum(t > config.tail_ttft[0] for t in ttfts) / len(ttfts),
+        "rate": percentile(rates, 0.5),
+    }
+
+
+def run_fleet(config: FakeServerConfig, devices: int, tasks: int) -> tuple:
+    """Run the tasks on a fleet; return (stats, outcome of each task)."""
+    close_openai_clients()
+    server = FakeModelServer(
+        config,
+        RuleResponder(
+            [(r"task \d*[05]\b", 'finish(message="Nothing to do")')],
+            default='do(action="Tap", element=[500, 500])',
+            max_steps=4,
+        ),
+    )
+    server.start()
+
+    def create_agent(device_id: str) -> PhoneAgent:
+        return PhoneAgent(
+            ModelConfig(base_url=server.base_url),
+            AgentConfig(
+                max_steps=6,
+                device_id=device_id,
+                verbose=False,
+                event_sink=NullSink(),
+            ),
+        )
+
+    runner = FleetRunner(
+        create_agent, [f"device-{index}" for index in range(devices)], FleetConfig()
+    )
+    runner.run(FleetTask(str(index), f"task {index}") for index in range(tasks))
+    server.shutdown()
+    outcomes = {r.task_id: (r.status, r.steps, r.message) for r in runner.results}
+    return runner.stats, outcomes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=25)
+    parser.add_argument("--tasks", type=int, default=24)
+    args = parser.parse_args()
+
+    factory = DeviceFactory(DeviceType.ADB)
+    screenshot = make_screenshot()
+    factory._module = SimpleNamespace(
+        get_screenshot=lambda device_id=None, timeout=10: screenshot,
+        get_current_app=lambda device_id=None: "Settings",
+        tap=lambda x, y, device_id=None, delay=None: None,
+    )
+    device_factory._device_factory = factory
+
+    config = FakeServerConfig(
+        port=0, ttft=0.1, ttft_sigma=0.2, tail_share=0.02, tail_ttft=(0.5, 0.8)
+    )
+    r = measure_client(config, args.clients, args.requests)
+    print(f"{args.clients} clients x {args.requests} requests")
+    print(f"{'':<10} {'TTFT p50':>9} {'TTFT p99':>9} {'tail':>6} {'tokens/s':>9}")
+    print(
+        f"{'config':<10} {config.ttft * 1000:>7.0f}ms {'':>9} "
+        f"{config.tail_share:>6.1%} {config.tokens_per_second:>9.0f}"
+    )
+    print(
+        f"{'measured':<10} {r['p50'] * 1000:>7.0f}ms {r['p99'] * 1000:>7.0f}ms "
+        f"{r['tail']:>6.1%} {r['rate']:>9.0f}"
+    )
+
+    print(f"\nfleet of {args.tasks} tasks, server max_concurrency 4")
+    print(f"{'devices':>7} {'seconds':>8} {'tasks/min':>10} {'completed':>10}")
+    fleet_config = FakeServerConfig(port=0, ttft=0.1, max_concurrency=4)
+    replays = []
+    for devices in (2, 4, 8, 16):
+        stats, outcomes = run_fleet(fleet_config, devices, args.tasks)
+        replays.append(outcomes)
+        print(
+            f"{devices:>7} {stats.elapsed:>8.2f} {stats.throughput:>10.1f} "
+            f"{stats.completed:>10}"
+        )
+    identical = all(outcomes == replays[0] for outcomes in replays)
+    print(f"same task outcomes in every run: {identical}")
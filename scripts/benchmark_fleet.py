@@ -0,0 +1,142 @@
+"""
+Fleet throughput as devices are added, against a model server of fixed capacity.
+
+Every device is simulated (the latencies of benchmark_pipeline.py, scaled
+down) and the model is a fake whose server handles --capacity requests at
+once; extra requests wait for a slot. Throughput should grow linearly with
+devices until the server saturates, then flatten. One task in every
+--fail-every has its first model call fail, so retries are exercised too.
+
+Usage:
+    python scripts/benchmark_fleet.py --tasks 24 --capacity 4
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from benchmark_pipeline import make_screenshot
+
+from phone_agent import PhoneAgent, device_factory
+from phone_agent.agent import AgentConfig
+from phone_agent.device_factory import DeviceFactory, DeviceType
+from phone_agent.fleet import FleetConfig, FleetRunner, FleetTask
+from phone_agent.model.client import ModelResponse
+
+# benchmark_pipeline.py latencies scaled by 1/5
+SCREENSHOT_LATENCY = 0.07
+CURRENT_APP_LATENCY = 0.05
+ACTION_LATENCY = 0.22
+MODEL_LATENCY = 0.24
+STEPS = 3
+
+
+def make_fake_device():
+    screenshot = make_screenshot()
+
+    def get_screenshot(device_id=None, timeout=10):
+        time.sleep(SCREENSHOT_LATENCY)
+        return screenshot
+
+    def get_current_app(device_id=None):
+        time.sleep(CURRENT_APP_LATENCY)
+        return "Settings"
+
+    def tap(x, y, device_id=None, delay=None):
+        time.sleep(ACTION_LATENCY)
+
+    return SimpleNamespace(
+        get_screenshot=get_screenshot, get_current_app=get_current_app, tap=tap
+    )
+
+
+class FakeModelServer:
+    """A model server that handles a fixed number of requests at once."""
+
+    def __init__(self, capacity: int, fail_every: int):
+        self._slots = threading.Semaphore(capacity)
+        self._lock = threading.Lock()
+        self._failed: set[str] = set()
+        self.fail_every = fail_every
+
+    def request(self, task: str, step: int) -> str:
+        with self._slots:
+            time.sleep(MODEL_LATENCY)
+        with self._lock:
+            index = int(task.split()[-1])
+            if step == 1 and index % self.fail_every == 0 and task not in self._failed:
+                self._failed.add(task)
+                raise ConnectionError("server overloaded")
+        if step >= STEPS:
+            return 'finish(message="done")'
+        return 'do(action="Tap", element=[500, 500])'
+
+
+class FakeModelClient:
+    def __init__(self, server: FakeModelServer):
+        self.server = server
+
+    def request(self, messages, on_action=None, max_tokens=None):
+        task = messages[1]["content"][-1]["text"].split("\n")[0]
+        step = sum(message["role"] == "assistant" for message in messages) + 1
+        action = self.server.request(task, step)
+        return ModelResponse(thinking="", action=action, raw_content=action)
+
+    def new_run(self):
+        pass
+
+
+def run(devices: int, tasks: int, capacity: int, fail_every: int, results: str):
+    server = FakeModelServer(capacity, fail_every)
+
+    def create_agent(device_id: str) -> PhoneAgent:
+        agent = PhoneAgent(
+            agent_config=AgentConfig(
+                max_steps=STEPS + 1, device_id=device_id, verbose=False
+            )
+        )
+        agent.model_client = FakeModelClient(server)
+        return agent
+
+    runner = FleetRunner(
+        create_agent,
+        [f"emulator-{5554 + 2 * index}" for index in range(devices)],
+        FleetConfig(results_path=results),
+    )
+    runner.run(FleetTask(str(index), f"task {index}") for index in range(tasks))
+    return runner.stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--tasks", type=int, default=24)
+    parser.add_argument("--capacity", type=int, default=4)
+    parser.add_argument("--fail-every", type=int, default=6)
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    factory = DeviceFactory(DeviceType.ADB)
+    factory._module = make_fake_device()
+    device_factory._device_factory = factory
+
+    print(f"{args.tasks} tasks x {STEPS} steps, model capacity {args.capacity}")
+    print(
+        f"{'devices':>7} {'seconds':>8} {'tasks/min':>10} "
+        f"{'completed':>10} {'retries':>8}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for devices in args.devices:
+            results = os.path.join(tmp, f"results-{devices}.jsonl")
+            with contextlib.redirect_stdout(io.StringIO()):
+                stats = run(
+                    devices, args.tasks, args.capacity, args.fail_every, results
+                )
+            print(
+                f"{devices:>7} {stats.elapsed:>8.2f} {stats.throughput:>10.1f} "
+                f"{stats.completed:>10} {stats.retries:>8}"
+            )
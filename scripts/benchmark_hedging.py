@@ -0,0 +1,196 @@
+"""
+Tail of time to first token with and without hedged model requests.
+
+Two local fake OpenAI-compatible replicas draw each request's TTFT from a
+seeded long-tailed distribution: most requests start in about 50ms, a few
+percent stall for up to a second. A duplicate draws again, so hedging a
+stalled request usually gets a fast copy. The replicas count streams the
+client closed before their first chunk, i.e. cancelled losers. Both copies
+are counted in flight by the router and scheduler of the endpoint they go
+to; "open" is what is still counted once every request is done, which
+should be 0.
+
+Usage:
+    python scripts/benchmark_hedging.py --clients 16 --requests 40
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from phone_agent.events import NullSink
+from phone_agent.model import (
+    HedgeConfig,
+    HedgingPolicy,
+    ModelConfig,
+    ModelRouter,
+    RequestScheduler,
+    SchedulerConfig,
+    close_openai_clients,
+)
+from phone_agent.model.client import AsyncModelClient, ModelClient
+
+TOKENS = ["I ", "tap ", "it. ", 'do(action="', "Back", '")']
+TAIL_SHARE = 0.04  # Share of requests that stall
+
+
+class TailHandler(BaseHTTPRequestHandler):
+    """Streams a fixed response after a TTFT drawn from a long tail."""
+
+    protocol_version = "HTTP/1.1"
+    rng = random.Random(0)
+    lock = threading.Lock()
+    cancelled = 0
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionResetError:
+            pass  # A cancelled copy on a kept-alive connection
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        with self.lock:
+            if self.rng.random() < TAIL_SHARE:
+                ttft = self.rng.uniform(0.4, 1.0)
+            else:
+                ttft = self.rng.uniform(0.04, 0.06)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self.wfile.flush()
+        time.sleep(ttft)
+        try:
+            for token in TOKENS:
+                chunk = {"choices": [{"index": 0, "delta": {"content": token}}]}
+                self._chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+            self._chunk(b"data: [DONE]\n\n", last=True)
+        except (BrokenPipeError, ConnectionResetError):
+            with self.lock:
+                TailHandler.cancelled += 1
+            self.close_connection = True
+
+    def _chunk(self, data: bytes, last: bool = False):
+        frame = f"{len(data):x}\r\n".encode() + data + b"\r\n"
+        self.wfile.write(frame + (b"0\r\n\r\n" if last else b""))
+        self.wfile.flush()
+
+
+def percentile(values: list[float], share: float) -> float:
+    return values[min(int(len(values) * share), len(values) - 1)]
+
+
+def run(urls: list[str], clients: int, requests: int, hedge: bool, is_async: bool):
+    """
+    Return (sorted TTFTs, hedging stats or None, cancelled streams, requests
+    still counted in flight).
+    """
+    close_openai_clients()
+    TailHandler.rng = random.Random(0)
+    TailHandler.cancelled = 0
+    router = ModelRouter(urls)
+    # Only counts: the limit is above the number of clients
+    scheduler = RequestScheduler(SchedulerConfig(max_in_flight=64, adaptive=False))
+    hedging = HedgingPolicy(HedgeConfig(initial_delay=0.2)) if hedge else None
+    config = ModelConfig(base_url=urls[0])
+    client_class = AsyncModelClient if is_async else ModelClient
+    model_clients = [
+        client_class(
+            config,
+            flow=f"device-{index}",
+            scheduler=scheduler,
+            event_sink=NullSink(),
+            router=router,
+            hedging=hedging,
+        )
+        for index in range(clients)
+    ]
+    messages = [{"role": "user", "content": "go back"}]
+    ttfts = []
+
+    if is_async:
+
+        async def client_loop(client: AsyncModelClient):
+            for _ in range(requests):
+                response = await client.request(messages)
+                ttfts.append(response.time_to_first_token)
+
+        async def run_all():
+            await asyncio.gather(*(client_loop(client) for client in model_clients))
+
+        asyncio.run(run_all())
+    else:
+
+        def client_loop(client: ModelClient):
+            for _ in range(requests):
+                response = client.request(messages)
+                ttfts.append(response.time_to_first_token)
+
+        threads = [
+            threading.Thread(target=client_loop, args=(client,))
+            for client in model_clients
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    time.sleep(0.2)  # Let the replicas notice the last cancelled streams
+    stats = hedging.stats() if hedging is not None else None
+    still_open = sum(route.in_flight for route in router.stats()) + sum(
+        endpoint.in_flight for endpoint in scheduler.stats()
+    )
+    return sorted(ttfts), stats, TailHandler.cancelled, still_open
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=40)
+    args = parser.parse_args()
+
+    servers = [ThreadingHTTPServer(("127.0.0.1", 0), TailHandler) for _ in range(2)]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/v1" for server in servers]
+
+    print(f"{args.clients} clients x {args.requests} requests, 2 replicas")
+    print(
+        f"{'mode':<13} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7} "
+        f"{'hedged':>7} {'won':>5} {'cancelled':>10} {'open':>5}"
+    )
+    try:
+        for is_async in (False, True):
+            kind = "async" if is_async else "sync"
+            p99 = {}
+            for hedge in (False, True):
+                ttfts, stats, cancelled, still_open = run(
+                    urls, args.clients, args.requests, hedge, is_async
+                )
+                p99[hedge] = percentile(ttfts, 0.99)
+                hedged = f"{stats.hedge_rate:.1%}" if stats else "-"
+                won = stats.hedge_wins if stats else "-"
+                print(
+                    f"{kind + (' hedged' if hedge else ''):<13} "
+                    f"{percentile(ttfts, 0.5) * 1000:>5.0f}ms "
+                    f"{percentile(ttfts, 0.95) * 1000:>5.0f}ms "
+                    f"{p99[hedge] * 1000:>5.0f}ms {ttfts[-1] * 1000:>5.0f}ms "
+                    f"{hedged:>7} {won:>5} {cancelled:>10} {still_open:>5}"
+                )
+            print(f"{kind} p99 improvement: {1 - p99[True] / p99[False]:.0%}")
+    finally:
+        for server in servers:
+            server.shutdown()
@@ -0,0 +1,154 @@
+"""
+Connections and set-up cost of per-client OpenAI clients vs the shared pool.
+
+Each agent gets its own ModelClient, and all of them stream from one local
+fake OpenAI-compatible endpoint. The fake endpoint counts the TCP
+connections it accepts. In the "per client" mode every ModelClient builds
+its own OpenAI client, as before the shared pool. That means its own SSL
+context, its own connection pool and its own handshakes.
+
+The sync openai Stream closes an HTTP/1.1 response at [DONE] without
+draining it. The shared sync pool reads the end of the body first, so both
+the sync and the async shared clients reuse connections; a per-client sync
+OpenAI client opens one connection per request.
+
+Usage:
+    python scripts/benchmark_http_pool.py --clients 32 --requests 5
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from openai import AsyncOpenAI, OpenAI
+
+from phone_agent.events import NullSink
+from phone_agent.model import ModelConfig, close_openai_clients, pool_stats
+from phone_agent.model.client import AsyncModelClient, ModelClient
+
+TOKENS = ["I ", "tap ", "it. ", 'do(action="', "Back", '")']
+
+
+class CountingModelHandler(BaseHTTPRequestHandler):
+    """Streams a fixed response and counts accepted connections."""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.lock:
+            CountingModelHandler.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in TOKENS:
+            chunk = {"choices": [{"index": 0, "delta": {"content": token}}]}
+            self._chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+        # The final chunk goes with [DONE], so the connection is reusable
+        # as soon as the client has read the stream
+        self._chunk(b"data: [DONE]\n\n", last=True)
+
+    def _chunk(self, data: bytes, last: bool = False):
+        frame = f"{len(data):x}\r\n".encode() + data + b"\r\n"
+        self.wfile.write(frame + (b"0\r\n\r\n" if last else b""))
+        self.wfile.flush()
+
+
+def make_clients(url: str, count: int, shared: bool, is_async: bool) -> list:
+    config = ModelConfig(base_url=url)
+    client_class = AsyncModelClient if is_async else ModelClient
+    clients = []
+    for index in range(count):
+        client = client_class(config, flow=f"device-{index}", event_sink=NullSink())
+        if not shared:
+            openai_class = AsyncOpenAI if is_async else OpenAI
+            client.client = openai_class(base_url=url, api_key=config.api_key)
+        clients.append(client)
+    return clients
+
+
+def run(url: str, clients: int, requests: int, shared: bool, is_async: bool):
+    """Return (client set-up seconds, wall seconds, connections accepted)."""
+    CountingModelHandler.connections = 0
+    close_openai_clients()
+    messages = [{"role": "user", "content": "go back"}]
+
+    start = time.perf_counter()
+    model_clients = make_clients(url, clients, shared, is_async)
+    setup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if is_async:
+
+        async def client_loop(client: AsyncModelClient):
+            for _ in range(requests):
+                await client.request(messages)
+
+        async def run_all():
+            await asyncio.gather(*(client_loop(client) for client in model_clients))
+
+        asyncio.run(run_all())
+    else:
+
+        def client_loop(client: ModelClient):
+            for _ in range(requests):
+                client.request(messages)
+
+        threads = [
+            threading.Thread(target=client_loop, args=(client,))
+            for client in model_clients
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    wall = time.perf_counter() - start
+    return setup, wall, CountingModelHandler.connections
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=5)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CountingModelHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    results = {}
+    try:
+        for is_async in (False, True):
+            kind = "async" if is_async else "sync"
+            for shared in (False, True):
+                mode = f"{kind} {'shared' if shared else 'per client'}"
+                results[mode] = run(url, args.clients, args.requests, shared, is_async)
+            stats = pool_stats()[0]
+            print(
+                f"{kind} shared pool: {stats.requests} requests, "
+                f"{stats.reuse_rate:.0%} on reused connections, peak "
+                f"{stats.peak_in_flight}/{stats.max_connections} in use"
+            )
+    finally:
+        server.shutdown()
+
+    print(f"\n{args.clients} clients x {args.requests} requests")
+    print(f"{'mode':<17} {'set-up':>8} {'wall':>8} {'connections':>12}")
+    for mode, (setup, wall, connections) in results.items():
+        print(
+            f"{mode:<17} {setup * 1000:>6.0f}ms {wall * 1000:>6.0f}ms {connections:>12}"
+        )
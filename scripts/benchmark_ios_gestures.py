@@ -0,0 +1,54 @@
+"""
+Count WDA round trips per step with and without batched gesture sequences.
+
+Each scenario is run once action by action through IOSActionHandler.execute()
+and once through IOSActionHandler.execute_batch() against a local fake WDA.
+
+Usage:
+    python scripts/benchmark_ios_gestures.py
+"""
+
+from benchmark_wda_session import start_fake_wda
+
+from phone_agent.actions.handler import do
+from phone_agent.actions.handler_ios import IOSActionHandler
+from phone_agent.xctest.session import WDAHttpSession
+
+SCENARIOS = {
+    "double tap": [do(action="Double Tap", element=[500, 500])],
+    "back, then tap": [do(action="Back"), do(action="Tap", element=[500, 300])],
+    "tap, tap, swipe": [
+        do(action="Tap", element=[100, 900]),
+        do(action="Tap", element=[900, 900]),
+        do(action="Swipe", start=[500, 800], end=[500, 200]),
+    ],
+}
+
+WIDTH, HEIGHT = 1179, 2556
+
+
+def count_round_trips(handler: IOSActionHandler, run) -> int:
+    """Return the number of WDA requests issued by run()."""
+    before = handler.http_session.request_count
+    run()
+    return handler.http_session.request_count - before
+
+
+if __name__ == "__main__":
+    server, wda_url = start_fake_wda()
+    handler = IOSActionHandler(wda_url=wda_url, http_session=WDAHttpSession(wda_url))
+
+    try:
+        print(f"{'scenario':<20} {'sequential':>10} {'batched':>8}")
+        for name, actions in SCENARIOS.items():
+            sequential = count_round_trips(
+                handler,
+                lambda: [handler.execute(a, WIDTH, HEIGHT) for a in actions],
+            )
+            batched = count_round_trips(
+                handler,
+                lambda: handler.execute_batch(actions, WIDTH, HEIGHT, delay=0),
+            )
+            print(f"{name:<20} {sequential:>10} {batched:>8}")
+    finally:
+        server.shutdown()
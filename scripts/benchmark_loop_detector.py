@@ -0,0 +1,78 @@
+"""
+Model calls recovered by the loop detector on a stuck task.
+
+The fake device ignores taps, and the fake model keeps tapping the same
+button, as an agent does when a button is disabled. Without the detector the
+run burns its whole step budget; with it the run escalates hint -> Back ->
+finish and stops early.
+
+Usage:
+    python scripts/benchmark_loop_detector.py --max-steps 30
+"""
+
+import argparse
+import contextlib
+import io
+from types import SimpleNamespace
+
+from benchmark_trajectory import make_screenshot
+
+from phone_agent import PhoneAgent, device_factory
+from phone_agent.agent import AgentConfig
+from phone_agent.device_factory import DeviceFactory, DeviceType
+from phone_agent.loop_detector import LoopDetectorConfig
+from phone_agent.model.client import ModelResponse
+
+
+class StuckModelClient:
+    def __init__(self):
+        self.calls = 0
+
+    def request(self, messages, on_action=None, max_tokens=None):
+        self.calls += 1
+        action = 'do(action="Tap", element=[500, 1800])'
+        return ModelResponse(thinking="", action=action, raw_content=action)
+
+    def new_run(self):
+        pass
+
+
+def run(max_steps: int, loop_detection: LoopDetectorConfig | None):
+    screenshot = make_screenshot(0)
+    factory = DeviceFactory(DeviceType.ADB)
+    factory._module = SimpleNamespace(
+        get_screenshot=lambda device_id=None, timeout=10: screenshot,
+        get_current_app=lambda device_id=None: "Settings",
+        tap=lambda x, y, device_id=None, delay=None: None,
+        back=lambda device_id=None, delay=None: None,
+    )
+    device_factory._device_factory = factory
+
+    agent = PhoneAgent(
+        agent_config=AgentConfig(
+            max_steps=max_steps, verbose=False, loop_detection=loop_detection
+        )
+    )
+    agent.model_client = StuckModelClient()
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent.run("Submit the form")
+    return agent
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--max-steps", type=int, default=30)
+    args = parser.parse_args()
+
+    baseline = run(args.max_steps, None)
+    detected = run(args.max_steps, LoopDetectorConfig())
+
+    print(f"without detector: {baseline.model_client.calls} model calls")
+    print(f"with detector:    {detected.model_client.calls} model calls")
+    for event in detected.loop_detector.events:
+        print(
+            f"  step {event.step}: {event.kind}, {event.wasted_steps} wasted steps "
+            f"-> {event.policy.value} ({event.remaining_steps} steps left)"
+        )
+    recovered = baseline.model_client.calls - detected.model_client.calls
+    print(f"recovered:        {recovered} model calls")
@@ -0,0 +1,118 @@
+"""
+End-to-end step latency of the sequential vs. pipelined agent loop.
+
+Uses a fake device and a fake model with fixed, realistic latencies, plus a
+step callback that stands in for trajectory persistence. Each mode is also run
+with early action dispatch, where the action completes before the stream ends.
+
+Usage:
+    python scripts/benchmark_pipeline.py --steps 10
+"""
+
+import argparse
+import base64
+import time
+from io import BytesIO
+from types import SimpleNamespace
+
+from PIL import Image
+
+from phone_agent import PhoneAgent, device_factory
+from phone_agent.adb.screenshot import Screenshot
+from phone_agent.agent import AgentConfig
+from phone_agent.device_factory import DeviceFactory, DeviceType
+from phone_agent.model.client import ModelResponse
+
+SCREENSHOT_LATENCY = 0.35  # screencap + pull
+CURRENT_APP_LATENCY = 0.25  # dumpsys window
+ACTION_LATENCY = 0.08  # input tap
+SETTLE_DELAY = 1.0  # TIMING_CONFIG default
+MODEL_LATENCY = 1.2  # full streamed response
+ACTION_COMPLETE_AT = 0.9  # closing paren of the action streamed in
+PERSIST_LATENCY = 0.15  # trajectory upload per step
+
+
+def make_screenshot() -> Screenshot:
+    buffered = BytesIO()
+    Image.new("RGB", (1080, 2400)).save(buffered, format="PNG")
+    return Screenshot(base64.b64encode(buffered.getvalue()).decode(), 1080, 2400)
+
+
+def make_fake_device():
+    screenshot = make_screenshot()
+
+    def get_screenshot(device_id=None, timeout=10):
+        time.sleep(SCREENSHOT_LATENCY)
+        return screenshot
+
+    def get_current_app(device_id=None):
+        time.sleep(CURRENT_APP_LATENCY)
+        return "Settings"
+
+    def tap(x, y, device_id=None, delay=None):
+        time.sleep(ACTION_LATENCY + SETTLE_DELAY)
+
+    return SimpleNamespace(
+        get_screenshot=get_screenshot, get_current_app=get_current_app, tap=tap
+    )
+
+
+class FakeModelClient:
+    def __init__(self, steps: int):
+        self.steps = steps
+        self.calls = 0
+
+    def request(self, messages, on_action=None, max_tokens=None):
+        self.calls += 1
+        if self.calls >= self.steps:
+            action = 'finish(message="done")'
+        else:
+            action = 'do(action="Tap", element=[500, 500])'
+        time.sleep(ACTION_COMPLETE_AT)
+        if on_action is not None:
+            on_action(action)
+        time.sleep(MODEL_LATENCY - ACTION_COMPLETE_AT)
+        return ModelResponse(
+            thinking="",
+            action=action,
+            raw_content=action,
+            time_to_action=ACTION_COMPLETE_AT,
+        )
+
+    def new_run(self):
+        pass
+
+
+def run(pipelined: bool, steps: int, early_dispatch: bool = False) -> float:
+    factory = DeviceFactory(DeviceType.ADB)
+    factory._module = make_fake_device()
+    device_factory._device_factory = factory
+
+    agent = PhoneAgent(
+        agent_config=AgentConfig(
+            verbose=False, pipelined=pipelined, early_dispatch=early_dispatch
+        ),
+        step_callback=lambda result: time.sleep(PERSIST_LATENCY),
+    )
+    agent.model_client = FakeModelClient(steps)
+
+    start = time.perf_counter()
+    agent.run("benchmark")
+    return (time.perf_counter() - start) / steps
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--steps", type=int, default=10)
+    args = parser.parse_args()
+
+    baseline = run(False, args.steps)
+    for label, pipelined, early in (
+        ("sequential", False, False),
+        ("sequential + early", False, True),
+        ("pipelined", True, False),
+        ("pipelined + early", True, True),
+    ):
+        per_step = run(pipelined, args.steps, early) if pipelined or early else baseline
+        saved = (baseline - per_step) * 1000
+        print(f"{label:<20} {per_step * 1000:>6.0f} ms/step  (saved {saved:.0f})")
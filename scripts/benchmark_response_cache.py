@@ -0,0 +1,78 @@
+"""
+Model calls saved by the response cache across repeated runs.
+
+Reuses the fake device and model of benchmark_trajectory.py. Each backend runs
+the same task several times; the sqlite backend is reopened between runs to
+show that entries survive a restart.
+
+Usage:
+    python scripts/benchmark_response_cache.py --runs 3 --steps 6
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmark_trajectory import FakeDevice, FakeModelClient
+
+from phone_agent import PhoneAgent, device_factory
+from phone_agent.agent import AgentConfig
+from phone_agent.device_factory import DeviceFactory, DeviceType
+from phone_agent.model.cache import (
+    MemoryCacheBackend,
+    ResponseCache,
+    SqliteCacheBackend,
+)
+
+
+def run(cache: ResponseCache, steps: int) -> tuple[int, float]:
+    """Return (model calls, seconds) for one run of the task."""
+    device = FakeDevice(steps)
+    factory = DeviceFactory(DeviceType.ADB)
+    factory._module = device.module()
+    device_factory._device_factory = factory
+
+    agent = PhoneAgent(agent_config=AgentConfig(verbose=False, response_cache=cache))
+    agent.model_client = FakeModelClient(device, steps)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent.run("Turn on Bluetooth")
+    return agent.model_client.calls, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--steps", type=int, default=6)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "responses.db")
+    memory_cache = ResponseCache(MemoryCacheBackend())
+
+    print(f"{'backend':<8} {'run':<4} {'model calls':>11} {'seconds':>8}")
+    for index in range(args.runs):
+        calls, seconds = run(memory_cache, args.steps)
+        print(f"{'memory':<8} {index + 1:<4} {calls:>11} {seconds:>8.2f}")
+
+    sqlite_stats = []
+    for index in range(args.runs):
+        # A fresh cache per run, as after a process restart
+        backend = SqliteCacheBackend(db_path)
+        sqlite_cache = ResponseCache(backend)
+        calls, seconds = run(sqlite_cache, args.steps)
+        sqlite_stats.append(sqlite_cache.stats)
+        backend.close()
+        print(f"{'sqlite':<8} {index + 1:<4} {calls:>11} {seconds:>8.2f}")
+
+    stats = memory_cache.stats
+    print(
+        f"\nmemory: hit rate {stats.hit_rate:.0%}, "
+        f"{stats.hits} hits, {stats.misses} misses, {stats.size} entries"
+    )
+    hits = sum(s.hits for s in sqlite_stats)
+    misses = sum(s.misses for s in sqlite_stats)
+    print(f"sqlite: {hits} hits, {misses} misses, {sqlite_stats[-1].size} entries")
@@ -0,0 +1,229 @@
+"""
+Task completion under model faults with and without retries and breakers.
+
+Agents run against a fake device and a local fake OpenAI-compatible server
+that injects seeded faults: 503 responses and streams that break off in the
+middle of the thinking. Without retries, the first fault ends a task. In a
+second scenario every request gets a 503, as from a replica that is down,
+and the circuit breaker turns the retry storm into fast failures.
+
+Usage:
+    python scripts/benchmark_retry.py --agents 16 --steps 10
+"""
+
+import argparse
+import json
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from benchmark_pipeline import make_screenshot
+
+from phone_agent import PhoneAgent, device_factory
+from phone_agent.agent import AgentConfig
+from phone_agent.device_factory import DeviceFactory, DeviceType
+from phone_agent.events import NullSink
+from phone_agent.model import (
+    ModelConfig,
+    ModelRequestError,
+    RetryConfig,
+    RetryPolicy,
+    close_openai_clients,
+)
+from phone_agent.model.client import ModelClient
+
+THINKING = "The settings list is visible, so I tap the next entry. " * 4
+
+
+class FaultyHandler(BaseHTTPRequestHandler):
+    """Streams agent responses, failing a seeded share of the requests."""
+
+    protocol_version = "HTTP/1.1"
+    rng = random.Random(0)
+    lock = threading.Lock()
+    error_rate = 0.05  # Share of requests answered with a 503
+    break_rate = 0.05  # Share of streams cut off in the thinking
+    steps = 10
+    requests = 0
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.lock:
+            FaultyHandler.requests += 1
+            draw = self.rng.random()
+        if draw < self.error_rate:
+            self.send_response(503)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+            return
+
+        step = sum(message["role"] == "assistant" for message in body["messages"])
+        if step + 1 >= self.steps:
+            action = 'finish(message="done")'
+        else:
+            action = 'do(action="Tap", element=[500, 500])'
+        tokens = [word + " " for word in THINKING.split()] + [action]
+        if draw < self.error_rate + self.break_rate:
+            tokens = tokens[: len(tokens) // 2]
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in tokens:
+            chunk = {"choices": [{"index": 0, "delta": {"content": token}}]}
+            self._chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+        if len(tokens) < len(THINKING.split()) + 1:
+            # Drop the connection without ending the chunked response
+            self.connection.shutdown(socket.SHUT_RDWR)
+            self.close_connection = True
+            return
+        self._chunk(b"data: [DONE]\n\n", last=True)
+
+    def _chunk(self, data: bytes, last: bool = False):
+        frame = f"{len(data):x}\r\n".encode() + data + b"\r\n"
+        self.wfile.write(frame + (b"0\r\n\r\n" if last else b""))
+        self.wfile.flush()
+
+
+def run_agents(url: str, agents: int, steps: int, policy: RetryPolicy) -> dict:
+    """Run every agent once and count completed tasks and retries."""
+    close_openai_clients()
+    FaultyHandler.rng = random.Random(0)
+    FaultyHandler.requests = 0
+    FaultyHandler.steps = steps
+    retries = []
+    finished = []
+    lock = threading.Lock()
+
+    def on_step(result):
+        with lock:
+            retries.append(result.model_retries)
+
+    def run(index: int):
+        agent = PhoneAgent(
+            ModelConfig(base_url=url),
+            AgentConfig(
+                max_steps=steps,
+                device_id=f"device-{index}",
+                verbose=False,
+                event_sink=NullSink(),
+                retry_policy=policy,
+            ),
+            step_callback=on_step,
+        )
+        agent.run("benchmark")
+        with lock:
+            finished.append(agent.last_run.reason.value == "finished")
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(agents)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        "wall": time.perf_counter() - start,
+        "completed": sum(finished),
+        "retries": sum(retries),
+        "requests": FaultyHandler.requests,
+    }
+
+
+def run_outage(url: str, clients: int, requests: int, policy: RetryPolicy) -> dict:
+    """Send requests to an endpoint that answers everything with a 503."""
+    close_openai_clients()
+    FaultyHandler.requests = 0
+    FaultyHandler.error_rate = 1.0
+    failed = []
+
+    def client_loop(index: int):
+        client = ModelClient(
+            ModelConfig(base_url=url),
+            flow=f"device-{index}",
+            event_sink=NullSink(),
+            retry_policy=policy,
+        )
+        for _ in range(requests):
+            start = time.perf_counter()
+            try:
+                client.request([{"role": "user", "content": "go back"}])
+            except ModelRequestError:
+                failed.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client_loop, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        "wall": time.perf_counter() - start,
+        "failed": len(failed),
+        "mean_failure": sum(failed) / len(failed),
+        "requests": FaultyHandler.requests,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--agents", type=int, default=16)
+    parser.add_argument("--steps", type=int, default=10)
+    args = parser.parse_args()
+
+    factory = DeviceFactory(DeviceType.ADB)
+    screenshot = make_screenshot()
+    factory._module = SimpleNamespace(
+        get_screenshot=lambda device_id=None, timeout=10: screenshot,
+        get_current_app=lambda device_id=None: "Settings",
+        tap=lambda x, y, device_id=None, delay=None: None,
+    )
+    device_factory._device_factory = factory
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FaultyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    # Short backoffs keep the benchmark quick; the shape is what matters
+    fast = {"backoff_base": 0.05, "backoff_max": 0.4}
+    try:
+        print(f"{args.agents} agents x {args.steps} steps, 5% 503s, 5% broken streams")
+        print(
+            f"{'mode':<11} {'wall':>8} {'completed':>10} {'requests':>9} {'retries':>8}"
+        )
+        for name, config in (
+            ("no retries", RetryConfig(max_retries=0, breaker_failures=0)),
+            ("retries", RetryConfig(max_retries=3, **fast)),
+        ):
+            r = run_agents(url, args.agents, args.steps, RetryPolicy(config))
+            print(
+                f"{name:<11} {r['wall'] * 1000:>6.0f}ms "
+                f"{r['completed']:>5}/{args.agents:<4} {r['requests']:>9} "
+                f"{r['retries']:>8}"
+            )
+
+        print(f"\nendpoint down: {args.agents} clients x 5 requests, 3 retries each")
+        print(f"{'mode':<11} {'wall':>8} {'sent':>6} {'mean time to fail':>18}")
+        for name, config in (
+            ("no breaker", RetryConfig(breaker_failures=0, **fast)),
+            ("breaker", RetryConfig(breaker_failures=5, **fast)),
+        ):
+            r = run_outage(url, args.agents, 5, RetryPolicy(config))
+            print(
+                f"{name:<11} {r['wall'] * 1000:>6.0f}ms {r['requests']:>6} "
+                f"{r['mean_failure'] * 1000:>16.0f}ms"
+            )
+    finally:
+        server.shutdown()
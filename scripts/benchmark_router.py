@@ -0,0 +1,220 @@
+"""
+Prefix cache hits and TTFT of agent runs spread over model replicas.
+
+Several local fake OpenAI-compatible replicas each keep a prefix cache of
+the conversations they have served. A request's prefill time grows with its
+prompt tokens missing from that replica's cache. Prefills on one replica run
+one at a time, like a GPU busy with other sequences. Each simulated run
+sends a growing conversation, one request per step, as an agent does.
+
+Modes:
+    single       every run on one replica
+    round robin  each request to the next replica, ignoring the cache
+    router       ModelRouter, each run pinned to one replica
+    failover     router, with one replica shut down halfway through
+
+Usage:
+    python scripts/benchmark_router.py --replicas 3 --runs 24 --steps 8
+"""
+
+import argparse
+import hashlib
+import json
+import socket
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from openai import APIConnectionError
+
+from phone_agent.events import NullSink
+from phone_agent.model import (
+    HttpPoolConfig,
+    ModelConfig,
+    ModelRouter,
+    close_openai_clients,
+    get_openai_client,
+)
+from phone_agent.model.client import ModelClient
+
+PREFILL_PER_TOKEN = 0.00002  # Seconds of prefill per uncached prompt token
+SYSTEM_PROMPT = "You are a phone agent. " * 400
+TOKENS = ["I ", "tap ", "the ", "entry. ", 'do(action="Tap", ', "element=[5, 5])"]
+
+
+def tokens_of(message: dict) -> int:
+    return len(message["content"]) // 4
+
+
+def prefix_hashes(messages: list[dict]) -> list[str]:
+    """Hash of every message prefix, shortest first."""
+    digest = hashlib.sha256()
+    hashes = []
+    for message in messages:
+        digest.update(json.dumps(message, sort_keys=True).encode())
+        hashes.append(digest.copy().hexdigest())
+    return hashes
+
+
+class ReplicaHandler(BaseHTTPRequestHandler):
+    """Streams a fixed response after a prefill priced by cache misses."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        messages = body["messages"]
+        replica = self.server
+        hashes = prefix_hashes(messages)
+        with replica.cache_lock:
+            hits = 0
+            for index, prefix in enumerate(hashes):
+                if prefix in replica.cache:
+                    hits = index + 1
+            replica.cache.update(hashes)
+        prompt = sum(tokens_of(message) for message in messages)
+        cached = sum(tokens_of(message) for message in messages[:hits])
+        with replica.gpu:
+            time.sleep((prompt - cached) * PREFILL_PER_TOKEN)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in TOKENS:
+            chunk = {"choices": [{"index": 0, "delta": {"content": token}}]}
+            self._chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+        usage = {
+            "choices": [],
+            "usage": {
+                "prompt_tokens": prompt,
+                "completion_tokens": len(TOKENS),
+                "total_tokens": prompt + len(TOKENS),
+                "prompt_tokens_details": {"cached_tokens": cached},
+            },
+        }
+        self._chunk(f"data: {json.dumps(usage)}\n\n".encode())
+        self._chunk(b"data: [DONE]\n\n", last=True)
+
+    def _chunk(self, data: bytes, last: bool = False):
+        frame = f"{len(data):x}\r\n".encode() + data + b"\r\n"
+        self.wfile.write(frame + (b"0\r\n\r\n" if last else b""))
+        self.wfile.flush()
+
+
+def start_replica() -> tuple[ThreadingHTTPServer, str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ReplicaHandler)
+    server.cache = set()
+    server.cache_lock = threading.Lock()
+    server.gpu = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def run_agent(client: ModelClient, run: int, steps: int, route, results: dict):
+    """One run: a conversation growing by a screen and a reply per step."""
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+    client.new_run()
+    for step in range(steps):
+        screen = f"Run {run} step {step}: " + f"list entry {run}-{step} " * 300
+        messages.append({"role": "user", "content": screen})
+        if route is not None:
+            route(client)
+        try:
+            response = client.request(messages)
+        except APIConnectionError:
+            results["errors"] += 1
+            break
+        messages.append({"role": "assistant", "content": response.raw_content})
+        with results["lock"]:
+            results["responses"].append(response)
+    client.new_run()
+
+
+def run_mode(mode: str, replicas: int, runs: int, steps: int) -> dict:
+    close_openai_clients()
+    servers = [start_replica() for _ in range(replicas)]
+    urls = [url for _, url in servers]
+    pool = HttpPoolConfig(max_retries=0)
+    router = ModelRouter(urls) if mode in ("router", "failover") else None
+    config = ModelConfig(base_url=urls[0], http_pool=pool)
+
+    route = None
+    if mode == "round robin":
+        counter = iter(range(10**9))
+        counter_lock = threading.Lock()
+
+        def route(client: ModelClient):
+            with counter_lock:
+                url = urls[next(counter) % len(urls)]
+            client.client = get_openai_client(url, config.api_key, pool)
+
+    results = {"responses": [], "errors": 0, "lock": threading.Lock()}
+    clients = [
+        ModelClient(config, flow=f"run-{run}", event_sink=NullSink(), router=router)
+        for run in range(runs)
+    ]
+    threads = [
+        threading.Thread(target=run_agent, args=(client, run, steps, route, results))
+        for run, client in enumerate(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    if mode == "failover":
+        time.sleep(0.5)
+        servers[-1][0].shutdown()
+        servers[-1][0].server_close()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    for server, _ in servers[: -1 if mode == "failover" else None]:
+        server.shutdown()
+        server.server_close()
+
+    responses = results["responses"]
+    ttfts = sorted(r.time_to_first_token for r in responses)
+    prompt = sum(r.prompt_tokens for r in responses)
+    cached = sum(r.cached_tokens for r in responses)
+    return {
+        "wall": wall,
+        "requests": len(responses),
+        "ttft_mean": statistics.mean(ttfts),
+        "ttft_p95": ttfts[int(len(ttfts) * 0.95)],
+        "cache_hit": cached / prompt,
+        "failovers": sum(r.failovers for r in responses),
+        "errors": results["errors"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--replicas", type=int, default=3)
+    parser.add_argument("--runs", type=int, default=24)
+    parser.add_argument("--steps", type=int, default=8)
+    args = parser.parse_args()
+
+    modes = ["single", "round robin", "router", "failover"]
+    results = {
+        mode: run_mode(mode, args.replicas, args.runs, args.steps) for mode in modes
+    }
+
+    print(f"{args.runs} runs x {args.steps} steps on {args.replicas} replicas")
+    print(
+        f"{'mode':<12} {'wall':>8} {'TTFT mean':>10} {'TTFT p95':>9} "
+        f"{'cache hit':>10} {'failovers':>10} {'failed runs':>12}"
+    )
+    for mode, r in results.items():
+        print(
+            f"{mode:<12} {r['wall'] * 1000:>6.0f}ms {r['ttft_mean'] * 1000:>8.0f}ms "
+            f"{r['ttft_p95'] * 1000:>7.0f}ms {r['cache_hit']:>10.0%} "
+            f"{r['failovers']:>10} {r['errors']:>12}"
+        )
@@ -0,0 +1,147 @@
+"""
+Latency of many agents sharing one model server, with and without scheduling.
+
+Runs a local fake OpenAI-compatible endpoint that serves CAPACITY requests at
+full speed; beyond that, prefill and decode slow down superlinearly (as a
+server that starts swapping KV cache would). Half of the clients send
+interactive requests and half batch requests.
+
+Usage:
+    python scripts/benchmark_scheduler.py --clients 16 --requests 6
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import socket
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from phone_agent.model import (
+    BATCH,
+    INTERACTIVE,
+    ModelConfig,
+    RequestScheduler,
+    SchedulerConfig,
+)
+from phone_agent.model.client import ModelClient
+
+CAPACITY = 4  # Concurrent requests the fake server handles at full speed
+PREFILL = 0.05  # Seconds to first token at or under capacity
+TOKEN_INTERVAL = 0.004
+TOKENS = ["I ", "tap ", "it. ", 'do(action="', "Back", '")'] * 5
+
+
+class ThrashingModelHandler(BaseHTTPRequestHandler):
+    """Streams a fixed response, slower the more requests are active."""
+
+    active = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    @classmethod
+    def slowdown(cls) -> float:
+        return max(1.0, cls.active / CAPACITY) ** 2
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.lock:
+            ThrashingModelHandler.active += 1
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            time.sleep(PREFILL * self.slowdown())
+            for token in TOKENS:
+                chunk = {"choices": [{"index": 0, "delta": {"content": token}}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+                time.sleep(TOKEN_INTERVAL * self.slowdown())
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self.lock:
+                ThrashingModelHandler.active -= 1
+
+
+def run(url: str, clients: int, requests: int, scheduler: RequestScheduler | None):
+    """Return ({priority: (latency, queue wait)}, TTFTs, wall seconds)."""
+    latencies: dict[int, list[tuple[float, float]]] = {INTERACTIVE: [], BATCH: []}
+    ttfts: list[float] = []
+    lock = threading.Lock()
+    messages = [{"role": "user", "content": "go back"}]
+
+    def client_loop(index: int):
+        priority = INTERACTIVE if index % 2 == 0 else BATCH
+        client = ModelClient(
+            ModelConfig(base_url=url),
+            scheduler=scheduler,
+            priority=priority,
+            flow=f"device-{index}",
+        )
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = client.request(messages)
+            with lock:
+                latencies[priority].append(
+                    (time.perf_counter() - start, response.queue_time or 0.0)
+                )
+                ttfts.append(response.time_to_first_token)
+
+    threads = [
+        threading.Thread(target=client_loop, args=(index,)) for index in range(clients)
+    ]
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return latencies, ttfts, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=6)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ThrashingModelHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    scheduler = RequestScheduler(SchedulerConfig(max_in_flight=args.clients))
+    try:
+        results = {
+            "unscheduled": run(url, args.clients, args.requests, None),
+            "scheduled": run(url, args.clients, args.requests, scheduler),
+        }
+    finally:
+        server.shutdown()
+
+    print(f"{args.clients} clients x {args.requests} requests, capacity {CAPACITY}")
+    print(
+        f"{'mode':<12} {'wall':>7} {'TTFT':>7} "
+        f"{'interactive (wait)':>19} {'batch (wait)':>17}"
+    )
+    for mode, (latencies, ttfts, wall) in results.items():
+        columns = []
+        for priority in (INTERACTIVE, BATCH):
+            latency = statistics.mean(total for total, _ in latencies[priority])
+            wait = statistics.mean(queued for _, queued in latencies[priority])
+            columns.append(f"{latency * 1000:.0f}ms ({wait * 1000:.0f}ms)")
+        print(
+            f"{mode:<12} {wall:>6.2f}s {statistics.mean(ttfts) * 1000:>5.0f}ms "
+            f"{columns[0]:>19} {columns[1]:>17}"
+        )
+    print(f"scheduler limit after the run: {scheduler.stats()[0].limit:g}")
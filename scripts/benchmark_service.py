@@ -0,0 +1,175 @@
+"""
+Per-task overhead of one main.py invocation per task vs the HTTP service.
+
+A cold task pays for interpreter start-up and imports, the model API check
+(a real chat completion), and a fresh agent with a new model connection
+before its own steps. A service task reuses a warm agent. The model is a
+local fake OpenAI-compatible endpoint and the device is fake; both tasks
+take one step.
+
+Usage:
+    python scripts/benchmark_service.py --tasks 5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from benchmark_pipeline import make_screenshot
+
+from phone_agent import PhoneAgent, device_factory
+from phone_agent.agent import AgentConfig
+from phone_agent.device_factory import DeviceFactory, DeviceType
+from phone_agent.model import ModelConfig
+from phone_agent.server import AgentService, ServiceConfig
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)  # For main.check_model_api
+MODEL_LATENCY = 0.15  # Prefill + decode of the fake model
+TOKENS = ["Done", ". ", 'finish(message="', "ok", '")']
+
+
+class FakeModelHandler(BaseHTTPRequestHandler):
+    """Answers streamed and non-streamed chat completions."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(MODEL_LATENCY)
+        if not body.get("stream"):
+            payload = json.dumps(
+                {
+                    "id": "check",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": body["model"],
+                    "choices": [
+                        {
+                            "index": 0,
+                            "finish_reason": "length",
+                            "message": {"role": "assistant", "content": "Hi"},
+                        }
+                    ],
+                }
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in TOKENS:
+            chunk = {"choices": [{"index": 0, "delta": {"content": token}}]}
+            self._chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+        self._chunk(b"data: [DONE]\n\n")
+        self._chunk(b"")
+
+    def _chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+def make_fake_device():
+    screenshot = make_screenshot()
+    return SimpleNamespace(
+        get_screenshot=lambda device_id=None, timeout=10: screenshot,
+        get_current_app=lambda device_id=None: "Settings",
+    )
+
+
+def create_agent(model_config: ModelConfig, device_id: str) -> PhoneAgent:
+    return PhoneAgent(
+        model_config=model_config,
+        agent_config=AgentConfig(max_steps=3, device_id=device_id, verbose=False),
+    )
+
+
+def cold_task(model_config: ModelConfig) -> float:
+    """Start-up, API check, fresh agent and run, like one main.py invocation."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import main"], cwd=REPO_ROOT, check=True)
+    from main import check_model_api
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        check_model_api(model_config.base_url, model_config.model_name)
+        create_agent(model_config, "emulator-5554").run("benchmark")
+    return time.perf_counter() - start
+
+
+def service_task(url: str) -> float:
+    """Submit a task and follow its events until it ends."""
+    start = time.perf_counter()
+    request = urllib.request.Request(
+        f"{url}/tasks",
+        data=json.dumps({"task": "benchmark"}).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request) as response:
+        task_id = json.load(response)["id"]
+    with urllib.request.urlopen(f"{url}/tasks/{task_id}/events") as events:
+        for line in events:
+            if line.startswith(b"event: end"):
+                break
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--tasks", type=int, default=5)
+    args = parser.parse_args()
+
+    factory = DeviceFactory(DeviceType.ADB)
+    factory._module = make_fake_device()
+    device_factory._device_factory = factory
+
+    model_server = ThreadingHTTPServer(("127.0.0.1", 0), FakeModelHandler)
+    threading.Thread(target=model_server.serve_forever, daemon=True).start()
+    model_config = ModelConfig(
+        base_url=f"http://127.0.0.1:{model_server.server_address[1]}/v1"
+    )
+
+    service = AgentService(
+        lambda device_id: create_agent(model_config, device_id),
+        ["emulator-5554"],
+        ServiceConfig(port=0),
+    )
+    threading.Thread(target=service.serve_forever, daemon=True).start()
+    while service.server_address is None:
+        time.sleep(0.01)
+    url = "http://127.0.0.1:{}".format(service.server_address[1])
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        service_task(url)  # Warm-up: the first task opens the model connection
+        warm = [service_task(url) for _ in range(args.tasks)]
+    cold = [cold_task(model_config) for _ in range(args.tasks)]
+    service.shutdown()
+    model_server.shutdown()
+
+    print(f"{args.tasks} one-step tasks, model latency {MODEL_LATENCY * 1000:.0f}ms")
+    print(f"{'mode':<16} {'per task':>9}")
+    print(f"{'main.py per task':<16} {statistics.mean(cold) * 1000:>7.0f}ms")
+    print(f"{'service':<16} {statistics.mean(warm) * 1000:>7.0f}ms")
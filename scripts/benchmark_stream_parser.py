@@ -0,0 +1,111 @@
+"""
+Microbenchmark of StreamParser against the previous ad-hoc streaming loop.
+
+The legacy loop rescanned its buffer for every marker and every marker prefix
+on each delta, re-checked the whole action text for completeness on every
+action delta, and split the full response again at the end.
+
+Usage:
+    python scripts/benchmark_stream_parser.py
+"""
+
+import ast
+import timeit
+
+from phone_agent.model.stream_parser import StreamParser
+
+MARKERS = ["finish(message=", "do(action="]
+
+
+def legacy_is_complete(text: str) -> bool:
+    depth, quote, escaped = 0, None, False
+    for i, char in enumerate(text):
+        if quote:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                try:
+                    tree = ast.parse(text[: i + 1], mode="eval")
+                except SyntaxError:
+                    return False
+                return isinstance(tree.body, ast.Call)
+    return False
+
+
+def legacy_split(content: str) -> tuple[str, str]:
+    for marker in MARKERS:
+        if marker in content:
+            thinking, action = content.split(marker, 1)
+            return thinking.strip(), marker + action
+    if "<answer>" in content:
+        thinking, action = content.split("<answer>", 1)
+        thinking = thinking.replace("<think>", "").replace("</think>", "").strip()
+        return thinking, action.replace("</answer>", "").strip()
+    return "", content
+
+
+def legacy_parse(deltas: list[str]) -> tuple[str, str]:
+    raw, buffer, action_text = "", "", ""
+    in_action, complete = False, False
+    for content in deltas:
+        raw += content
+        if in_action:
+            if not complete:
+                action_text += content
+                complete = legacy_is_complete(action_text)
+            continue
+        buffer += content
+        for marker in MARKERS:
+            if marker in buffer:
+                in_action = True
+                action_text = marker + buffer.split(marker, 1)[1]
+                complete = legacy_is_complete(action_text)
+                break
+        if in_action:
+            continue
+        if not any(
+            buffer.endswith(marker[:i])
+            for marker in MARKERS
+            for i in range(1, len(marker))
+        ):
+            buffer = ""
+    return legacy_split(raw)
+
+
+def parse(deltas: list[str]) -> tuple[str, str]:
+    parser = StreamParser()
+    for delta in deltas:
+        parser.feed(delta)
+    parser.close()
+    return parser.result()
+
+
+def make_deltas(thinking_tokens: int, text_tokens: int) -> list[str]:
+    """Long thinking, then a Type action carrying a long text argument."""
+    thinking = ["step ", "by ", "step, ", "(maybe) "] * (thinking_tokens // 4)
+    text = ["lorem ", "ipsum ", "(dolor) ", "sit "] * (text_tokens // 4)
+    return thinking + ['do(action="Type", ', 'text="'] + text + ['")', "</answer>"]
+
+
+if __name__ == "__main__":
+    print(f"{'thinking':>8} {'action':>8} {'legacy':>10} {'parser':>10}")
+    for thinking_tokens, text_tokens in ((200, 20), (1000, 200), (1000, 2000)):
+        deltas = make_deltas(thinking_tokens, text_tokens)
+        assert parse(deltas) == legacy_parse(deltas)
+        number = 20
+        legacy = timeit.timeit(lambda: legacy_parse(deltas), number=number) / number
+        parser = timeit.timeit(lambda: parse(deltas), number=number) / number
+        print(
+            f"{thinking_tokens:>8} {text_tokens:>8} "
+            f"{legacy * 1000:>8.2f}ms {parser * 1000:>8.2f}ms"
+        )
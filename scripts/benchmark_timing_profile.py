@@ -0,0 +1,164 @@
+"""
+Action time saved by learned per-app delays versus the fixed defaults.
+
+The fake device animates for an app-specific time after every tap. With the
+fixed defaults each tap waits TIMING_CONFIG's delay (1 s) whatever the app.
+With a timing profile the first taps per app measure the settle time, and
+later runs wait p90 + margin instead. Every screenshot, including the polls
+taken while measuring, costs SCREENSHOT_TIME as on a real device.
+
+Usage:
+    python scripts/benchmark_timing_profile.py --runs 3 --steps 10
+"""
+
+import argparse
+import base64
+import contextlib
+import io
+import os
+import tempfile
+import time
+from io import BytesIO
+from types import SimpleNamespace
+
+from PIL import Image, ImageDraw
+
+from phone_agent import PhoneAgent, device_factory
+from phone_agent.adb.screenshot import Screenshot
+from phone_agent.agent import AgentConfig
+from phone_agent.config.timing import TIMING_CONFIG
+from phone_agent.device_factory import DeviceFactory, DeviceType
+from phone_agent.model.client import ModelResponse
+from phone_agent.timing_profile import TimingProfileStore
+
+# Seconds each app keeps animating after a tap
+SETTLE_TIMES = {"Settings": 0.2, "Maps": 0.6}
+FRAME_TIME = 0.04
+SCREENSHOT_TIME = 0.15  # Typical screencap + transfer time over ADB
+
+
+def make_frame(index: int) -> Screenshot:
+    image = Image.new("RGB", (270, 600), "white")
+    x, y = (index % 4) * 60, (index // 4 % 8) * 70
+    ImageDraw.Draw(image).rectangle([x, y, x + 50, y + 120], fill="black")
+    buffered = BytesIO()
+    image.save(buffered, format="PNG")
+    return Screenshot(base64.b64encode(buffered.getvalue()).decode(), 1080, 2400)
+
+
+class AnimatedDevice:
+    """Alternates between apps; each tap animates for the app's settle time."""
+
+    def __init__(self):
+        self.frames = [make_frame(index) for index in range(32)]
+        self.page = 0
+        self.tapped_at = 0.0
+        self.settle = 0.0
+
+    @property
+    def app(self) -> str:
+        return "Maps" if self.page % 2 else "Settings"
+
+    def module(self):
+        def get_screenshot(device_id=None, timeout=10):
+            time.sleep(SCREENSHOT_TIME)
+            elapsed = time.perf_counter() - self.tapped_at
+            if elapsed < self.settle:
+                return self.frames[8 + int(elapsed / FRAME_TIME) % 24]
+            return self.frames[self.page % 8]
+
+        def tap(x, y, device_id=None, delay=None):
+            self.settle = SETTLE_TIMES[self.app]
+            self.page += 1
+            self.tapped_at = time.perf_counter()
+            if delay is None:
+                delay = TIMING_CONFIG.device.default_tap_delay
+            time.sleep(delay)
+
+        return SimpleNamespace(
+            get_screenshot=get_screenshot,
+            get_current_app=lambda device_id=None: self.app,
+            get_device_model=lambda device_id=None: "Pixel 7",
+            tap=tap,
+        )
+
+
+class FakeModelClient:
+    def __init__(self, device: AnimatedDevice, steps: int):
+        self.device = device
+        self.steps = steps
+
+    def request(self, messages, on_action=None, max_tokens=None):
+        if self.device.page >= self.steps:
+            action = 'finish(message="done")'
+        else:
+            action = f'do(action="Tap", element=[500, {self.device.page * 50}])'
+        return ModelResponse(thinking="", action=action, raw_content=action)
+
+    def new_run(self):
+        pass
+
+
+def run(steps: int, store: TimingProfileStore | None) -> float:
+    """Return the wall time of one run."""
+    device = AnimatedDevice()
+    factory = DeviceFactory(DeviceType.ADB)
+    factory._module = device.module()
+    device_factory._device_factory = factory
+
+    agent = PhoneAgent(agent_config=AgentConfig(verbose=False, timing_profile=store))
+    agent.model_client = FakeModelClient(device, steps)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent.run("Check the commute")
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--steps", type=int, default=10)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "timing.json")
+
+    print(f"{'mode':<10} {'run':<4} {'seconds':>8}")
+    defaults = []
+    for index in range(args.runs):
+        defaults.append(run(args.steps, None))
+        print(f"{'defaults':<10} {index + 1:<4} {defaults[-1]:>8.2f}")
+    profiled = []
+    for index in range(args.runs):
+        # Reopened per run, as a later CLI invocation would
+        profiled.append(run(args.steps, TimingProfileStore(path)))
+        print(f"{'profile':<10} {index + 1:<4} {profiled[-1]:>8.2f}")
+
+    print()
+    profiles = TimingProfileStore(path).profiles()
+    for profile in profiles:
+        delay = f"{profile.delay:.2f}s" if profile.delay is not None else "learning"
+        print(
+            f"{profile.app:<10} {profile.action:<5} n={profile.samples:<3} "
+            f"p90={profile.p90:.2f}s delay={delay} default={profile.default:.2f}s"
+        )
+
+    print()
+    for profile in profiles:
+        if profile.delay is not None:
+            print(
+                f"{profile.app}: the learned delay saves "
+                f"{profile.default - profile.delay:.2f}s per {profile.action} "
+                f"over the {profile.default:.2f}s default"
+            )
+    baseline = sum(defaults) / len(defaults)
+    print(
+        f"Learning run: {profiled[0] - baseline:+.2f}s vs defaults "
+        "(settle polls cost a screenshot each)"
+    )
+    if len(profiled) > 1:
+        learned = sum(profiled[1:]) / len(profiled[1:])
+        print(
+            f"Learned runs: {learned - baseline:+.2f}s per run "
+            f"({(learned - baseline) / baseline:+.0%}) vs defaults"
+        )
@@ -0,0 +1,122 @@
+"""
+Model calls saved by replaying recorded trajectories.
+
+Runs the same task repeatedly against a fake device whose screen changes with
+every tap, and a fake model with a fixed latency. The first run is recorded,
+later runs replay it; one run sees an unexpected screen midway and falls back
+to the model.
+
+Usage:
+    python scripts/benchmark_trajectory.py --runs 5 --steps 6
+"""
+
+import argparse
+import base64
+import contextlib
+import io
+import time
+from io import BytesIO
+from types import SimpleNamespace
+
+from PIL import Image, ImageDraw
+
+from phone_agent import PhoneAgent, device_factory
+from phone_agent.adb.screenshot import Screenshot
+from phone_agent.agent import AgentConfig
+from phone_agent.device_factory import DeviceFactory, DeviceType
+from phone_agent.model.client import ModelResponse
+from phone_agent.trajectory import TrajectoryStore
+
+MODEL_LATENCY = 1.2
+
+
+def make_screenshot(page: int) -> Screenshot:
+    """A distinct screen per page: a block whose position depends on the page."""
+    image = Image.new("RGB", (1080, 2400), "white")
+    x, y = (page % 4) * 270, (page // 4) * 600
+    ImageDraw.Draw(image).rectangle([x, y, x + 200, y + 500], fill="black")
+    buffered = BytesIO()
+    image.save(buffered, format="PNG")
+    return Screenshot(base64.b64encode(buffered.getvalue()).decode(), 1080, 2400)
+
+
+class FakeDevice:
+    def __init__(self, steps: int, popup_at: int | None = None):
+        self.screens = [make_screenshot(page) for page in range(steps + 1)]
+        self.popup = make_screenshot(steps + 2)
+        self.popup_at = popup_at
+        self.page = 0
+
+    def module(self):
+        def get_screenshot(device_id=None, timeout=10):
+            if self.page == self.popup_at:
+                return self.popup
+            return self.screens[self.page]
+
+        def tap(x, y, device_id=None, delay=None):
+            if self.page == self.popup_at:
+                self.popup_at = None  # Dismissed
+            else:
+                self.page += 1
+
+        return SimpleNamespace(
+            get_screenshot=get_screenshot,
+            get_current_app=lambda device_id=None: "Settings",
+            tap=tap,
+        )
+
+
+class FakeModelClient:
+    def __init__(self, device: FakeDevice, steps: int):
+        self.device = device
+        self.steps = steps
+        self.calls = 0
+
+    def request(self, messages, on_action=None, max_tokens=None):
+        time.sleep(MODEL_LATENCY)
+        self.calls += 1
+        if self.device.page >= self.steps:
+            action = 'finish(message="done")'
+        else:
+            action = f'do(action="Tap", element=[500, {self.device.page * 100}])'
+        return ModelResponse(thinking="", action=action, raw_content=action)
+
+    def new_run(self):
+        pass
+
+
+def run(store: TrajectoryStore, steps: int, popup_at: int | None) -> tuple[int, float]:
+    """Return (model calls, seconds) for one run of the task."""
+    device = FakeDevice(steps, popup_at)
+    factory = DeviceFactory(DeviceType.ADB)
+    factory._module = device.module()
+    device_factory._device_factory = factory
+
+    agent = PhoneAgent(agent_config=AgentConfig(verbose=False, trajectory_store=store))
+    agent.model_client = FakeModelClient(device, steps)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent.run("Turn on Bluetooth")
+    return agent.model_client.calls, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--steps", type=int, default=6)
+    args = parser.parse_args()
+
+    store = TrajectoryStore()
+    print(f"{'run':<4} {'screen':<10} {'model calls':>11} {'seconds':>8}")
+    for index in range(args.runs):
+        popup_at = args.steps // 2 if index == 2 else None
+        calls, seconds = run(store, args.steps, popup_at)
+        screen = "popup" if popup_at is not None else "normal"
+        print(f"{index + 1:<4} {screen:<10} {calls:>11} {seconds:>8.2f}")
+
+    stats = store.stats
+    print(f"\nhit rate:          {stats.hit_rate:.0%}")
+    print(f"model calls saved: {stats.model_calls_saved}")
+    print(f"model steps:       {stats.model_steps}")
+    print(f"divergences:       {stats.divergences}")
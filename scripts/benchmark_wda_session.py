@@ -0,0 +1,115 @@
+"""
+Latency benchmark: fresh connection per WDA call vs. pooled keep-alive session.
+
+Starts a local fake WebDriverAgent server and issues the same sequence of
+tap/screenshot/activeAppInfo requests both ways.
+
+Usage:
+    python scripts/benchmark_wda_session.py --iterations 200
+"""
+
+import argparse
+import base64
+import json
+import socket
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from phone_agent.xctest.session import WDAHttpSession
+
+# 1x1 black PNG
+_PNG_B64 = base64.b64encode(
+    bytes.fromhex(
+        "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+        "1f15c4890000000d49444154789c6360000002000100e221bc330000000049454e44ae426082"
+    )
+).decode()
+
+
+class FakeWDAHandler(BaseHTTPRequestHandler):
+    """Minimal WDA endpoints answering with canned JSON."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; avoid Nagle stalls
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _reply(self, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.endswith("/screenshot"):
+            self._reply({"value": _PNG_B64})
+        elif self.path.endswith("/wda/activeAppInfo"):
+            self._reply({"value": {"bundleId": "com.apple.mobilesafari"}})
+        else:
+            self._reply({"value": {}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self._reply({"value": None})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_wda() -> tuple[ThreadingHTTPServer, str]:
+    """Start the fake WDA server on a free port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeWDAHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def run_step(get, post, wda_url: str) -> None:
+    """One agent step worth of WDA traffic."""
+    get(f"{wda_url}/screenshot", timeout=5)
+    get(f"{wda_url}/wda/activeAppInfo", timeout=5)
+    post(f"{wda_url}/actions", json={"actions": []}, timeout=5)
+
+
+def measure(get, post, wda_url: str, iterations: int) -> list[float]:
+    """Return per-step latencies in milliseconds."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        run_step(get, post, wda_url)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{name:<24} p50={p50:7.3f}ms  p99={p99:7.3f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    server, wda_url = start_fake_wda()
+    try:
+        fresh = measure(requests.get, requests.post, wda_url, args.iterations)
+        http = WDAHttpSession(wda_url)
+        pooled = measure(http.get, http.post, wda_url, args.iterations)
+        http.close()
+    finally:
+        server.shutdown()
+
+    print(f"Per-step latency over {args.iterations} steps (3 WDA calls each):")
+    report("fresh connection", fresh)
+    report("pooled keep-alive", pooled)
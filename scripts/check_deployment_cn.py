@@ -2,7 +2,7 @@ import argparse
 import json
 import os
 
-from openai import OpenAI
+from phone_agent.model import get_openai_client
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -77,10 +77,7 @@ if __name__ == "__main__":
     print("=" * 80)
 
     try:
-        client = OpenAI(
-            base_url=base_url,
-            api_key=api_key,
-        )
+        client = get_openai_client(base_url, api_key)
 
         response = client.chat.completions.create(
             messages=messages,
@@ -34,6 +34,10 @@ setup(
         "openai>=2.9.0",
     ],
     extras_require={
+        # HTTP/2 to https model endpoints
+        "http2": [
+            "h2>=4.0.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "black>=23.0.0",
@@ -44,6 +48,7 @@ setup(
     entry_points={
         "console_scripts": [
             "phone-agent=main:main",
+            "phone-agent-fake-model=phone_agent.model.fake_server:main",
         ],
     },
 )